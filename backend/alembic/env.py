@@ -11,6 +11,7 @@ from sqlalchemy import engine_from_config, pool
 from app.core.config import settings
 from app.db.base import Base
 import app.models  # noqa: F401  # ensure models are imported for metadata
+import app.models.embedding  # noqa: F401  # lazily exported by app.models, register it explicitly
 
 config = context.config
 
@@ -0,0 +1,28 @@
+"""Natural-key unique constraints on analysis output tables for bulk upserts."""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20261019_0002"
+down_revision = "20241121_0001"
+branch_labels = None
+depends_on = None
+
+
+CONSTRAINTS = (
+    ("uq_deal_metrics_run_lien", "deal_metrics", ["analysis_run_id", "lien_id"]),
+    ("uq_risk_assessments_run_lien", "risk_assessments", ["analysis_run_id", "lien_id"]),
+    ("uq_scenario_analyses_run_lien_scenario", "scenario_analyses", ["analysis_run_id", "lien_id", "scenario_type"]),
+    ("uq_deal_scores_run_profile_lien", "deal_scores", ["analysis_run_id", "investor_profile_id", "lien_id"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in CONSTRAINTS:
+        op.create_unique_constraint(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _columns in reversed(CONSTRAINTS):
+        op.drop_constraint(name, table, type_="unique")
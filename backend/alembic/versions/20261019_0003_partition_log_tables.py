@@ -0,0 +1,123 @@
+"""Monthly range partitioning for agent_logs, audit_logs and integration_events.
+
+Each table is rebuilt as ``PARTITION BY RANGE`` on its timestamp column. The primary key becomes
+``(id, <partition column>)`` because Postgres requires the partition key in every unique constraint.
+Partitions are created from the oldest existing row through ``PREMAKE_MONTHS`` ahead; afterwards the
+``manage_log_partitions`` job keeps them rolling.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261019_0003"
+down_revision = "20261019_0002"
+branch_labels = None
+depends_on = None
+
+PREMAKE_MONTHS = 3
+
+TABLES = {
+    "agent_logs": {
+        "column": "created_at",
+        "definition": """
+            id UUID NOT NULL DEFAULT uuid_generate_v4(),
+            agent_task_id UUID NOT NULL REFERENCES agent_tasks (id) ON DELETE CASCADE,
+            log_type agent_log_type NOT NULL,
+            content JSONB NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, created_at)
+        """,
+        "columns": "id, agent_task_id, log_type, content, created_at",
+        "indexes": ["CREATE INDEX ix_agent_logs_agent_task_id_created_at ON agent_logs (agent_task_id, created_at)"],
+    },
+    "audit_logs": {
+        "column": "created_at",
+        "definition": """
+            id UUID NOT NULL DEFAULT uuid_generate_v4(),
+            user_id UUID REFERENCES users (id) ON DELETE SET NULL,
+            event_type VARCHAR(120) NOT NULL,
+            entity_type VARCHAR(120) NOT NULL,
+            entity_id VARCHAR(64) NOT NULL,
+            description TEXT NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, created_at)
+        """,
+        "columns": "id, user_id, event_type, entity_type, entity_id, description, created_at",
+        "indexes": [],
+    },
+    "integration_events": {
+        "column": "started_at",
+        "definition": """
+            id UUID NOT NULL DEFAULT uuid_generate_v4(),
+            source_system integration_source NOT NULL,
+            request_payload JSONB,
+            response_payload JSONB,
+            status integration_status NOT NULL,
+            error_message TEXT,
+            started_at TIMESTAMPTZ NOT NULL,
+            completed_at TIMESTAMPTZ,
+            PRIMARY KEY (id, started_at)
+        """,
+        "columns": "id, source_system, request_payload, response_payload, status, error_message, started_at, completed_at",
+        "indexes": [],
+    },
+}
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partitions(table: str, first: date, last: date) -> None:
+    month = first
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month.year:04d}_{month.month:02d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+
+def upgrade() -> None:
+    op.add_column(
+        "agent_logs",
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+
+    bind = op.get_bind()
+    today = datetime.now(timezone.utc).date()
+    current_month = date(today.year, today.month, 1)
+
+    for table, spec in TABLES.items():
+        legacy = f"{table}_legacy"
+        op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+        op.execute(f"CREATE TABLE {table} ({spec['definition']}) PARTITION BY RANGE ({spec['column']})")
+
+        oldest = bind.execute(sa.text(f"SELECT min({spec['column']}) FROM {legacy}")).scalar()
+        first = date(oldest.year, oldest.month, 1) if oldest is not None else current_month
+        _create_partitions(table, min(first, current_month), _add_months(current_month, PREMAKE_MONTHS))
+
+        op.execute(f"INSERT INTO {table} ({spec['columns']}) SELECT {spec['columns']} FROM {legacy}")
+        op.execute(f"DROP TABLE {legacy}")
+        for statement in spec["indexes"]:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    for table, spec in TABLES.items():
+        partitioned = f"{table}_partitioned"
+        op.execute(f"ALTER TABLE {table} RENAME TO {partitioned}")
+        op.execute(f"ALTER TABLE {partitioned} RENAME CONSTRAINT {table}_pkey TO {partitioned}_pkey")
+        definition = spec["definition"].replace(f"PRIMARY KEY (id, {spec['column']})", "PRIMARY KEY (id)")
+        op.execute(f"CREATE TABLE {table} ({definition})")
+        op.execute(f"INSERT INTO {table} ({spec['columns']}) SELECT {spec['columns']} FROM {partitioned}")
+        op.execute(f"DROP TABLE {partitioned} CASCADE")
+
+    op.drop_column("agent_logs", "created_at")
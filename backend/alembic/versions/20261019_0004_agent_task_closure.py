@@ -0,0 +1,90 @@
+"""Closure table for the agent task tree, maintained by an insert trigger.
+
+``agent_task_closure`` holds one row per (ancestor, descendant) pair including the depth-0 self
+row. An ``AFTER INSERT`` trigger on ``agent_tasks`` copies the parent's ancestor rows for each new
+task, so every writer (ORM, bulk ``INSERT ... SELECT``, ``COPY``) keeps the table current. Tasks are
+not re-parented after creation; the trigger deliberately ignores ``parent_task_id`` updates.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20261019_0004"
+down_revision = "20261019_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_agent_tasks_analysis_run_id", "agent_tasks", ["analysis_run_id"])
+
+    op.create_table(
+        "agent_task_closure",
+        sa.Column(
+            "ancestor_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("agent_tasks.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "descendant_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("agent_tasks.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.Column(
+            "analysis_run_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("analysis_runs.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_agent_task_closure_descendant_id", "agent_task_closure", ["descendant_id"])
+    op.create_index("ix_agent_task_closure_analysis_run_id", "agent_task_closure", ["analysis_run_id"])
+
+    op.execute(
+        """
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM agent_tasks
+            UNION ALL
+            SELECT tree.ancestor_id, child.id, tree.depth + 1
+            FROM tree JOIN agent_tasks child ON child.parent_task_id = tree.descendant_id
+        )
+        INSERT INTO agent_task_closure (ancestor_id, descendant_id, depth, analysis_run_id)
+        SELECT tree.ancestor_id, tree.descendant_id, tree.depth, task.analysis_run_id
+        FROM tree JOIN agent_tasks task ON task.id = tree.descendant_id
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION agent_task_closure_insert() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO agent_task_closure (ancestor_id, descendant_id, depth, analysis_run_id)
+            SELECT ancestor_id, NEW.id, depth + 1, NEW.analysis_run_id
+            FROM agent_task_closure
+            WHERE descendant_id = NEW.parent_task_id
+            UNION ALL
+            SELECT NEW.id, NEW.id, 0, NEW.analysis_run_id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER trg_agent_task_closure_insert AFTER INSERT ON agent_tasks "
+        "FOR EACH ROW EXECUTE FUNCTION agent_task_closure_insert()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_agent_task_closure_insert ON agent_tasks")
+    op.execute("DROP FUNCTION IF EXISTS agent_task_closure_insert()")
+    op.drop_index("ix_agent_task_closure_analysis_run_id", table_name="agent_task_closure")
+    op.drop_index("ix_agent_task_closure_descendant_id", table_name="agent_task_closure")
+    op.drop_table("agent_task_closure")
+    op.drop_index("ix_agent_tasks_analysis_run_id", table_name="agent_tasks")
@@ -0,0 +1,62 @@
+"""Document chunks for corpus ingestion and a natural key on embeddings.
+
+``document_chunks`` stores each document's overlapping text windows. Embeddings for chunks are keyed
+by ``(entity_type='document_chunk', entity_id=<sha256 of chunk text>, model_name)`` so identical text
+is embedded once across documents and re-uploads; duplicate embedding rows are collapsed before
+the unique constraint is added.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20261019_0005"
+down_revision = "20261019_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("documents", sa.Column("content_hash", sa.String(length=64)))
+    op.add_column("documents", sa.Column("ingested_at", sa.DateTime(timezone=True)))
+
+    op.create_table(
+        "document_chunks",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("uuid_generate_v4()")),
+        sa.Column(
+            "document_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("chunk_index", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("location", sa.String(length=255)),
+        sa.UniqueConstraint("document_id", "chunk_index", name="uq_document_chunks_document_chunk_index"),
+    )
+    op.create_index("ix_document_chunks_content_hash", "document_chunks", ["content_hash"])
+
+    op.execute(
+        """
+        DELETE FROM embeddings a
+        USING embeddings b
+        WHERE a.entity_type = b.entity_type
+          AND a.entity_id = b.entity_id
+          AND a.model_name IS NOT DISTINCT FROM b.model_name
+          AND a.ctid > b.ctid
+        """
+    )
+    op.create_unique_constraint(
+        "uq_embeddings_entity_model", "embeddings", ["entity_type", "entity_id", "model_name"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_embeddings_entity_model", "embeddings", type_="unique")
+    op.drop_index("ix_document_chunks_content_hash", table_name="document_chunks")
+    op.drop_table("document_chunks")
+    op.drop_column("documents", "ingested_at")
+    op.drop_column("documents", "content_hash")
@@ -0,0 +1,47 @@
+"""Full-text and approximate-nearest-neighbour indexes for corpus retrieval.
+
+``document_chunks.search_vector`` is a stored ``tsvector`` generated from ``content`` and indexed with
+GIN for lexical matches (parcel IDs, certificate numbers, statute citations). Chunk embeddings get a
+partial HNSW index using cosine distance, restricted to ``entity_type = 'document_chunk'`` so other
+embedding kinds do not share the graph.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20261019_0006"
+down_revision = "20261019_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "document_chunks",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', content)", persisted=True),
+        ),
+    )
+    op.create_index(
+        "ix_document_chunks_search_vector", "document_chunks", ["search_vector"], postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_embeddings_document_chunk_hnsw",
+        "embeddings",
+        ["embedding_vector"],
+        postgresql_using="hnsw",
+        postgresql_with={"m": 16, "ef_construction": 64},
+        postgresql_ops={"embedding_vector": "vector_cosine_ops"},
+        postgresql_where=sa.text("entity_type = 'document_chunk'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_embeddings_document_chunk_hnsw", table_name="embeddings")
+    op.drop_index("ix_document_chunks_search_vector", table_name="document_chunks")
+    op.drop_column("document_chunks", "search_vector")
@@ -0,0 +1,42 @@
+"""Digest grouping for notifications.
+
+``group_key`` identifies an event stream within a digest window (e.g. ``top_deals_updated:<bucket>``)
+and ``event_count`` how many events a row stands for. The partial unique index allows one unread row
+per user and group, which fan-out targets with ``ON CONFLICT ... DO UPDATE`` to collapse bursts.
+``ix_notifications_user_unread`` serves unread listings, bulk mark-read and digest builds.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261019_0007"
+down_revision = "20261019_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("notifications", sa.Column("group_key", sa.String(length=160)))
+    op.add_column("notifications", sa.Column("event_count", sa.Integer(), nullable=False, server_default="1"))
+    op.create_index(
+        "uq_notifications_user_open_group",
+        "notifications",
+        ["user_id", "group_key"],
+        unique=True,
+        postgresql_where=sa.text("group_key IS NOT NULL AND NOT is_read"),
+    )
+    op.create_index(
+        "ix_notifications_user_unread",
+        "notifications",
+        ["user_id", "created_at"],
+        postgresql_where=sa.text("NOT is_read"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_user_unread", table_name="notifications")
+    op.drop_index("uq_notifications_user_open_group", table_name="notifications")
+    op.drop_column("notifications", "event_count")
+    op.drop_column("notifications", "group_key")
@@ -0,0 +1,61 @@
+"""Redemption survival observations and monthly cash-flow forecasts.
+
+``redemption_observations`` holds one row per closed portfolio holding: county, lien stratum, months
+held and whether the holding ended in redemption. The forecast job upserts holdings changed since the
+newest ``observed_at`` and fits hazards from this narrow table. ``redemption_cashflow_forecasts`` stores
+the projection per forecast date, portfolio and calendar month; a rerun replaces its ``as_of``.
+``ix_portfolio_holdings_updated_at`` serves the incremental observation refresh.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20261019_0008"
+down_revision = "20261019_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "redemption_observations",
+        sa.Column(
+            "holding_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("portfolio_holdings.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("county_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("stratum", sa.SmallInteger(), nullable=False),
+        sa.Column("duration_months", sa.SmallInteger(), nullable=False),
+        sa.Column("redeemed", sa.Boolean(), nullable=False),
+        sa.Column("observed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_redemption_observations_observed_at", "redemption_observations", ["observed_at"])
+    op.create_table(
+        "redemption_cashflow_forecasts",
+        sa.Column("as_of", sa.Date(), primary_key=True),
+        sa.Column(
+            "portfolio_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("portfolios.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("expected_redemptions", sa.Numeric(18, 4), nullable=False),
+        sa.Column("expected_cashflow", sa.Numeric(18, 2), nullable=False),
+        sa.Column("cashflow_lower", sa.Numeric(18, 2), nullable=False),
+        sa.Column("cashflow_upper", sa.Numeric(18, 2), nullable=False),
+    )
+    # Incremental refits read only holdings updated since the last observation.
+    op.create_index("ix_portfolio_holdings_updated_at", "portfolio_holdings", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_portfolio_holdings_updated_at", table_name="portfolio_holdings")
+    op.drop_table("redemption_cashflow_forecasts")
+    op.drop_index("ix_redemption_observations_observed_at", table_name="redemption_observations")
+    op.drop_table("redemption_observations")
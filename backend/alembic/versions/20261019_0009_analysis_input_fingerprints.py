@@ -0,0 +1,41 @@
+"""Input fingerprints on analysis outputs for incremental watchlist refreshes.
+
+Each per-lien output row records an md5 of the inputs it was computed from. A refresh run copies the
+previous run's rows forward for liens whose fingerprint is unchanged. The indexes serve the latest
+valuation lookup inside the fingerprint and the search for the previous completed run.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261019_0009"
+down_revision = "20261019_0008"
+branch_labels = None
+depends_on = None
+
+
+OUTPUT_TABLES = ("deal_metrics", "risk_assessments", "scenario_analyses", "deal_scores")
+
+
+def upgrade() -> None:
+    for table in OUTPUT_TABLES:
+        op.add_column(table, sa.Column("input_fingerprint", sa.String(length=32), nullable=True))
+    op.create_index(
+        "ix_property_valuations_property_latest",
+        "property_valuations",
+        ["property_id", sa.text("valuation_date DESC"), sa.text("created_at DESC")],
+    )
+    op.create_index(
+        "ix_analysis_runs_profile_type_completed",
+        "analysis_runs",
+        ["investor_profile_id", "analysis_type", sa.text("completed_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_analysis_runs_profile_type_completed", table_name="analysis_runs")
+    op.drop_index("ix_property_valuations_property_latest", table_name="property_valuations")
+    for table in reversed(OUTPUT_TABLES):
+        op.drop_column(table, "input_fingerprint")
@@ -0,0 +1,27 @@
+"""Rank-ordered index on deal scores for streaming ranked-deal exports.
+
+Exports read a run's scores in ``(investor_profile_id, rank_within_run, lien_id)`` order through a
+server-side cursor. With this index the rows come back already in order, so the first chunk arrives
+without sorting the whole run first.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20261019_0010"
+down_revision = "20261019_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_deal_scores_run_profile_rank",
+        "deal_scores",
+        ["analysis_run_id", "investor_profile_id", "rank_within_run", "lien_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_deal_scores_run_profile_rank", table_name="deal_scores")
@@ -0,0 +1,53 @@
+"""Uploaded lead lists and their staged rows.
+
+``uploads`` records each CSV or XLSX lead list with its inferred sheet layout. ``upload_rows``
+stages every source row as a JSON array of cell text, keyed by sheet and source row number, and is
+bulk-loaded with ``COPY``.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20261019_0011"
+down_revision = "20261019_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "uploads",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("uuid_generate_v4()")),
+        sa.Column("owner_user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="SET NULL")),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("mime_type", sa.String(length=255)),
+        sa.Column("file_format", sa.String(length=16), nullable=False),
+        sa.Column("content_hash", sa.String(length=64)),
+        sa.Column("status", sa.String(length=32), nullable=False, server_default="pending"),
+        sa.Column("row_count", sa.Integer()),
+        sa.Column("sheets", postgresql.JSONB()),
+        sa.Column("error", sa.Text()),
+        sa.Column("staged_at", sa.DateTime(timezone=True)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "upload_rows",
+        sa.Column(
+            "upload_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("uploads.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("sheet_index", sa.SmallInteger(), primary_key=True),
+        sa.Column("row_number", sa.Integer(), primary_key=True),
+        sa.Column("cells", postgresql.JSONB(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("upload_rows")
+    op.drop_table("uploads")
@@ -0,0 +1,45 @@
+"""Chunked, resumable uploads.
+
+``uploads`` gains the declared size and part layout of a chunked upload and the time its last part
+arrived. ``upload_parts`` records each received part with its verified length and SHA-256, so a
+client can ask which parts are still missing and resume.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20261019_0012"
+down_revision = "20261019_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("uploads", sa.Column("size_bytes", sa.BigInteger()))
+    op.add_column("uploads", sa.Column("part_size", sa.Integer()))
+    op.add_column("uploads", sa.Column("part_count", sa.Integer()))
+    op.add_column("uploads", sa.Column("received_at", sa.DateTime(timezone=True)))
+    op.create_table(
+        "upload_parts",
+        sa.Column(
+            "upload_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("uploads.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("part_number", sa.Integer(), primary_key=True),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("received_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("upload_parts")
+    op.drop_column("uploads", "received_at")
+    op.drop_column("uploads", "part_count")
+    op.drop_column("uploads", "part_size")
+    op.drop_column("uploads", "size_bytes")
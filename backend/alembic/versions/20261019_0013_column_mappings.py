@@ -0,0 +1,32 @@
+"""Confirmed column mappings of uploaded lead lists.
+
+``column_mappings`` stores one reviewed lead-field mapping per header layout, keyed by the SHA-256
+fingerprint of the layout's normalised headers, so ``suggest_mapping`` answers known layouts without
+heuristics, embeddings or an LLM call.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20261019_0013"
+down_revision = "20261019_0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "column_mappings",
+        sa.Column("fingerprint", sa.String(length=64), primary_key=True),
+        sa.Column("headers", postgresql.JSONB(), nullable=False),
+        sa.Column("fields", postgresql.JSONB(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("column_mappings")
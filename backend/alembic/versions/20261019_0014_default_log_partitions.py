@@ -0,0 +1,43 @@
+"""Default partitions for the monthly-partitioned log tables.
+
+Without a ``DEFAULT`` partition, a row whose timestamp falls outside every pre-created month (a
+backdated event, or a month maintenance did not reach in time) fails to insert. ``<table>_default``
+takes those rows instead, and ``manage_log_partitions`` later moves them into monthly partitions.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261019_0014"
+down_revision = "20261019_0013"
+branch_labels = None
+depends_on = None
+
+TABLES = {"agent_logs": "created_at", "audit_logs": "created_at", "integration_events": "started_at"}
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    for table, column in TABLES.items():
+        # Rows still in the default partition need a monthly home before it goes away.
+        op.execute(f"ALTER TABLE {table} DETACH PARTITION {table}_default")
+        months = connection.execute(
+            sa.text(f"SELECT DISTINCT CAST(date_trunc('month', {column}) AS date) FROM {table}_default")
+        ).scalars().all()
+        for month in months:
+            upper = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+            op.execute(
+                f"CREATE TABLE IF NOT EXISTS {table}_p{month.year:04d}_{month.month:02d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_default")
+        op.execute(f"DROP TABLE {table}_default")
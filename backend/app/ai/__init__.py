@@ -1,5 +1,6 @@
 """AI-related helpers and service abstractions."""
 
 from .openai_service import OpenAIService
+from .tool_executor import ToolExecutor, ToolRegistry, ToolSpec
 
-__all__ = ["OpenAIService"]
+__all__ = ["OpenAIService", "ToolExecutor", "ToolRegistry", "ToolSpec"]
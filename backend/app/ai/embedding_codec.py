@@ -0,0 +1,93 @@
+"""Compact encodings for embedding matrices.
+
+Embeddings are handled as little-endian float32 ``(vectors, dimensions)`` matrices end to end.
+``OpenAIService`` requests ``encoding_format="base64"`` explicitly. The SDK then hands back the raw
+strings instead of expanding them into Python floats, and ``decode_base64`` writes each vector
+straight into one matrix.
+
+``POST /api/v1/ai/embeddings`` serves that matrix in the form the client asks for:
+
+* JSON floats (the default), serialised from the array by orjson without per-float validation.
+* JSON with ``encoding_format="base64"``: one base64 string of float32 bytes per vector. At 3072
+  dimensions that is about 16 KB per vector instead of about 60 KB of decimal text.
+* ``Accept: application/x-npy``: a NumPy ``.npy`` file.
+* ``Accept: application/vnd.apache.arrow.stream``: an Arrow IPC stream with one
+  ``fixed_size_list<float32>`` column. This needs the optional ``pyarrow`` package.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+import orjson
+
+DTYPE = np.dtype("<f4")
+
+
+def decode_base64(encoded: Sequence[str]) -> np.ndarray:
+    """Base64 float32 vectors, as returned with ``encoding_format="base64"``, in one matrix."""
+    if not encoded:
+        return np.empty((0, 0), dtype=DTYPE)
+    first = np.frombuffer(base64.b64decode(encoded[0]), dtype=DTYPE)
+    matrix = np.empty((len(encoded), first.shape[0]), dtype=DTYPE)
+    matrix[0] = first
+    for row in range(1, len(encoded)):
+        vector = np.frombuffer(base64.b64decode(encoded[row]), dtype=DTYPE)
+        if vector.shape[0] != matrix.shape[1]:
+            raise RuntimeError("Embedding vectors have inconsistent dimensions.")
+        matrix[row] = vector
+    return matrix
+
+
+def as_matrix(vectors: Any) -> np.ndarray:
+    """A float32 matrix view of ``vectors``; float32 arrays pass through without a copy."""
+    try:
+        matrix = np.asarray(vectors, dtype=DTYPE)
+    except ValueError as exc:
+        raise RuntimeError("Embedding vectors have inconsistent dimensions.") from exc
+    if matrix.ndim != 2:
+        if matrix.size == 0:
+            return matrix.reshape(len(matrix), 0)
+        raise RuntimeError("Embedding vectors have inconsistent dimensions.")
+    return np.ascontiguousarray(matrix)
+
+
+def encode_base64(matrix: np.ndarray) -> List[str]:
+    return [base64.b64encode(row).decode("ascii") for row in as_matrix(matrix)]
+
+
+def to_npy(matrix: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, as_matrix(matrix), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def to_arrow(matrix: np.ndarray, metadata: Mapping[str, str]) -> bytes:
+    """Arrow IPC stream: one ``embedding`` column of ``fixed_size_list<float32>[dimensions]``."""
+    try:
+        import pyarrow as pa
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("Arrow responses require the pyarrow package.") from exc
+    matrix = as_matrix(matrix)
+    # ``pa.array`` wraps the NumPy buffer without copying it.
+    column = pa.FixedSizeListArray.from_arrays(pa.array(matrix.reshape(-1)), matrix.shape[1])
+    schema = pa.schema([pa.field("embedding", column.type)], metadata=dict(metadata))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(pa.record_batch([column], schema=schema))
+    return sink.getvalue().to_pybytes()
+
+
+def binary_headers(model: str, usage: Dict[str, Any] | None, matrix: np.ndarray) -> Dict[str, str]:
+    """What the JSON body would carry besides the vectors, for the binary formats."""
+    headers = {
+        "X-Embedding-Model": model,
+        "X-Embedding-Shape": f"{matrix.shape[0]},{matrix.shape[1]}",
+        "X-Embedding-Dtype": "float32",
+    }
+    if usage:
+        headers["X-Embedding-Usage"] = orjson.dumps(usage).decode("ascii")
+    return headers
@@ -3,9 +3,15 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 
-from openai import AsyncOpenAI
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from app.core.tracing import get_tracer, record_token_usage
+
+if TYPE_CHECKING:  # pragma: no cover - the SDK is imported lazily by callers constructing the client
+    from openai import AsyncOpenAI
 
 
 class OpenAIService:
@@ -28,70 +34,174 @@ class OpenAIService:
             raise ValueError("Prompt must not be empty.")
 
         model_name = model or self._default_model
-        request_payload: Dict[str, Any] = {
-            "model": model_name,
-            "input": prompt,
-            "temperature": temperature,
-        }
-        if max_output_tokens is not None:
-            request_payload["max_output_tokens"] = max_output_tokens
-
-        response = await self._client.responses.create(**request_payload)
-        if hasattr(response, "model_dump"):
-            response_data = response.model_dump()
-        else:
-            response_data = {
-                "output_text": getattr(response, "output_text", None),
-                "output": getattr(response, "output", None),
-            }
-            usage_obj = getattr(response, "usage", None)
-            if usage_obj is not None:
-                if hasattr(usage_obj, "model_dump"):
-                    response_data["usage"] = usage_obj.model_dump()
-                elif isinstance(usage_obj, dict):
-                    response_data["usage"] = usage_obj
+        request_payload = self._response_payload(prompt, model_name, temperature, max_output_tokens)
+
+        with get_tracer().start_as_current_span(
+            "openai.responses.create",
+            kind=SpanKind.CLIENT,
+            attributes={"gen_ai.system": "openai", "gen_ai.request.model": model_name},
+        ) as span:
+            response = await self._client.responses.create(**request_payload)
+            if hasattr(response, "model_dump"):
+                response_data = response.model_dump()
+            else:
+                response_data = {
+                    "output_text": getattr(response, "output_text", None),
+                    "output": getattr(response, "output", None),
+                }
+                usage_obj = getattr(response, "usage", None)
+                if usage_obj is not None:
+                    if hasattr(usage_obj, "model_dump"):
+                        response_data["usage"] = usage_obj.model_dump()
+                    elif isinstance(usage_obj, dict):
+                        response_data["usage"] = usage_obj
+
+            usage = self._normalise_usage(response_data.get("usage"))
+            record_token_usage(span, usage)
 
         text = self._extract_text(response_data)
         if not text:
             raise RuntimeError("OpenAI response did not contain any text output.")
 
-        usage = self._normalise_usage(response_data.get("usage"))
         return {"content": text, "model": model_name, "usage": usage}
 
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_output_tokens: int | None = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield ``{"type": "delta", "text": ...}`` events as tokens arrive, then one ``completed`` event.
+
+        The final event carries the full ``content``, ``model`` and normalised ``usage``. Closing the
+        generator early (e.g. the HTTP client disconnected) closes the upstream stream, which aborts the
+        OpenAI request instead of letting it run to completion.
+        """
+        if not prompt.strip():
+            raise ValueError("Prompt must not be empty.")
+
+        model_name = model or self._default_model
+        request_payload = self._response_payload(prompt, model_name, temperature, max_output_tokens)
+
+        # Not made the current span: an async generator may resume in a different context.
+        span = get_tracer().start_span(
+            "openai.responses.stream",
+            kind=SpanKind.CLIENT,
+            attributes={"gen_ai.system": "openai", "gen_ai.request.model": model_name},
+        )
+        stream = None
+        try:
+            stream = await self._client.responses.create(**request_payload, stream=True)
+            parts: List[str] = []
+            usage: Optional[Dict[str, int]] = None
+            async for event in stream:
+                event_type = getattr(event, "type", None)
+                if event_type == "response.output_text.delta":
+                    delta = getattr(event, "delta", "") or ""
+                    if delta:
+                        if not parts:
+                            span.add_event("first_token")
+                        parts.append(delta)
+                        yield {"type": "delta", "text": delta}
+                elif event_type in {"response.completed", "response.incomplete"}:
+                    response = getattr(event, "response", None)
+                    usage = self._normalise_usage(self._as_dict(getattr(response, "usage", None)))
+                elif event_type in {"response.failed", "error"}:
+                    raise RuntimeError("OpenAI streaming response failed.")
+
+            record_token_usage(span, usage)
+            content = "".join(parts).strip()
+            if not content:
+                raise RuntimeError("OpenAI response did not contain any text output.")
+            yield {"type": "completed", "content": content, "model": model_name, "usage": usage}
+        except BaseException as exc:
+            if not isinstance(exc, (GeneratorExit, asyncio.CancelledError)):
+                span.record_exception(exc)
+                span.set_status(Status(StatusCode.ERROR))
+            raise
+        finally:
+            if stream is not None:
+                await stream.close()
+            span.end()
+
+    async def aclose(self) -> None:
+        await self._client.close()
+
     async def create_embeddings(
         self,
         texts: List[str],
         *,
         model: str | None = None,
+        dimensions: int | None = None,
     ) -> Dict[str, Any]:
         if not texts:
             raise ValueError("At least one text input is required for embeddings.")
 
         embedding_model = model or self._embedding_model
-        response = await self._client.embeddings.create(model=embedding_model, input=texts)
-
-        vectors: List[List[float]] = []
+        with get_tracer().start_as_current_span(
+            "openai.embeddings.create",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "gen_ai.system": "openai",
+                "gen_ai.request.model": embedding_model,
+                "gen_ai.request.input_count": len(texts),
+            },
+        ) as span:
+            # Asking for base64 explicitly makes the SDK return the raw strings instead of Python float lists.
+            request_payload: Dict[str, Any] = {"model": embedding_model, "input": texts, "encoding_format": "base64"}
+            if dimensions is not None:
+                request_payload["dimensions"] = dimensions
+            response = await self._client.embeddings.create(**request_payload)
+            usage_source: Optional[Any] = getattr(response, "usage", None)
+            usage_data: Optional[Dict[str, Any]] = None
+            if usage_source is not None:
+                if hasattr(usage_source, "model_dump"):
+                    usage_data = usage_source.model_dump()
+                elif isinstance(usage_source, dict):
+                    usage_data = usage_source
+            usage = self._normalise_usage(usage_data)
+            record_token_usage(span, usage)
+
+        encoded: List[Any] = []
         for item in getattr(response, "data", []) or []:
             embedding = getattr(item, "embedding", None)
             if embedding is None and hasattr(item, "model_dump"):
                 embedding = item.model_dump().get("embedding")
             if embedding is not None:
-                vectors.append(list(embedding))
+                encoded.append(embedding)
 
-        if len(vectors) != len(texts):
+        if len(encoded) != len(texts):
             raise RuntimeError("OpenAI returned an unexpected number of embeddings.")
 
-        usage_source: Optional[Any] = getattr(response, "usage", None)
-        usage_data: Optional[Dict[str, Any]] = None
-        if usage_source is not None:
-            if hasattr(usage_source, "model_dump"):
-                usage_data = usage_source.model_dump()
-            elif isinstance(usage_source, dict):
-                usage_data = usage_source
+        from app.ai.embedding_codec import as_matrix, decode_base64  # NumPy stays out of API start-up
 
-        usage = self._normalise_usage(usage_data)
+        # A float32 ``(texts, dimensions)`` matrix; rows slice out without copying.
+        vectors = decode_base64(encoded) if isinstance(encoded[0], str) else as_matrix(encoded)
         return {"embeddings": vectors, "model": embedding_model, "usage": usage}
 
+    @staticmethod
+    def _response_payload(
+        prompt: str, model_name: str, temperature: float, max_output_tokens: int | None
+    ) -> Dict[str, Any]:
+        request_payload: Dict[str, Any] = {
+            "model": model_name,
+            "input": prompt,
+            "temperature": temperature,
+        }
+        if max_output_tokens is not None:
+            request_payload["max_output_tokens"] = max_output_tokens
+        return request_payload
+
+    @staticmethod
+    def _as_dict(value: Any) -> Optional[Dict[str, Any]]:
+        if value is None:
+            return None
+        if hasattr(value, "model_dump"):
+            return value.model_dump()
+        return value if isinstance(value, dict) else None
+
     @staticmethod
     def _extract_text(response_data: Dict[str, Any]) -> str:
         if not isinstance(response_data, dict):
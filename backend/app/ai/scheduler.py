@@ -0,0 +1,490 @@
+"""Token-budget-aware scheduling of LLM calls shared by interactive, agent and batch work.
+
+Every call is queued with a priority class and dispatched only when the requests-per-minute and
+tokens-per-minute budgets allow it. Budgets are continuous token buckets: capacity is the per-minute
+limit and they refill at ``limit / 60`` per second. Cost is estimated up front (prompt characters / 4
+plus the output allowance) and reconciled against the provider's reported usage afterwards.
+
+* Higher classes always dispatch first (``INTERACTIVE`` > ``AGENT`` > ``BATCH``).
+* Lower classes may only spend the budget down to a reserved share
+  (``LLM_INTERACTIVE_RESERVE_RATIO``), so a burst of batch work cannot leave interactive requests
+  waiting for a refill; batch still uses all remaining capacity.
+* Small embedding requests of the same class and model queued within ``LLM_COALESCE_WINDOW_MS`` are
+  merged into one upstream call and split back per caller.
+* Streamed text (``generate_text_stream``) is admitted like any other call. It then holds its
+  concurrency slot until the stream ends, and its token estimate is settled from the usage in the final
+  event.
+
+Budgets are per process; size them as the provider limit divided by the number of API and worker
+processes sharing the key.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Protocol
+
+from app.core.config import settings
+
+CHARS_PER_TOKEN = 4
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    AGENT = 1
+    BATCH = 2
+
+
+class LLMProvider(Protocol):
+    """The subset of ``OpenAIService`` the scheduler drives."""
+
+    async def generate_text(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_output_tokens: int | None = None,
+    ) -> Dict[str, Any]: ...
+
+    def generate_text_stream(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_output_tokens: int | None = None,
+    ) -> AsyncIterator[Dict[str, Any]]: ...
+
+    async def create_embeddings(
+        self, texts: List[str], *, model: str | None = None, dimensions: int | None = None
+    ) -> Dict[str, Any]: ...
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def usage_tokens(usage: Optional[Dict[str, int]]) -> Optional[int]:
+    if not usage:
+        return None
+    if usage.get("total_tokens") is not None:
+        return usage["total_tokens"]
+    if usage.get("input_tokens") is None and usage.get("output_tokens") is None:
+        return None
+    return (usage.get("input_tokens") or 0) + (usage.get("output_tokens") or 0)
+
+
+class RateBudget:
+    """Token bucket holding up to ``per_minute`` units; ``per_minute <= 0`` means unlimited."""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float]) -> None:
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self._rate = self.capacity / 60.0
+        self._clock = clock
+        self._updated = clock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, reserve_ratio: float = 0.0) -> float:
+        """Seconds until ``amount`` can be spent while leaving ``reserve_ratio`` of capacity untouched."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        # A single request larger than the spendable capacity is admitted once the bucket is full.
+        floor = self.capacity * reserve_ratio
+        amount = min(amount, self.capacity - floor)
+        shortfall = amount + floor - self.level
+        return 0.0 if shortfall <= 0 else shortfall / self._rate
+
+    def consume(self, amount: float) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.level -= amount
+
+    def adjust(self, delta: float) -> None:
+        """Return (positive) or charge (negative) the difference between estimated and actual usage."""
+        if not self.unlimited:
+            self._refill()
+            self.level = min(self.capacity, self.level + delta)
+
+
+@dataclass
+class _Job:
+    priority: Priority
+    kind: str
+    payload: Dict[str, Any]
+    estimated_tokens: int
+    future: asyncio.Future
+    enqueued_at: float
+    sequence: int = 0
+    coalesce_key: Optional[tuple] = None
+    item_count: int = 1
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+@dataclass
+class SchedulerStats:
+    dispatched: Dict[Priority, int] = field(default_factory=lambda: {priority: 0 for priority in Priority})
+    coalesced_requests: int = 0
+    upstream_calls: int = 0
+
+
+class LLMScheduler:
+    """Priority queue in front of an ``LLMProvider`` enforcing RPM/TPM budgets."""
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        *,
+        tokens_per_minute: int | None = None,
+        requests_per_minute: int | None = None,
+        max_concurrency: int | None = None,
+        interactive_reserve_ratio: float | None = None,
+        coalesce_window_ms: float | None = None,
+        coalesce_max_items: int | None = None,
+        default_output_tokens: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._provider = provider
+        self._clock = clock
+        self._tokens = RateBudget(
+            settings.LLM_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute, clock
+        )
+        self._requests = RateBudget(
+            settings.LLM_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute, clock
+        )
+        reserve = (
+            settings.LLM_INTERACTIVE_RESERVE_RATIO if interactive_reserve_ratio is None else interactive_reserve_ratio
+        )
+        if not 0 <= reserve < 1:
+            raise ValueError("Interactive reserve ratio must be in [0, 1).")
+        self._reserve = {Priority.INTERACTIVE: 0.0, Priority.AGENT: reserve / 2, Priority.BATCH: reserve}
+        window_ms = settings.LLM_COALESCE_WINDOW_MS if coalesce_window_ms is None else coalesce_window_ms
+        self._coalesce_window = window_ms / 1000
+        self._coalesce_max_items = coalesce_max_items or settings.LLM_COALESCE_MAX_ITEMS
+        self._default_output_tokens = default_output_tokens or settings.LLM_DEFAULT_OUTPUT_TOKENS
+        self._slots = asyncio.Semaphore(max_concurrency or settings.LLM_SCHEDULER_MAX_CONCURRENCY)
+
+        self._queue: List[_Job] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._in_flight: set[asyncio.Task] = set()
+        self.stats = SchedulerStats()
+
+    # -- public API ---------------------------------------------------------------------------
+
+    async def generate_text(
+        self,
+        prompt: str,
+        *,
+        priority: Priority = Priority.INTERACTIVE,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_output_tokens: int | None = None,
+    ) -> Dict[str, Any]:
+        estimate = estimate_tokens(prompt) + (max_output_tokens or self._default_output_tokens)
+        payload = {"prompt": prompt, "model": model, "temperature": temperature, "max_output_tokens": max_output_tokens}
+        return await self._submit(priority, "text", payload, estimate)
+
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        *,
+        priority: Priority = Priority.INTERACTIVE,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_output_tokens: int | None = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """The provider's stream events, started once budgets allow; the slot is held until it ends."""
+        estimate = estimate_tokens(prompt) + (max_output_tokens or self._default_output_tokens)
+        await self._admit_stream(priority, estimate)
+        usage: Optional[Dict[str, int]] = None
+        events = self._provider.generate_text_stream(
+            prompt, model=model, temperature=temperature, max_output_tokens=max_output_tokens
+        )
+        try:
+            async for event in events:
+                if event.get("type") == "completed":
+                    usage = event.get("usage")
+                yield event
+        finally:
+            try:
+                await events.aclose()
+            finally:
+                self._release_slot()
+                actual = usage_tokens(usage)
+                if actual is not None:
+                    self._tokens.adjust(estimate - actual)
+
+    async def create_embeddings(
+        self,
+        texts: List[str],
+        *,
+        priority: Priority = Priority.INTERACTIVE,
+        model: str | None = None,
+        dimensions: int | None = None,
+    ) -> Dict[str, Any]:
+        if not texts:
+            raise ValueError("At least one text input is required for embeddings.")
+        estimate = sum(estimate_tokens(text) for text in texts)
+        coalesce_key = ("embeddings", priority, model, dimensions) if len(texts) < self._coalesce_max_items else None
+        payload = {"texts": list(texts), "model": model, "dimensions": dimensions}
+        return await self._submit(priority, "embeddings", payload, estimate, coalesce_key, len(texts))
+
+    @property
+    def provider(self) -> LLMProvider:
+        return self._provider
+
+    def client(self, priority: Priority) -> "ScheduledLLMClient":
+        return ScheduledLLMClient(self, priority)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    async def aclose(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        for job in self._queue:
+            job.future.cancel()
+        self._queue.clear()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    # -- queueing -----------------------------------------------------------------------------
+
+    async def _submit(
+        self,
+        priority: Priority,
+        kind: str,
+        payload: Dict[str, Any],
+        estimate: int,
+        coalesce_key: Optional[tuple] = None,
+        item_count: int = 1,
+    ) -> Dict[str, Any]:
+        return await self._enqueue(priority, kind, payload, estimate, coalesce_key, item_count).future
+
+    async def _admit_stream(self, priority: Priority, estimate: int) -> None:
+        job = self._enqueue(priority, "stream", {}, estimate)
+        try:
+            await job.future
+        except asyncio.CancelledError:
+            # Admitted just as the caller gave up: nobody will stream, so hand the slot back.
+            if job.future.done() and not job.future.cancelled():
+                self._release_slot()
+            raise
+
+    def _enqueue(
+        self,
+        priority: Priority,
+        kind: str,
+        payload: Dict[str, Any],
+        estimate: int,
+        coalesce_key: Optional[tuple] = None,
+        item_count: int = 1,
+    ) -> _Job:
+        loop = asyncio.get_running_loop()
+        job = _Job(
+            priority=Priority(priority),
+            kind=kind,
+            payload=payload,
+            estimated_tokens=estimate,
+            future=loop.create_future(),
+            enqueued_at=self._clock(),
+            sequence=next(self._sequence),
+            coalesce_key=coalesce_key,
+            item_count=item_count,
+        )
+        heapq.heappush(self._queue, job)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch_loop())
+        self._wakeup.set()
+        return job
+
+    def _pop_live(self) -> Optional[_Job]:
+        # Callers that gave up leave cancelled futures behind; drop them without spending budget.
+        while self._queue and self._queue[0].future.done():
+            heapq.heappop(self._queue)
+        return self._queue[0] if self._queue else None
+
+    async def _sleep_or_wake(self, timeout: Optional[float]) -> None:
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            head = self._pop_live()
+            if head is None:
+                await self._sleep_or_wake(None)
+                continue
+
+            if head.coalesce_key is not None:
+                linger = head.enqueued_at + self._coalesce_window - self._clock()
+                if linger > 0 and self._coalescable_items(head) < self._coalesce_max_items:
+                    await self._sleep_or_wake(linger)
+                    continue
+
+            if self._slots.locked():
+                await self._sleep_or_wake(None)
+                continue
+
+            batch = self._take_batch(head)
+            estimate = sum(job.estimated_tokens for job in batch)
+            reserve = self._reserve[head.priority]
+            wait = max(self._requests.wait_time(1, reserve), self._tokens.wait_time(estimate, reserve))
+            if wait > 0:
+                # A newly queued higher-priority job wakes the loop and is considered first.
+                await self._sleep_or_wake(wait)
+                continue
+
+            await self._slots.acquire()  # free: only this loop acquires and it checked ``locked()``
+            for job in batch:
+                self._queue.remove(job)
+            heapq.heapify(self._queue)
+            self._requests.consume(1)
+            self._tokens.consume(estimate)
+            self.stats.dispatched[head.priority] += len(batch)
+            self.stats.upstream_calls += 1
+            if len(batch) > 1:
+                self.stats.coalesced_requests += len(batch)
+            task = asyncio.get_running_loop().create_task(self._execute(batch, estimate))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    def _coalescable_items(self, head: _Job) -> int:
+        return sum(
+            job.item_count for job in self._queue if job.coalesce_key == head.coalesce_key and not job.future.done()
+        )
+
+    def _take_batch(self, head: _Job) -> List[_Job]:
+        if head.coalesce_key is None:
+            return [head]
+        batch, items = [], 0
+        for job in sorted(self._queue):
+            if job.coalesce_key != head.coalesce_key or job.future.done():
+                continue
+            if batch and items + job.item_count > self._coalesce_max_items:
+                break
+            batch.append(job)
+            items += job.item_count
+        return batch
+
+    # -- execution ----------------------------------------------------------------------------
+
+    def _release_slot(self) -> None:
+        self._slots.release()
+        self._wakeup.set()
+
+    async def _execute(self, batch: List[_Job], estimate: int) -> None:
+        if batch[0].kind == "stream":
+            # The caller streams and releases the slot; one that already gave up releases nothing.
+            if batch[0].future.done():
+                self._release_slot()
+            else:
+                batch[0].future.set_result(None)
+            return
+        try:
+            if batch[0].kind == "text":
+                result = await self._provider.generate_text(**batch[0].payload)
+                results = [result]
+            else:
+                texts = [text for job in batch for text in job.payload["texts"]]
+                payload = batch[0].payload
+                options = {"model": payload["model"]}
+                if payload["dimensions"] is not None:
+                    options["dimensions"] = payload["dimensions"]
+                result = await self._provider.create_embeddings(texts, **options)
+                results = self._split_embeddings(batch, result)
+        except Exception as exc:
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_exception(exc)
+            return
+        finally:
+            self._release_slot()
+
+        actual = usage_tokens(result.get("usage"))
+        if actual is not None:
+            self._tokens.adjust(estimate - actual)
+        for job, job_result in zip(batch, results):
+            if not job.future.done():
+                job.future.set_result(job_result)
+
+    @staticmethod
+    def _split_embeddings(batch: List[_Job], result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if len(batch) == 1:
+            return [result]
+        vectors = result["embeddings"]
+        usage = result.get("usage")
+        total_items = sum(job.item_count for job in batch)
+        results, offset = [], 0
+        for job in batch:
+            share = None
+            if usage:
+                share = {key: round(value * job.item_count / total_items) for key, value in usage.items()}
+            results.append(
+                {"embeddings": vectors[offset : offset + job.item_count], "model": result["model"], "usage": share}
+            )
+            offset += job.item_count
+        return results
+
+
+class ScheduledLLMClient:
+    """``OpenAIService``-shaped facade that routes every call through the scheduler at one priority."""
+
+    def __init__(self, scheduler: LLMScheduler, priority: Priority) -> None:
+        self._scheduler = scheduler
+        self.priority = priority
+
+    async def generate_text(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_output_tokens: int | None = None,
+    ) -> Dict[str, Any]:
+        return await self._scheduler.generate_text(
+            prompt, priority=self.priority, model=model, temperature=temperature, max_output_tokens=max_output_tokens
+        )
+
+    def generate_text_stream(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_output_tokens: int | None = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        return self._scheduler.generate_text_stream(
+            prompt, priority=self.priority, model=model, temperature=temperature, max_output_tokens=max_output_tokens
+        )
+
+    async def create_embeddings(
+        self, texts: List[str], *, model: str | None = None, dimensions: int | None = None
+    ) -> Dict[str, Any]:
+        return await self._scheduler.create_embeddings(
+            texts, priority=self.priority, model=model, dimensions=dimensions
+        )
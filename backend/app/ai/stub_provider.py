@@ -0,0 +1,95 @@
+"""Deterministic in-process LLM provider for tests, benchmarks and offline development."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Dict, List
+
+from app.ai.scheduler import estimate_tokens
+
+
+class StubLLMProvider:
+    """Implements the ``LLMProvider`` protocol without network access.
+
+    Text responses echo a prefix of the prompt; embeddings are derived from a hash of each text so the
+    same input always maps to the same vector. ``latency`` simulates upstream response time and usage
+    is reported with the scheduler's token estimate so budgets reconcile exactly.
+    """
+
+    def __init__(self, *, latency: float = 0.0, dimensions: int = 8, model: str = "stub-model") -> None:
+        self.latency = latency
+        self.dimensions = dimensions
+        self.model = model
+        self.calls: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _simulate(self) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+    async def generate_text(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_output_tokens: int | None = None,
+    ) -> Dict[str, Any]:
+        if not prompt.strip():
+            raise ValueError("Prompt must not be empty.")
+        self.calls.append({"kind": "text", "prompt": prompt, "model": model})
+        await self._simulate()
+        content = f"stub: {prompt[:64]}"
+        input_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(content)
+        return {
+            "content": content,
+            "model": model or self.model,
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        }
+
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_output_tokens: int | None = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """``generate_text`` delivered as one ``delta`` per word, then the ``completed`` event."""
+        result = await self.generate_text(
+            prompt, model=model, temperature=temperature, max_output_tokens=max_output_tokens
+        )
+        self.calls[-1]["kind"] = "stream"
+        for word in result["content"].split(" "):
+            yield {"type": "delta", "text": word + " "}
+        yield {"type": "completed", **result}
+
+    async def create_embeddings(
+        self, texts: List[str], *, model: str | None = None, dimensions: int | None = None
+    ) -> Dict[str, Any]:
+        if not texts:
+            raise ValueError("At least one text input is required for embeddings.")
+        self.calls.append({"kind": "embeddings", "texts": list(texts), "model": model})
+        await self._simulate()
+        vectors = [self._vector(text, dimensions or self.dimensions) for text in texts]
+        tokens = sum(estimate_tokens(text) for text in texts)
+        return {
+            "embeddings": vectors,
+            "model": model or self.model,
+            "usage": {"input_tokens": tokens, "output_tokens": 0, "total_tokens": tokens},
+        }
+
+    def _vector(self, text: str, dimensions: int | None = None) -> List[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [digest[index % len(digest)] / 255.0 for index in range(dimensions or self.dimensions)]
@@ -0,0 +1,271 @@
+"""Concurrent runtime for agent tool calls.
+
+An agent step usually emits several independent tool calls (property details for a handful of
+liens, their metrics, a decision log). ``ToolExecutor`` dispatches them together so step latency
+tracks the slowest call rather than the sum:
+
+* each tool has its own concurrency limit (an ``asyncio.Semaphore`` shared by every run),
+* every attempt is bounded by the tool's timeout,
+* transient failures (timeouts, dropped connections) of idempotent tools are retried up to
+  ``AGENT_MAX_TOOL_RETRIES`` times with full-jitter backoff; a tool that writes runs at most once,
+  since a call that timed out may already have committed,
+* idempotent tools are memoised per run, and identical in-flight calls share one execution.
+
+Arguments are validated against the request models in ``app.schemas.agent_tools`` before dispatch
+and outputs against the response models, so handlers work with typed payloads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import orjson
+import structlog
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+from app.core.tracing import get_tracer
+from app.schemas.agent_tools import (
+    ComputeLienMetricsRequest,
+    ComputeLienMetricsResponse,
+    DocCorpusLookupRequest,
+    DocCorpusLookupResponse,
+    FetchCountyLiensRequest,
+    FetchCountyLiensResponse,
+    FetchPropertyDetailsRequest,
+    FetchPropertyDetailsResponse,
+    GenerateDocumentFromTemplateRequest,
+    GenerateDocumentFromTemplateResponse,
+    LogDecisionEventRequest,
+    LogDecisionEventResponse,
+    ToolCall,
+    ToolCallResult,
+    UpdateAnalysisRunStatusRequest,
+)
+
+logger = structlog.get_logger(__name__)
+
+ToolHandler = Callable[[BaseModel], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class ToolContract:
+    request_model: Type[BaseModel]
+    response_model: Optional[Type[BaseModel]]
+    idempotent: bool
+
+
+# Tool catalog from docs/agent_protocol_and_tools.md. Read-only lookups are idempotent within a run;
+# anything that writes (documents, run status, decision logs) always executes, and is never retried.
+TOOL_CONTRACTS: Dict[str, ToolContract] = {
+    "fetch_county_liens": ToolContract(FetchCountyLiensRequest, FetchCountyLiensResponse, idempotent=True),
+    "fetch_property_details": ToolContract(FetchPropertyDetailsRequest, FetchPropertyDetailsResponse, idempotent=True),
+    "compute_lien_metrics": ToolContract(ComputeLienMetricsRequest, ComputeLienMetricsResponse, idempotent=True),
+    "doc_corpus_lookup": ToolContract(DocCorpusLookupRequest, DocCorpusLookupResponse, idempotent=True),
+    "generate_document_from_template": ToolContract(
+        GenerateDocumentFromTemplateRequest, GenerateDocumentFromTemplateResponse, idempotent=False
+    ),
+    "update_analysis_run_status": ToolContract(UpdateAnalysisRunStatusRequest, None, idempotent=False),
+    "log_decision_event": ToolContract(LogDecisionEventRequest, LogDecisionEventResponse, idempotent=False),
+}
+
+# Failures worth another attempt: the call never reached the tool, or the tool did not answer in time.
+TRANSIENT_TOOL_ERRORS: Tuple[Type[BaseException], ...] = (asyncio.TimeoutError, ConnectionError)
+
+
+@dataclass
+class ToolSpec:
+    """A registered tool: its handler plus the limits the executor applies to it.
+
+    ``retry_on`` defaults to ``TRANSIENT_TOOL_ERRORS`` for idempotent tools and to nothing otherwise.
+    """
+
+    name: str
+    handler: ToolHandler
+    request_model: Type[BaseModel]
+    response_model: Optional[Type[BaseModel]] = None
+    idempotent: bool = False
+    max_concurrency: int = field(default_factory=lambda: settings.AGENT_TOOL_MAX_CONCURRENCY)
+    timeout_seconds: float = field(default_factory=lambda: settings.AGENT_TOOL_TIMEOUT_SECONDS)
+    retry_on: Optional[Tuple[Type[BaseException], ...]] = None
+
+    def __post_init__(self) -> None:
+        if self.retry_on is None:
+            self.retry_on = TRANSIENT_TOOL_ERRORS if self.idempotent else ()
+
+    @classmethod
+    def from_catalog(cls, name: str, handler: ToolHandler, **overrides: Any) -> "ToolSpec":
+        """Build a spec for a catalogued tool, taking its schemas and idempotency from ``TOOL_CONTRACTS``."""
+        try:
+            contract = TOOL_CONTRACTS[name]
+        except KeyError:
+            raise ValueError(f"Unknown tool '{name}'.") from None
+        options: Dict[str, Any] = {
+            "request_model": contract.request_model,
+            "response_model": contract.response_model,
+            "idempotent": contract.idempotent,
+        }
+        options.update(overrides)
+        return cls(name=name, handler=handler, **options)
+
+
+class ToolRegistry:
+    def __init__(self, specs: Iterable[ToolSpec] = ()) -> None:
+        self._specs: Dict[str, ToolSpec] = {}
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: ToolSpec) -> None:
+        if spec.max_concurrency < 1:
+            raise ValueError("Tool concurrency limit must be at least 1.")
+        self._specs[spec.name] = spec
+
+    def get(self, name: str) -> ToolSpec:
+        try:
+            return self._specs[name]
+        except KeyError:
+            raise ValueError(f"Tool '{name}' is not registered.") from None
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+
+class ToolExecutor:
+    """Shared executor; per-tool semaphores are process-wide so limits hold across concurrent runs."""
+
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        *,
+        max_retries: int | None = None,
+        base_delay: float | None = None,
+        max_delay: float | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._registry = registry
+        self._max_retries = settings.AGENT_MAX_TOOL_RETRIES if max_retries is None else max_retries
+        self._base_delay = settings.AGENT_TOOL_RETRY_BASE_DELAY_SECONDS if base_delay is None else base_delay
+        self._max_delay = settings.AGENT_TOOL_RETRY_MAX_DELAY_SECONDS if max_delay is None else max_delay
+        self._rng = rng or random.Random()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def for_run(self, run_id: Any) -> "ToolRunSession":
+        """Open a session whose memo cache lives as long as one agent run."""
+        return ToolRunSession(self, run_id)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (1-based) retry number."""
+        ceiling = min(self._max_delay, self._base_delay * (2 ** (attempt - 1)))
+        return self._rng.uniform(0, ceiling)
+
+    def _semaphore(self, spec: ToolSpec) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(spec.name)
+        if semaphore is None:
+            semaphore = self._semaphores[spec.name] = asyncio.Semaphore(spec.max_concurrency)
+        return semaphore
+
+    async def _invoke(self, spec: ToolSpec, request: BaseModel) -> Tuple[Dict[str, Any], int]:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self._semaphore(spec):
+                    output = await asyncio.wait_for(spec.handler(request), timeout=spec.timeout_seconds)
+                return _dump_output(spec, output), attempt
+            except Exception as exc:
+                retryable = isinstance(exc, spec.retry_on) and not isinstance(exc, ValidationError)
+                if not retryable or attempt > self._max_retries:
+                    raise _ToolFailure(exc, attempt) from exc
+                delay = self.backoff_delay(attempt)
+                logger.warning(
+                    "agent_tool_retry", tool=spec.name, attempt=attempt, delay_seconds=round(delay, 3), error=repr(exc)
+                )
+                await asyncio.sleep(delay)
+
+
+class ToolRunSession:
+    """Executes tool calls for a single run and memoises idempotent ones."""
+
+    def __init__(self, executor: ToolExecutor, run_id: Any) -> None:
+        self._executor = executor
+        self.run_id = run_id
+        self._memo: Dict[Tuple[str, bytes], asyncio.Task] = {}
+
+    async def execute(self, calls: Sequence[ToolCall]) -> List[ToolCallResult]:
+        """Run independent calls concurrently; results keep the order of ``calls``."""
+        return list(await asyncio.gather(*(self.execute_one(call) for call in calls)))
+
+    async def execute_one(self, call: ToolCall) -> ToolCallResult:
+        started = time.perf_counter()
+        with get_tracer().start_as_current_span(
+            f"tool {call.name}", attributes={"agent.tool.name": call.name, "agent.tool.call_id": call.call_id}
+        ) as span:
+            result = await self._execute(call)
+            result.duration_ms = (time.perf_counter() - started) * 1000
+            span.set_attribute("agent.tool.attempts", result.attempts)
+            span.set_attribute("agent.tool.cached", result.cached)
+            if result.error is not None:
+                span.set_attribute("agent.tool.error", result.error)
+            return result
+
+    async def _execute(self, call: ToolCall) -> ToolCallResult:
+        try:
+            spec = self._executor._registry.get(call.name)
+            request = spec.request_model.model_validate(call.arguments)
+        except (ValueError, ValidationError) as exc:
+            return ToolCallResult(call_id=call.call_id, name=call.name, error=str(exc))
+
+        if not spec.idempotent:
+            return await self._run(call, spec, request)
+
+        key = (spec.name, orjson.dumps(request.model_dump(mode="json"), option=orjson.OPT_SORT_KEYS))
+        task = self._memo.get(key)
+        cached = task is not None
+        if task is None:
+            task = self._memo[key] = asyncio.ensure_future(self._executor._invoke(spec, request))
+        try:
+            # Shield so a cancelled caller does not cancel the execution other callers share.
+            output, attempts = await asyncio.shield(task)
+        except _ToolFailure as failure:
+            # Failures are not memoised; a later step may retry the same call.
+            if self._memo.get(key) is task:
+                del self._memo[key]
+            return _failed(call, failure)
+        return ToolCallResult(
+            call_id=call.call_id, name=call.name, output=output, attempts=0 if cached else attempts, cached=cached
+        )
+
+    async def _run(self, call: ToolCall, spec: ToolSpec, request: BaseModel) -> ToolCallResult:
+        try:
+            output, attempts = await self._executor._invoke(spec, request)
+        except _ToolFailure as failure:
+            return _failed(call, failure)
+        return ToolCallResult(call_id=call.call_id, name=call.name, output=output, attempts=attempts)
+
+
+class _ToolFailure(Exception):
+    def __init__(self, error: BaseException, attempts: int) -> None:
+        super().__init__(str(error))
+        self.attempts = attempts
+        if isinstance(error, asyncio.TimeoutError):
+            self.message = "Tool call timed out."
+        else:
+            self.message = str(error) or type(error).__name__
+
+
+def _failed(call: ToolCall, failure: _ToolFailure) -> ToolCallResult:
+    return ToolCallResult(call_id=call.call_id, name=call.name, error=failure.message, attempts=failure.attempts)
+
+
+def _dump_output(spec: ToolSpec, output: Any) -> Dict[str, Any]:
+    if output is None:
+        return {}
+    if spec.response_model is not None and not isinstance(output, spec.response_model):
+        output = spec.response_model.model_validate(output)
+    if isinstance(output, BaseModel):
+        return output.model_dump(mode="json", by_alias=True)
+    return dict(output)
@@ -1,14 +1,24 @@
 """FastAPI dependency utilities (sessions, auth, pagination)."""
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable, Optional
+from uuid import UUID
 
-from fastapi import HTTPException, status
-from openai import AsyncOpenAI
+from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.openai_service import OpenAIService
+from app.ai.scheduler import LLMProvider, LLMScheduler, Priority, ScheduledLLMClient
 from app.core.config import settings
-from app.db.session import get_session
+from app.db.session import engine, get_read_session, get_session, read_engine
+from app.repositories.column_mappings import ColumnMappingRepository
+from app.repositories.deal_exports import DealExportRepository
+from app.repositories.lien_terms import LienTermsRepository
+from app.repositories.reasoning_graph import ReasoningGraphRepository
+from app.repositories.uploads import UploadRepository
+from app.repositories.what_if import WhatIfRepository
+from app.services.column_mapping import ColumnMapper
+from app.services.document_storage import ArtifactStorage, StorageConfig, build_storage
+from app.services.event_recorder import EventRecorder, build_event_recorder
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
@@ -16,17 +26,133 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-async def get_openai_service() -> AsyncGenerator[OpenAIService, None]:
+async def get_read_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Session for analytics and search reads; served by the read replica when one is configured."""
+    async for session in get_read_session():
+        yield session
+
+
+def get_reasoning_graph_repository() -> ReasoningGraphRepository:
+    """Graphs stream on a read-replica connection opened by the body itself; a request session closes first."""
+    return ReasoningGraphRepository(read_engine)
+
+
+async def get_lien_terms_repository(
+    session: AsyncSession = Depends(get_read_db_session),
+) -> LienTermsRepository:
+    return LienTermsRepository(session)
+
+
+async def get_what_if_repository(
+    session: AsyncSession = Depends(get_read_db_session),
+) -> WhatIfRepository:
+    return WhatIfRepository(session)
+
+
+def get_deal_export_repository() -> DealExportRepository:
+    """Exports hold a read-replica connection for as long as the streamed body lasts, not a request session."""
+    return DealExportRepository(read_engine)
+
+
+def get_upload_repository() -> UploadRepository:
+    return UploadRepository(engine)
+
+
+_upload_storage: Optional[ArtifactStorage] = None
+
+
+def get_upload_storage() -> ArtifactStorage:
+    """Process-wide document storage (local or S3-compatible) for chunked upload parts; one boto3 client per process."""
+    global _upload_storage
+    if _upload_storage is None:
+        _upload_storage = build_storage(StorageConfig.from_settings())
+    return _upload_storage
+
+
+def queue_upload_ingestion(upload_id: UUID) -> None:
+    from app.worker import celery_app
+
+    celery_app.send_task("app.jobs.uploads.ingest_chunked_upload", args=[str(upload_id)])
+
+
+def get_upload_ingestion_queue() -> Callable[[UUID], None]:
+    return queue_upload_ingestion
+
+
+def _build_openai_service() -> OpenAIService:
     if not settings.OPENAI_API_KEY:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="OpenAI API key not configured.")
 
+    from openai import AsyncOpenAI  # deferred: the SDK is only needed once an AI route is hit
+
     client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-    service = OpenAIService(
+    return OpenAIService(
         client=client,
         default_model=settings.OPENAI_MODEL_NAME,
         embedding_model=settings.OPENAI_EMBEDDING_MODEL,
     )
-    try:
-        yield service
-    finally:
-        await client.close()
+
+
+_llm_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Process-wide scheduler sharing one OpenAI client and one set of rate budgets."""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        _llm_scheduler = LLMScheduler(_build_openai_service())
+    return _llm_scheduler
+
+
+async def close_llm_scheduler() -> None:
+    global _llm_scheduler
+    if _llm_scheduler is not None:
+        scheduler, _llm_scheduler = _llm_scheduler, None
+        await scheduler.aclose()
+        await scheduler.provider.aclose()
+
+
+_event_recorder: Optional[EventRecorder] = None
+
+
+def get_event_recorder() -> EventRecorder:
+    """Process-wide audit/integration recorder; buffered rows are flushed in the background."""
+    global _event_recorder
+    if _event_recorder is None:
+        _event_recorder = build_event_recorder(engine)
+    return _event_recorder
+
+
+async def close_event_recorder() -> None:
+    global _event_recorder
+    if _event_recorder is not None:
+        recorder, _event_recorder = _event_recorder, None
+        await recorder.aclose()
+
+
+_column_mapper: Optional[ColumnMapper] = None
+
+
+def get_column_mapper() -> ColumnMapper:
+    """Process-wide mapper, so its layout cache is shared; embeddings and the LLM need an OpenAI key."""
+    global _column_mapper
+    if _column_mapper is None:
+        provider = get_llm_scheduler().client(Priority.INTERACTIVE) if settings.OPENAI_API_KEY else None
+        _column_mapper = ColumnMapper(
+            ColumnMappingRepository(engine),
+            provider=provider,
+            cache_size=settings.COLUMN_MAPPING_CACHE_SIZE,
+            embedding_min_similarity=settings.COLUMN_MAPPING_EMBEDDING_MIN_SIMILARITY,
+            use_llm=settings.COLUMN_MAPPING_USE_LLM,
+        )
+    return _column_mapper
+
+
+async def get_openai_service() -> LLMProvider:
+    """OpenAI access for interactive routes, queued ahead of agent and batch work."""
+    return get_llm_scheduler().client(Priority.INTERACTIVE)
+
+
+async def get_streaming_openai_service() -> ScheduledLLMClient:
+    """Streaming routes share the scheduler's client and budgets; each stream holds a slot until it ends."""
+    return get_llm_scheduler().client(Priority.INTERACTIVE)
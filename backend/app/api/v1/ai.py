@@ -2,25 +2,79 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from openai import OpenAIError
+import importlib.util
+from typing import Any, AsyncIterator, Dict, Optional
 
-from app.ai.openai_service import OpenAIService
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+from app.ai.scheduler import LLMProvider
 from app.api import deps
+from app.core.lazy import lazy_import
 from app.schemas.ai import (
+    EmbeddingEncoding,
     EmbeddingsRequest,
     EmbeddingsResponse,
     TextGenerationRequest,
     TextGenerationResponse,
+    TokenUsage,
 )
 
+openai = lazy_import("openai")
+
 router = APIRouter(prefix="/ai", tags=["ai"])
 
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+JSON_MEDIA_TYPE = "application/json"
+NPY_MEDIA_TYPE = "application/x-npy"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+_EMBEDDING_RESPONSES: Dict[int | str, Dict[str, Any]] = {
+    200: {
+        "model": EmbeddingsResponse,
+        "content": {NPY_MEDIA_TYPE: {}, ARROW_MEDIA_TYPE: {}},
+        "description": (
+            "JSON by default. With Accept: application/x-npy or application/vnd.apache.arrow.stream, the body is "
+            "a float32 matrix, and the model and usage move to X-Embedding-* headers."
+        ),
+    }
+}
+
+
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def _sse_stream(first: Dict[str, Any], events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    # Starlette cancels this generator when the client disconnects; closing ``events`` then closes
+    # the upstream OpenAI stream so the request stops generating tokens nobody will read, and hands
+    # the stream's scheduler slot back.
+    try:
+        event = first
+        while True:
+            if event["type"] == "delta":
+                yield _sse("delta", {"text": event["text"]})
+            else:
+                usage = TokenUsage(**event["usage"]) if event.get("usage") else None
+                yield _sse("usage", usage.model_dump() if usage else {})
+                yield _sse("done", {"content": event["content"], "model": event["model"]})
+            try:
+                event = await events.__anext__()
+            except StopAsyncIteration:
+                break
+    except (RuntimeError, openai.OpenAIError) as exc:
+        detail = str(exc) if isinstance(exc, RuntimeError) else "OpenAI request failed."
+        yield _sse("error", {"detail": detail})
+    finally:
+        await events.aclose()
+
 
 @router.post("/responses", response_model=TextGenerationResponse)
 async def create_text_response(
     payload: TextGenerationRequest,
-    service: OpenAIService = Depends(deps.get_openai_service),
+    service: LLMProvider = Depends(deps.get_openai_service),
 ) -> TextGenerationResponse:
     try:
         result = await service.generate_text(
@@ -33,25 +87,102 @@ async def create_text_response(
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
     except RuntimeError as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-    except OpenAIError as exc:
+    except openai.OpenAIError as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="OpenAI request failed.") from exc
 
     return TextGenerationResponse(**result)
 
 
-@router.post("/embeddings", response_model=EmbeddingsResponse)
+def _embedding_media_type(accept: Optional[str]) -> str:
+    """The supported media type ``accept`` ranks highest; JSON when it is absent or only wildcards."""
+    ranges = []
+    for position, part in enumerate((accept or JSON_MEDIA_TYPE).split(",")):
+        media_type, *params = [piece.strip().lower() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranges.append((-quality, position, media_type))
+    for _, _, media_type in sorted(ranges):
+        if media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            return JSON_MEDIA_TYPE
+        if media_type == NPY_MEDIA_TYPE:
+            return media_type
+        if media_type == ARROW_MEDIA_TYPE and importlib.util.find_spec("pyarrow") is not None:
+            return media_type
+    raise HTTPException(
+        status_code=status.HTTP_406_NOT_ACCEPTABLE,
+        detail=f"Embeddings are available as {JSON_MEDIA_TYPE} or {NPY_MEDIA_TYPE}"
+        + (f" or {ARROW_MEDIA_TYPE}." if importlib.util.find_spec("pyarrow") is not None else "."),
+    )
+
+
+def _embeddings_response(result: Dict[str, Any], media_type: str, encoding_format: EmbeddingEncoding) -> Response:
+    from app.ai import embedding_codec  # NumPy stays out of API start-up
+
+    matrix = embedding_codec.as_matrix(result["embeddings"])
+    usage = TokenUsage(**result["usage"]).model_dump() if result.get("usage") else None
+    if media_type == JSON_MEDIA_TYPE:
+        # orjson writes the float32 array directly; the floats never become Python objects.
+        embeddings = embedding_codec.encode_base64(matrix) if encoding_format == "base64" else matrix
+        return ORJSONResponse({"model": result["model"], "embeddings": embeddings, "usage": usage})
+
+    headers = embedding_codec.binary_headers(result["model"], usage, matrix)
+    if media_type == NPY_MEDIA_TYPE:
+        body = embedding_codec.to_npy(matrix)
+    else:
+        metadata = {key.lower().removeprefix("x-embedding-"): value for key, value in headers.items()}
+        body = embedding_codec.to_arrow(matrix, metadata)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+@router.post("/embeddings", response_model=EmbeddingsResponse, responses=_EMBEDDING_RESPONSES)
 async def create_embeddings(
     payload: EmbeddingsRequest,
-    service: OpenAIService = Depends(deps.get_openai_service),
-) -> EmbeddingsResponse:
+    accept: Optional[str] = Header(default=None),
+    service: LLMProvider = Depends(deps.get_openai_service),
+) -> Response:
+    media_type = _embedding_media_type(accept)
     try:
         result = await service.create_embeddings(texts=payload.texts, model=payload.model)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
     except RuntimeError as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
-    except OpenAIError as exc:
+    except openai.OpenAIError as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="OpenAI request failed.") from exc
 
-    return EmbeddingsResponse(**result)
+    return _embeddings_response(result, media_type, payload.encoding_format)
+
+
+@router.post("/responses/stream", response_class=StreamingResponse)
+async def stream_text_response(
+    payload: TextGenerationRequest,
+    service: LLMProvider = Depends(deps.get_streaming_openai_service),
+) -> StreamingResponse:
+    """Server-sent events: ``delta`` per text chunk, then ``usage`` and ``done`` (or ``error``)."""
+    events = service.generate_text_stream(
+        prompt=payload.prompt,
+        model=payload.model,
+        temperature=payload.temperature,
+        max_output_tokens=payload.max_output_tokens,
+    )
+    # Pull the first event before responding so setup failures still map to HTTP status codes.
+    try:
+        first = await events.__anext__()
+    except BaseException as exc:
+        await events.aclose()
+        if isinstance(exc, ValueError):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+        if isinstance(exc, RuntimeError):
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+        if isinstance(exc, (openai.OpenAIError, StopAsyncIteration)):
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="OpenAI request failed.") from exc
+        raise
 
+    return StreamingResponse(_sse_stream(first, events), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,45 @@
+"""Export routes: stream an analysis run's ranked deals as CSV, XLSX or Parquet."""
+
+from __future__ import annotations
+
+import importlib.util
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.api import deps
+from app.core.config import settings
+from app.repositories.deal_exports import EXPORT_COLUMNS, DealExportRepository
+from app.schemas.exports import DealExportFormat
+from app.services.deal_export import EXPORT_FORMATS, encode_export, open_encoder
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+@router.get("/runs/{run_id}/deals", response_class=StreamingResponse)
+async def export_ranked_deals(
+    run_id: UUID,
+    format: DealExportFormat = Query(default="csv"),
+    investor_profile_id: Optional[UUID] = None,
+    repository: DealExportRepository = Depends(deps.get_deal_export_repository),
+) -> StreamingResponse:
+    """The run's deal scores with lien, property and deal-metric columns, best rank first per profile.
+
+    The body is written while rows are read from a server-side cursor, so it can be any length.
+    For large runs, the ``app.jobs.exports.export_ranked_deals`` task writes the same file to document storage.
+    """
+    if format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Parquet exports need pyarrow.")
+    if not await repository.run_exists(run_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analysis run not found.")
+
+    export_format = EXPORT_FORMATS[format]
+    batches = repository.iter_ranked_deals(run_id, settings.DEAL_EXPORT_CHUNK_SIZE, investor_profile_id)
+    filename = f"ranked-deals-{run_id}{export_format.extension}"
+    return StreamingResponse(
+        encode_export(batches, open_encoder(format, EXPORT_COLUMNS)),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,58 @@
+"""Lien valuation routes: redemption payoff as of a date."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import List, Sequence
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.api import deps
+from app.repositories.lien_terms import LienTermsRepository
+from app.schemas.liens import LienPayoff, LienPayoffRequest, LienPayoffResponse
+
+router = APIRouter(prefix="/liens", tags=["liens"])
+
+
+async def _payoffs(repository: LienTermsRepository, lien_ids: Sequence[UUID], as_of: date) -> LienPayoffResponse:
+    from app.services.lien_accrual import payoff_as_of  # NumPy stays out of API start-up
+
+    terms = await repository.load(lien_ids)
+    amounts = payoff_as_of(terms, as_of)
+    payoffs: List[LienPayoff] = []
+    for lien_id, principal, amount in zip(terms.lien_ids, terms.principal.tolist(), amounts.tolist()):
+        principal_amount, payoff_amount = Decimal(f"{principal:.2f}"), Decimal(f"{amount:.2f}")
+        payoffs.append(
+            LienPayoff(
+                lien_id=lien_id,
+                principal=principal_amount,
+                accrued_interest=payoff_amount - principal_amount,
+                payoff_amount=payoff_amount,
+            )
+        )
+    found = set(terms.lien_ids)
+    missing = [lien_id for lien_id in dict.fromkeys(lien_ids) if lien_id not in found]
+    return LienPayoffResponse(as_of=as_of, payoffs=payoffs, missing_lien_ids=missing)
+
+
+@router.post("/payoffs", response_model=LienPayoffResponse)
+async def get_payoffs(
+    request: LienPayoffRequest,
+    repository: LienTermsRepository = Depends(deps.get_lien_terms_repository),
+) -> LienPayoffResponse:
+    """Redemption payoff of many liens on one date, computed in a single vectorised pass."""
+    return await _payoffs(repository, request.lien_ids, request.as_of)
+
+
+@router.get("/{lien_id}/payoff", response_model=LienPayoff)
+async def get_payoff(
+    lien_id: UUID,
+    as_of: date = Query(default_factory=date.today),
+    repository: LienTermsRepository = Depends(deps.get_lien_terms_repository),
+) -> LienPayoff:
+    response = await _payoffs(repository, [lien_id], as_of)
+    if not response.payoffs:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lien not found.")
+    return response.payoffs[0]
@@ -0,0 +1,72 @@
+"""Reasoning Explorer routes returning agent task graphs and their logs."""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Dict, Literal
+from uuid import UUID
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+from app.api import deps
+from app.repositories.reasoning_graph import ReasoningGraphRepository
+from app.schemas.reasoning import ReasoningGraphResponse
+
+router = APIRouter(prefix="/reasoning", tags=["reasoning"])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_LINES_PER_CHUNK = 500
+
+GraphFormat = Literal["ndjson", "json"]
+
+_GRAPH_RESPONSES: Dict[int | str, Dict[str, Any]] = {
+    200: {
+        "model": ReasoningGraphResponse,
+        "content": {NDJSON_MEDIA_TYPE: {}},
+        "description": "NDJSON stream of task then log records, or a single JSON document with format=json.",
+    }
+}
+
+
+async def _ndjson_chunks(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    lines: list[bytes] = []
+    async for record in records:
+        lines.append(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+        if len(lines) >= NDJSON_LINES_PER_CHUNK:
+            yield b"".join(lines)
+            lines.clear()
+    if lines:
+        yield b"".join(lines)
+
+
+async def _graph_response(records: AsyncIterator[Dict[str, Any]], graph_format: GraphFormat) -> Any:
+    if graph_format == "ndjson":
+        return StreamingResponse(_ndjson_chunks(records), media_type=NDJSON_MEDIA_TYPE)
+
+    graph: Dict[str, list] = {"tasks": [], "logs": []}
+    async for record in records:
+        graph["tasks" if record.pop("type") == "task" else "logs"].append(record)
+    return ORJSONResponse(graph)
+
+
+@router.get("/runs/{run_id}/graph", responses=_GRAPH_RESPONSES)
+async def get_run_graph(
+    run_id: UUID,
+    graph_format: GraphFormat = Query(default="ndjson", alias="format"),
+    repository: ReasoningGraphRepository = Depends(deps.get_reasoning_graph_repository),
+) -> Any:
+    if not await repository.run_exists(run_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analysis run not found.")
+    return await _graph_response(repository.stream_run_graph(run_id), graph_format)
+
+
+@router.get("/tasks/{task_id}/subtree", responses=_GRAPH_RESPONSES)
+async def get_task_subtree(
+    task_id: UUID,
+    graph_format: GraphFormat = Query(default="ndjson", alias="format"),
+    repository: ReasoningGraphRepository = Depends(deps.get_reasoning_graph_repository),
+) -> Any:
+    if not await repository.task_exists(task_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent task not found.")
+    return await _graph_response(repository.stream_task_subtree(task_id), graph_format)
@@ -2,11 +2,16 @@
 
 from fastapi import APIRouter
 
-from app.api.v1 import ai
+from app.api.v1 import ai, exports, liens, reasoning, uploads, what_if
 
 
 router = APIRouter()
 router.include_router(ai.router)
+router.include_router(exports.router)
+router.include_router(liens.router)
+router.include_router(reasoning.router)
+router.include_router(uploads.router)
+router.include_router(what_if.router)
 
-# Pending: include domain routers (auth, investors, properties, liens, analysis, portfolios, documents,
-# notifications, agents, reasoning explorer) once implemented.
+# Pending: include domain routers (auth, investors, properties, analysis, portfolios, documents,
+# notifications, agents) once implemented.
@@ -0,0 +1,228 @@
+"""Upload routes: chunked, resumable CSV and XLSX lead-list uploads.
+
+``POST /uploads`` declares the file and returns its part layout. Parts are then ``PUT`` one at a time,
+each with an ``X-Part-SHA256`` header, and can be retried. ``GET /uploads/{id}`` lists the parts that
+are still missing so an interrupted client can resume. ``POST /uploads/{id}/complete`` closes the
+upload once every part is in. CSV staging is queued at init and follows the parts as they arrive;
+XLSX staging is queued on completion.
+
+``POST /uploads/mappings/suggest`` maps a header layout to lead fields (``suggest_mapping``), and
+``PUT /uploads/mappings`` stores a reviewed mapping so the same layout is answered from cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Request, status
+
+from app.api import deps
+from app.core.config import settings
+from app.repositories.uploads import UploadRepository
+from app.schemas.uploads import (
+    SHA256_PATTERN,
+    ColumnMappingConfirmRequest,
+    ColumnMappingEntry,
+    ColumnMappingRequest,
+    ColumnMappingResponse,
+    UploadCompleteRequest,
+    UploadInitRequest,
+    UploadPartReceipt,
+    UploadStatus,
+)
+from app.services.chunked_upload import PartRejected, UploadPlan, part_key, store_part
+from app.services.column_mapping import ColumnMapper, MappingSuggestion
+from app.services.document_storage import ArtifactStorage
+from app.services.event_recorder import EventRecorder
+from app.services.tabular_readers import detect_tabular_format
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+_PART_CONFLICT = "Part {} was already received with different content."
+
+
+async def _upload_status(repository: UploadRepository, upload_id: UUID) -> UploadStatus:
+    upload = await repository.get(upload_id)
+    if upload is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found.")
+    parts = [UploadPartReceipt(**part._mapping) for part in await repository.received_parts(upload_id)]
+    received = {part.part_number for part in parts}
+    return UploadStatus(
+        upload_id=upload.id,
+        filename=upload.filename,
+        file_format=upload.file_format,
+        status=upload.status,
+        size=upload.size_bytes,
+        part_size=upload.part_size,
+        part_count=upload.part_count,
+        received_parts=parts,
+        missing_parts=[number for number in range(1, upload.part_count + 1) if number not in received],
+        received_at=upload.received_at,
+        row_count=upload.row_count,
+        sheets=upload.sheets,
+        error=upload.error,
+    )
+
+
+def _mapping_response(suggestion: MappingSuggestion) -> ColumnMappingResponse:
+    return ColumnMappingResponse(
+        fingerprint=suggestion.fingerprint,
+        confirmed=suggestion.confirmed,
+        cached=suggestion.cached,
+        columns=[ColumnMappingEntry(**vars(column)) for column in suggestion.columns],
+    )
+
+
+@router.post("/mappings/suggest", response_model=ColumnMappingResponse)
+async def suggest_mapping(
+    request: ColumnMappingRequest,
+    mapper: ColumnMapper = Depends(deps.get_column_mapper),
+) -> ColumnMappingResponse:
+    """Lead field (or ``null``) per column, with where each answer came from; known layouts come from cache."""
+    return _mapping_response(await mapper.suggest(request.headers, request.sample_rows))
+
+
+@router.put("/mappings", response_model=ColumnMappingResponse)
+async def confirm_mapping(
+    request: ColumnMappingConfirmRequest,
+    mapper: ColumnMapper = Depends(deps.get_column_mapper),
+    recorder: EventRecorder = Depends(deps.get_event_recorder),
+) -> ColumnMappingResponse:
+    """Store a reviewed mapping for the layout; columns left out of ``mapping`` are unmapped."""
+    try:
+        suggestion = await mapper.confirm(request.headers, request.mapping)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    mapped = sum(field is not None for field in suggestion.mapping.values())
+    await recorder.record_audit(
+        "column_mapping.confirmed",
+        "column_mapping",
+        suggestion.fingerprint,
+        f"{mapped} of {len(request.headers)} columns mapped",
+    )
+    return _mapping_response(suggestion)
+
+
+@router.post("", response_model=UploadStatus, status_code=status.HTTP_201_CREATED)
+async def create_upload(
+    request: UploadInitRequest,
+    repository: UploadRepository = Depends(deps.get_upload_repository),
+    queue_ingestion: Callable[[UUID], None] = Depends(deps.get_upload_ingestion_queue),
+    recorder: EventRecorder = Depends(deps.get_event_recorder),
+) -> UploadStatus:
+    """Start an upload of ``size`` bytes; send the returned ``part_count`` parts of ``part_size`` bytes."""
+    if request.size > settings.UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Uploads are limited to {settings.UPLOAD_MAX_BYTES} bytes.",
+        )
+    try:
+        file_format = detect_tabular_format(request.mime_type, request.filename)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc)) from exc
+
+    plan = UploadPlan(request.size, settings.UPLOAD_PART_SIZE_BYTES)
+    upload_id = await repository.create(
+        filename=request.filename,
+        mime_type=request.mime_type,
+        file_format=file_format,
+        size_bytes=plan.size,
+        part_size=plan.part_size,
+        part_count=plan.part_count,
+        content_hash=request.sha256.lower() if request.sha256 else None,
+    )
+    await recorder.record_audit(
+        "upload.created", "upload", upload_id, f"{request.filename}: {plan.size} bytes in {plan.part_count} parts"
+    )
+    if file_format == "csv":
+        # CSV is parsed as parts arrive; the job waits for each part in turn.
+        await asyncio.to_thread(queue_ingestion, upload_id)
+    return await _upload_status(repository, upload_id)
+
+
+@router.put("/{upload_id}/parts/{part_number}", response_model=UploadPartReceipt)
+async def upload_part(
+    upload_id: UUID,
+    part_number: int,
+    request: Request,
+    part_sha256: str = Header(..., alias="X-Part-SHA256", pattern=SHA256_PATTERN),
+    repository: UploadRepository = Depends(deps.get_upload_repository),
+    storage: ArtifactStorage = Depends(deps.get_upload_storage),
+    recorder: EventRecorder = Depends(deps.get_event_recorder),
+) -> UploadPartReceipt:
+    """Store one part from the raw request body, streamed to storage.
+
+    Re-sending a received part with the same SHA-256 is a no-op; different content is refused with 409,
+    since staging may already have read the part.
+    """
+    upload = await repository.get(upload_id)
+    if upload is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found.")
+    if upload.received_at is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload is already complete.")
+    received = await repository.get_part(upload_id, part_number)
+    if received is not None:
+        if received.sha256 != part_sha256.lower():
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=_PART_CONFLICT.format(part_number))
+        return UploadPartReceipt(part_number=part_number, size=received.size, sha256=received.sha256)
+    try:
+        expected_length = UploadPlan(upload.size_bytes, upload.part_size).part_length(part_number)
+        stored = await store_part(
+            storage,
+            part_key(upload_id, part_number),
+            request.stream(),
+            expected_length=expected_length,
+            expected_sha256=part_sha256,
+        )
+    except PartRejected as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    if await repository.record_part(upload_id, part_number, stored.size, stored.sha256) != stored.sha256:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=_PART_CONFLICT.format(part_number))
+    await recorder.record_audit(
+        "upload.part_received", "upload", upload_id, f"part {part_number}: {stored.size} bytes, sha256 {stored.sha256}"
+    )
+    return UploadPartReceipt(part_number=part_number, size=stored.size, sha256=stored.sha256)
+
+
+@router.get("/{upload_id}", response_model=UploadStatus)
+async def get_upload(
+    upload_id: UUID,
+    repository: UploadRepository = Depends(deps.get_upload_repository),
+) -> UploadStatus:
+    """Received and missing parts, staging status, and the rows staged so far."""
+    return await _upload_status(repository, upload_id)
+
+
+@router.post("/{upload_id}/complete", response_model=UploadStatus)
+async def complete_upload(
+    upload_id: UUID,
+    request: Optional[UploadCompleteRequest] = Body(default=None),
+    repository: UploadRepository = Depends(deps.get_upload_repository),
+    queue_ingestion: Callable[[UUID], None] = Depends(deps.get_upload_ingestion_queue),
+    recorder: EventRecorder = Depends(deps.get_event_recorder),
+) -> UploadStatus:
+    """Close the upload once every part is in; ``parts``, when sent, must match the received parts."""
+    current = await _upload_status(repository, upload_id)
+    if current.missing_parts:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload is missing {len(current.missing_parts)} part(s); see missing_parts on GET.",
+        )
+    if request is not None and request.parts is not None:
+        manifest = sorted((part.part_number, part.sha256.lower()) for part in request.parts)
+        if manifest != [(part.part_number, part.sha256) for part in current.received_parts]:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Part manifest does not match.")
+    if current.received_at is not None:
+        return current
+
+    await repository.mark_received(upload_id)
+    await recorder.record_audit(
+        "upload.completed", "upload", upload_id, f"{len(current.received_parts)} parts received"
+    )
+    # XLSX is only readable once whole; a CSV whose job gave up waiting for a part is staged again.
+    if current.file_format == "xlsx" or current.status == "failed":
+        await asyncio.to_thread(queue_ingestion, upload_id)
+    return await _upload_status(repository, upload_id)
@@ -0,0 +1,57 @@
+"""What-if routes: re-rank an analysis run's deals under adjusted assumptions."""
+
+from __future__ import annotations
+
+import time
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from app.api import deps
+from app.repositories.what_if import WhatIfRepository
+from app.schemas.what_if import RankedDeal, WhatIfAssumptions, WhatIfRequest, WhatIfResponse
+
+router = APIRouter(prefix="/what-if", tags=["what-if"])
+
+
+@router.post("/runs/{run_id}", response_model=WhatIfResponse)
+async def rank_what_if(
+    run_id: UUID,
+    request: WhatIfRequest,
+    repository: WhatIfRepository = Depends(deps.get_what_if_repository),
+) -> WhatIfResponse:
+    """Top ``top_k`` deals of the run under ``assumptions``.
+
+    Pass back the returned ``session_id`` to keep the run's arrays warm between calls. An evicted or
+    unknown session is replaced by a new one, so the response's ``session_id`` may differ from the request's.
+    """
+    from app.services.what_if import WhatIfParameters, get_what_if_sessions  # NumPy stays out of API start-up
+
+    started = time.perf_counter()
+    sessions = get_what_if_sessions()
+    session = sessions.get(request.session_id, run_id) if request.session_id else None
+    if session is None:
+        baseline = sessions.baseline(run_id) or await repository.load(run_id)
+        if baseline is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analysis run not found.")
+        session = sessions.open(baseline)
+
+    ranking = session.rank(WhatIfParameters(**request.assumptions.model_dump()), request.top_k)
+    return WhatIfResponse(
+        session_id=ranking.session_id,
+        run_id=ranking.run_id,
+        assumptions=WhatIfAssumptions(**vars(ranking.parameters)),
+        total_liens=ranking.total_liens,
+        recomputed=list(ranking.recomputed),
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+        deals=[RankedDeal(**vars(deal)) for deal in ranking.deals],
+    )
+
+
+@router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def close_what_if_session(session_id: UUID) -> Response:
+    from app.services.what_if import get_what_if_sessions  # NumPy stays out of API start-up
+
+    if not get_what_if_sessions().close(session_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="What-if session not found.")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -17,6 +17,14 @@ class Settings(BaseSettings):
     CORS_ALLOW_ORIGINS: list[AnyHttpUrl | str] = ["*"]
 
     DATABASE_URL: str
+    DATABASE_READ_REPLICA_URL: str | None = None
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 30.0
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_STATEMENT_CACHE_SIZE: int = 500
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 500
     REDIS_URL: str
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
@@ -28,17 +36,91 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str | None = None
     OPENAI_MODEL_NAME: str = "gpt-5.1"
     OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-large"
+    LLM_TOKENS_PER_MINUTE: int = 450_000
+    LLM_REQUESTS_PER_MINUTE: int = 5_000
+    LLM_SCHEDULER_MAX_CONCURRENCY: int = 32
+    LLM_INTERACTIVE_RESERVE_RATIO: float = 0.2
+    LLM_COALESCE_WINDOW_MS: float = 10.0
+    LLM_COALESCE_MAX_ITEMS: int = 64
+    LLM_DEFAULT_OUTPUT_TOKENS: int = 1_024
+    DOCUMENT_CHUNK_SIZE_CHARS: int = 2_000
+    DOCUMENT_CHUNK_OVERLAP_CHARS: int = 200
+    DOCUMENT_EMBEDDING_BATCH_SIZE: int = 64
+    DOCUMENT_EMBEDDING_CONCURRENCY: int = 4
+    DOCUMENT_EMBEDDING_DIMENSIONS: int = 1_536
+    RETRIEVAL_CANDIDATES: int = 50
+    RETRIEVAL_RRF_K: int = 60
+    RETRIEVAL_HNSW_EF_SEARCH: int = 100
+    RETRIEVAL_RERANK_MODEL: str | None = None
+    RETRIEVAL_RERANK_TOP_N: int = 20
+    DOCUMENT_TEMPLATE_DIR: str | None = None
+    DOCUMENT_TEMPLATE_BYTECODE_DIR: str | None = None
+    DOCUMENT_RENDER_WORKERS: int = 0
+    DOCUMENT_GENERATION_QUEUE: str = "documents"
+    DOCUMENT_STORAGE_BACKEND: str = "local"
+    DOCUMENT_STORAGE_LOCAL_PATH: str = "generated_documents"
+    DOCUMENT_STORAGE_BUCKET: str | None = None
+    DOCUMENT_STORAGE_PREFIX: str = "documents"
+    DOCUMENT_STORAGE_ENDPOINT_URL: str | None = None
+    DOCUMENT_STORAGE_REGION: str | None = None
+    DOCUMENT_STORAGE_PART_SIZE_BYTES: int = 8 * 1024 * 1024
+    NOTIFICATION_FANOUT_BATCH_SIZE: int = 10_000
+    NOTIFICATION_DIGEST_WINDOW_SECONDS: int = 900
+    NOTIFICATION_DIGEST_MAX_EVENTS: int = 20
+    ANALYSIS_EQUATIONS_WORKBOOK: str | None = None
+    ANALYSIS_EQUATIONS_CACHE_DIR: str | None = None
+    REDEMPTION_FORECAST_HORIZON_MONTHS: int = 36
+    REDEMPTION_FORECAST_MAX_DURATION_MONTHS: int = 60
+    REDEMPTION_FORECAST_PRIOR_STRENGTH: float = 25.0
+    REDEMPTION_FORECAST_CHUNK_SIZE: int = 50_000
+    WHAT_IF_MAX_SESSIONS: int = 32
+    DEAL_EXPORT_CHUNK_SIZE: int = 5_000
+    UPLOAD_STAGING_CHUNK_SIZE: int = 5_000
+    UPLOAD_PART_SIZE_BYTES: int = 8 * 1024 * 1024
+    UPLOAD_MAX_BYTES: int = 5 * 1024 * 1024 * 1024
+    UPLOAD_PART_WAIT_SECONDS: float = 900.0
+    UPLOAD_INGESTION_QUEUE: str = "uploads"
+    COLUMN_MAPPING_CACHE_SIZE: int = 1_024
+    COLUMN_MAPPING_EMBEDDING_MIN_SIMILARITY: float = 0.55
+    COLUMN_MAPPING_USE_LLM: bool = True
+    EVENT_RECORDER_MODE: str = "async"
+    EVENT_RECORDER_FLUSH_INTERVAL_MS: float = 200.0
+    EVENT_RECORDER_FLUSH_MAX_EVENTS: int = 1_000
+    EVENT_RECORDER_MAX_BUFFERED: int = 50_000
+    EVENT_RECORDER_STREAM_KEY: str = "event-recorder"
+    EVENT_RECORDER_STREAM_GROUP: str = "event-recorder"
+    EVENT_RECORDER_CLAIM_IDLE_MS: int = 60_000
     HUGGINGFACE_API_KEY: str | None = None
     HUGGINGFACE_EMBEDDING_MODEL: str | None = None
 
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
+    LOG_QUEUE_ENABLED: bool = True
+    LOG_QUEUE_MAX_SIZE: int = 10_000
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0
+    LOG_RATE_LIMIT_PER_SECOND: int = 0
+
+    TRACING_ENABLED: bool = False
+    TRACING_SERVICE_NAME: str = "tax-lien-strategist"
+    TRACING_EXPORTER: str = "file"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str | None = None
+    TRACING_SAMPLE_RATIO: float = 1.0
 
     REASONING_LOG_RETENTION_DAYS: int = 30
+    AUDIT_LOG_RETENTION_DAYS: int = 365
+    INTEGRATION_EVENT_RETENTION_DAYS: int = 90
+    PARTITION_PREMAKE_MONTHS: int = 3
+    PARTITION_RETENTION_MODE: str = "drop"
     AGENT_MAX_TOOL_RETRIES: int = 3
+    AGENT_TOOL_TIMEOUT_SECONDS: float = 30.0
+    AGENT_TOOL_MAX_CONCURRENCY: int = 8
+    AGENT_TOOL_RETRY_BASE_DELAY_SECONDS: float = 0.2
+    AGENT_TOOL_RETRY_MAX_DELAY_SECONDS: float = 5.0
 
     ANALYSIS_DEFAULT_MAX_BUDGET: int = 500_000
     ANALYSIS_DEFAULT_PAGE_SIZE: int = 100
+    ANALYSIS_BULK_SHARD_SIZE: int = 5_000
 
     @field_validator("CORS_ALLOW_ORIGINS", mode="before")
     @classmethod
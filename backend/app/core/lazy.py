@@ -0,0 +1,29 @@
+"""Deferred imports for heavy optional subsystems (OpenAI SDK, pgvector, ML libraries)."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return ``name`` as a module whose body only executes on first attribute access.
+
+    Keeps SDKs that are only touched inside request handlers or tasks out of process start-up.
+    Already-imported modules are returned unchanged.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
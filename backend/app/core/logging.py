@@ -1,54 +1,165 @@
 """Central logging configuration for structured application logs."""
 
+import atexit
 import logging
-import logging.config
+import logging.handlers
+import queue
+import random
 import sys
-from typing import Any
+import threading
+import time
+from typing import Any, MutableMapping, TextIO
 
+import orjson
 import structlog
 
 from app.core.config import settings
 
+_queue_listener: logging.handlers.QueueListener | None = None
 
-def configure_logging(force: bool = False) -> None:
-    """Initialise structlog + standard logging handlers if not already configured."""
+
+def _orjson_dumps(value: Any, **_: Any) -> str:
+    return orjson.dumps(value, default=str).decode("utf-8")
+
+
+class DebugSampler:
+    """Structlog processor that keeps only a fraction of debug-level events."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+
+    def __call__(self, logger: Any, method_name: str, event_dict: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        if method_name == "debug" and self.rate < 1.0 and random.random() >= self.rate:
+            raise structlog.DropEvent
+        return event_dict
+
+
+class PerLoggerRateLimiter:
+    """Structlog processor capping events per logger per second.
+
+    Dropped events are counted and reported as ``suppressed`` on the next event that gets through.
+    """
+
+    def __init__(self, max_per_second: int) -> None:
+        self.max_per_second = max_per_second
+        self._windows: dict[str, list[float | int]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, logger: Any, method_name: str, event_dict: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        if self.max_per_second <= 0 or method_name in {"error", "critical", "exception"}:
+            return event_dict
+
+        key = getattr(logger, "name", None) or "root"
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.setdefault(key, [now, 0, 0])
+            if now - window[0] >= 1.0:
+                window[0], window[1] = now, 0
+            if window[1] >= self.max_per_second:
+                window[2] += 1
+                raise structlog.DropEvent
+            window[1] += 1
+            suppressed, window[2] = window[2], 0
+
+        if suppressed:
+            event_dict["suppressed"] = suppressed
+        return event_dict
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking or erroring when the queue is full.
+
+    Dropped records are counted and reported as ``dropped`` on the next record that gets through.
+    """
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # ``prepare`` has already rendered the message; ``Handler.handle`` holds the lock around this call.
+        message = record.msg
+        if self.dropped:
+            record.msg = _with_dropped(message, self.dropped)
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            record.msg = message
+            self.dropped += 1
+        else:
+            self.dropped = 0
+
+
+def _with_dropped(message: Any, dropped: int) -> str:
+    message = str(message)
+    if message.startswith("{") and message.endswith("}") and message != "{}":
+        return f'{message[:-1]},"dropped":{dropped}}}'
+    return f"{message} dropped={dropped}"
+
+
+def _build_handler(stream: TextIO) -> logging.Handler:
+    global _queue_listener
+
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    if not settings.LOG_QUEUE_ENABLED:
+        return stream_handler
+
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=settings.LOG_QUEUE_MAX_SIZE)
+    _queue_listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=False)
+    _queue_listener.start()
+    return DroppingQueueHandler(log_queue)
+
+
+def shutdown_logging() -> None:
+    """Drain queued records and stop the background writer thread, if one is running."""
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def configure_logging(force: bool = False, *, stream: TextIO | None = None) -> None:
+    """Initialise structlog + standard logging handlers if not already configured.
+
+    With ``LOG_QUEUE_ENABLED`` the calling thread only enqueues records; a ``QueueListener``
+    thread performs the stdout writes.
+    """
     if getattr(configure_logging, "_configured", False) and not force:
         return
 
-    logging_config: dict[str, Any] = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "plain": {
-                "format": "%(message)s",
-            },
-        },
-        "handlers": {
-            "default": {
-                "level": settings.LOG_LEVEL,
-                "class": "logging.StreamHandler",
-                "stream": sys.stdout,
-                "formatter": "plain",
-            }
-        },
-        "root": {
-            "handlers": ["default"],
-            "level": settings.LOG_LEVEL,
-        },
-    }
-
-    logging.config.dictConfig(logging_config)
+    shutdown_logging()
 
+    handler = _build_handler(stream or sys.stdout)
+    handler.setLevel(settings.LOG_LEVEL)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+    renderer = (
+        structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+        if settings.LOG_FORMAT == "json"
+        else structlog.dev.ConsoleRenderer()
+    )
     structlog.configure(
         processors=[
+            DebugSampler(settings.LOG_DEBUG_SAMPLE_RATE),
+            PerLoggerRateLimiter(settings.LOG_RATE_LIMIT_PER_SECOND),
             structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer() if settings.LOG_FORMAT == "json" else structlog.dev.ConsoleRenderer(),
+            renderer,
         ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
         wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(settings.LOG_LEVEL)),
         cache_logger_on_first_use=True,
     )
 
+    if not getattr(configure_logging, "_atexit_registered", False):
+        atexit.register(shutdown_logging)
+        configure_logging._atexit_registered = True
+
     configure_logging._configured = True
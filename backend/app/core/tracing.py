@@ -0,0 +1,270 @@
+"""OpenTelemetry tracing setup spanning the API, Celery tasks, SQL statements and OpenAI calls."""
+
+from __future__ import annotations
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Mapping, Optional
+
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.propagators.textmap import Getter
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+
+from app.core.config import settings
+
+if TYPE_CHECKING:  # pragma: no cover - the SDK is only imported once tracing is enabled
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SpanExporter
+
+TRACER_NAME = "tax_lien_strategist"
+_MAX_STATEMENT_LENGTH = 2048
+
+_tracer_provider: Optional[TracerProvider] = None
+
+
+def _build_exporter() -> Optional[SpanExporter]:
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    exporter_name = settings.TRACING_EXPORTER.lower()
+    if exporter_name == "none":
+        return None
+    if exporter_name == "console":
+        return ConsoleSpanExporter(out=sys.stdout, formatter=lambda span: span.to_json(indent=None) + "\n")
+    if exporter_name == "file":
+        stream = open(settings.TRACING_FILE_PATH, "a", encoding="utf-8")  # noqa: SIM115 - owned by the exporter
+        return ConsoleSpanExporter(out=stream, formatter=lambda span: span.to_json(indent=None) + "\n")
+    if exporter_name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    raise ValueError(f"Unsupported TRACING_EXPORTER '{settings.TRACING_EXPORTER}'.")
+
+
+def configure_tracing(
+    service_name: str | None = None,
+    *,
+    exporter: SpanExporter | None = None,
+    force: bool = False,
+) -> None:
+    """Install the tracer provider and span exporter if tracing is enabled and not yet configured."""
+    global _tracer_provider
+
+    if getattr(configure_tracing, "_configured", False) and not force:
+        return
+
+    configure_tracing._configured = True
+    if not settings.TRACING_ENABLED:
+        return
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name or settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    span_exporter = exporter or _build_exporter()
+    if span_exporter is not None:
+        provider.add_span_processor(BatchSpanProcessor(span_exporter))
+
+    if _tracer_provider is None:
+        trace.set_tracer_provider(provider)
+    else:
+        _tracer_provider.shutdown()
+    _tracer_provider = provider
+
+
+def flush_tracing() -> None:
+    """Export any spans still buffered by the batch processor."""
+    if _tracer_provider is not None:
+        _tracer_provider.force_flush()
+
+
+def get_tracer() -> trace.Tracer:
+    provider = _tracer_provider or trace.get_tracer_provider()
+    return provider.get_tracer(TRACER_NAME)
+
+
+@contextmanager
+def traced_stage(name: str, **attributes: Any) -> Iterator[Span]:
+    """Wrap a pipeline stage in a span so slow stages show up in trace lookups."""
+    with get_tracer().start_as_current_span(f"stage {name}", attributes={"pipeline.stage": name, **attributes}) as span:
+        yield span
+
+
+def record_token_usage(span: Span, usage: Optional[Mapping[str, int]]) -> None:
+    """Copy normalised OpenAI token usage onto a span using GenAI semantic attribute names."""
+    if not usage:
+        return
+    for key in ("input_tokens", "output_tokens", "total_tokens", "reasoning_tokens"):
+        value = usage.get(key)
+        if value is not None:
+            span.set_attribute(f"gen_ai.usage.{key}", value)
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy
+# ---------------------------------------------------------------------------
+
+
+def instrument_engine(engine: Any) -> None:
+    """Emit one client span per SQL statement executed through ``engine`` (sync or async)."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if getattr(sync_engine, "_tracing_instrumented", False):
+        return
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        operation = statement.split(None, 1)[0].upper() if statement.strip() else "SQL"
+        span = get_tracer().start_span(
+            f"db {operation}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": sync_engine.dialect.name,
+                "db.operation": operation,
+                "db.statement": statement[:_MAX_STATEMENT_LENGTH],
+                "db.executemany": bool(executemany),
+            },
+        )
+        conn.info.setdefault("_tracing_spans", []).append(span)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        spans = conn.info.get("_tracing_spans")
+        if spans:
+            span = spans.pop()
+            rowcount = getattr(cursor, "rowcount", -1)
+            if isinstance(rowcount, int) and rowcount >= 0:
+                span.set_attribute("db.rowcount", rowcount)
+            span.end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):  # type: ignore[no-untyped-def]
+        connection = exception_context.connection
+        spans = connection.info.get("_tracing_spans") if connection is not None else None
+        if spans:
+            span = spans.pop()
+            span.record_exception(exception_context.original_exception)
+            span.set_status(Status(StatusCode.ERROR))
+            span.end()
+
+    sync_engine._tracing_instrumented = True
+
+
+# ---------------------------------------------------------------------------
+# Celery
+# ---------------------------------------------------------------------------
+
+
+class _CeleryRequestGetter(Getter):
+    """Reads propagated trace headers off a Celery task request context."""
+
+    def get(self, carrier: Any, key: str) -> Optional[list[str]]:
+        value = getattr(carrier, key, None)
+        if value is None:
+            headers = getattr(carrier, "headers", None) or {}
+            value = headers.get(key) if isinstance(headers, dict) else None
+        return [value] if isinstance(value, str) else None
+
+    def keys(self, carrier: Any) -> list[str]:
+        return []
+
+
+_celery_getter = _CeleryRequestGetter()
+_active_task_spans: Dict[str, tuple[Span, object]] = {}
+
+
+def _inject_task_headers(headers: Optional[dict] = None, **_: Any) -> None:
+    if headers is not None:
+        propagate.inject(headers)
+
+
+def _start_task_span(task_id: str | None = None, task: Any = None, **_: Any) -> None:
+    if task_id is None or task is None:
+        return
+    parent = propagate.extract(task.request, getter=_celery_getter)
+    span = get_tracer().start_span(
+        f"celery.task {task.name}",
+        context=parent,
+        kind=SpanKind.CONSUMER,
+        attributes={"celery.task_name": task.name, "celery.task_id": task_id},
+    )
+    token = otel_context.attach(trace.set_span_in_context(span))
+    _active_task_spans[task_id] = (span, token)
+
+
+def _record_task_failure(task_id: str | None = None, exception: BaseException | None = None, **_: Any) -> None:
+    entry = _active_task_spans.get(task_id or "")
+    if entry is not None and exception is not None:
+        span, _token = entry
+        span.record_exception(exception)
+        span.set_status(Status(StatusCode.ERROR))
+
+
+def _end_task_span(task_id: str | None = None, state: str | None = None, **_: Any) -> None:
+    entry = _active_task_spans.pop(task_id or "", None)
+    if entry is None:
+        return
+    span, token = entry
+    if state:
+        span.set_attribute("celery.state", state)
+    otel_context.detach(token)
+    span.end()
+
+
+def instrument_celery() -> None:
+    """Propagate trace context through task headers and open a span around each task run."""
+    from celery.signals import before_task_publish, task_failure, task_postrun, task_prerun
+
+    before_task_publish.connect(_inject_task_headers, weak=False)
+    task_prerun.connect(_start_task_span, weak=False)
+    task_failure.connect(_record_task_failure, weak=False)
+    task_postrun.connect(_end_task_span, weak=False)
+
+
+# ---------------------------------------------------------------------------
+# ASGI
+# ---------------------------------------------------------------------------
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per HTTP request, honouring inbound ``traceparent``."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        parent = propagate.extract(carrier)
+        method = scope.get("method", "GET")
+        path = scope.get("path", "")
+        started = time.perf_counter()
+
+        with get_tracer().start_as_current_span(
+            f"{method} {path}",
+            context=parent,
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": path},
+        ) as span:
+
+            async def send_wrapper(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                span.set_attribute("http.server.duration_ms", (time.perf_counter() - started) * 1000)
@@ -0,0 +1,196 @@
+"""Monthly range-partition maintenance for append-only log tables.
+
+``agent_logs``, ``audit_logs`` and ``integration_events`` are partitioned by month on their
+timestamp column. New partitions are created ahead of time and retention removes whole expired
+partitions (``DETACH`` + ``DROP``, or ``DETACH`` only to keep them for archival) instead of
+deleting rows, so neither writes nor cleanup get slower as history grows.
+
+Each table also has a ``<table>_default`` partition. It catches rows outside every monthly range: a
+backdated timestamp, or a month reached while maintenance was not running. An insert therefore never
+fails for lack of a partition. Maintenance then moves those rows into proper monthly partitions, so
+retention can still drop them by month.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class PartitionPolicy:
+    table: str
+    column: str
+    retention_setting: str
+
+    @property
+    def retention_days(self) -> int:
+        return int(getattr(settings, self.retention_setting))
+
+
+PARTITIONED_TABLES: Dict[str, PartitionPolicy] = {
+    "agent_logs": PartitionPolicy("agent_logs", "created_at", "REASONING_LOG_RETENTION_DAYS"),
+    "audit_logs": PartitionPolicy("audit_logs", "created_at", "AUDIT_LOG_RETENTION_DAYS"),
+    "integration_events": PartitionPolicy("integration_events", "started_at", "INTEGRATION_EVENT_RETENTION_DAYS"),
+}
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(moment: date | datetime) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_bounds(name: str) -> Optional[tuple[date, date]]:
+    """Return the ``[lower, upper)`` month range encoded in a partition name."""
+    match = _PARTITION_SUFFIX.search(name)
+    if match is None:
+        return None
+    lower = date(int(match.group(1)), int(match.group(2)), 1)
+    return lower, add_months(lower, 1)
+
+
+def expired_partitions(names: Iterable[str], cutoff: datetime) -> List[str]:
+    """Partitions whose entire range ends on or before ``cutoff``."""
+    cutoff_day = cutoff.date()
+    expired = []
+    for name in names:
+        bounds = partition_bounds(name)
+        if bounds is not None and bounds[1] <= cutoff_day:
+            expired.append(name)
+    return sorted(expired)
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def create_default_partition_sql(table: str) -> str:
+    return f"CREATE TABLE IF NOT EXISTS {default_partition_name(table)} PARTITION OF {table} DEFAULT"
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    upper = add_months(month, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+
+
+async def list_partitions(connection: AsyncConnection, table: str) -> List[str]:
+    result = await connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return sorted(row[0] for row in result)
+
+
+async def split_default_partition(connection: AsyncConnection, table: str, column: str) -> List[str]:
+    """Give every month with rows in the default partition its own partition, moving those rows into it.
+
+    Postgres refuses to create a partition whose range has rows in the default partition. Each
+    month's rows are therefore held in a temporary table while its partition is created, then
+    re-inserted.
+    """
+    default = default_partition_name(table)
+    result = await connection.execute(
+        text(f"SELECT DISTINCT CAST(date_trunc('month', {column}) AS date) FROM {default} ORDER BY 1")
+    )
+    created = []
+    for (month,) in result:
+        upper = add_months(month, 1)
+        await connection.execute(
+            text(
+                f"CREATE TEMPORARY TABLE _moved_{table} AS "
+                f"WITH moved AS (DELETE FROM {default} WHERE {column} >= '{month.isoformat()}' "
+                f"AND {column} < '{upper.isoformat()}' RETURNING *) SELECT * FROM moved"
+            )
+        )
+        await connection.execute(text(create_partition_sql(table, month)))
+        await connection.execute(text(f"INSERT INTO {table} SELECT * FROM _moved_{table}"))
+        await connection.execute(text(f"DROP TABLE _moved_{table}"))
+        created.append(partition_name(table, month))
+    return created
+
+
+async def ensure_partitions(
+    connection: AsyncConnection,
+    table: str,
+    *,
+    months_ahead: int | None = None,
+    now: datetime | None = None,
+) -> List[str]:
+    """Create the current month's partition plus ``months_ahead`` future ones if missing.
+
+    Rows that landed in the default partition are first moved into monthly partitions of their own.
+    """
+    months_ahead = settings.PARTITION_PREMAKE_MONTHS if months_ahead is None else months_ahead
+    current = month_start(now or datetime.now(timezone.utc))
+    existing = set(await list_partitions(connection, table))
+
+    created = []
+    if default_partition_name(table) in existing:
+        created = await split_default_partition(connection, table, PARTITIONED_TABLES[table].column)
+    else:
+        await connection.execute(text(create_default_partition_sql(table)))
+    existing.update(created)
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(table, month)
+        if name not in existing:
+            await connection.execute(text(create_partition_sql(table, month)))
+            created.append(name)
+    return created
+
+
+async def apply_retention(
+    connection: AsyncConnection,
+    table: str,
+    *,
+    retention_days: int,
+    mode: str | None = None,
+    now: datetime | None = None,
+) -> List[str]:
+    """Detach (and by default drop) partitions that only hold rows older than the retention window."""
+    mode = mode or settings.PARTITION_RETENTION_MODE
+    if mode not in {"drop", "detach"}:
+        raise ValueError("Partition retention mode must be 'drop' or 'detach'.")
+
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=retention_days)
+    removed = expired_partitions(await list_partitions(connection, table), cutoff)
+    for name in removed:
+        await connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        if mode == "drop":
+            await connection.execute(text(f"DROP TABLE {name}"))
+    return removed
+
+
+async def maintain_partitions(connection: AsyncConnection, *, now: datetime | None = None) -> Dict[str, Dict[str, List[str]]]:
+    """Run creation and retention for every partitioned log table."""
+    summary: Dict[str, Dict[str, List[str]]] = {}
+    for policy in PARTITIONED_TABLES.values():
+        created = await ensure_partitions(connection, policy.table, now=now)
+        removed = await apply_retention(connection, policy.table, retention_days=policy.retention_days, now=now)
+        summary[policy.table] = {"created": created, "removed": removed}
+    return summary
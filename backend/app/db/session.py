@@ -1,14 +1,57 @@
-"""Async database engine and session management."""
+"""Async database engines and session management.
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+Writes go to the primary (``DATABASE_URL``). Heavy analytics and search reads can be routed to a
+replica (``DATABASE_READ_REPLICA_URL``) through ``get_read_session``; without a replica both roles
+share the primary engine.
+"""
+
+from typing import Any, AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
+from app.core.tracing import instrument_engine
+
+
+def build_engine(url: str) -> AsyncEngine:
+    """Create an async engine with the configured pool sizing and asyncpg statement caches."""
+    connect_args: dict[str, Any] = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args = {
+            # asyncpg's server-side prepared statement LRU (set to 0 behind pgbouncer transaction pooling).
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            # SQLAlchemy's per-connection cache of asyncpg prepared statement handles.
+            "prepared_statement_cache_size": settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE,
+        }
+
+    engine = create_async_engine(
+        url,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE_SECONDS,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        pool_use_lifo=True,
+        connect_args=connect_args,
+    )
+    if settings.TRACING_ENABLED:
+        instrument_engine(engine)
+    return engine
 
 
-engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
+engine = build_engine(settings.DATABASE_URL)
+read_engine = build_engine(settings.DATABASE_READ_REPLICA_URL) if settings.DATABASE_READ_REPLICA_URL else engine
+
 SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+ReadSessionLocal = async_sessionmaker(bind=read_engine, expire_on_commit=False, class_=AsyncSession)
 
 
-async def get_session() -> AsyncSession:
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with SessionLocal() as session:
         yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Session bound to the read replica (or the primary when no replica is configured)."""
+    async with ReadSessionLocal() as session:
+        yield session
@@ -0,0 +1,105 @@
+"""Background document work: corpus ingestion and batch generation from templates."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.ai.openai_service import OpenAIService
+from app.ai.scheduler import LLMScheduler, Priority
+from app.core.config import settings
+from app.core.tracing import traced_stage
+from app.models.enums import DocumentType
+from app.models.notification import Document
+from app.repositories.document_corpus import DocumentCorpusRepository
+from app.services.document_generation import DocumentGenerator, RenderedArtifact, RenderJob
+from app.services.document_ingestion import DocumentIngestionPipeline
+from app.worker import celery_app
+
+logger = structlog.get_logger(__name__)
+
+
+async def _ingest(document_id: UUID, path: str, mime_type: Optional[str], force: bool) -> Dict[str, Any]:
+    from openai import AsyncOpenAI
+
+    # Throwaway engine and client: both are bound to the event loop asyncio.run creates.
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    service = OpenAIService(
+        client=AsyncOpenAI(api_key=settings.OPENAI_API_KEY),
+        default_model=settings.OPENAI_MODEL_NAME,
+        embedding_model=settings.OPENAI_EMBEDDING_MODEL,
+    )
+    scheduler = LLMScheduler(service)
+    try:
+        pipeline = DocumentIngestionPipeline(DocumentCorpusRepository(engine), scheduler.client(Priority.BATCH))
+        result = await pipeline.ingest(document_id, path, mime_type=mime_type, filename=path, force=force)
+    finally:
+        await scheduler.aclose()
+        await service.aclose()
+        await engine.dispose()
+    return {**asdict(result), "document_id": str(result.document_id)}
+
+
+@celery_app.task(name="app.jobs.documents.ingest_document")
+def ingest_document(
+    document_id: str, path: str, mime_type: Optional[str] = None, force: bool = False
+) -> Dict[str, Any]:
+    """Chunk and embed one stored document; unchanged re-uploads finish without embedding calls."""
+    return asyncio.run(_ingest(UUID(document_id), path, mime_type, force))
+
+
+async def _record_documents(rows: List[Dict[str, Any]]) -> None:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(insert(Document.__table__), rows)
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="app.jobs.documents.generate_documents")
+def generate_documents(
+    template_key: str,
+    document_type: str,
+    items: List[Dict[str, Any]],
+    shared_context: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Render one document per item and record a ``Document`` row for each artifact written.
+
+    Each item carries ``output_name``, ``owner_user_id``, its template ``context`` and optionally
+    ``portfolio_id``, ``analysis_run_id`` and ``lien_id``.
+    """
+    kind = DocumentType(document_type)
+    generator = DocumentGenerator()
+    jobs = [RenderJob(template_key, item.get("context", {}), item["output_name"]) for item in items]
+    artifacts: List[RenderedArtifact] = generator.render_batch(jobs, shared_context=shared_context)
+
+    rows = [
+        {
+            "owner_user_id": UUID(item["owner_user_id"]),
+            "portfolio_id": UUID(item["portfolio_id"]) if item.get("portfolio_id") else None,
+            "analysis_run_id": UUID(item["analysis_run_id"]) if item.get("analysis_run_id") else None,
+            "lien_id": UUID(item["lien_id"]) if item.get("lien_id") else None,
+            "document_type": kind,
+            "storage_url": artifact.storage_url,
+            "mime_type": artifact.mime_type,
+        }
+        for item, artifact in zip(items, artifacts)
+        if artifact.ok
+    ]
+    if rows:
+        with traced_stage("generation.record", documents=len(rows)):
+            asyncio.run(_record_documents(rows))
+    failed = [
+        {"output_name": artifact.output_name, "error": artifact.error} for artifact in artifacts if not artifact.ok
+    ]
+    if failed:
+        logger.warning("document_generation_failures", template_key=template_key, failed=len(failed))
+    return {"generated": len(rows), "failed": failed}
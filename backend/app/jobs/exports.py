@@ -0,0 +1,74 @@
+"""Export jobs: ranked deals written to document storage."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.tracing import traced_stage
+from app.repositories.deal_exports import EXPORT_COLUMNS, DealExportRepository
+from app.services.deal_export import EXPORT_FORMATS, encode_export, open_encoder
+from app.services.document_storage import StorageConfig, build_storage
+from app.worker import celery_app
+
+logger = structlog.get_logger(__name__)
+
+
+def export_key(run_id: UUID, output_name: Optional[str], extension: str) -> str:
+    """``deal_exports/<run_id>/<output_name><ext>``, ``ranked-deals`` by default."""
+    return f"deal_exports/{run_id}/{output_name or 'ranked-deals'}{extension}"
+
+
+async def _export(
+    run_id: UUID, format_name: str, investor_profile_id: Optional[UUID], output_name: Optional[str]
+) -> Dict[str, Any]:
+    export_format = EXPORT_FORMATS[format_name]
+    encoder = open_encoder(format_name, EXPORT_COLUMNS)
+    storage = build_storage(StorageConfig.from_settings())
+    writer = storage.open_writer(export_key(run_id, output_name, export_format.extension), export_format.media_type)
+    rows = 0
+
+    def count(batch_rows: int) -> None:
+        nonlocal rows
+        rows += batch_rows
+
+    # A throwaway engine: pooled asyncpg connections cannot outlive the event loop asyncio.run creates.
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        batches = DealExportRepository(engine).iter_ranked_deals(
+            run_id, settings.DEAL_EXPORT_CHUNK_SIZE, investor_profile_id
+        )
+        with traced_stage("export.encode", format=format_name) as span:
+            async for data in encode_export(batches, encoder, on_rows=count):
+                await asyncio.to_thread(writer.write, data)
+            span.set_attribute("export.rows", rows)
+        with traced_stage("export.store", format=format_name):
+            stored = await asyncio.to_thread(writer.close)
+    except BaseException:
+        await asyncio.to_thread(writer.abort)
+        raise
+    finally:
+        await engine.dispose()
+    logger.info("deal_export.completed", run_id=str(run_id), format=format_name, rows=rows, size=stored.size)
+    return {**asdict(stored), "run_id": str(run_id), "format": format_name, "rows": rows}
+
+
+@celery_app.task(name="app.jobs.exports.export_ranked_deals")
+def export_ranked_deals(
+    run_id: str,
+    format: str = "csv",
+    investor_profile_id: Optional[str] = None,
+    output_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Write the run's ranked deals to document storage as ``csv``, ``xlsx`` or ``parquet``."""
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{format}'.")
+    profile_id = UUID(investor_profile_id) if investor_profile_id else None
+    return asyncio.run(_export(UUID(run_id), format, profile_id, output_name))
@@ -0,0 +1,40 @@
+"""Forecast jobs: redemption survival refit and monthly cash-flow projection."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict
+from datetime import date
+from typing import Any, Dict, Optional
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.repositories.redemption_forecasts import RedemptionForecastRepository
+from app.worker import celery_app
+
+
+async def _forecast(as_of: date) -> Dict[str, Any]:
+    from app.services.redemption_forecast import RedemptionForecaster  # NumPy stays out of worker start-up
+
+    # A throwaway engine: pooled asyncpg connections cannot outlive the event loop asyncio.run creates.
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        forecaster = RedemptionForecaster(
+            RedemptionForecastRepository(engine),
+            horizon_months=settings.REDEMPTION_FORECAST_HORIZON_MONTHS,
+            max_duration_months=settings.REDEMPTION_FORECAST_MAX_DURATION_MONTHS,
+            prior_strength=settings.REDEMPTION_FORECAST_PRIOR_STRENGTH,
+            chunk_size=settings.REDEMPTION_FORECAST_CHUNK_SIZE,
+        )
+        result = await forecaster.run(as_of)
+    finally:
+        await engine.dispose()
+    return {**asdict(result), "as_of": result.as_of.isoformat()}
+
+
+@celery_app.task(name="app.jobs.forecasts.forecast_redemptions")
+def forecast_redemptions(as_of: Optional[str] = None) -> Dict[str, Any]:
+    """Refit the redemption hazard model and replace the forecast for ``as_of``'s month (default: this month)."""
+    return asyncio.run(_forecast(date.fromisoformat(as_of) if as_of else date.today()))
@@ -0,0 +1,34 @@
+"""Scheduled database maintenance tasks."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List
+
+import structlog
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.partitions import maintain_partitions
+from app.worker import celery_app
+
+logger = structlog.get_logger(__name__)
+
+
+async def _run_partition_maintenance() -> Dict[str, Dict[str, List[str]]]:
+    # A throwaway engine: pooled asyncpg connections cannot outlive the event loop asyncio.run creates.
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.begin() as connection:
+            return await maintain_partitions(connection)
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="app.jobs.maintenance.manage_log_partitions")
+def manage_log_partitions() -> Dict[str, Dict[str, List[str]]]:
+    """Pre-create upcoming monthly log partitions and drop/detach the expired ones."""
+    summary = asyncio.run(_run_partition_maintenance())
+    logger.info("log_partitions_maintained", summary=summary)
+    return summary
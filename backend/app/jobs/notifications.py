@@ -0,0 +1,84 @@
+"""Notification jobs: one task per event fan-out, not one per recipient."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.models.enums import NotificationType, StrategyType, UserRole
+from app.repositories.notifications import Audience, NotificationRepository
+from app.services.notification_fanout import NotificationEvent, NotificationFanout
+from app.worker import celery_app
+
+
+def _audience(filters: Dict[str, Any]) -> Audience:
+    return Audience(
+        user_ids=[UUID(value) for value in filters["user_ids"]] if filters.get("user_ids") is not None else None,
+        roles=tuple(UserRole(value) for value in filters.get("roles", [UserRole.INVESTOR.value])),
+        strategy_types=[StrategyType(value) for value in filters["strategy_types"]]
+        if filters.get("strategy_types")
+        else None,
+        states=filters.get("states"),
+        lien_ids=[UUID(value) for value in filters["lien_ids"]] if filters.get("lien_ids") else None,
+    )
+
+
+async def _publish(event: NotificationEvent, audience: Audience) -> Dict[str, Any]:
+    # A throwaway engine: pooled asyncpg connections cannot outlive the event loop asyncio.run creates.
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        result = await NotificationFanout(NotificationRepository(engine)).publish(event, audience)
+    finally:
+        await engine.dispose()
+    return asdict(result)
+
+
+@celery_app.task(name="app.jobs.notifications.send_notification")
+def send_notification(
+    title: str,
+    body: str,
+    notification_type: str = NotificationType.ALERT.value,
+    group: Optional[str] = None,
+    payload: Optional[Dict[str, Any]] = None,
+    audience: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Notify every user matching ``audience`` (user_ids, roles, strategy_types, states, lien_ids).
+
+    With a ``group``, repeats within the digest window update each user's unread row instead of adding one.
+    """
+    event = NotificationEvent(
+        title=title,
+        body=body,
+        notification_type=NotificationType(notification_type),
+        group=group,
+        payload=payload or {},
+    )
+    return asyncio.run(_publish(event, _audience(audience or {})))
+
+
+async def _collect_digests(since: datetime, until: datetime) -> List[Dict[str, Any]]:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    digests: List[Dict[str, Any]] = []
+    try:
+        fanout = NotificationFanout(NotificationRepository(engine))
+        async for batch in fanout.digests(since, until):
+            digests.extend({**asdict(digest), "user_id": str(digest.user_id)} for digest in batch)
+    finally:
+        await engine.dispose()
+    return digests
+
+
+@celery_app.task(name="app.jobs.notifications.build_digests")
+def build_digests(since: str, until: str) -> List[Dict[str, Any]]:
+    """Unread notifications created in ``[since, until)`` grouped per user, ready for a digest email.
+
+    No email provider is wired into the app yet; the task returns the digest payloads for the sender.
+    """
+    return asyncio.run(_collect_digests(datetime.fromisoformat(since), datetime.fromisoformat(until)))
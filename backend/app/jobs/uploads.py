@@ -0,0 +1,84 @@
+"""Upload jobs: stage uploaded lead lists for mapping and import."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import tempfile
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.tracing import traced_stage
+from app.repositories.uploads import UploadRepository
+from app.services.chunked_upload import READ_SIZE, PartStreamReader, spool_parts
+from app.services.document_storage import StorageConfig, build_storage
+from app.services.tabular_readers import detect_tabular_format
+from app.services.upload_ingestion import UploadIngestionPipeline, UploadIngestionResult
+from app.worker import celery_app
+
+
+async def _ingest(upload_id: UUID, path: str, file_format: str) -> Dict[str, Any]:
+    # A throwaway engine: pooled asyncpg connections cannot outlive the event loop asyncio.run creates.
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        pipeline = UploadIngestionPipeline(UploadRepository(engine), chunk_size=settings.UPLOAD_STAGING_CHUNK_SIZE)
+        result = await pipeline.ingest(upload_id, path, file_format)
+    finally:
+        await engine.dispose()
+    return {**asdict(result), "upload_id": str(result.upload_id)}
+
+
+@celery_app.task(name="app.jobs.uploads.ingest_upload")
+def ingest_upload(upload_id: str, path: str, mime_type: Optional[str] = None) -> Dict[str, Any]:
+    """Stage every row of a stored CSV or XLSX upload into ``upload_rows``; re-running replaces them."""
+    return asyncio.run(_ingest(UUID(upload_id), path, detect_tabular_format(mime_type, path)))
+
+
+async def _stage_parts(
+    repository: UploadRepository, pipeline: UploadIngestionPipeline, upload: Any, reader: PartStreamReader
+) -> UploadIngestionResult:
+    if upload.file_format == "csv":
+        return await pipeline.ingest(upload.id, io.BufferedReader(reader, READ_SIZE), "csv")
+    with tempfile.TemporaryFile() as spooled:
+        try:
+            with traced_stage("upload.spool", upload_id=str(upload.id)):
+                await asyncio.to_thread(spool_parts, reader, spooled)
+        except Exception as exc:
+            await repository.fail(upload.id, repr(exc))
+            raise
+        return await pipeline.ingest(upload.id, spooled, upload.file_format)
+
+
+async def _ingest_chunked(upload_id: UUID) -> Dict[str, Any]:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        repository = UploadRepository(engine)
+        upload = await repository.get(upload_id)
+        if upload is None:
+            raise ValueError(f"Upload {upload_id} not found.")
+        reader = PartStreamReader(
+            build_storage(StorageConfig.from_settings()),
+            upload_id,
+            upload.part_count,
+            expected_sha256=upload.content_hash,
+            wait_seconds=settings.UPLOAD_PART_WAIT_SECONDS,
+        )
+        pipeline = UploadIngestionPipeline(repository, chunk_size=settings.UPLOAD_STAGING_CHUNK_SIZE)
+        with reader:
+            result = await _stage_parts(repository, pipeline, upload, reader)
+            if upload.content_hash is None:
+                await repository.record_content_hash(upload_id, reader.sha256)
+    finally:
+        await engine.dispose()
+    return {**asdict(result), "upload_id": str(result.upload_id)}
+
+
+@celery_app.task(name="app.jobs.uploads.ingest_chunked_upload")
+def ingest_chunked_upload(upload_id: str) -> Dict[str, Any]:
+    """Stage a chunked upload from its stored parts, waiting for parts that are still arriving."""
+    return asyncio.run(_ingest_chunked(UUID(upload_id)))
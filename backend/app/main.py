@@ -1,22 +1,36 @@
 """Application entrypoint for the FastAPI service."""
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.deps import close_event_recorder, close_llm_scheduler
 from app.api.router import api_router
 from app.core.config import settings
 from app.core.logging import configure_logging
+from app.core.tracing import TracingMiddleware, configure_tracing
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    await close_llm_scheduler()
+    await close_event_recorder()
 
 
 def create_app() -> FastAPI:
     """FastAPI application factory used by uvicorn."""
     configure_logging()
+    configure_tracing()
 
     app = FastAPI(
         title="Tax Lien Strategist API",
         version=settings.VERSION,
         docs_url="/docs",
         openapi_url="/openapi.json",
+        lifespan=lifespan,
     )
 
     app.add_middleware(
@@ -27,6 +41,9 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if settings.TRACING_ENABLED:
+        app.add_middleware(TracingMiddleware)
+
     app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
     @app.get("/health", tags=["health"])
@@ -1,15 +1,19 @@
 """SQLAlchemy model package exports."""
 
 # Import models so that SQLAlchemy metadata registration is available to Alembic.
+# ``Embedding`` is resolved lazily (see ``__getattr__``) so pgvector stays out of API/worker start-up;
+# Alembic imports ``app.models.embedding`` explicitly.
+
+from typing import Any
 
 from app.models.analysis import AnalysisRun, DealMetric, DealScore, RiskAssessment, ScenarioAnalysis
-from app.models.agent import AgentLog, AgentTask
-from app.models.embedding import Embedding
+from app.models.agent import AgentLog, AgentTask, AgentTaskClosure
 from app.models.geography import Auction, County, Property, PropertyComp, PropertyValuation
 from app.models.lien import Lien
-from app.models.notification import Document, Notification
-from app.models.portfolio import Portfolio, PortfolioHolding
+from app.models.notification import Document, DocumentChunk, Notification
+from app.models.portfolio import Portfolio, PortfolioHolding, RedemptionCashflowForecast, RedemptionObservation
 from app.models.system import AuditLog, IntegrationEvent
+from app.models.upload import ColumnMapping, Upload, UploadPart, UploadRow
 from app.models.user import InvestorProfile, User
 
 __all__ = [
@@ -20,6 +24,7 @@ __all__ = [
 	"ScenarioAnalysis",
 	"AgentLog",
 	"AgentTask",
+	"AgentTaskClosure",
 	"Embedding",
 	"Auction",
 	"County",
@@ -28,12 +33,26 @@ __all__ = [
 	"PropertyValuation",
 	"Lien",
 	"Document",
+	"DocumentChunk",
 	"Notification",
 	"Portfolio",
 	"PortfolioHolding",
+	"RedemptionCashflowForecast",
+	"RedemptionObservation",
 	"AuditLog",
 	"IntegrationEvent",
+	"Upload",
+	"UploadPart",
+	"UploadRow",
+	"ColumnMapping",
 	"InvestorProfile",
 	"User",
 ]
 
+
+def __getattr__(name: str) -> Any:
+	if name == "Embedding":
+		from app.models.embedding import Embedding
+
+		return Embedding
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,15 +2,16 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID as PyUUID
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.enums import AgentLogType, AgentTaskStatus, AgentType
+from app.db.base import Base
+from app.models.enums import AgentLogType, AgentTaskStatus, AgentType, enum_values
 from app.models.mixins import BaseModel, TimestampMixin
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -20,14 +21,19 @@ if TYPE_CHECKING:  # pragma: no cover
 
 class AgentTask(TimestampMixin, BaseModel):
     __tablename__ = "agent_tasks"
+    __table_args__ = (Index("ix_agent_tasks_analysis_run_id", "analysis_run_id"),)
 
     analysis_run_id: Mapped[Optional[PyUUID]] = mapped_column(
         ForeignKey("analysis_runs.id", ondelete="SET NULL"), nullable=True
     )
     parent_task_id: Mapped[Optional[PyUUID]] = mapped_column(ForeignKey("agent_tasks.id", ondelete="SET NULL"))
-    agent_type: Mapped[AgentType] = mapped_column(Enum(AgentType, name="agent_type"), nullable=False)
+    agent_type: Mapped[AgentType] = mapped_column(
+        Enum(AgentType, name="agent_type", values_callable=enum_values), nullable=False
+    )
     task_name: Mapped[str] = mapped_column(String(255), nullable=False)
-    status: Mapped[AgentTaskStatus] = mapped_column(Enum(AgentTaskStatus, name="agent_task_status"), nullable=False)
+    status: Mapped[AgentTaskStatus] = mapped_column(
+        Enum(AgentTaskStatus, name="agent_task_status", values_callable=enum_values), nullable=False
+    )
     input_payload: Mapped[Optional[dict]] = mapped_column(JSONB)
     output_payload: Mapped[Optional[dict]] = mapped_column(JSONB)
     error_message: Mapped[Optional[str]] = mapped_column(Text)
@@ -40,11 +46,51 @@ class AgentTask(TimestampMixin, BaseModel):
     documents: Mapped[list["Document"]] = relationship(back_populates="generated_by")
 
 
+class AgentTaskClosure(Base):
+    """Ancestor/descendant pairs for the agent task tree, maintained by an ``AFTER INSERT`` trigger.
+
+    Every task has a depth-0 row pointing at itself plus one row per ancestor, so a whole subtree
+    is a single indexed lookup on ``ancestor_id``. ``analysis_run_id`` is copied from the descendant.
+    """
+
+    __tablename__ = "agent_task_closure"
+    __table_args__ = (
+        Index("ix_agent_task_closure_descendant_id", "descendant_id"),
+        Index("ix_agent_task_closure_analysis_run_id", "analysis_run_id"),
+    )
+
+    ancestor_id: Mapped[PyUUID] = mapped_column(
+        ForeignKey("agent_tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[PyUUID] = mapped_column(
+        ForeignKey("agent_tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+    analysis_run_id: Mapped[Optional[PyUUID]] = mapped_column(
+        ForeignKey("analysis_runs.id", ondelete="CASCADE"), nullable=True
+    )
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class AgentLog(BaseModel):
+    """Append-only agent log entry; the table is range-partitioned by month on ``created_at``."""
+
     __tablename__ = "agent_logs"
+    __table_args__ = (
+        Index("ix_agent_logs_agent_task_id_created_at", "agent_task_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     agent_task_id: Mapped[PyUUID] = mapped_column(ForeignKey("agent_tasks.id", ondelete="CASCADE"), nullable=False)
-    log_type: Mapped[AgentLogType] = mapped_column(Enum(AgentLogType, name="agent_log_type"), nullable=False)
+    log_type: Mapped[AgentLogType] = mapped_column(
+        Enum(AgentLogType, name="agent_log_type", values_callable=enum_values), nullable=False
+    )
     content: Mapped[dict | str] = mapped_column(JSONB)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, default=_utcnow, server_default=func.now()
+    )
 
     agent_task: Mapped["AgentTask"] = relationship(back_populates="logs")
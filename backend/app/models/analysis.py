@@ -7,11 +7,11 @@ from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID as PyUUID
 
-from sqlalchemy import DateTime, Enum, Float, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import DateTime, Enum, Float, ForeignKey, Index, Integer, Numeric, String, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.enums import AnalysisStatus, AnalysisType, ScenarioType
+from app.models.enums import AnalysisStatus, AnalysisType, ScenarioType, enum_values
 from app.models.mixins import BaseModel, TimestampMixin
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -23,6 +23,14 @@ if TYPE_CHECKING:  # pragma: no cover
 
 class AnalysisRun(TimestampMixin, BaseModel):
     __tablename__ = "analysis_runs"
+    __table_args__ = (
+        Index(
+            "ix_analysis_runs_profile_type_completed",
+            "investor_profile_id",
+            "analysis_type",
+            text("completed_at DESC"),
+        ),
+    )
 
     investor_profile_id: Mapped[Optional[PyUUID]] = mapped_column(
         ForeignKey("investor_profiles.id", ondelete="SET NULL"), nullable=True
@@ -30,11 +38,15 @@ class AnalysisRun(TimestampMixin, BaseModel):
     initiated_by_user_id: Mapped[Optional[PyUUID]] = mapped_column(
         ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
-    analysis_type: Mapped[AnalysisType] = mapped_column(Enum(AnalysisType, name="analysis_type"), nullable=False)
+    analysis_type: Mapped[AnalysisType] = mapped_column(
+        Enum(AnalysisType, name="analysis_type", values_callable=enum_values), nullable=False
+    )
     target_county_id: Mapped[Optional[PyUUID]] = mapped_column(
         ForeignKey("counties.id", ondelete="SET NULL"), nullable=True
     )
-    status: Mapped[AnalysisStatus] = mapped_column(Enum(AnalysisStatus, name="analysis_status"), nullable=False)
+    status: Mapped[AnalysisStatus] = mapped_column(
+        Enum(AnalysisStatus, name="analysis_status", values_callable=enum_values), nullable=False
+    )
     started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     error_message: Mapped[Optional[str]] = mapped_column(Text)
@@ -52,6 +64,7 @@ class AnalysisRun(TimestampMixin, BaseModel):
 
 class DealMetric(BaseModel):
     __tablename__ = "deal_metrics"
+    __table_args__ = (UniqueConstraint("analysis_run_id", "lien_id", name="uq_deal_metrics_run_lien"),)
 
     analysis_run_id: Mapped[PyUUID] = mapped_column(ForeignKey("analysis_runs.id", ondelete="CASCADE"), nullable=False)
     lien_id: Mapped[PyUUID] = mapped_column(ForeignKey("liens.id", ondelete="CASCADE"), nullable=False)
@@ -66,6 +79,7 @@ class DealMetric(BaseModel):
     irr_deed_scenario: Mapped[Optional[Decimal]] = mapped_column(Numeric(6, 3))
     expected_value_overall: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 2))
     liquidity_score: Mapped[Optional[Decimal]] = mapped_column(Numeric(6, 3))
+    input_fingerprint: Mapped[Optional[str]] = mapped_column(String(32))
 
     analysis_run: Mapped["AnalysisRun"] = relationship(back_populates="deal_metrics")
     lien: Mapped["Lien"] = relationship(back_populates="deal_metrics")
@@ -73,6 +87,7 @@ class DealMetric(BaseModel):
 
 class RiskAssessment(BaseModel):
     __tablename__ = "risk_assessments"
+    __table_args__ = (UniqueConstraint("analysis_run_id", "lien_id", name="uq_risk_assessments_run_lien"),)
 
     analysis_run_id: Mapped[PyUUID] = mapped_column(ForeignKey("analysis_runs.id", ondelete="CASCADE"), nullable=False)
     lien_id: Mapped[PyUUID] = mapped_column(ForeignKey("liens.id", ondelete="CASCADE"), nullable=False)
@@ -84,6 +99,7 @@ class RiskAssessment(BaseModel):
     legal_complexity_risk_score: Mapped[Optional[float]] = mapped_column(Float)
     overall_risk_score: Mapped[Optional[float]] = mapped_column(Float)
     risk_flags: Mapped[Optional[dict]] = mapped_column(JSONB)
+    input_fingerprint: Mapped[Optional[str]] = mapped_column(String(32))
 
     analysis_run: Mapped["AnalysisRun"] = relationship(back_populates="risk_assessments")
     lien: Mapped["Lien"] = relationship(back_populates="risk_assessments")
@@ -91,11 +107,14 @@ class RiskAssessment(BaseModel):
 
 class ScenarioAnalysis(BaseModel):
     __tablename__ = "scenario_analyses"
+    __table_args__ = (UniqueConstraint(
+            "analysis_run_id", "lien_id", "scenario_type", name="uq_scenario_analyses_run_lien_scenario"
+        ),)
 
     analysis_run_id: Mapped[PyUUID] = mapped_column(ForeignKey("analysis_runs.id", ondelete="CASCADE"), nullable=False)
     lien_id: Mapped[PyUUID] = mapped_column(ForeignKey("liens.id", ondelete="CASCADE"), nullable=False)
     scenario_type: Mapped[ScenarioType] = mapped_column(
-        Enum(ScenarioType, name="scenario_type"), nullable=False
+        Enum(ScenarioType, name="scenario_type", values_callable=enum_values), nullable=False
     )
     probability: Mapped[Optional[float]] = mapped_column(Float)
     projected_profit: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 2))
@@ -104,6 +123,7 @@ class ScenarioAnalysis(BaseModel):
     holding_period_months: Mapped[Optional[int]] = mapped_column(Integer)
     total_capital_required: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 2))
     notes: Mapped[Optional[str]] = mapped_column(Text)
+    input_fingerprint: Mapped[Optional[str]] = mapped_column(String(32))
 
     analysis_run: Mapped["AnalysisRun"] = relationship(back_populates="scenario_analyses")
     lien: Mapped["Lien"] = relationship(back_populates="scenario_analyses")
@@ -111,6 +131,12 @@ class ScenarioAnalysis(BaseModel):
 
 class DealScore(BaseModel):
     __tablename__ = "deal_scores"
+    __table_args__ = (
+        UniqueConstraint("analysis_run_id", "investor_profile_id", "lien_id", name="uq_deal_scores_run_profile_lien"),
+        Index(
+            "ix_deal_scores_run_profile_rank", "analysis_run_id", "investor_profile_id", "rank_within_run", "lien_id"
+        ),
+    )
 
     analysis_run_id: Mapped[PyUUID] = mapped_column(ForeignKey("analysis_runs.id", ondelete="CASCADE"), nullable=False)
     investor_profile_id: Mapped[PyUUID] = mapped_column(ForeignKey("investor_profiles.id", ondelete="CASCADE"), nullable=False)
@@ -121,6 +147,7 @@ class DealScore(BaseModel):
     liquidity_score: Mapped[Optional[float]] = mapped_column(Float)
     strategy_fit_score: Mapped[Optional[float]] = mapped_column(Float)
     rank_within_run: Mapped[Optional[int]] = mapped_column(Integer)
+    input_fingerprint: Mapped[Optional[str]] = mapped_column(String(32))
 
     analysis_run: Mapped["AnalysisRun"] = relationship(back_populates="deal_scores")
     investor_profile: Mapped["InvestorProfile"] = relationship(back_populates="deal_scores")
@@ -134,4 +134,12 @@ class NotificationType(str, Enum):
     GENERAL = "general"
     WORKFLOW = "workflow"
     PORTFOLIO = "portfolio"
-    ALERT = "alert"
\ No newline at end of file
+    ALERT = "alert"
+
+
+def enum_values(enum_cls: type[Enum]) -> list[str]:
+    """Labels to store for ``enum_cls``: the member values, as the migrations created the Postgres enums.
+
+    Passed as ``values_callable`` so columns bind ``"investor"`` rather than the member name ``"INVESTOR"``.
+    """
+    return [member.value for member in enum_cls]
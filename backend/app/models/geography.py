@@ -7,10 +7,10 @@ from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID as PyUUID
 
-from sqlalchemy import DateTime, Enum, Float, ForeignKey, Integer, Numeric, String
+from sqlalchemy import DateTime, Enum, Float, ForeignKey, Index, Integer, Numeric, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.enums import AuctionSaleType, CountyAuctionType, PropertyType
+from app.models.enums import AuctionSaleType, CountyAuctionType, PropertyType, enum_values
 from app.models.mixins import BaseModel, TimestampMixin
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -24,7 +24,7 @@ class County(TimestampMixin, BaseModel):
     state_code: Mapped[str] = mapped_column(String(2), nullable=False)
     county_name: Mapped[str] = mapped_column(String(255), nullable=False)
     auction_type: Mapped[CountyAuctionType] = mapped_column(
-        Enum(CountyAuctionType, name="county_auction_type"), nullable=False
+        Enum(CountyAuctionType, name="county_auction_type", values_callable=enum_values), nullable=False
     )
     timezone: Mapped[str] = mapped_column(String(64), nullable=False)
     data_source_url: Mapped[Optional[str]] = mapped_column(String(512))
@@ -46,7 +46,7 @@ class Property(BaseModel):
     lat: Mapped[Optional[float]] = mapped_column(Float)
     lng: Mapped[Optional[float]] = mapped_column(Float)
     property_type: Mapped[PropertyType] = mapped_column(
-        Enum(PropertyType, name="property_type"), nullable=False
+        Enum(PropertyType, name="property_type", values_callable=enum_values), nullable=False
     )
     land_sqft: Mapped[Optional[int]] = mapped_column(Integer)
     building_sqft: Mapped[Optional[int]] = mapped_column(Integer)
@@ -67,7 +67,7 @@ class Auction(TimestampMixin, BaseModel):
     auction_name: Mapped[str] = mapped_column(String(255), nullable=False)
     auction_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     auction_type: Mapped[AuctionSaleType] = mapped_column(
-        Enum(AuctionSaleType, name="auction_sale_type"), nullable=False
+        Enum(AuctionSaleType, name="auction_sale_type", values_callable=enum_values), nullable=False
     )
     source_url: Mapped[Optional[str]] = mapped_column(String(512))
     status: Mapped[str] = mapped_column(String(32), nullable=False)
@@ -78,6 +78,14 @@ class Auction(TimestampMixin, BaseModel):
 
 class PropertyValuation(BaseModel):
     __tablename__ = "property_valuations"
+    __table_args__ = (
+        Index(
+            "ix_property_valuations_property_latest",
+            "property_id",
+            text("valuation_date DESC"),
+            text("created_at DESC"),
+        ),
+    )
 
     property_id: Mapped[PyUUID] = mapped_column(ForeignKey("properties.id", ondelete="CASCADE"), nullable=False)
     valuation_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
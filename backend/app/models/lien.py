@@ -11,7 +11,7 @@ from sqlalchemy import DateTime, Enum, Float, ForeignKey, Integer, Numeric, Stri
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.enums import InterestType, LienStatus, LienType
+from app.models.enums import InterestType, LienStatus, LienType, enum_values
 from app.models.mixins import BaseModel, TimestampMixin
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -27,14 +27,20 @@ class Lien(TimestampMixin, BaseModel):
     property_id: Mapped[PyUUID] = mapped_column(ForeignKey("properties.id", ondelete="CASCADE"), nullable=False)
     auction_id: Mapped[Optional[PyUUID]] = mapped_column(ForeignKey("auctions.id", ondelete="SET NULL"))
     lien_certificate_number: Mapped[str] = mapped_column(String(128), nullable=False)
-    lien_type: Mapped[LienType] = mapped_column(Enum(LienType, name="lien_type"), nullable=False)
+    lien_type: Mapped[LienType] = mapped_column(
+        Enum(LienType, name="lien_type", values_callable=enum_values), nullable=False
+    )
     lien_principal_amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
     interest_rate_nominal: Mapped[Decimal] = mapped_column(Numeric(5, 2), nullable=False)
-    interest_type: Mapped[InterestType] = mapped_column(Enum(InterestType, name="interest_type"), nullable=False)
+    interest_type: Mapped[InterestType] = mapped_column(
+        Enum(InterestType, name="interest_type", values_callable=enum_values), nullable=False
+    )
     redemption_period_months: Mapped[int] = mapped_column(Integer, nullable=False)
     issue_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     redemption_deadline: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
-    status: Mapped[LienStatus] = mapped_column(Enum(LienStatus, name="lien_status"), nullable=False)
+    status: Mapped[LienStatus] = mapped_column(
+        Enum(LienStatus, name="lien_status", values_callable=enum_values), nullable=False
+    )
     current_holder: Mapped[Optional[str]] = mapped_column(String(255))
 
     property: Mapped["Property"] = relationship(back_populates="liens")
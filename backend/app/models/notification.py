@@ -6,11 +6,23 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID as PyUUID
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import (
+    Boolean,
+    Computed,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.enums import DocumentType, NotificationType
+from app.models.enums import DocumentType, NotificationType, enum_values
 from app.models.mixins import BaseModel, TimestampMixin
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -29,27 +41,64 @@ class Document(TimestampMixin, BaseModel):
     analysis_run_id: Mapped[Optional[PyUUID]] = mapped_column(ForeignKey("analysis_runs.id", ondelete="SET NULL"))
     lien_id: Mapped[Optional[PyUUID]] = mapped_column(ForeignKey("liens.id", ondelete="SET NULL"))
     document_type: Mapped[DocumentType] = mapped_column(
-        Enum(DocumentType, name="document_type"), nullable=False
+        Enum(DocumentType, name="document_type", values_callable=enum_values), nullable=False
     )
     storage_url: Mapped[str] = mapped_column(String(512), nullable=False)
     mime_type: Mapped[str] = mapped_column(String(120), nullable=False)
     generated_by_agent_task_id: Mapped[Optional[PyUUID]] = mapped_column(
         ForeignKey("agent_tasks.id", ondelete="SET NULL")
     )
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64))
+    ingested_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
     owner: Mapped["User"] = relationship(back_populates="documents")
     portfolio: Mapped[Optional["Portfolio"]] = relationship(back_populates="documents")
     analysis_run: Mapped[Optional["AnalysisRun"]] = relationship(back_populates="documents")
     lien: Mapped[Optional["Lien"]] = relationship(back_populates="documents")
     generated_by: Mapped[Optional["AgentTask"]] = relationship(back_populates="documents")
+    chunks: Mapped[list["DocumentChunk"]] = relationship(back_populates="document", passive_deletes=True)
+
+
+class DocumentChunk(BaseModel):
+    """Overlapping text window of a document; its embedding is stored once per distinct ``content_hash``."""
+
+    __tablename__ = "document_chunks"
+    __table_args__ = (
+        UniqueConstraint("document_id", "chunk_index", name="uq_document_chunks_document_chunk_index"),
+        Index("ix_document_chunks_content_hash", "content_hash"),
+        Index("ix_document_chunks_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    document_id: Mapped[PyUUID] = mapped_column(ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    location: Mapped[Optional[str]] = mapped_column(String(255))
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed("to_tsvector('english', content)", persisted=True)
+    )
+
+    document: Mapped["Document"] = relationship(back_populates="chunks")
 
 
 class Notification(BaseModel):
+    """Per-user notification; events sharing ``group_key`` collapse into one unread digest row."""
+
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index(
+            "uq_notifications_user_open_group",
+            "user_id",
+            "group_key",
+            unique=True,
+            postgresql_where=text("group_key IS NOT NULL AND NOT is_read"),
+        ),
+        Index("ix_notifications_user_unread", "user_id", "created_at", postgresql_where=text("NOT is_read")),
+    )
 
     user_id: Mapped[PyUUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     notification_type: Mapped[NotificationType] = mapped_column(
-        Enum(NotificationType, name="notification_type"), nullable=False
+        Enum(NotificationType, name="notification_type", values_callable=enum_values), nullable=False
     )
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     body: Mapped[str] = mapped_column(Text, nullable=False)
@@ -57,5 +106,7 @@ class Notification(BaseModel):
     is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default="CURRENT_TIMESTAMP")
     read_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    group_key: Mapped[Optional[str]] = mapped_column(String(160))
+    event_count: Mapped[int] = mapped_column(Integer, default=1, server_default="1", nullable=False)
 
     user: Mapped["User"] = relationship(back_populates="notifications")
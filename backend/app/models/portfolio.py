@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID as PyUUID
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Numeric, String
+from sqlalchemy import Boolean, Date, DateTime, Enum, ForeignKey, Index, Numeric, SmallInteger, String
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.enums import PortfolioHoldingStatus
+from app.db.base import Base
+from app.models.enums import PortfolioHoldingStatus, enum_values
 from app.models.mixins import BaseModel, TimestampMixin
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -36,13 +38,14 @@ class Portfolio(TimestampMixin, BaseModel):
 
 class PortfolioHolding(TimestampMixin, BaseModel):
     __tablename__ = "portfolio_holdings"
+    __table_args__ = (Index("ix_portfolio_holdings_updated_at", "updated_at"),)
 
     portfolio_id: Mapped[PyUUID] = mapped_column(ForeignKey("portfolios.id", ondelete="CASCADE"), nullable=False)
     lien_id: Mapped[PyUUID] = mapped_column(ForeignKey("liens.id", ondelete="CASCADE"), nullable=False)
     acquisition_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     acquisition_price: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 2))
     current_status: Mapped[PortfolioHoldingStatus] = mapped_column(
-        Enum(PortfolioHoldingStatus, name="portfolio_holding_status"), nullable=False
+        Enum(PortfolioHoldingStatus, name="portfolio_holding_status", values_callable=enum_values), nullable=False
     )
     redemption_amount_received: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 2))
     foreclosure_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
@@ -51,3 +54,37 @@ class PortfolioHolding(TimestampMixin, BaseModel):
 
     portfolio: Mapped["Portfolio"] = relationship(back_populates="holdings")
     lien: Mapped["Lien"] = relationship(back_populates="portfolio_holdings")
+
+
+class RedemptionObservation(Base):
+    """One closed holding as a survival observation: months held and whether it ended in redemption.
+
+    Rows are upserted from holdings changed since the newest ``observed_at``, so refits only re-derive
+    what changed. ``stratum`` encodes interest type, principal band and rate band.
+    """
+
+    __tablename__ = "redemption_observations"
+    __table_args__ = (Index("ix_redemption_observations_observed_at", "observed_at"),)
+
+    holding_id: Mapped[PyUUID] = mapped_column(
+        ForeignKey("portfolio_holdings.id", ondelete="CASCADE"), primary_key=True
+    )
+    county_id: Mapped[PyUUID] = mapped_column(PGUUID(as_uuid=True), nullable=False)
+    stratum: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    duration_months: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    redeemed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    observed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class RedemptionCashflowForecast(Base):
+    """Expected redemptions and cash per portfolio and calendar month, for one forecast date."""
+
+    __tablename__ = "redemption_cashflow_forecasts"
+
+    as_of: Mapped[date] = mapped_column(Date, primary_key=True)
+    portfolio_id: Mapped[PyUUID] = mapped_column(ForeignKey("portfolios.id", ondelete="CASCADE"), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    expected_redemptions: Mapped[Decimal] = mapped_column(Numeric(18, 4), nullable=False)
+    expected_cashflow: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
+    cashflow_lower: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
+    cashflow_upper: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
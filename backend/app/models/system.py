@@ -2,45 +2,57 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, TYPE_CHECKING
 from uuid import UUID as PyUUID
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import DateTime, Enum, ForeignKey, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.enums import IntegrationSource, IntegrationStatus
+from app.models.enums import IntegrationSource, IntegrationStatus, enum_values
 from app.models.mixins import BaseModel
 
 if TYPE_CHECKING:  # pragma: no cover
     from app.models.user import User
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class IntegrationEvent(BaseModel):
+    """Outbound integration call record; range-partitioned by month on ``started_at``."""
+
     __tablename__ = "integration_events"
+    __table_args__ = {"postgresql_partition_by": "RANGE (started_at)"}
 
     source_system: Mapped[IntegrationSource] = mapped_column(
-        Enum(IntegrationSource, name="integration_source"), nullable=False
+        Enum(IntegrationSource, name="integration_source", values_callable=enum_values), nullable=False
     )
     request_payload: Mapped[Optional[dict]] = mapped_column(JSONB)
     response_payload: Mapped[Optional[dict]] = mapped_column(JSONB)
     status: Mapped[IntegrationStatus] = mapped_column(
-        Enum(IntegrationStatus, name="integration_status"), nullable=False
+        Enum(IntegrationStatus, name="integration_status", values_callable=enum_values), nullable=False
     )
     error_message: Mapped[Optional[str]] = mapped_column(Text)
-    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, default=_utcnow)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
 
 class AuditLog(BaseModel):
+    """Audit trail entry; range-partitioned by month on ``created_at``."""
+
     __tablename__ = "audit_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     user_id: Mapped[Optional[PyUUID]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
     event_type: Mapped[str] = mapped_column(String(120), nullable=False)
     entity_type: Mapped[str] = mapped_column(String(120), nullable=False)
     entity_id: Mapped[str] = mapped_column(String(64), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default="CURRENT_TIMESTAMP")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, default=_utcnow, server_default=func.now()
+    )
 
     user: Mapped[Optional["User"]] = relationship(back_populates="audit_logs")
@@ -0,0 +1,86 @@
+"""Uploaded lead lists, their received parts and staged rows, and confirmed column mappings."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID as PyUUID
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, SmallInteger, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+from app.models.mixins import BaseModel, TimestampMixin
+
+
+class Upload(TimestampMixin, BaseModel):
+    """An uploaded CSV or XLSX lead list.
+
+    ``status`` is ``pending``, ``staging``, ``staged`` or ``failed``. Once staged, ``sheets`` lists each
+    sheet's ``name``, ``columns``, inferred column ``types`` and ``rows``. While staging, ``row_count``
+    counts the rows staged so far.
+
+    Chunked uploads declare ``size_bytes`` up front and arrive as ``part_count`` parts of ``part_size``
+    bytes (the last may be shorter). ``received_at`` is set once every part is in.
+    """
+
+    __tablename__ = "uploads"
+
+    owner_user_id: Mapped[Optional[PyUUID]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    mime_type: Mapped[Optional[str]] = mapped_column(String(255))
+    file_format: Mapped[str] = mapped_column(String(16), nullable=False)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64))
+    status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending")
+    row_count: Mapped[Optional[int]] = mapped_column(Integer)
+    sheets: Mapped[Optional[list]] = mapped_column(JSONB)
+    error: Mapped[Optional[str]] = mapped_column(Text)
+    staged_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    size_bytes: Mapped[Optional[int]] = mapped_column(BigInteger)
+    part_size: Mapped[Optional[int]] = mapped_column(Integer)
+    part_count: Mapped[Optional[int]] = mapped_column(Integer)
+    received_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    parts: Mapped[list["UploadPart"]] = relationship(back_populates="upload", passive_deletes=True)
+    rows: Mapped[list["UploadRow"]] = relationship(back_populates="upload", passive_deletes=True)
+
+
+class UploadPart(Base):
+    """A received part of a chunked upload, with the length and SHA-256 it was verified against."""
+
+    __tablename__ = "upload_parts"
+
+    upload_id: Mapped[PyUUID] = mapped_column(ForeignKey("uploads.id", ondelete="CASCADE"), primary_key=True)
+    part_number: Mapped[int] = mapped_column(Integer, primary_key=True)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    received_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    upload: Mapped[Upload] = relationship(back_populates="parts")
+
+
+class UploadRow(Base):
+    """One staged source row: its cells as a JSON array of text, in the sheet's column order."""
+
+    __tablename__ = "upload_rows"
+
+    upload_id: Mapped[PyUUID] = mapped_column(ForeignKey("uploads.id", ondelete="CASCADE"), primary_key=True)
+    sheet_index: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    row_number: Mapped[int] = mapped_column(Integer, primary_key=True)
+    cells: Mapped[list] = mapped_column(JSONB, nullable=False)
+
+    upload: Mapped[Upload] = relationship(back_populates="rows")
+
+
+class ColumnMapping(TimestampMixin, Base):
+    """A confirmed lead-field mapping for one header layout, keyed by the layout's fingerprint.
+
+    ``fields`` holds one lead field name (or ``None``) per column, in the order of ``headers``.
+    """
+
+    __tablename__ = "column_mappings"
+
+    fingerprint: Mapped[str] = mapped_column(String(64), primary_key=True)
+    headers: Mapped[list] = mapped_column(JSONB, nullable=False)
+    fields: Mapped[list] = mapped_column(JSONB, nullable=False)
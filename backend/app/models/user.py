@@ -11,7 +11,7 @@ from sqlalchemy import Boolean, Enum, ForeignKey, Integer, Numeric, String
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.enums import StrategyType, UserRole
+from app.models.enums import StrategyType, UserRole, enum_values
 from app.models.mixins import BaseModel, TimestampMixin
 
 if TYPE_CHECKING:  # pragma: no cover - imported for type checking only
@@ -26,7 +26,9 @@ class User(TimestampMixin, BaseModel):
 
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
-    role: Mapped[UserRole] = mapped_column(Enum(UserRole, name="user_role"), nullable=False)
+    role: Mapped[UserRole] = mapped_column(
+        Enum(UserRole, name="user_role", values_callable=enum_values), nullable=False
+    )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
     investor_profile: Mapped["InvestorProfile"] = relationship(back_populates="user", uselist=False)
@@ -45,7 +47,9 @@ class InvestorProfile(TimestampMixin, BaseModel):
     max_risk_score: Mapped[Optional[Decimal]] = mapped_column(Numeric(5, 2))
     preferred_states: Mapped[Optional[list[str]]] = mapped_column(ARRAY(String(2)))
     time_horizon_months: Mapped[Optional[int]] = mapped_column(Integer)
-    strategy_type: Mapped[StrategyType] = mapped_column(Enum(StrategyType, name="strategy_type"), nullable=False)
+    strategy_type: Mapped[StrategyType] = mapped_column(
+        Enum(StrategyType, name="strategy_type", values_callable=enum_values), nullable=False
+    )
 
     user: Mapped[User] = relationship(back_populates="investor_profile")
     portfolios: Mapped[list["Portfolio"]] = relationship(back_populates="investor_profile")
@@ -0,0 +1,15 @@
+"""Persistence helpers that sit between services and the ORM models."""
+
+from .analysis_results import AnalysisResultRepository
+from .document_search import DocumentSearchRepository
+from .event_log import EventLogRepository
+from .notifications import NotificationRepository
+from .reasoning_graph import ReasoningGraphRepository
+
+__all__ = [
+    "AnalysisResultRepository",
+    "DocumentSearchRepository",
+    "EventLogRepository",
+    "NotificationRepository",
+    "ReasoningGraphRepository",
+]
@@ -0,0 +1,214 @@
+"""Input fingerprints and copy-forward for incremental watchlist refresh runs.
+
+A lien's analysis depends on four things: its own terms and status, its property's latest valuation,
+its county's rules, and the analysis formulas. ``input_fingerprint`` hashes exactly those inputs in SQL:
+
+    md5(FINGERPRINT_VERSION | lien fields | latest valuation id | county updated_at | formula version)
+
+There is no versioned county-rules table, so ``counties.updated_at`` stands in for the rules version.
+Every output row (deal metrics, risk assessments, scenario analyses and deal scores) stores the
+fingerprint it was computed from.
+
+``plan`` fingerprints a new run's liens into a temporary table. A lien counts as unchanged when the
+previous run's ``deal_metrics`` row carries the same fingerprint. For unchanged liens, every output
+table is copied forward with one ``INSERT ... SELECT``; only the changed liens come back for
+re-analysis.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import DateTime, Select, Text, any_, bindparam, cast, column, func, literal, select, table, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.analysis import AnalysisRun, DealMetric
+from app.models.enums import AnalysisStatus, AnalysisType
+from app.models.geography import County, Property, PropertyValuation
+from app.models.lien import Lien
+from app.repositories.analysis_results import (
+    DEAL_METRICS,
+    DEAL_SCORES,
+    RISK_ASSESSMENTS,
+    SCENARIO_ANALYSES,
+    BulkTableSpec,
+)
+
+liens = Lien.__table__
+properties = Property.__table__
+counties = County.__table__
+valuations = PropertyValuation.__table__
+runs = AnalysisRun.__table__
+metrics = DealMetric.__table__
+
+# Bump when the inputs hashed below change, so every lien is re-analysed once.
+FINGERPRINT_VERSION = "1"
+OUTPUT_SPECS = (DEAL_METRICS, RISK_ASSESSMENTS, SCENARIO_ANALYSES, DEAL_SCORES)
+STAGING_TABLE = "_refresh_inputs"
+
+LATEST_VALUATION_ID = (
+    select(valuations.c.id)
+    .where(valuations.c.property_id == liens.c.property_id)
+    .order_by(valuations.c.valuation_date.desc(), valuations.c.created_at.desc(), valuations.c.id.desc())
+    .limit(1)
+    .scalar_subquery()
+)
+LIEN_INPUTS = (
+    liens.c.property_id,
+    liens.c.lien_type,
+    liens.c.lien_principal_amount,
+    liens.c.interest_rate_nominal,
+    liens.c.interest_type,
+    liens.c.redemption_period_months,
+    liens.c.issue_date,
+    liens.c.redemption_deadline,
+    liens.c.status,
+)
+LIEN_SOURCE = liens.join(properties, properties.c.id == liens.c.property_id).join(
+    counties, counties.c.id == properties.c.county_id
+)
+
+
+def _text(value: Any) -> Any:
+    # Epoch seconds keep timestamps independent of the session's TimeZone; NULL hashes as ''.
+    if isinstance(getattr(value, "type", None), DateTime):
+        value = func.extract("epoch", value)
+    return func.coalesce(cast(value, Text), "")
+
+
+def input_fingerprint(formula_version: str) -> Any:
+    parts = (
+        literal(FINGERPRINT_VERSION),
+        *LIEN_INPUTS,
+        LATEST_VALUATION_ID,
+        counties.c.updated_at,
+        bindparam("formula_version", formula_version, type_=Text),
+    )
+    return func.md5(func.concat_ws("|", *(_text(part) for part in parts)))
+
+
+def fingerprint_query(lien_ids: Sequence[UUID], formula_version: str) -> Select:
+    ids = bindparam("lien_ids", list(lien_ids), type_=ARRAY(PGUUID(as_uuid=True)))
+    return (
+        select(liens.c.id.label("lien_id"), input_fingerprint(formula_version).label("input_fingerprint"))
+        .select_from(LIEN_SOURCE)
+        .where(liens.c.id == any_(ids))
+    )
+
+
+def previous_run_query(run_id: UUID) -> Select:
+    """The latest completed watchlist refresh for the same investor profile as ``run_id``."""
+    current = runs.alias("current_run")
+    return (
+        select(runs.c.id)
+        .join(current, current.c.id == run_id)
+        .where(
+            runs.c.id != current.c.id,
+            runs.c.investor_profile_id.is_not_distinct_from(current.c.investor_profile_id),
+            runs.c.analysis_type == AnalysisType.WATCHLIST_REFRESH,
+            runs.c.status == AnalysisStatus.COMPLETED,
+        )
+        .order_by(runs.c.completed_at.desc().nulls_last())
+        .limit(1)
+    )
+
+
+staging = table(STAGING_TABLE, column("lien_id"), column("input_fingerprint"))
+
+CREATE_STAGING = (
+    f"CREATE TEMPORARY TABLE {STAGING_TABLE} "
+    "(lien_id uuid PRIMARY KEY, input_fingerprint text NOT NULL, unchanged bool NOT NULL DEFAULT false) "
+    "ON COMMIT DROP"
+)
+MARK_UNCHANGED = (
+    f"UPDATE {STAGING_TABLE} AS inputs SET unchanged = true FROM deal_metrics AS previous "
+    "WHERE previous.analysis_run_id = :previous_run_id AND previous.lien_id = inputs.lien_id "
+    "AND previous.input_fingerprint = inputs.input_fingerprint"
+)
+CHANGED_LIENS = f"SELECT lien_id, input_fingerprint FROM {STAGING_TABLE} WHERE NOT unchanged ORDER BY lien_id"
+RERANK_DEAL_SCORES = (
+    "UPDATE deal_scores AS scores SET rank_within_run = ranked.rank "
+    "FROM (SELECT id, row_number() OVER (PARTITION BY investor_profile_id "
+    "ORDER BY composite_score DESC NULLS LAST, lien_id) AS rank "
+    "FROM deal_scores WHERE analysis_run_id = :run_id) AS ranked "
+    "WHERE scores.id = ranked.id AND scores.rank_within_run IS DISTINCT FROM ranked.rank"
+)
+
+
+def build_copy_forward(spec: BulkTableSpec) -> str:
+    """Copy the previous run's rows for unchanged liens into the new run; existing rows win."""
+    names = list(spec.columns)
+    values = ", ".join("CAST(:run_id AS uuid)" if name == "analysis_run_id" else f"previous.{name}" for name in names)
+    return (
+        f"INSERT INTO {spec.table_name} ({', '.join(names)}) "
+        f"SELECT {values} FROM {spec.table_name} AS previous "
+        f"JOIN {STAGING_TABLE} AS inputs ON inputs.lien_id = previous.lien_id AND inputs.unchanged "
+        f"WHERE previous.analysis_run_id = :previous_run_id "
+        f"ON CONFLICT ({', '.join(spec.conflict_columns)}) DO NOTHING"
+    )
+
+
+@dataclass(frozen=True)
+class RefreshPlan:
+    run_id: UUID
+    previous_run_id: Optional[UUID]
+    liens: int
+    changed: Dict[UUID, str]
+    copied_forward: Dict[str, int] = field(default_factory=dict)
+
+
+class AnalysisRefreshRepository:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def previous_run(self, run_id: UUID) -> Optional[UUID]:
+        async with self._engine.connect() as connection:
+            return await connection.scalar(previous_run_query(run_id))
+
+    async def fingerprints(self, lien_ids: Sequence[UUID], formula_version: str) -> Dict[UUID, str]:
+        """Current input fingerprints, for stamping the outputs of any run."""
+        async with self._engine.connect() as connection:
+            result = await connection.execute(fingerprint_query(lien_ids, formula_version))
+            return {lien_id: fingerprint for lien_id, fingerprint in result}
+
+    async def plan(
+        self,
+        run_id: UUID,
+        previous_run_id: Optional[UUID],
+        lien_ids: Sequence[UUID],
+        formula_version: str,
+    ) -> RefreshPlan:
+        """Copy forward unchanged liens' outputs into ``run_id``; returns the changed liens' fingerprints."""
+        copied: Dict[str, int] = {}
+        async with self._engine.begin() as connection:
+            await connection.execute(text(CREATE_STAGING))
+            await connection.execute(
+                insert(staging).from_select(
+                    ["lien_id", "input_fingerprint"], fingerprint_query(lien_ids, formula_version)
+                )
+            )
+            if previous_run_id is not None:
+                await connection.execute(text(MARK_UNCHANGED), {"previous_run_id": previous_run_id})
+                for spec in OUTPUT_SPECS:
+                    result = await connection.execute(
+                        text(build_copy_forward(spec)), {"run_id": run_id, "previous_run_id": previous_run_id}
+                    )
+                    copied[spec.table_name] = result.rowcount
+            changed: List[Any] = (await connection.execute(text(CHANGED_LIENS))).all()
+        return RefreshPlan(
+            run_id=run_id,
+            previous_run_id=previous_run_id,
+            liens=len(set(lien_ids)),
+            changed={lien_id: fingerprint for lien_id, fingerprint in changed},
+            copied_forward=copied,
+        )
+
+    async def rerank_deal_scores(self, run_id: UUID) -> int:
+        """Renumber ``rank_within_run`` per investor profile once copied and fresh scores are all in."""
+        async with self._engine.begin() as connection:
+            result = await connection.execute(text(RERANK_DEAL_SCORES), {"run_id": run_id})
+            return result.rowcount
@@ -0,0 +1,202 @@
+"""Bulk persistence for analysis outputs (deal metrics, risk, scenarios, scores).
+
+Result sets arrive as columnar arrays (``{"lien_id": [...], "simple_yield": [...], ...}``) and are
+written set-based, one transaction per shard:
+
+* ``unnest`` (default): a single ``INSERT ... SELECT FROM unnest($1::uuid[], $2::float8[], ...)``
+  statement per shard, so a shard costs one round trip regardless of row count.
+* ``copy``: ``COPY`` the shard into a temporary staging table, then ``INSERT ... SELECT`` from it.
+  Fastest for very large shards.
+
+Both paths upsert on the table's natural key (``ON CONFLICT ... DO UPDATE``) and leave ``id`` to the
+database default, so re-running a stage for the same run and lien replaces the previous row.
+"""
+
+from __future__ import annotations
+
+import enum
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Sequence, Tuple, Type
+
+import orjson
+from sqlalchemy import Boolean, DateTime, Enum, Float, Integer, Numeric, String, Text, Uuid, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+from app.db.base import Base
+from app.models.analysis import DealMetric, DealScore, RiskAssessment, ScenarioAnalysis
+
+BULK_METHODS = ("unnest", "copy")
+
+
+def _transport_type(column_type: Any) -> str:
+    """Array element type used on the wire; the SELECT casts back to the real column type."""
+    if isinstance(column_type, Uuid):
+        return "uuid"
+    if isinstance(column_type, (Float, Numeric)):
+        return "float8"
+    if isinstance(column_type, Integer):
+        return "int8"
+    if isinstance(column_type, DateTime):
+        return "timestamptz"
+    if isinstance(column_type, Boolean):
+        return "bool"
+    if isinstance(column_type, (JSONB, Enum, String, Text)):
+        return "text"
+    raise TypeError(f"Unsupported column type for bulk writes: {column_type!r}")
+
+
+@dataclass(frozen=True)
+class BulkColumn:
+    name: str
+    sql_type: str
+    transport_type: str
+    is_json: bool
+
+
+@dataclass(frozen=True)
+class BulkTableSpec:
+    """Column metadata and conflict target for one result table."""
+
+    table_name: str
+    columns: Dict[str, BulkColumn]
+    conflict_columns: Tuple[str, ...]
+
+    @classmethod
+    def from_model(cls, model: Type[Base], conflict_columns: Sequence[str]) -> "BulkTableSpec":
+        dialect = postgresql.dialect()
+        columns = {
+            column.name: BulkColumn(
+                name=column.name,
+                sql_type=column.type.compile(dialect=dialect),
+                transport_type=_transport_type(column.type),
+                is_json=isinstance(column.type, JSONB),
+            )
+            for column in model.__table__.columns
+            if column.name != "id"
+        }
+        return cls(table_name=model.__tablename__, columns=columns, conflict_columns=tuple(conflict_columns))
+
+
+DEAL_METRICS = BulkTableSpec.from_model(DealMetric, ("analysis_run_id", "lien_id"))
+RISK_ASSESSMENTS = BulkTableSpec.from_model(RiskAssessment, ("analysis_run_id", "lien_id"))
+SCENARIO_ANALYSES = BulkTableSpec.from_model(ScenarioAnalysis, ("analysis_run_id", "lien_id", "scenario_type"))
+DEAL_SCORES = BulkTableSpec.from_model(DealScore, ("analysis_run_id", "investor_profile_id", "lien_id"))
+
+
+def _to_list(values: Any) -> List[Any]:
+    # NumPy arrays convert to native Python scalars in one C-level pass.
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def _encode_column(column: BulkColumn, values: List[Any]) -> List[Any]:
+    if column.is_json:
+        return [None if value is None else orjson.dumps(value).decode("utf-8") for value in values]
+    if column.transport_type == "text":
+        return [value.value if isinstance(value, enum.Enum) else value for value in values]
+    return values
+
+
+def prepare_columns(spec: BulkTableSpec, columns: Mapping[str, Any]) -> Tuple[List[str], List[List[Any]], int]:
+    """Validate a columnar payload and encode it into transport-ready lists."""
+    unknown = set(columns) - set(spec.columns)
+    if unknown:
+        raise ValueError(f"Unknown columns for {spec.table_name}: {sorted(unknown)}")
+    missing_keys = [name for name in spec.conflict_columns if name not in columns]
+    if missing_keys:
+        raise ValueError(f"Missing key columns for {spec.table_name}: {missing_keys}")
+
+    names = list(columns)
+    encoded = [_encode_column(spec.columns[name], _to_list(columns[name])) for name in names]
+    lengths = {len(values) for values in encoded}
+    if len(lengths) > 1:
+        raise ValueError(f"Column arrays for {spec.table_name} have mismatched lengths: {sorted(lengths)}")
+    return names, encoded, lengths.pop() if lengths else 0
+
+
+def _upsert_tail(spec: BulkTableSpec, names: Sequence[str]) -> str:
+    updates = [name for name in names if name not in spec.conflict_columns]
+    conflict = ", ".join(spec.conflict_columns)
+    if not updates:
+        return f"ON CONFLICT ({conflict}) DO NOTHING"
+    assignments = ", ".join(f"{name} = EXCLUDED.{name}" for name in updates)
+    return f"ON CONFLICT ({conflict}) DO UPDATE SET {assignments}"
+
+
+def build_unnest_upsert(spec: BulkTableSpec, names: Sequence[str]) -> str:
+    columns = [spec.columns[name] for name in names]
+    arrays = ", ".join(f"CAST(:{column.name} AS {column.transport_type}[])" for column in columns)
+    casts = ", ".join(f"CAST(u.{column.name} AS {column.sql_type})" for column in columns)
+    return (
+        f"INSERT INTO {spec.table_name} ({', '.join(names)}) "
+        f"SELECT {casts} FROM unnest({arrays}) AS u({', '.join(names)}) "
+        f"{_upsert_tail(spec, names)}"
+    )
+
+
+def build_staging_upsert(spec: BulkTableSpec, names: Sequence[str], staging_table: str) -> Tuple[str, str]:
+    columns = [spec.columns[name] for name in names]
+    create = (
+        f"CREATE TEMPORARY TABLE {staging_table} "
+        f"({', '.join(f'{column.name} {column.transport_type}' for column in columns)}) ON COMMIT DROP"
+    )
+    casts = ", ".join(f"CAST({column.name} AS {column.sql_type})" for column in columns)
+    insert = (
+        f"INSERT INTO {spec.table_name} ({', '.join(names)}) "
+        f"SELECT {casts} FROM {staging_table} "
+        f"{_upsert_tail(spec, names)}"
+    )
+    return create, insert
+
+
+class AnalysisResultRepository:
+    """Set-based writer for per-lien analysis output tables."""
+
+    def __init__(self, engine: AsyncEngine, *, shard_size: int | None = None, method: str = "unnest") -> None:
+        if method not in BULK_METHODS:
+            raise ValueError(f"method must be one of {BULK_METHODS}.")
+        self._engine = engine
+        self._shard_size = shard_size or settings.ANALYSIS_BULK_SHARD_SIZE
+        self._method = method
+
+    async def upsert_deal_metrics(self, columns: Mapping[str, Any]) -> int:
+        return await self.upsert(DEAL_METRICS, columns)
+
+    async def upsert_risk_assessments(self, columns: Mapping[str, Any]) -> int:
+        return await self.upsert(RISK_ASSESSMENTS, columns)
+
+    async def upsert_scenario_analyses(self, columns: Mapping[str, Any]) -> int:
+        return await self.upsert(SCENARIO_ANALYSES, columns)
+
+    async def upsert_deal_scores(self, columns: Mapping[str, Any]) -> int:
+        return await self.upsert(DEAL_SCORES, columns)
+
+    async def upsert(self, spec: BulkTableSpec, columns: Mapping[str, Any]) -> int:
+        """Write ``columns`` into ``spec``'s table, committing each shard separately. Returns rows written.
+
+        Key tuples must be unique within one payload; Postgres rejects an upsert that touches the same
+        row twice in a single statement.
+        """
+        names, encoded, row_count = prepare_columns(spec, columns)
+        for start in range(0, row_count, self._shard_size):
+            shard = [values[start : start + self._shard_size] for values in encoded]
+            async with self._engine.begin() as connection:
+                if self._method == "copy":
+                    await self._copy_shard(connection, spec, names, shard)
+                else:
+                    await connection.execute(text(build_unnest_upsert(spec, names)), dict(zip(names, shard)))
+        return row_count
+
+    async def _copy_shard(
+        self, connection: AsyncConnection, spec: BulkTableSpec, names: List[str], shard: List[List[Any]]
+    ) -> None:
+        staging_table = f"_bulk_{spec.table_name}"
+        create, insert = build_staging_upsert(spec, names, staging_table)
+        await connection.execute(text(create))
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging_table, records=zip(*shard), columns=names
+        )
+        await connection.execute(text(insert))
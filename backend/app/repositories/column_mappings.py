@@ -0,0 +1,37 @@
+"""Confirmed lead-field mappings of upload header layouts, keyed by header fingerprint."""
+
+from __future__ import annotations
+
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.upload import ColumnMapping
+
+column_mappings = ColumnMapping.__table__
+
+
+def save_mapping_statement(fingerprint: str, headers: Sequence[str], fields: Sequence[Optional[str]]) -> Any:
+    """Upsert: confirming a layout again replaces its mapping."""
+    statement = insert(column_mappings).values(fingerprint=fingerprint, headers=list(headers), fields=list(fields))
+    return statement.on_conflict_do_update(
+        index_elements=[column_mappings.c.fingerprint],
+        set_={"headers": statement.excluded.headers, "fields": statement.excluded.fields, "updated_at": func.now()},
+    )
+
+
+class ColumnMappingRepository:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def get(self, fingerprint: str) -> Optional[List[Optional[str]]]:
+        async with self._engine.connect() as connection:
+            return await connection.scalar(
+                select(column_mappings.c.fields).where(column_mappings.c.fingerprint == fingerprint)
+            )
+
+    async def save(self, fingerprint: str, headers: Sequence[str], fields: Sequence[Optional[str]]) -> None:
+        async with self._engine.begin() as connection:
+            await connection.execute(save_mapping_statement(fingerprint, headers, fields))
@@ -0,0 +1,98 @@
+"""Ranked-deal export rows: deal scores joined with their lien, property and deal metrics.
+
+Rows are read through a server-side cursor in ``(investor_profile_id, rank_within_run, lien_id)``
+order, which ``ix_deal_scores_run_profile_rank`` serves without a sort. Only one fetch of rows is
+held at a time, whatever the size of the run.
+"""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, and_, exists, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.analysis import AnalysisRun, DealMetric, DealScore
+from app.models.geography import Property
+from app.models.lien import Lien
+
+scores = DealScore.__table__
+metrics = DealMetric.__table__
+liens = Lien.__table__
+properties = Property.__table__
+runs = AnalysisRun.__table__
+
+# Output columns in export order; deal-metric columns that clash with score columns get a prefix.
+EXPORT_COLUMNS = (
+    scores.c.investor_profile_id,
+    scores.c.rank_within_run,
+    scores.c.composite_score,
+    scores.c.yield_score,
+    scores.c.risk_adjusted_return_score,
+    scores.c.liquidity_score,
+    scores.c.strategy_fit_score,
+    scores.c.lien_id,
+    liens.c.lien_certificate_number,
+    liens.c.lien_type,
+    liens.c.lien_principal_amount,
+    liens.c.interest_rate_nominal,
+    liens.c.interest_type,
+    liens.c.redemption_deadline,
+    liens.c.status.label("lien_status"),
+    properties.c.apn,
+    properties.c.street_address,
+    properties.c.city,
+    properties.c.state,
+    properties.c.zip_code,
+    properties.c.property_type,
+    properties.c.building_sqft,
+    properties.c.year_built,
+    metrics.c.lien_to_value_ratio,
+    metrics.c.estimated_redemption_hold_months,
+    metrics.c.simple_yield,
+    metrics.c.annualized_yield,
+    metrics.c.cash_on_cash_return,
+    metrics.c.irr_redemption_scenario,
+    metrics.c.irr_deed_scenario,
+    metrics.c.expected_value_overall,
+    metrics.c.liquidity_score.label("metric_liquidity_score"),
+)
+EXPORT_SOURCE = (
+    scores.join(liens, liens.c.id == scores.c.lien_id)
+    .join(properties, properties.c.id == liens.c.property_id)
+    .outerjoin(
+        metrics,
+        and_(metrics.c.analysis_run_id == scores.c.analysis_run_id, metrics.c.lien_id == scores.c.lien_id),
+    )
+)
+
+
+def export_column_names() -> List[str]:
+    return [column.name for column in EXPORT_COLUMNS]
+
+
+def ranked_deals_query(run_id: UUID, investor_profile_id: Optional[UUID] = None) -> Select:
+    query = select(*EXPORT_COLUMNS).select_from(EXPORT_SOURCE).where(scores.c.analysis_run_id == run_id)
+    if investor_profile_id is not None:
+        query = query.where(scores.c.investor_profile_id == investor_profile_id)
+    return query.order_by(scores.c.investor_profile_id, scores.c.rank_within_run, scores.c.lien_id)
+
+
+class DealExportRepository:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def run_exists(self, run_id: UUID) -> bool:
+        async with self._engine.connect() as connection:
+            return bool(await connection.scalar(select(exists().where(runs.c.id == run_id))))
+
+    async def iter_ranked_deals(
+        self, run_id: UUID, chunk_size: int, investor_profile_id: Optional[UUID] = None
+    ) -> AsyncIterator[Sequence[Any]]:
+        """Export rows in ``EXPORT_COLUMNS`` order, ``chunk_size`` at a time from a server-side cursor."""
+        query = ranked_deals_query(run_id, investor_profile_id).execution_options(yield_per=chunk_size)
+        async with self._engine.connect() as connection:
+            result = await connection.stream(query)
+            async for rows in result.partitions(chunk_size):
+                yield rows
@@ -0,0 +1,114 @@
+"""Persistence for corpus ingestion: document chunks and their content-addressed embeddings.
+
+Chunk embeddings live in ``embeddings`` with ``entity_type='document_chunk'`` and ``entity_id`` set to
+the chunk's SHA-256, so identical text is embedded once no matter how many documents contain it.
+All writes are set-based ``unnest`` statements (see ``analysis_results``).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional, Sequence, Set
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.services.document_text import TextChunk
+
+CHUNK_ENTITY_TYPE = "document_chunk"
+
+_SELECT_DOCUMENT_HASH = text("SELECT content_hash FROM documents WHERE id = :document_id")
+
+_SELECT_EXISTING_EMBEDDINGS = text(
+    "SELECT entity_id FROM embeddings "
+    "WHERE entity_type = :entity_type AND model_name = :model_name AND entity_id = ANY(CAST(:hashes AS text[]))"
+)
+
+_INSERT_EMBEDDINGS = text(
+    "INSERT INTO embeddings (entity_type, entity_id, embedding_vector, model_name) "
+    "SELECT :entity_type, u.entity_id, CAST(u.embedding_vector AS vector), :model_name "
+    "FROM unnest(CAST(:hashes AS text[]), CAST(:vectors AS text[])) AS u(entity_id, embedding_vector) "
+    "ON CONFLICT (entity_type, entity_id, model_name) DO NOTHING"
+)
+
+_UPSERT_CHUNKS = text(
+    "INSERT INTO document_chunks (document_id, chunk_index, content_hash, content, location) "
+    "SELECT :document_id, u.chunk_index, u.content_hash, u.content, u.location "
+    "FROM unnest(CAST(:chunk_indexes AS int4[]), CAST(:content_hashes AS text[]), "
+    "CAST(:contents AS text[]), CAST(:locations AS text[])) AS u(chunk_index, content_hash, content, location) "
+    "ON CONFLICT (document_id, chunk_index) DO UPDATE SET "
+    "content_hash = EXCLUDED.content_hash, content = EXCLUDED.content, location = EXCLUDED.location "
+    "WHERE document_chunks.content_hash IS DISTINCT FROM EXCLUDED.content_hash"
+)
+
+_DELETE_STALE_CHUNKS = text("DELETE FROM document_chunks WHERE document_id = :document_id AND chunk_index >= :count")
+
+_MARK_DOCUMENT_INGESTED = text(
+    "UPDATE documents SET content_hash = :content_hash, ingested_at = :ingested_at WHERE id = :document_id"
+)
+
+
+def vector_literal(vector: Iterable[float]) -> str:
+    """pgvector's text input format; NumPy arrays go through ``tolist`` in one C-level pass."""
+    values = vector.tolist() if hasattr(vector, "tolist") else vector
+    return "[" + ",".join(repr(float(value)) for value in values) + "]"
+
+
+class DocumentCorpusRepository:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def get_document_hash(self, document_id: UUID) -> Optional[str]:
+        """Source hash recorded by the last ingestion; raises ``LookupError`` for unknown documents."""
+        async with self._engine.connect() as connection:
+            result = await connection.execute(_SELECT_DOCUMENT_HASH, {"document_id": document_id})
+            row = result.first()
+        if row is None:
+            raise LookupError(f"Document {document_id} not found.")
+        return row[0]
+
+    async def existing_embedding_hashes(self, hashes: Sequence[str], model_name: str) -> Set[str]:
+        if not hashes:
+            return set()
+        async with self._engine.connect() as connection:
+            result = await connection.execute(
+                _SELECT_EXISTING_EMBEDDINGS,
+                {"entity_type": CHUNK_ENTITY_TYPE, "model_name": model_name, "hashes": list(hashes)},
+            )
+            return {row[0] for row in result}
+
+    async def insert_embeddings(self, hashes: Sequence[str], vectors: Sequence[Any], model_name: str) -> int:
+        if not hashes:
+            return 0
+        async with self._engine.begin() as connection:
+            await connection.execute(
+                _INSERT_EMBEDDINGS,
+                {
+                    "entity_type": CHUNK_ENTITY_TYPE,
+                    "model_name": model_name,
+                    "hashes": list(hashes),
+                    "vectors": [vector_literal(vector) for vector in vectors],
+                },
+            )
+        return len(hashes)
+
+    async def replace_chunks(self, document_id: UUID, chunks: List[TextChunk], source_hash: str) -> None:
+        """Make the document's chunk rows match ``chunks`` and record the source hash, atomically."""
+        async with self._engine.begin() as connection:
+            if chunks:
+                await connection.execute(
+                    _UPSERT_CHUNKS,
+                    {
+                        "document_id": document_id,
+                        "chunk_indexes": [chunk.index for chunk in chunks],
+                        "content_hashes": [chunk.content_hash for chunk in chunks],
+                        "contents": [chunk.content for chunk in chunks],
+                        "locations": [chunk.location[:255] for chunk in chunks],
+                    },
+                )
+            await connection.execute(_DELETE_STALE_CHUNKS, {"document_id": document_id, "count": len(chunks)})
+            await connection.execute(
+                _MARK_DOCUMENT_INGESTED,
+                {"document_id": document_id, "content_hash": source_hash, "ingested_at": datetime.now(timezone.utc)},
+            )
@@ -0,0 +1,90 @@
+"""Candidate queries for hybrid corpus retrieval.
+
+Two independent candidate lists are produced per query and fused in ``app.services.hybrid_retrieval``:
+
+* lexical: ``websearch_to_tsquery`` against the GIN-indexed ``document_chunks.search_vector``, ranked
+  with ``ts_rank_cd``; catches exact tokens such as parcel IDs, certificate numbers and citations.
+* vector: cosine distance over the partial HNSW index on chunk embeddings, joined back to every
+  chunk carrying that content hash. ``hnsw.ef_search`` is raised per transaction so the ANN scan
+  returns enough candidates for fusion.
+
+Both return ``(chunk_id, score)`` pairs best-first; chunk text is fetched once for the fused winners.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.repositories.document_corpus import CHUNK_ENTITY_TYPE, vector_literal
+
+_LEXICAL_CANDIDATES = text(
+    "SELECT c.id, ts_rank_cd(c.search_vector, q.query) AS score "
+    "FROM document_chunks AS c, websearch_to_tsquery('english', :query) AS q(query) "
+    "WHERE c.search_vector @@ q.query "
+    "ORDER BY score DESC, c.id "
+    "LIMIT :limit"
+)
+
+# The entity_type predicate is a literal so the planner can match the partial HNSW index.
+_VECTOR_CANDIDATES = text(
+    "WITH nearest AS ("
+    "  SELECT e.entity_id, e.embedding_vector <=> CAST(:vector AS vector) AS distance "
+    "  FROM embeddings AS e "
+    f"  WHERE e.entity_type = '{CHUNK_ENTITY_TYPE}' AND e.model_name = :model_name "
+    "  ORDER BY e.embedding_vector <=> CAST(:vector AS vector) "
+    "  LIMIT :limit"
+    ") "
+    "SELECT c.id, n.distance FROM nearest AS n JOIN document_chunks AS c ON c.content_hash = n.entity_id "
+    "ORDER BY n.distance, c.id "
+    "LIMIT :limit"
+)
+
+_SELECT_CHUNKS = text(
+    "SELECT c.id, c.document_id, c.chunk_index, c.content, c.location "
+    "FROM document_chunks AS c WHERE c.id = ANY(CAST(:chunk_ids AS uuid[]))"
+)
+
+
+@dataclass(frozen=True)
+class ChunkRecord:
+    chunk_id: UUID
+    document_id: UUID
+    chunk_index: int
+    content: str
+    location: Optional[str]
+
+
+class DocumentSearchRepository:
+    def __init__(self, engine: AsyncEngine, *, ef_search: int | None = None) -> None:
+        self._engine = engine
+        self._ef_search = settings.RETRIEVAL_HNSW_EF_SEARCH if ef_search is None else ef_search
+
+    async def lexical_candidates(self, query: str, limit: int) -> List[Tuple[UUID, float]]:
+        async with self._engine.connect() as connection:
+            result = await connection.execute(_LEXICAL_CANDIDATES, {"query": query, "limit": limit})
+            return [(row[0], float(row[1])) for row in result]
+
+    async def vector_candidates(self, vector: Sequence[float], model_name: str, limit: int) -> List[Tuple[UUID, float]]:
+        """Nearest chunks by cosine distance (lower is closer)."""
+        async with self._engine.begin() as connection:
+            if self._ef_search:
+                # SET LOCAL takes no bind parameters; the value is an int from settings.
+                await connection.execute(text(f"SET LOCAL hnsw.ef_search = {max(int(self._ef_search), limit)}"))
+            result = await connection.execute(
+                _VECTOR_CANDIDATES,
+                {"vector": vector_literal(vector), "model_name": model_name, "limit": limit},
+            )
+            return [(row[0], float(row[1])) for row in result]
+
+    async def fetch_chunks(self, chunk_ids: Sequence[UUID]) -> Dict[UUID, ChunkRecord]:
+        if not chunk_ids:
+            return {}
+        async with self._engine.connect() as connection:
+            result = await connection.execute(_SELECT_CHUNKS, {"chunk_ids": list(chunk_ids)})
+            return {row[0]: ChunkRecord(*row) for row in result}
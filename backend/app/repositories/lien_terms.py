@@ -0,0 +1,43 @@
+"""Reads of the lien columns that drive interest accrual, as ``LienTerms`` arrays."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lien import Lien
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.lien_accrual import LienTerms
+
+liens = Lien.__table__
+
+TERM_COLUMNS = (
+    liens.c.id,
+    liens.c.lien_principal_amount,
+    liens.c.interest_rate_nominal,
+    liens.c.interest_type,
+    liens.c.issue_date,
+)
+
+
+def lien_terms_query(lien_ids: Sequence[UUID]) -> Select:
+    ids = bindparam("lien_ids", list(lien_ids), type_=ARRAY(PGUUID(as_uuid=True)))
+    return select(*TERM_COLUMNS).where(liens.c.id == any_(ids))
+
+
+class LienTermsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def load(self, lien_ids: Sequence[UUID]) -> "LienTerms":
+        """Terms for the liens that exist, in database order; ``LienTerms.lien_ids`` says which ones."""
+        from app.services.lien_accrual import LienTerms  # NumPy stays out of API start-up
+
+        rows = (await self._session.execute(lien_terms_query(lien_ids))).all()
+        return LienTerms.from_liens(rows)
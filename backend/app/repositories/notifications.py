@@ -0,0 +1,251 @@
+"""Set-based notification writes: audience fan-out, digest collapse, bulk mark-read, digest reads.
+
+Fan-out never materialises recipients in Python. Each batch is one statement:
+
+    WITH audience AS (SELECT users.id ... WHERE <filters> AND users.id > :after ORDER BY users.id LIMIT :n),
+         written AS (INSERT INTO notifications ... SELECT ... FROM audience
+                     ON CONFLICT (user_id, group_key) WHERE group_key IS NOT NULL AND NOT is_read
+                     DO UPDATE SET event_count = notifications.event_count + 1, ...
+                     RETURNING user_id, xmax = 0)
+    SELECT <audience size>, <rows inserted>, <rows written>, <last user id>
+
+A user who already has an unread row for the event's group gets that row updated (count, latest
+title/body, appended event payload) instead of a new row, so bursts collapse into one digest entry.
+Batches are keyset-paginated on ``users.id`` and committed separately to keep transactions short.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, and_, any_, bindparam, exists, func, literal, literal_column, not_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, aggregate_order_by, insert
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.enums import NotificationType, StrategyType, UserRole
+from app.models.notification import Notification
+from app.models.portfolio import Portfolio, PortfolioHolding
+from app.models.user import InvestorProfile, User
+
+users = User.__table__
+profiles = InvestorProfile.__table__
+portfolios = Portfolio.__table__
+holdings = PortfolioHolding.__table__
+notifications = Notification.__table__
+
+UUID_ARRAY = ARRAY(PGUUID(as_uuid=True))
+OPEN_GROUP_PREDICATE = and_(notifications.c.group_key.isnot(None), not_(notifications.c.is_read))
+
+
+@dataclass(frozen=True)
+class Audience:
+    """Recipient filter; every set field narrows the audience. Only active users are included."""
+
+    user_ids: Optional[Sequence[UUID]] = None
+    roles: Sequence[UserRole] = (UserRole.INVESTOR,)
+    strategy_types: Optional[Sequence[StrategyType]] = None
+    states: Optional[Sequence[str]] = None
+    lien_ids: Optional[Sequence[UUID]] = None
+
+
+@dataclass(frozen=True)
+class FanoutBatch:
+    recipients: int
+    inserted: int
+    written: int
+    last_user_id: Optional[UUID]
+
+
+@dataclass(frozen=True)
+class UserDigest:
+    user_id: UUID
+    notification_count: int
+    event_count: int
+    items: List[Dict[str, Any]]
+
+
+def audience_query(audience: Audience) -> Select:
+    query = select(users.c.id.label("user_id")).where(users.c.is_active)
+    if audience.roles:
+        query = query.where(users.c.role.in_(list(audience.roles)))
+    if audience.user_ids is not None:
+        # One array parameter instead of an expanding IN, which would hit the bind-parameter limit.
+        user_ids = bindparam("audience_user_ids", list(audience.user_ids), type_=UUID_ARRAY)
+        query = query.where(users.c.id == any_(user_ids))
+    if audience.strategy_types or audience.states:
+        profile = exists().where(profiles.c.user_id == users.c.id)
+        if audience.strategy_types:
+            profile = profile.where(profiles.c.strategy_type.in_(list(audience.strategy_types)))
+        if audience.states:
+            state_type = ARRAY(profiles.c.preferred_states.type.item_type)
+            states = bindparam("audience_states", [state.upper() for state in audience.states], type_=state_type)
+            profile = profile.where(profiles.c.preferred_states.overlap(states))
+        query = query.where(profile)
+    if audience.lien_ids:
+        lien_ids = bindparam("audience_lien_ids", list(audience.lien_ids), type_=UUID_ARRAY)
+        query = query.where(
+            exists().where(
+                profiles.c.user_id == users.c.id,
+                portfolios.c.investor_profile_id == profiles.c.id,
+                holdings.c.portfolio_id == portfolios.c.id,
+                holdings.c.lien_id == any_(lien_ids),
+            )
+        )
+    return query
+
+
+def _merged_events(max_events: int) -> Any:
+    # Append the new event's payload until the digest holds ``max_events``; the count keeps growing.
+    existing = "coalesce(notifications.metadata -> 'events', '[]'::jsonb)"
+    return literal_column(
+        f"jsonb_set(coalesce(notifications.metadata, '{{}}'::jsonb), '{{events}}', "
+        f"CASE WHEN jsonb_array_length({existing}) >= {int(max_events)} THEN {existing} "
+        f"ELSE {existing} || coalesce(excluded.metadata -> 'events', '[]'::jsonb) END)"
+    )
+
+
+def fan_out_statement(
+    audience: Audience,
+    *,
+    notification_type: NotificationType,
+    title: str,
+    body: str,
+    metadata: Dict[str, Any],
+    group_key: Optional[str],
+    after: Optional[UUID],
+    batch_size: int,
+    max_events: int,
+) -> Select:
+    page = audience_query(audience)
+    if after is not None:
+        page = page.where(users.c.id > bindparam("after_user_id", after, type_=PGUUID(as_uuid=True)))
+    recipients = page.order_by(users.c.id).limit(batch_size).cte("audience")
+
+    source = select(
+        recipients.c.user_id,
+        literal(notification_type, notifications.c.notification_type.type),
+        literal(title, notifications.c.title.type),
+        literal(body, notifications.c.body.type),
+        literal(metadata, JSONB),
+        literal(group_key, notifications.c.group_key.type),
+    )
+    statement = insert(notifications).from_select(
+        ["user_id", "notification_type", "title", "body", "metadata", "group_key"], source, include_defaults=False
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[notifications.c.user_id, notifications.c.group_key],
+        index_where=OPEN_GROUP_PREDICATE,
+        set_={
+            "event_count": notifications.c.event_count + 1,
+            "title": statement.excluded.title,
+            "body": statement.excluded.body,
+            "notification_type": statement.excluded.notification_type,
+            "metadata": _merged_events(max_events),
+            "created_at": func.now(),
+        },
+    )
+    written = statement.returning(
+        notifications.c.user_id, literal_column("(xmax = 0)").label("inserted")
+    ).cte("written")
+
+    return select(
+        select(func.count()).select_from(recipients).scalar_subquery().label("recipients"),
+        select(func.count()).select_from(written).where(written.c.inserted).scalar_subquery().label("inserted"),
+        select(func.count()).select_from(written).scalar_subquery().label("written"),
+        select(recipients.c.user_id).order_by(recipients.c.user_id.desc()).limit(1).scalar_subquery().label("last"),
+    )
+
+
+def mark_read_statement(
+    *,
+    user_id: Optional[UUID] = None,
+    notification_ids: Optional[Sequence[UUID]] = None,
+    group_key: Optional[str] = None,
+    before: Optional[datetime] = None,
+):
+    if user_id is None and not notification_ids:
+        raise ValueError("Mark-read needs a user_id or notification ids.")
+    statement = update(notifications).where(not_(notifications.c.is_read))
+    if user_id is not None:
+        statement = statement.where(notifications.c.user_id == user_id)
+    if notification_ids:
+        statement = statement.where(
+            notifications.c.id == any_(bindparam("notification_ids", list(notification_ids), type_=UUID_ARRAY))
+        )
+    if group_key is not None:
+        statement = statement.where(notifications.c.group_key == group_key)
+    if before is not None:
+        statement = statement.where(notifications.c.created_at <= before)
+    return statement.values(is_read=True, read_at=func.now())
+
+
+def digest_query(since: datetime, until: datetime, after: Optional[UUID], batch_size: int) -> Select:
+    item = func.jsonb_build_object(
+        "id",
+        notifications.c.id,
+        "type",
+        notifications.c.notification_type,
+        "title",
+        notifications.c.title,
+        "body",
+        notifications.c.body,
+        "event_count",
+        notifications.c.event_count,
+        "created_at",
+        notifications.c.created_at,
+    )
+    query = (
+        select(
+            notifications.c.user_id,
+            func.count().label("notification_count"),
+            func.sum(notifications.c.event_count).label("event_count"),
+            func.jsonb_agg(aggregate_order_by(item, notifications.c.created_at.desc())).label("items"),
+        )
+        .where(
+            not_(notifications.c.is_read),
+            notifications.c.created_at >= since,
+            notifications.c.created_at < until,
+        )
+        .group_by(notifications.c.user_id)
+        .order_by(notifications.c.user_id)
+        .limit(batch_size)
+    )
+    if after is not None:
+        query = query.where(notifications.c.user_id > after)
+    return query
+
+
+class NotificationRepository:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def fan_out_batch(self, statement: Select) -> FanoutBatch:
+        async with self._engine.begin() as connection:
+            row = (await connection.execute(statement)).one()
+        return FanoutBatch(recipients=row[0], inserted=row[1], written=row[2], last_user_id=row[3])
+
+    async def mark_read(self, **filters: Any) -> int:
+        async with self._engine.begin() as connection:
+            result = await connection.execute(mark_read_statement(**filters))
+            return result.rowcount
+
+    async def iter_digests(
+        self, since: datetime, until: datetime, *, batch_size: int = 1_000
+    ) -> AsyncIterator[List[UserDigest]]:
+        """Unread notifications created in ``[since, until)``, grouped per user, ``batch_size`` users at a time."""
+        after: Optional[UUID] = None
+        while True:
+            async with self._engine.connect() as connection:
+                rows: Sequence[Tuple[Any, ...]] = (
+                    await connection.execute(digest_query(since, until, after, batch_size))
+                ).all()
+            if not rows:
+                return
+            yield [UserDigest(row[0], row[1], int(row[2]), row[3]) for row in rows]
+            if len(rows) < batch_size:
+                return
+            after = rows[-1][0]
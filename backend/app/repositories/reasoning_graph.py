@@ -0,0 +1,108 @@
+"""Set-based reads of agent task graphs for the Reasoning Explorer.
+
+A run's graph is two statements: every task of the run (with its depth from the
+``agent_task_closure`` table) and every log of those tasks. Subtrees use the closure table so a
+task and all its descendants come back from one indexed lookup instead of a recursive walk.
+Rows are streamed through a server-side cursor so large runs never materialise as ORM objects. The
+cursor's connection is opened inside the stream, so it lives exactly as long as the response body.
+"""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Dict
+from uuid import UUID
+
+from sqlalchemy import Select, exists, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.agent import AgentLog, AgentTask, AgentTaskClosure
+from app.models.analysis import AnalysisRun
+
+tasks = AgentTask.__table__
+logs = AgentLog.__table__
+closure = AgentTaskClosure.__table__
+
+TASK_COLUMNS = (
+    tasks.c.id,
+    tasks.c.parent_task_id,
+    tasks.c.analysis_run_id,
+    tasks.c.agent_type,
+    tasks.c.task_name,
+    tasks.c.status,
+    tasks.c.input_payload,
+    tasks.c.output_payload,
+    tasks.c.error_message,
+    tasks.c.started_at,
+    tasks.c.completed_at,
+    tasks.c.created_at,
+)
+LOG_COLUMNS = (logs.c.id, logs.c.agent_task_id, logs.c.log_type, logs.c.content, logs.c.created_at)
+
+STREAM_BATCH_SIZE = 1_000
+
+
+def run_tasks_query(run_id: UUID) -> Select:
+    # A task's depth is its distance from the furthest ancestor, i.e. the root of its tree.
+    depth = (
+        select(func.max(closure.c.depth))
+        .where(closure.c.descendant_id == tasks.c.id)
+        .scalar_subquery()
+        .label("depth")
+    )
+    return select(*TASK_COLUMNS, depth).where(tasks.c.analysis_run_id == run_id).order_by(tasks.c.created_at)
+
+
+def run_logs_query(run_id: UUID) -> Select:
+    return (
+        select(*LOG_COLUMNS)
+        .join(tasks, tasks.c.id == logs.c.agent_task_id)
+        .where(tasks.c.analysis_run_id == run_id)
+        .order_by(logs.c.agent_task_id, logs.c.created_at)
+    )
+
+
+def subtree_tasks_query(task_id: UUID) -> Select:
+    return (
+        select(*TASK_COLUMNS, closure.c.depth)
+        .join(closure, closure.c.descendant_id == tasks.c.id)
+        .where(closure.c.ancestor_id == task_id)
+        .order_by(closure.c.depth, tasks.c.created_at)
+    )
+
+
+def subtree_logs_query(task_id: UUID) -> Select:
+    return (
+        select(*LOG_COLUMNS)
+        .join(closure, closure.c.descendant_id == logs.c.agent_task_id)
+        .where(closure.c.ancestor_id == task_id)
+        .order_by(logs.c.agent_task_id, logs.c.created_at)
+    )
+
+
+class ReasoningGraphRepository:
+    """Streams task and log records (``{"type": "task" | "log", ...}``) for a run or a subtree."""
+
+    def __init__(self, engine: AsyncEngine, *, batch_size: int = STREAM_BATCH_SIZE) -> None:
+        self._engine = engine
+        self._batch_size = batch_size
+
+    async def run_exists(self, run_id: UUID) -> bool:
+        async with self._engine.connect() as connection:
+            return bool(await connection.scalar(select(exists().where(AnalysisRun.id == run_id))))
+
+    async def task_exists(self, task_id: UUID) -> bool:
+        async with self._engine.connect() as connection:
+            return bool(await connection.scalar(select(exists().where(tasks.c.id == task_id))))
+
+    def stream_run_graph(self, run_id: UUID) -> AsyncIterator[Dict[str, Any]]:
+        return self._stream(run_tasks_query(run_id), run_logs_query(run_id))
+
+    def stream_task_subtree(self, task_id: UUID) -> AsyncIterator[Dict[str, Any]]:
+        return self._stream(subtree_tasks_query(task_id), subtree_logs_query(task_id))
+
+    async def _stream(self, task_query: Select, log_query: Select) -> AsyncIterator[Dict[str, Any]]:
+        async with self._engine.connect() as connection:
+            for record_type, query in (("task", task_query), ("log", log_query)):
+                result = await connection.stream(query.execution_options(yield_per=self._batch_size))
+                async for row in result.mappings():
+                    yield {"type": record_type, **row}
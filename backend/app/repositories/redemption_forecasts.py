@@ -0,0 +1,187 @@
+"""Set-based reads and writes behind the redemption survival model and cash-flow forecast.
+
+Survival observations are derived in SQL from ``portfolio_holdings`` joined to their lien and property.
+``stratum`` packs the lien attributes the model conditions on into one small integer:
+
+    stratum = interest_type_code * 16 + principal_band * 4 + rate_band
+
+Bands come from ``width_bucket`` over ``PRINCIPAL_BANDS``/``RATE_BANDS``, so there are 4 bands each.
+A holding's duration is the number of whole months from ``acquisition_date`` (falling back to the
+lien's ``issue_date``) to its exit. The exit is redemption, foreclosure, or disposition, and falls back
+to ``updated_at`` when the dated column is empty. For holdings still held, the duration runs to the
+forecast date.
+
+``refresh_observations`` upserts closed holdings changed since the newest ``observed_at``. Hazard
+fitting then reads ``GROUP BY`` counts (one row per county, stratum, duration and outcome), never the
+holdings themselves.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timezone
+from typing import Any, AsyncIterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, Integer, Numeric, Select, bindparam, case, delete, false, func, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.enums import InterestType, PortfolioHoldingStatus
+from app.models.geography import Property
+from app.models.lien import Lien
+from app.models.portfolio import PortfolioHolding, RedemptionCashflowForecast, RedemptionObservation
+
+holdings = PortfolioHolding.__table__
+liens = Lien.__table__
+properties = Property.__table__
+observations = RedemptionObservation.__table__
+forecasts = RedemptionCashflowForecast.__table__
+
+PRINCIPAL_BANDS = (1_000, 5_000, 25_000)
+RATE_BANDS = (10, 14, 18)
+FORECAST_COLUMNS = tuple(column.name for column in forecasts.columns)
+
+HOLDING_SOURCE = holdings.join(liens, liens.c.id == holdings.c.lien_id).join(
+    properties, properties.c.id == liens.c.property_id
+)
+
+
+def _band(column: Any, name: str, edges: Sequence[int]) -> Any:
+    return func.width_bucket(column, bindparam(name, list(edges), type_=ARRAY(Numeric)))
+
+
+STRATUM = (
+    case(*((liens.c.interest_type == kind, code) for code, kind in enumerate(InterestType)), else_=0) * 16
+    + _band(liens.c.lien_principal_amount, "principal_bands", PRINCIPAL_BANDS) * 4
+    + _band(liens.c.interest_rate_nominal, "rate_bands", RATE_BANDS)
+)
+STARTED_AT = func.coalesce(holdings.c.acquisition_date, liens.c.issue_date)
+CHANGED_AT = func.coalesce(holdings.c.updated_at, holdings.c.created_at)
+ENDED_AT = case(
+    (
+        holdings.c.current_status == PortfolioHoldingStatus.FORECLOSED,
+        func.coalesce(holdings.c.foreclosure_date, holdings.c.disposition_date, CHANGED_AT),
+    ),
+    else_=func.coalesce(holdings.c.disposition_date, CHANGED_AT),
+)
+
+
+def months_between(start: Any, end: Any) -> Any:
+    span = func.age(end, start)
+    return func.greatest(func.extract("year", span) * 12 + func.extract("month", span), 0).cast(Integer)
+
+
+def _as_of_param(as_of: date) -> Any:
+    return bindparam("as_of", datetime.combine(as_of, time.min, tzinfo=timezone.utc), type_=DateTime(timezone=True))
+
+
+def observation_upsert_statement(since: Optional[datetime]) -> Any:
+    source = (
+        select(
+            holdings.c.id,
+            properties.c.county_id,
+            STRATUM,
+            months_between(STARTED_AT, ENDED_AT),
+            holdings.c.current_status == PortfolioHoldingStatus.REDEEMED,
+            CHANGED_AT,
+        )
+        .select_from(HOLDING_SOURCE)
+        .where(holdings.c.current_status != PortfolioHoldingStatus.HELD)
+    )
+    if since is not None:
+        # ``>=``: rows committed with the watermark's own timestamp are re-read; the upsert is idempotent.
+        source = source.where(CHANGED_AT >= since)
+    statement = insert(observations).from_select(
+        ["holding_id", "county_id", "stratum", "duration_months", "redeemed", "observed_at"], source
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[observations.c.holding_id],
+        set_={
+            name: statement.excluded[name]
+            for name in ("county_id", "stratum", "duration_months", "redeemed", "observed_at")
+        },
+    )
+
+
+def reopened_delete_statement(since: Optional[datetime]) -> Any:
+    """Observations of holdings that are open again (a reversed redemption, say)."""
+    statement = delete(observations).where(
+        observations.c.holding_id == holdings.c.id,
+        holdings.c.current_status == PortfolioHoldingStatus.HELD,
+    )
+    return statement.where(CHANGED_AT >= since) if since is not None else statement
+
+
+def hazard_counts_query(as_of: date, max_duration: int) -> Any:
+    """``(county_id, stratum, duration, redeemed, count)`` for closed observations and open holdings.
+
+    Open holdings count as censored at their age on ``as_of``.
+    """
+    closed = select(
+        observations.c.county_id,
+        observations.c.stratum,
+        func.least(observations.c.duration_months, max_duration).label("duration"),
+        observations.c.redeemed,
+        func.count().label("holdings"),
+    ).group_by(observations.c.county_id, observations.c.stratum, "duration", observations.c.redeemed)
+    stratum = STRATUM.label("stratum")
+    duration = func.least(months_between(STARTED_AT, _as_of_param(as_of)), max_duration).label("duration")
+    still_open = (
+        select(properties.c.county_id, stratum, duration, false().label("redeemed"), func.count().label("holdings"))
+        .select_from(HOLDING_SOURCE)
+        .where(holdings.c.current_status == PortfolioHoldingStatus.HELD)
+        .group_by(properties.c.county_id, stratum, duration)
+    )
+    return union_all(closed, still_open)
+
+
+def open_holdings_query(as_of: date) -> Select:
+    return (
+        select(
+            holdings.c.id,
+            holdings.c.portfolio_id,
+            properties.c.county_id,
+            STRATUM.label("stratum"),
+            months_between(STARTED_AT, _as_of_param(as_of)).label("age_months"),
+            liens.c.lien_principal_amount,
+            liens.c.interest_rate_nominal,
+            liens.c.interest_type,
+            liens.c.issue_date,
+        )
+        .select_from(HOLDING_SOURCE)
+        .where(holdings.c.current_status == PortfolioHoldingStatus.HELD)
+    )
+
+
+class RedemptionForecastRepository:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def refresh_observations(self) -> int:
+        """Upsert observations for holdings changed since the last refresh; returns rows written."""
+        async with self._engine.begin() as connection:
+            since = await connection.scalar(select(func.max(observations.c.observed_at)))
+            await connection.execute(reopened_delete_statement(since))
+            result = await connection.execute(observation_upsert_statement(since))
+            return result.rowcount
+
+    async def hazard_counts(self, as_of: date, max_duration: int) -> List[Tuple[Any, ...]]:
+        async with self._engine.connect() as connection:
+            return [tuple(row) for row in await connection.execute(hazard_counts_query(as_of, max_duration))]
+
+    async def iter_open_holdings(self, as_of: date, chunk_size: int) -> AsyncIterator[Sequence[Any]]:
+        """Open holdings with their lien terms, ``chunk_size`` rows at a time from a server-side cursor."""
+        async with self._engine.connect() as connection:
+            result = await connection.stream(open_holdings_query(as_of).execution_options(yield_per=chunk_size))
+            async for rows in result.partitions(chunk_size):
+                yield rows
+
+    async def replace_forecast(self, as_of: date, rows: Sequence[Tuple[Any, ...]]) -> int:
+        """Swap in the forecast for ``as_of`` in one transaction; rows are in ``FORECAST_COLUMNS`` order."""
+        async with self._engine.begin() as connection:
+            await connection.execute(delete(forecasts).where(forecasts.c.as_of == as_of))
+            if rows:
+                raw_connection = await connection.get_raw_connection()
+                await raw_connection.driver_connection.copy_records_to_table(
+                    forecasts.name, records=rows, columns=FORECAST_COLUMNS
+                )
+        return len(rows)
@@ -0,0 +1,156 @@
+"""Uploaded lead lists: upload records, received chunked-upload parts, and bulk-loaded ``upload_rows``."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+import orjson
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.upload import Upload, UploadPart, UploadRow
+
+uploads = Upload.__table__
+upload_parts = UploadPart.__table__
+upload_rows = UploadRow.__table__
+
+ROW_COLUMNS = ("upload_id", "sheet_index", "row_number", "cells")
+
+
+def row_records(
+    upload_id: UUID, sheet_index: int, row_numbers: Sequence[int], rows: Sequence[Sequence[Optional[str]]]
+) -> List[tuple]:
+    """``COPY`` records in ``ROW_COLUMNS`` order; cells go over as JSON text."""
+    return [
+        (upload_id, sheet_index, number, orjson.dumps(row).decode("utf-8"))
+        for number, row in zip(row_numbers, rows)
+    ]
+
+
+class UploadRepository:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def create(
+        self,
+        *,
+        filename: str,
+        mime_type: Optional[str],
+        file_format: str,
+        size_bytes: int,
+        part_size: int,
+        part_count: int,
+        content_hash: Optional[str] = None,
+    ) -> UUID:
+        async with self._engine.begin() as connection:
+            return await connection.scalar(
+                insert(uploads)
+                .values(
+                    filename=filename,
+                    mime_type=mime_type,
+                    file_format=file_format,
+                    size_bytes=size_bytes,
+                    part_size=part_size,
+                    part_count=part_count,
+                    content_hash=content_hash,
+                    status="pending",
+                )
+                .returning(uploads.c.id)
+            )
+
+    async def get(self, upload_id: UUID) -> Optional[Row]:
+        async with self._engine.connect() as connection:
+            return (await connection.execute(select(uploads).where(uploads.c.id == upload_id))).first()
+
+    async def received_parts(self, upload_id: UUID) -> List[Row]:
+        """``part_number``, ``size`` and ``sha256`` of every received part, in part order."""
+        query = (
+            select(upload_parts.c.part_number, upload_parts.c.size, upload_parts.c.sha256)
+            .where(upload_parts.c.upload_id == upload_id)
+            .order_by(upload_parts.c.part_number)
+        )
+        async with self._engine.connect() as connection:
+            return list((await connection.execute(query)).all())
+
+    async def get_part(self, upload_id: UUID, part_number: int) -> Optional[Row]:
+        """``size`` and ``sha256`` of a received part, or ``None`` if it has not arrived."""
+        query = select(upload_parts.c.size, upload_parts.c.sha256).where(
+            upload_parts.c.upload_id == upload_id, upload_parts.c.part_number == part_number
+        )
+        async with self._engine.connect() as connection:
+            return (await connection.execute(query)).first()
+
+    async def record_part(self, upload_id: UUID, part_number: int, size: int, sha256: str) -> str:
+        """Record a stored part and return the SHA-256 on record for it.
+
+        The first record wins: staging may already have read the part, so a retry never replaces it.
+        The returned hash differs from ``sha256`` when another request recorded the part first.
+        """
+        statement = pg_insert(upload_parts).values(
+            upload_id=upload_id, part_number=part_number, size=size, sha256=sha256
+        )
+        statement = statement.on_conflict_do_nothing(
+            index_elements=[upload_parts.c.upload_id, upload_parts.c.part_number]
+        )
+        recorded = select(upload_parts.c.sha256).where(
+            upload_parts.c.upload_id == upload_id, upload_parts.c.part_number == part_number
+        )
+        async with self._engine.begin() as connection:
+            await connection.execute(statement)
+            return (await connection.execute(recorded)).scalar_one()
+
+    async def mark_received(self, upload_id: UUID) -> None:
+        async with self._engine.begin() as connection:
+            await connection.execute(update(uploads).where(uploads.c.id == upload_id).values(received_at=func.now()))
+
+    async def record_content_hash(self, upload_id: UUID, content_hash: str) -> None:
+        async with self._engine.begin() as connection:
+            await connection.execute(
+                update(uploads).where(uploads.c.id == upload_id).values(content_hash=content_hash)
+            )
+
+    async def begin_staging(self, upload_id: UUID) -> None:
+        """Drop rows from any earlier attempt and mark the upload as staging."""
+        async with self._engine.begin() as connection:
+            await connection.execute(delete(upload_rows).where(upload_rows.c.upload_id == upload_id))
+            await connection.execute(
+                update(uploads).where(uploads.c.id == upload_id).values(status="staging", error=None, row_count=0)
+            )
+
+    async def stage_rows(
+        self,
+        upload_id: UUID,
+        sheet_index: int,
+        row_numbers: Sequence[int],
+        rows: Sequence[Sequence[Optional[str]]],
+    ) -> int:
+        if not rows:
+            return 0
+        records = row_records(upload_id, sheet_index, row_numbers, rows)
+        async with self._engine.begin() as connection:
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                upload_rows.name, records=records, columns=ROW_COLUMNS
+            )
+            # Committed with the rows, so readers see staging progress while the upload is still arriving.
+            await connection.execute(
+                update(uploads).where(uploads.c.id == upload_id).values(row_count=uploads.c.row_count + len(records))
+            )
+        return len(records)
+
+    async def complete(self, upload_id: UUID, sheets: List[Dict[str, Any]], row_count: int) -> None:
+        async with self._engine.begin() as connection:
+            await connection.execute(
+                update(uploads)
+                .where(uploads.c.id == upload_id)
+                .values(status="staged", sheets=sheets, row_count=row_count, staged_at=func.now())
+            )
+
+    async def fail(self, upload_id: UUID, error: str) -> None:
+        async with self._engine.begin() as connection:
+            await connection.execute(
+                update(uploads).where(uploads.c.id == upload_id).values(status="failed", error=error)
+            )
@@ -0,0 +1,80 @@
+"""Reads of an analysis run's stored outputs as the per-lien baseline for what-if ranking."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional
+from uuid import UUID
+
+from sqlalchemy import Select, and_, exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analysis import AnalysisRun, DealMetric, DealScore, ScenarioAnalysis
+from app.models.enums import ScenarioType
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.what_if import RunBaseline
+
+runs = AnalysisRun.__table__
+metrics = DealMetric.__table__
+scores = DealScore.__table__
+redemption = ScenarioAnalysis.__table__.alias("redemption")
+deed = ScenarioAnalysis.__table__.alias("deed")
+
+
+def _scenario_join(scenario: Any, scenario_type: ScenarioType) -> Any:
+    return and_(
+        scenario.c.analysis_run_id == metrics.c.analysis_run_id,
+        scenario.c.lien_id == metrics.c.lien_id,
+        scenario.c.scenario_type == scenario_type,
+    )
+
+
+def what_if_baseline_query(run_id: UUID) -> Select:
+    """One row per deal metric of the run, with its redemption and deed-conversion scenarios.
+
+    A missing redemption probability falls back to the complement of the deed-conversion one. The
+    baseline rank is the run's ``DealScore`` for the run's own investor profile.
+    """
+    source = (
+        metrics.join(runs, runs.c.id == metrics.c.analysis_run_id)
+        .outerjoin(redemption, _scenario_join(redemption, ScenarioType.REDEMPTION))
+        .outerjoin(deed, _scenario_join(deed, ScenarioType.DEED_CONVERSION))
+        .outerjoin(
+            scores,
+            and_(
+                scores.c.analysis_run_id == metrics.c.analysis_run_id,
+                scores.c.lien_id == metrics.c.lien_id,
+                scores.c.investor_profile_id == runs.c.investor_profile_id,
+            ),
+        )
+    )
+    return (
+        select(
+            metrics.c.lien_id,
+            func.coalesce(redemption.c.probability, 1 - deed.c.probability),
+            redemption.c.projected_profit,
+            func.coalesce(redemption.c.holding_period_months, metrics.c.estimated_redemption_hold_months),
+            redemption.c.total_capital_required,
+            deed.c.projected_profit,
+            deed.c.holding_period_months,
+            deed.c.total_capital_required,
+            scores.c.rank_within_run,
+        )
+        .select_from(source)
+        .where(metrics.c.analysis_run_id == run_id)
+        .order_by(metrics.c.lien_id)
+    )
+
+
+class WhatIfRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def load(self, run_id: UUID) -> Optional["RunBaseline"]:
+        """The run's baseline columns, or ``None`` if the run does not exist."""
+        from app.services.what_if import RunBaseline  # NumPy stays out of API start-up
+
+        if not await self._session.scalar(select(exists().where(runs.c.id == run_id))):
+            return None
+        rows = (await self._session.execute(what_if_baseline_query(run_id))).all()
+        return RunBaseline.from_rows(run_id, rows)
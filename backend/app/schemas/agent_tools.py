@@ -5,7 +5,9 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from uuid import UUID
+
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 
 class DateRange(BaseModel):
@@ -97,4 +99,61 @@ class LogDecisionEventResponse(BaseModel):
     episode_id: int
     agent_task_id: int
     decision_type: str
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+
+
+class DocCorpusLookupRequest(BaseModel):
+    """Input payload for `doc_corpus_lookup`: a text query, a precomputed embedding, or both."""
+
+    query: Optional[str] = Field(default=None, min_length=1)
+    embedding: Optional[List[float]] = None
+    top_k: int = Field(default=10, ge=1, le=100)
+
+    @model_validator(mode="after")
+    def _require_query_or_embedding(self) -> "DocCorpusLookupRequest":
+        if self.query is None and self.embedding is None:
+            raise ValueError("Either query or embedding is required.")
+        return self
+
+
+class DocRef(BaseModel):
+    """A retrieved corpus chunk with the evidence needed to cite it."""
+
+    document_id: UUID
+    chunk_id: UUID
+    chunk_index: int
+    location: Optional[str] = None
+    snippet: str
+    confidence: float
+    lexical_rank: Optional[int] = None
+    vector_rank: Optional[int] = None
+
+
+class DocCorpusLookupResponse(BaseModel):
+    """Ranked evidence returned by `doc_corpus_lookup`."""
+
+    items: List[DocRef] = Field(default_factory=list)
+
+
+class ToolCall(BaseModel):
+    """One tool invocation requested by an agent step."""
+
+    call_id: str
+    name: str
+    arguments: Dict[str, Any] = Field(default_factory=dict)
+
+
+class ToolCallResult(BaseModel):
+    """Outcome of a tool invocation; failures are reported per call instead of failing the step."""
+
+    call_id: str
+    name: str
+    output: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    cached: bool = False
+    duration_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
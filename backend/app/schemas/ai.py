@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -27,9 +27,13 @@ class TextGenerationResponse(BaseModel):
     usage: Optional[TokenUsage] = None
 
 
+EmbeddingEncoding = Literal["float", "base64"]
+
+
 class EmbeddingsRequest(BaseModel):
     texts: List[str] = Field(..., min_length=1)
     model: str | None = None
+    encoding_format: EmbeddingEncoding = "float"
 
     @field_validator("texts")
     @classmethod
@@ -41,6 +45,7 @@ class EmbeddingsRequest(BaseModel):
 
 class EmbeddingsResponse(BaseModel):
     model: str
-    embeddings: List[List[float]]
+    # ``encoding_format="base64"``: one base64 string of little-endian float32 values per vector.
+    embeddings: List[List[float]] | List[str]
     usage: Optional[TokenUsage] = None
 
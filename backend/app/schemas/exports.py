@@ -0,0 +1,7 @@
+"""Pydantic types for ranked-deal exports."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+DealExportFormat = Literal["csv", "xlsx", "parquet"]
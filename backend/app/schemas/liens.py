@@ -0,0 +1,30 @@
+"""Pydantic models for lien valuation endpoints."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import List
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+MAX_PAYOFF_LIENS = 10_000
+
+
+class LienPayoffRequest(BaseModel):
+    lien_ids: List[UUID] = Field(min_length=1, max_length=MAX_PAYOFF_LIENS)
+    as_of: date
+
+
+class LienPayoff(BaseModel):
+    lien_id: UUID
+    principal: Decimal
+    accrued_interest: Decimal
+    payoff_amount: Decimal
+
+
+class LienPayoffResponse(BaseModel):
+    as_of: date
+    payoffs: List[LienPayoff]
+    missing_lien_ids: List[UUID] = Field(default_factory=list)
@@ -0,0 +1,42 @@
+"""Pydantic models describing Reasoning Explorer graph payloads."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.models.enums import AgentLogType, AgentTaskStatus, AgentType
+
+
+class ReasoningTaskNode(BaseModel):
+    id: UUID
+    parent_task_id: Optional[UUID] = None
+    analysis_run_id: Optional[UUID] = None
+    agent_type: AgentType
+    task_name: str
+    status: AgentTaskStatus
+    input_payload: Optional[dict] = None
+    output_payload: Optional[dict] = None
+    error_message: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+    depth: int
+
+
+class ReasoningLogEntry(BaseModel):
+    id: UUID
+    agent_task_id: UUID
+    log_type: AgentLogType
+    content: Any = None
+    created_at: datetime
+
+
+class ReasoningGraphResponse(BaseModel):
+    """Flat node and log lists; clients rebuild edges from ``parent_task_id``."""
+
+    tasks: List[ReasoningTaskNode] = Field(default_factory=list)
+    logs: List[ReasoningLogEntry] = Field(default_factory=list)
@@ -0,0 +1,71 @@
+"""Pydantic models for chunked, resumable lead-list uploads and their column mappings."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+SHA256_PATTERN = r"^[0-9a-fA-F]{64}$"
+MAX_SAMPLE_ROWS = 100
+
+
+class UploadInitRequest(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    mime_type: Optional[str] = Field(default=None, max_length=255)
+    size: int = Field(..., gt=0)
+    sha256: Optional[str] = Field(default=None, pattern=SHA256_PATTERN)
+
+
+class UploadPartReceipt(BaseModel):
+    part_number: int = Field(..., ge=1)
+    size: int
+    sha256: str = Field(..., pattern=SHA256_PATTERN)
+
+
+class UploadCompleteRequest(BaseModel):
+    # Optional manifest: when given, it must match the received parts exactly.
+    parts: Optional[List[UploadPartReceipt]] = None
+
+
+class UploadStatus(BaseModel):
+    upload_id: UUID
+    filename: str
+    file_format: str
+    status: str
+    size: int
+    part_size: int
+    part_count: int
+    received_parts: List[UploadPartReceipt]
+    missing_parts: List[int]
+    received_at: Optional[datetime] = None
+    row_count: Optional[int] = None
+    sheets: Optional[List[Dict[str, Any]]] = None
+    error: Optional[str] = None
+
+
+class ColumnMappingRequest(BaseModel):
+    headers: List[Optional[str]] = Field(..., min_length=1)
+    # A few data rows in header order; they help with columns whose header says little.
+    sample_rows: List[List[Optional[str]]] = Field(default_factory=list, max_length=MAX_SAMPLE_ROWS)
+
+
+class ColumnMappingConfirmRequest(BaseModel):
+    headers: List[Optional[str]] = Field(..., min_length=1)
+    mapping: Dict[str, Optional[str]]
+
+
+class ColumnMappingEntry(BaseModel):
+    column: str
+    field: Optional[str] = None
+    source: str
+    confidence: float
+
+
+class ColumnMappingResponse(BaseModel):
+    fingerprint: str
+    confirmed: bool
+    cached: bool
+    columns: List[ColumnMappingEntry]
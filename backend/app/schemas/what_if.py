@@ -0,0 +1,42 @@
+"""Pydantic models for what-if re-ranking of an analysis run."""
+
+from __future__ import annotations
+
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+MAX_WHAT_IF_TOP_K = 1_000
+
+
+class WhatIfAssumptions(BaseModel):
+    rehab_cost_multiplier: float = Field(default=1.0, ge=0.0)
+    redemption_probability_multiplier: float = Field(default=1.0, ge=0.0)
+    discount_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+
+
+class WhatIfRequest(BaseModel):
+    session_id: Optional[UUID] = None
+    assumptions: WhatIfAssumptions = Field(default_factory=WhatIfAssumptions)
+    top_k: int = Field(default=50, ge=1, le=MAX_WHAT_IF_TOP_K)
+
+
+class RankedDeal(BaseModel):
+    lien_id: UUID
+    rank: int
+    baseline_rank: Optional[int] = None
+    score: Optional[float] = None
+    expected_value: float
+    expected_capital: float
+    redemption_probability: float
+
+
+class WhatIfResponse(BaseModel):
+    session_id: UUID
+    run_id: UUID
+    assumptions: WhatIfAssumptions
+    total_liens: int
+    recomputed: List[str]
+    elapsed_ms: float
+    deals: List[RankedDeal]
@@ -0,0 +1,702 @@
+"""Analysis equations compiled from ``Real_Estate_Analysis_Equations_KB.xlsx`` into NumPy evaluators.
+
+The workbook is the source of truth for analysis formulas: each row has a ``Category``, a ``Metric`` and a
+``Formula`` such as ``NOI = EGI − Operating_Expenses − Replacement_Reserves``. ``read_workbook`` parses
+every formula into a small expression tree. It first repairs the UTF-8-read-as-Mac-Roman mojibake the
+sheet was saved with (``√ó`` → ``×``). ``Variables`` cells that define a helper such as
+``Debt_Service_Constant = r/(1 − (1 + r)^(−n))`` become equations too.
+
+* A name that another row assigns refers to that row's result, so ``Cap_Rate`` pulls in ``NOI`` → ``EGI`` →
+  ``VCL`` → ``PGI``. The first row to assign a name owns it. Later rows that assign the same name are exposed
+  as ``<category>.<name>`` (e.g. ``nnn_retail.NOI``).
+* ``Σ`` is dropped. Columns hold per-row totals, so ``Σ Distributions_to_Equity`` is just that column.
+* Some formulas are not expressible as row-wise arithmetic and are kept in ``EquationSet.skipped`` with a
+  reason: series indexed by ``_t``/``_i``/``_k`` (NPV, WALT), solvers (IRR), conditionals (promote
+  waterfall), and unknown functions (MIRR).
+
+``AnalysisEngine.plan`` turns the requested outputs and the set of supplied columns into one DAG. A supplied
+column always wins over the formula that would derive it. Nodes are hash-consed, so shared subexpressions
+such as ``1 − (1 + r)^(−n)`` in ``PMT`` and ``Debt_Service_Constant`` are computed once. Constant subtrees
+are folded. The DAG is emitted as one straight-line Python function of NumPy array expressions, and
+intermediates are released after their last use. Plans are kept in an LRU per engine.
+
+Parsed workbooks are cached by SHA-256 in process and, with ``ANALYSIS_EQUATIONS_CACHE_DIR`` set, as JSON on
+disk, so workers only pay for ``openpyxl`` the first time a workbook version is seen. Editing the workbook
+changes the hash, so formula changes ship without code edits.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_WORKBOOK = Path(__file__).resolve().parents[3] / "Real_Estate_Analysis_Equations_KB.xlsx"
+# Bump when parsing changes so on-disk caches written by older code are ignored.
+PARSER_VERSION = 1
+DEFAULT_PLAN_CACHE_SIZE = 64
+
+# Expressions are nested tuples: ("const", 12.0), ("name", "NOI"), ("neg", e), ("add", a, b), ("max", a, b).
+Expr = Tuple[Any, ...]
+
+BINARY_OPERATORS = {"+": "add", "-": "sub", "*": "mul", "/": "div"}
+FUNCTIONS = {"max": 2, "min": 2, "abs": 1}
+COMMUTATIVE = frozenset({"add", "mul", "max", "min"})
+TEMPLATES = {
+    "add": "{0} + {1}",
+    "sub": "{0} - {1}",
+    "mul": "{0} * {1}",
+    "div": "{0} / {1}",
+    "pow": "{0} ** {1}",
+    "neg": "-{0}",
+    "max": "np.maximum({0}, {1})",
+    "min": "np.minimum({0}, {1})",
+    "abs": "np.abs({0})",
+}
+OPERATIONS: Dict[str, Callable[..., Any]] = {
+    "add": np.add,
+    "sub": np.subtract,
+    "mul": np.multiply,
+    "div": np.divide,
+    "pow": np.power,
+    "neg": np.negative,
+    "max": np.maximum,
+    "min": np.minimum,
+    "abs": np.abs,
+}
+
+SYMBOLS = {
+    "×": "*",
+    "·": "*",
+    "÷": "/",
+    "−": "-",
+    "≈": "=",
+    "‑": "_",  # non-breaking hyphen inside names such as Annual_Pre‑Tax_Cash_Flow
+    "\u00a0": " ",
+}
+TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<number>\d+(?:\.\d+)?(?![\w.]))"
+    r"|(?P<sigma>Σ)"
+    r"|(?P<name>[^\W\d][\w%]*(?:(?<=_)\([^()]*\)|(?<=_)\{[^{}]*\})?)"
+    r"|(?P<op>[-+*/^(),\[\]])"
+    r"|(?P<other>\S+)"
+    r")"
+)
+INDEXED = re.compile(r"_(?:[tik]|\{.*\})$")
+
+
+class UnsupportedFormula(ValueError):
+    """Raised for formulas that cannot be compiled to row-wise arithmetic."""
+
+
+class MissingInputsError(LookupError):
+    """Raised when requested outputs need columns that were not supplied."""
+
+    def __init__(self, missing: Mapping[str, Sequence[str]]) -> None:
+        self.missing = dict(missing)
+        details = "; ".join(f"{output}: {', '.join(names)}" for output, names in self.missing.items())
+        super().__init__(f"Missing input columns ({details}).")
+
+
+def repair_text(value: str) -> str:
+    """Undo UTF-8 text that was decoded as Mac Roman (``Œ£`` → ``Σ``); other text is returned unchanged."""
+    try:
+        return value.encode("mac_roman").decode("utf-8")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return value
+
+
+def _normalise(text: str) -> str:
+    text = repair_text(text)
+    for symbol, replacement in SYMBOLS.items():
+        text = text.replace(symbol, replacement)
+    return text.strip()
+
+
+def _tokens(text: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    for match in TOKEN.finditer(text):
+        kind = match.lastgroup
+        if kind is None:
+            continue
+        value = match.group(kind)
+        if kind == "other":
+            raise UnsupportedFormula(f"unexpected {value!r}")
+        tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent over ``+ -`` < ``* /`` < unary ``- + Σ`` < ``^`` (right-associative)."""
+
+    def __init__(self, text: str) -> None:
+        self._tokens = _tokens(text)
+        self._position = 0
+
+    def parse(self) -> Expr:
+        expression = self._sum()
+        if self._peek() is not None:
+            raise UnsupportedFormula(f"unexpected {self._peek()[1]!r}")
+        return expression
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self._tokens[self._position] if self._position < len(self._tokens) else None
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise UnsupportedFormula("unexpected end of formula")
+        self._position += 1
+        return token
+
+    def _accept(self, *values: str) -> Optional[str]:
+        token = self._peek()
+        if token is not None and token[0] == "op" and token[1] in values:
+            self._position += 1
+            return token[1]
+        return None
+
+    def _expect(self, value: str) -> None:
+        if self._accept(value) is None:
+            raise UnsupportedFormula(f"expected {value!r}")
+
+    def _sum(self) -> Expr:
+        expression = self._product()
+        while (operator := self._accept("+", "-")) is not None:
+            expression = (BINARY_OPERATORS[operator], expression, self._product())
+        return expression
+
+    def _product(self) -> Expr:
+        expression = self._unary()
+        while (operator := self._accept("*", "/")) is not None:
+            expression = (BINARY_OPERATORS[operator], expression, self._unary())
+        return expression
+
+    def _unary(self) -> Expr:
+        if self._accept("-") is not None:
+            return ("neg", self._unary())
+        if self._accept("+") is not None:
+            return self._unary()
+        token = self._peek()
+        if token is not None and token[0] == "sigma":
+            self._position += 1
+            return self._unary()
+        return self._power()
+
+    def _power(self) -> Expr:
+        base = self._atom()
+        if self._accept("^") is not None:
+            return ("pow", base, self._unary())
+        return base
+
+    def _atom(self) -> Expr:
+        kind, value = self._next()
+        if kind == "number":
+            return ("const", float(value))
+        if kind == "name":
+            if self._accept("(") is not None:
+                return self._call(value)
+            parts = [value]
+            # Names written with spaces ("Market Rent_per_Unit") read as one name.
+            while (token := self._peek()) is not None and token[0] == "name":
+                parts.append(self._next()[1])
+            name = "_".join(parts)
+            if INDEXED.search(name):
+                raise UnsupportedFormula(f"indexed series {name!r}")
+            return ("name", name)
+        if value in ("(", "["):
+            expression = self._sum()
+            self._expect(")" if value == "(" else "]")
+            return expression
+        raise UnsupportedFormula(f"unexpected {value!r}")
+
+    def _call(self, function: str) -> Expr:
+        arity = FUNCTIONS.get(function.lower())
+        if arity is None:
+            raise UnsupportedFormula(f"unknown function {function!r}")
+        arguments = [self._sum()]
+        while self._accept(",") is not None:
+            arguments.append(self._sum())
+        self._expect(")")
+        if len(arguments) != arity:
+            raise UnsupportedFormula(f"{function} takes {arity} argument(s)")
+        return (function.lower(), *arguments)
+
+
+def parse_formula(formula: str) -> List[Tuple[str, Expr]]:
+    """``(target, expression)`` for each ``;``-separated assignment; all or nothing."""
+    assignments = []
+    for statement in _normalise(formula).split(";"):
+        if statement.count("=") != 1:
+            raise UnsupportedFormula("not an assignment")
+        left, right = statement.split("=")
+        target = _tokens(left)
+        if not target or any(kind != "name" for kind, _ in target):
+            raise UnsupportedFormula(f"cannot assign to {left.strip()!r}")
+        assignments.append(("_".join(value for _, value in target), _Parser(right).parse()))
+    return assignments
+
+
+def _definitions(variables: str) -> Iterator[Tuple[str, Expr]]:
+    """Helper equations declared in a ``Variables`` cell; aliases such as ``L=Loan`` are ignored."""
+    depth, start, text = 0, 0, _normalise(variables)
+    parts = []
+    for position, char in enumerate(text):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:position])
+            start = position + 1
+    parts.append(text[start:])
+    for part in parts:
+        if "=" not in part:
+            continue
+        try:
+            ((target, expression),) = parse_formula(part)
+        except (UnsupportedFormula, ValueError):
+            continue
+        if expression[0] not in ("name", "const"):
+            yield target, expression
+
+
+def expression_names(expression: Expr) -> Iterator[str]:
+    if expression[0] == "name":
+        yield expression[1]
+    elif expression[0] != "const":
+        for argument in expression[1:]:
+            yield from expression_names(argument)
+
+
+@dataclass(frozen=True)
+class Equation:
+    name: str
+    target: str
+    metric: str
+    category: str
+    formula: str
+    expression: Expr
+    names: FrozenSet[str] = field(default=frozenset(), compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "names", frozenset(expression_names(self.expression)))
+
+
+@dataclass(frozen=True)
+class SkippedFormula:
+    metric: str
+    category: str
+    formula: str
+    reason: str
+
+
+def _slug(category: str) -> str:
+    return re.sub(r"[^0-9a-z]+", "_", category.lower()).strip("_")
+
+
+def _tuples(value: Any) -> Any:
+    return tuple(_tuples(item) for item in value) if isinstance(value, list) else value
+
+
+@dataclass(frozen=True)
+class EquationSet:
+    digest: str
+    equations: Tuple[Equation, ...]
+    skipped: Tuple[SkippedFormula, ...] = ()
+
+    @classmethod
+    def from_rows(cls, digest: str, rows: Iterable[Mapping[str, Any]]) -> "EquationSet":
+        """Build from ``Category``/``Metric``/``Formula``/``Variables`` rows in sheet order."""
+        equations: List[Equation] = []
+        skipped: List[SkippedFormula] = []
+        owners: Dict[str, Equation] = {}
+
+        def add(target: str, metric: str, category: str, formula: str, expression: Expr) -> None:
+            name = target if target not in owners else f"{_slug(category)}.{target}"
+            if any(equation.name == name for equation in equations):
+                skipped.append(SkippedFormula(metric, category, formula, f"{name!r} is already defined"))
+                return
+            equation = Equation(name, target, metric, category, formula, expression)
+            owners.setdefault(target, equation)
+            equations.append(equation)
+
+        for row in rows:
+            metric = repair_text(str(row.get("Metric") or "")).strip()
+            category = repair_text(str(row.get("Category") or "")).strip()
+            formula = repair_text(str(row.get("Formula") or "")).strip()
+            if not formula:
+                continue
+            try:
+                assignments = parse_formula(formula)
+            except UnsupportedFormula as exc:
+                skipped.append(SkippedFormula(metric, category, formula, str(exc)))
+            else:
+                for target, expression in assignments:
+                    add(target, metric, category, formula, expression)
+            for target, expression in _definitions(str(row.get("Variables") or "")):
+                if target not in owners:
+                    add(target, target, category, repair_text(str(row["Variables"])).strip(), expression)
+
+        circular = _circular(equations, owners)
+        skipped.extend(
+            SkippedFormula(equation.metric, equation.category, equation.formula, "circular reference")
+            for equation in equations
+            if equation.name in circular
+        )
+        return cls(
+            digest=digest,
+            equations=tuple(equation for equation in equations if equation.name not in circular),
+            skipped=tuple(skipped),
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "parser_version": PARSER_VERSION,
+                "digest": self.digest,
+                "equations": [
+                    [item.name, item.target, item.metric, item.category, item.formula, item.expression]
+                    for item in self.equations
+                ],
+                "skipped": [[item.metric, item.category, item.formula, item.reason] for item in self.skipped],
+            }
+        )
+
+    @classmethod
+    def from_json(cls, payload: str) -> "EquationSet":
+        data = json.loads(payload)
+        if data.get("parser_version") != PARSER_VERSION:
+            raise ValueError("Equation cache was written by a different parser version.")
+        return cls(
+            digest=data["digest"],
+            equations=tuple(Equation(*item[:5], _tuples(item[5])) for item in data["equations"]),
+            skipped=tuple(SkippedFormula(*item) for item in data["skipped"]),
+        )
+
+
+def _circular(equations: Sequence[Equation], owners: Mapping[str, Equation]) -> FrozenSet[str]:
+    """Names of equations that reach themselves through the names they reference."""
+    state: Dict[str, int] = {}
+    circular: set[str] = set()
+
+    def visit(equation: Equation, path: List[str]) -> None:
+        if state.get(equation.name) == 2:
+            return
+        if state.get(equation.name) == 1:
+            circular.update(path[path.index(equation.name) :])
+            return
+        state[equation.name] = 1
+        path.append(equation.name)
+        for name in equation.names:
+            if name in owners:
+                visit(owners[name], path)
+        path.pop()
+        state[equation.name] = 2
+
+    for equation in equations:
+        visit(equation, [])
+    return frozenset(circular)
+
+
+def workbook_digest(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_workbook(path: str | Path, digest: Optional[str] = None) -> EquationSet:
+    """Parse the first sheet that has a ``Formula`` header column."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+            if "Formula" in header:
+                records = [dict(zip(header, row)) for row in rows]
+                return EquationSet.from_rows(digest or workbook_digest(path), records)
+    finally:
+        workbook.close()
+    raise ValueError(f"No sheet with a 'Formula' column in {path}.")
+
+
+_equation_sets: Dict[str, EquationSet] = {}
+_engines: Dict[str, "AnalysisEngine"] = {}
+_lock = threading.Lock()
+
+
+def load_equations(path: str | Path | None = None, *, cache_dir: str | Path | None = None) -> EquationSet:
+    """Equations for the workbook's current contents, parsed at most once per hash (per process and on disk)."""
+    path = Path(path or settings.ANALYSIS_EQUATIONS_WORKBOOK or DEFAULT_WORKBOOK)
+    cache_dir = cache_dir if cache_dir is not None else settings.ANALYSIS_EQUATIONS_CACHE_DIR
+    digest = workbook_digest(path)
+    equations = _equation_sets.get(digest)
+    if equations is not None:
+        return equations
+
+    cache_file = Path(cache_dir) / f"analysis_equations-v{PARSER_VERSION}-{digest[:16]}.json" if cache_dir else None
+    if cache_file is not None and cache_file.is_file():
+        try:
+            equations = EquationSet.from_json(cache_file.read_text(encoding="utf-8"))
+        except (ValueError, KeyError, TypeError):
+            equations = None
+    if equations is None:
+        equations = read_workbook(path, digest)
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            partial = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            partial.write_text(equations.to_json(), encoding="utf-8")
+            partial.replace(cache_file)
+        logger.info(
+            "analysis_equations.parsed",
+            workbook=str(path),
+            digest=digest[:16],
+            equations=len(equations.equations),
+            skipped=len(equations.skipped),
+        )
+    with _lock:
+        return _equation_sets.setdefault(digest, equations)
+
+
+def formula_version(path: str | Path | None = None) -> str:
+    """Changes whenever the workbook or its parser does; part of every lien's analysis input fingerprint."""
+    path = Path(path or settings.ANALYSIS_EQUATIONS_WORKBOOK or DEFAULT_WORKBOOK)
+    return f"{PARSER_VERSION}:{workbook_digest(path)[:16]}"
+
+
+def get_analysis_engine(path: str | Path | None = None) -> "AnalysisEngine":
+    """Process-wide engine for the workbook's current version; compiled plans survive until it changes."""
+    equations = load_equations(path)
+    with _lock:
+        engine = _engines.get(equations.digest)
+        if engine is None:
+            engine = _engines[equations.digest] = AnalysisEngine(equations)
+        return engine
+
+
+class _Dag:
+    """Hash-consed nodes in creation order, so every node follows its operands."""
+
+    def __init__(self) -> None:
+        self.nodes: List[Tuple[Any, ...]] = []
+        self._ids: Dict[Tuple[Any, ...], int] = {}
+
+    def add(self, key: Tuple[Any, ...]) -> int:
+        operation, *arguments = key
+        if operation in OPERATIONS:
+            if operation in COMMUTATIVE:
+                arguments.sort()
+            if all(self.nodes[argument][0] == "const" for argument in arguments):
+                with np.errstate(all="ignore"):
+                    value = OPERATIONS[operation](*(np.float64(self.nodes[argument][1]) for argument in arguments))
+                return self.add(("const", float(value)))
+            key = (operation, *arguments)
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self.nodes)
+            self.nodes.append(key)
+        return node
+
+
+@dataclass(frozen=True)
+class CompiledPlan:
+    outputs: Tuple[str, ...]
+    inputs: Tuple[str, ...]
+    node_count: int
+    source: str
+    function: Callable[[Mapping[str, np.ndarray]], Dict[str, np.ndarray]] = field(repr=False)
+
+    def __call__(self, columns: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+        arrays = {name: np.asarray(columns[name], dtype=np.float64) for name in self.inputs}
+        shape = np.broadcast_shapes(*(array.shape for array in arrays.values())) if arrays else ()
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            results = self.function(arrays)
+        return {
+            name: value if np.shape(value) == shape else np.broadcast_to(value, shape).copy()
+            for name, value in results.items()
+        }
+
+
+def _literal(value: float) -> str:
+    return repr(value) if np.isfinite(value) else f"np.float64({str(value)!r})"
+
+
+class AnalysisEngine:
+    def __init__(self, equations: EquationSet, *, plan_cache_size: int = DEFAULT_PLAN_CACHE_SIZE) -> None:
+        self.equations = equations
+        self._by_name: Dict[str, Equation] = {equation.name: equation for equation in equations.equations}
+        self._owners: Dict[str, Equation] = {}
+        for equation in equations.equations:
+            self._owners.setdefault(equation.target, equation)
+        self._plans: "OrderedDict[Tuple[FrozenSet[str], Optional[Tuple[str, ...]]], CompiledPlan]" = OrderedDict()
+        self._plan_cache_size = plan_cache_size
+        self._lock = threading.Lock()
+
+    @property
+    def outputs(self) -> Tuple[str, ...]:
+        return tuple(self._by_name)
+
+    def equation(self, name: str) -> Equation:
+        return self._by_name[name]
+
+    def required_inputs(self, output: str, available: Iterable[str] = ()) -> FrozenSet[str]:
+        """Base columns ``output`` needs when ``available`` columns are supplied (those are not expanded)."""
+        available = frozenset(available)
+        needed: set[str] = set()
+        seen: set[str] = set()
+        pending = list(self._by_name[output].names)
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            if name in available or name not in self._owners:
+                needed.add(name)
+            else:
+                pending.extend(self._owners[name].names)
+        return frozenset(needed)
+
+    def plan(self, available: Iterable[str], outputs: Optional[Sequence[str]] = None) -> CompiledPlan:
+        """Compile (or reuse) an evaluator for ``outputs`` given the supplied column names.
+
+        Without ``outputs``, every equation computable from ``available`` is included, except those whose
+        target is itself supplied.
+        """
+        available = frozenset(available)
+        key = (available, tuple(outputs) if outputs is not None else None)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+
+        if outputs is None:
+            selected = [
+                name
+                for name, equation in self._by_name.items()
+                if equation.target not in available and self.required_inputs(name, available) <= available
+            ]
+        else:
+            unknown = [name for name in outputs if name not in self._by_name]
+            if unknown:
+                raise KeyError(f"Unknown analysis outputs: {', '.join(unknown)}")
+            missing = {
+                name: sorted(self.required_inputs(name, available) - available)
+                for name in outputs
+                if not self.required_inputs(name, available) <= available
+            }
+            if missing:
+                raise MissingInputsError(missing)
+            selected = list(dict.fromkeys(outputs))
+        plan = self._compile(available, selected)
+
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self._plan_cache_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def evaluate(self, columns: Mapping[str, Any], outputs: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Evaluate ``outputs`` (default: everything computable) over equal-length columns or scalars."""
+        return self.plan(columns.keys(), outputs)(columns)
+
+    def _compile(self, available: FrozenSet[str], outputs: Sequence[str]) -> CompiledPlan:
+        dag = _Dag()
+        resolved: Dict[str, int] = {}
+
+        def reference(name: str) -> int:
+            node = resolved.get(name)
+            if node is None:
+                if name in available or name not in self._owners:
+                    node = dag.add(("input", name))
+                else:
+                    node = build(self._owners[name].expression)
+                resolved[name] = node
+            return node
+
+        def build(expression: Expr) -> int:
+            operation = expression[0]
+            if operation == "const":
+                return dag.add(("const", float(expression[1])))
+            if operation == "name":
+                return reference(expression[1])
+            return dag.add((operation, *(build(argument) for argument in expression[1:])))
+
+        roots = {name: build(self._by_name[name].expression) for name in outputs}
+        source, inputs = _emit(dag.nodes, roots)
+        namespace: Dict[str, Any] = {"np": np}
+        exec(compile(source, f"<analysis plan {self.equations.digest[:12]}>", "exec"), namespace)
+        return CompiledPlan(
+            outputs=tuple(roots),
+            inputs=inputs,
+            node_count=sum(node[0] not in ("const", "input") for node in dag.nodes),
+            source=source,
+            function=namespace["evaluate"],
+        )
+
+
+def _emit(nodes: Sequence[Tuple[Any, ...]], roots: Mapping[str, int]) -> Tuple[str, Tuple[str, ...]]:
+    """Straight-line source for ``roots``; dead nodes are skipped and temporaries freed after last use."""
+    live: set[int] = set()
+    pending = list(roots.values())
+    while pending:
+        node = pending.pop()
+        if node not in live:
+            live.add(node)
+            if nodes[node][0] not in ("const", "input"):
+                pending.extend(nodes[node][1:])
+
+    last_use: Dict[int, int] = {}
+    for node in sorted(live):
+        if nodes[node][0] not in ("const", "input"):
+            for argument in nodes[node][1:]:
+                last_use[argument] = node
+    kept = set(roots.values())
+
+    def operand(node: int) -> str:
+        if nodes[node][0] != "const":
+            return f"v{node}"
+        value = nodes[node][1]
+        # Parenthesised so ``-2.0 ** n`` cannot parse as ``-(2.0 ** n)``.
+        return f"({_literal(value)})" if np.signbit(value) or not np.isfinite(value) else _literal(value)
+
+    lines = ["def evaluate(columns):"]
+    inputs: List[str] = []
+    for node in sorted(live):
+        operation, *arguments = nodes[node]
+        if operation == "const":
+            if node in kept:
+                lines.append(f"    v{node} = np.float64({_literal(arguments[0])})")
+            continue
+        if operation == "input":
+            inputs.append(arguments[0])
+            lines.append(f"    v{node} = columns[{arguments[0]!r}]")
+            continue
+        lines.append(f"    v{node} = {TEMPLATES[operation].format(*(operand(argument) for argument in arguments))}")
+        released = sorted(
+            argument
+            for argument in set(arguments)
+            if last_use.get(argument) == node and argument not in kept and nodes[argument][0] != "const"
+        )
+        if released:
+            lines.append(f"    del {', '.join(f'v{argument}' for argument in released)}")
+    lines.append("    return {" + ", ".join(f"{name!r}: v{node}" for name, node in roots.items()) + "}")
+    return "\n".join(lines) + "\n", tuple(inputs)
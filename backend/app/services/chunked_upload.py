@@ -0,0 +1,170 @@
+"""Resumable chunked uploads: parts are stored as they arrive and read back as one stream.
+
+At init a client declares the file's size and gets a part size back. It then sends the file as
+``ceil(size / part_size)`` numbered parts, each with its SHA-256. Parts may arrive in any order and may
+be retried. Every part except the last is exactly ``part_size`` bytes.
+
+``store_part`` streams a part's body to document storage under ``uploads/<upload_id>/parts/<number>``.
+It keeps the part only if the part's length and hash match, so a stored part is always whole. Memory
+per part is bounded by the storage writer's buffer.
+
+``PartStreamReader`` reads the stored parts back in order as one file. If a part has not arrived yet,
+it waits for it. That lets a CSV be parsed and staged while its later parts are still being uploaded.
+The reader hashes everything it reads and checks the whole file's SHA-256 after the last part.
+An XLSX workbook is a zip whose directory sits at the end, so ``spool_parts`` copies it to a
+temporary file first and it is parsed only after the last part.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import shutil
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, Callable, Optional
+from uuid import UUID
+
+from app.services.document_storage import ArtifactStorage, StoredArtifact
+
+PART_MIME_TYPE = "application/octet-stream"
+READ_SIZE = 1024 * 1024
+
+
+class PartRejected(ValueError):
+    """A part whose number, length or SHA-256 does not match the upload."""
+
+
+@dataclass(frozen=True)
+class UploadPlan:
+    size: int
+    part_size: int
+
+    @property
+    def part_count(self) -> int:
+        return max(-(-self.size // self.part_size), 1)
+
+    def part_length(self, number: int) -> int:
+        """Expected byte length of part ``number`` (1-based)."""
+        if not 1 <= number <= self.part_count:
+            raise PartRejected(f"Part {number} is outside 1..{self.part_count}.")
+        if number < self.part_count:
+            return self.part_size
+        return self.size - self.part_size * (self.part_count - 1)
+
+
+def part_key(upload_id: UUID, number: int) -> str:
+    return f"uploads/{upload_id}/parts/{number:06d}"
+
+
+async def store_part(
+    storage: ArtifactStorage,
+    key: str,
+    chunks: AsyncIterator[bytes],
+    *,
+    expected_length: int,
+    expected_sha256: str,
+) -> StoredArtifact:
+    """Stream ``chunks`` to ``key``; an oversized, short or mismatched part is discarded and rejected."""
+    writer = await asyncio.to_thread(storage.open_writer, key, PART_MIME_TYPE)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async for data in chunks:
+            size += len(data)
+            if size > expected_length:
+                raise PartRejected(f"Part is longer than the expected {expected_length} bytes.")
+            digest.update(data)
+            await asyncio.to_thread(writer.write, data)
+        if size != expected_length:
+            raise PartRejected(f"Part has {size} bytes; expected {expected_length}.")
+        if digest.hexdigest() != expected_sha256.lower():
+            raise PartRejected("Part SHA-256 does not match.")
+    except BaseException:
+        await asyncio.to_thread(writer.abort)
+        raise
+    return await asyncio.to_thread(writer.close)
+
+
+class PartStreamReader(io.RawIOBase):
+    """The parts of an upload read in order as one file, waiting for parts that are still missing.
+
+    Reading fails with ``TimeoutError`` when no new part arrives within ``wait_seconds``. When
+    ``expected_sha256`` is given, it fails with ``PartRejected`` at the end of the last part if the
+    whole file's hash differs.
+    """
+
+    def __init__(
+        self,
+        storage: ArtifactStorage,
+        upload_id: UUID,
+        part_count: int,
+        *,
+        expected_sha256: Optional[str] = None,
+        wait_seconds: float = 900.0,
+        poll_seconds: float = 0.5,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self._storage = storage
+        self._upload_id = upload_id
+        self._part_count = part_count
+        self._expected_sha256 = expected_sha256.lower() if expected_sha256 else None
+        self._wait_seconds = wait_seconds
+        self._poll_seconds = poll_seconds
+        self._sleep = sleep
+        self._clock = clock
+        self._number = 1
+        self._part: Optional[BinaryIO] = None
+        self._digest = hashlib.sha256()
+        self._last_progress = clock()
+        self.size = 0
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    def readable(self) -> bool:
+        return True
+
+    def _open_next(self) -> bool:
+        if self._number > self._part_count:
+            return False
+        while (part := self._storage.open_reader(part_key(self._upload_id, self._number))) is None:
+            if self._clock() - self._last_progress > self._wait_seconds:
+                raise TimeoutError(f"Part {self._number} of upload {self._upload_id} did not arrive.")
+            self._sleep(self._poll_seconds)
+        self._part = part
+        return True
+
+    def readinto(self, buffer: memoryview) -> int:
+        while True:
+            if self._part is None and not self._open_next():
+                return 0
+            data = self._part.read(len(buffer))
+            if data:
+                buffer[: len(data)] = data
+                self._digest.update(data)
+                self.size += len(data)
+                self._last_progress = self._clock()
+                return len(data)
+            self._part.close()
+            self._part = None
+            self._number += 1
+            if self._number > self._part_count and self._expected_sha256 not in (None, self.sha256):
+                raise PartRejected("Upload SHA-256 does not match the assembled parts.")
+
+    def close(self) -> None:
+        if self._part is not None:
+            self._part.close()
+            self._part = None
+        super().close()
+
+
+def spool_parts(reader: PartStreamReader, target: BinaryIO) -> int:
+    """Copy every part into ``target`` (a temporary file, say) and rewind it; returns the byte count."""
+    shutil.copyfileobj(reader, target, READ_SIZE)
+    target.seek(0)
+    return reader.size
@@ -0,0 +1,444 @@
+"""Column mapping for uploaded lead lists (``suggest_mapping``), cached by header fingerprint.
+
+Every lead vendor has its own header layout: ``Phone 1``–``Phone 4`` in one export, three ``Email``
+columns and no phones in another, a 52-column Property Export from a third. A layout's fingerprint is
+the SHA-256 of its normalised, de-duplicated headers in order. The mapping of a known layout is
+therefore a dictionary lookup.
+
+``ColumnMapper.suggest`` resolves a layout with the cheapest source that can answer. Each column
+keeps the first answer it gets:
+
+1. The in-process LRU of recent layouts (``COLUMN_MAPPING_CACHE_SIZE``), for a confirmed mapping.
+2. A mapping confirmed earlier, from ``column_mappings``, possibly by another worker. Failing that,
+   an unconfirmed suggestion from the LRU, so a layout is not resolved twice.
+3. Heuristics, column by column:
+   * an exact alias of a ``LEAD_FIELDS`` entry or of a known-irrelevant header;
+   * a close alias by string similarity;
+   * the shape of the sample values (e-mail addresses, phone numbers).
+4. Embedding similarity between a header and each field's description, at or above
+   ``COLUMN_MAPPING_EMBEDDING_MIN_SIMILARITY``.
+5. One LLM call for the columns still open, when ``COLUMN_MAPPING_USE_LLM`` is set.
+
+Steps 4 and 5 need a provider. Without one, the columns left open stay unmapped. A suggestion made
+while the provider was failing is not cached, so those steps run again for the next request.
+
+``confirm`` stores a reviewed mapping under its fingerprint. Later uploads with the same layout then
+skip every step after the cache.
+
+Mappings are positional, one field (or ``None``) per column. Headers that only differ in case or
+punctuation share a fingerprint. Repeatable fields (``phone``, ``do_not_call``, ``email``) may take any
+number of columns, in column order; every other field takes at most one.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+import orjson
+import structlog
+
+from app.ai.scheduler import LLMProvider
+from app.services.tabular_readers import header_names
+
+logger = structlog.get_logger(__name__)
+
+FUZZY_CUTOFF = 0.86
+VALUE_MATCH_RATIO = 0.8
+LLM_SAMPLE_VALUES = 3
+LLM_MAX_OUTPUT_TOKENS = 800
+# The LLM gives no score of its own; its answers rank below every measured match.
+LLM_CONFIDENCE = 0.5
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_TRAILING_INDEX = re.compile(r"(?:\s+\d+)+$")
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[a-z]{2,}", re.IGNORECASE)
+_PHONE_DIGITS = re.compile(r"\D+")
+
+
+@dataclass(frozen=True)
+class LeadField:
+    name: str
+    description: str
+    aliases: Tuple[str, ...] = ()
+    repeated: bool = False
+
+
+LEAD_FIELDS: Tuple[LeadField, ...] = (
+    LeadField(
+        "owner_first_name", "First name of the property owner", ("first name", "owner first name", "owner 1 first name")
+    ),
+    LeadField(
+        "owner_last_name", "Last name of the property owner", ("last name", "owner last name", "owner 1 last name")
+    ),
+    LeadField("co_owner_first_name", "First name of the second owner", ("owner 2 first name",)),
+    LeadField("co_owner_last_name", "Last name of the second owner", ("owner 2 last name",)),
+    LeadField("owner_name", "Full name of the owner", ("owner name", "owner", "full name", "name")),
+    LeadField(
+        "company_name",
+        "Company or entity that owns the property",
+        ("company name", "company", "business name", "entity name"),
+    ),
+    LeadField("contact_type", "Kind of contact, such as owner or tenant", ("type", "contact type")),
+    LeadField("lead_status", "Workflow status of the lead", ("status", "lead status")),
+    LeadField(
+        "street_address",
+        "Street address of the property",
+        ("street address", "address", "property address", "situs address", "site address"),
+    ),
+    LeadField("unit", "Unit or apartment number of the property", ("unit", "apt", "suite")),
+    LeadField("city", "City of the property", ("city", "property city")),
+    LeadField("state", "State of the property", ("state", "property state")),
+    LeadField("zip_code", "ZIP code of the property", ("zip", "zip code", "zipcode", "postal code", "property zip")),
+    LeadField("county", "County of the property", ("county", "property county")),
+    LeadField("apn", "Assessor parcel number", ("apn", "parcel", "parcel id", "parcel number", "account number")),
+    LeadField("owner_occupied", "Whether the owner lives at the property", ("owner occupied",)),
+    LeadField("mailing_care_of", "Care-of name on the mailing address", ("mailing care of name", "care of")),
+    LeadField(
+        "mailing_address",
+        "Owner's mailing street address",
+        ("mail street address", "mailing address", "mail address", "mailing street address"),
+    ),
+    LeadField("mailing_unit", "Unit number of the mailing address", ("mailing unit", "mail unit")),
+    LeadField("mailing_city", "City of the mailing address", ("mail city", "mailing city")),
+    LeadField("mailing_state", "State of the mailing address", ("mail state", "mailing state")),
+    LeadField("mailing_zip", "ZIP code of the mailing address", ("mail zip", "mailing zip", "mailing zip code")),
+    LeadField("mailing_county", "County of the mailing address", ("mailing county",)),
+    LeadField(
+        "mailing_same_as_property",
+        "Whether the mailing address is the property address",
+        ("mail address same", "mailing address same"),
+    ),
+    LeadField("do_not_mail", "Do-not-mail flag", ("do not mail",)),
+    LeadField("property_type", "Property type, such as single family", ("property type", "land use")),
+    LeadField("bedrooms", "Number of bedrooms", ("bedrooms", "beds")),
+    LeadField("bathrooms", "Number of bathrooms", ("total bathrooms", "bathrooms", "baths")),
+    LeadField("building_sqft", "Building living area in square feet", ("building sqft", "living area", "sqft")),
+    LeadField("land_sqft", "Lot size in square feet", ("lot size sqft", "lot sqft", "land sqft", "lot size")),
+    LeadField("year_built", "Year the building was built", ("year built", "effective year built")),
+    LeadField("assessed_value", "Total assessed value", ("total assessed value", "assessed value")),
+    LeadField("last_sale_date", "Date of the last sale", ("last sale recording date", "last sale date", "sale date")),
+    LeadField("last_sale_amount", "Price of the last sale", ("last sale amount", "last sale price", "sale price")),
+    LeadField("open_loan_count", "Number of open loans", ("total open loans", "open loans")),
+    LeadField(
+        "open_loan_balance",
+        "Estimated balance of open loans",
+        ("est remaining balance of open loans", "loan balance", "mortgage balance"),
+    ),
+    LeadField("estimated_value", "Estimated market value", ("est value", "estimated value", "market value", "avm")),
+    LeadField("loan_to_value", "Estimated loan-to-value ratio", ("est loan to value", "loan to value", "ltv")),
+    LeadField("estimated_equity", "Estimated equity", ("est equity", "estimated equity", "equity")),
+    LeadField("property_condition", "Overall property condition", ("total condition", "condition")),
+    LeadField("foreclosure_factor", "Foreclosure status or likelihood", ("foreclosure factor",)),
+    LeadField("mls_status", "Listing status on the MLS", ("mls status",)),
+    LeadField("mls_date", "Date of the MLS listing status", ("mls date",)),
+    LeadField("mls_amount", "MLS listing price", ("mls amount", "list price")),
+    LeadField(
+        "lien_amount",
+        "Delinquent tax or lien amount",
+        ("lien amount", "amount due", "delinquent amount", "tax amount due"),
+    ),
+    LeadField(
+        "phone", "Phone number of the contact", ("phone", "cell", "landline", "mobile", "phone number"), repeated=True
+    ),
+    LeadField("do_not_call", "Do-not-call flag for the preceding phone", ("dnc", "do not call"), repeated=True),
+    LeadField("email", "E-mail address of the contact", ("email", "e mail", "email address"), repeated=True),
+)
+FIELDS_BY_NAME: Dict[str, LeadField] = {field.name: field for field in LEAD_FIELDS}
+
+# Headers that carry no lead data (vendor marketing counters and bookkeeping); they map to ``None``.
+IGNORED_HEADERS = (
+    "marketing lists",
+    "marketing campaigns",
+    "voicemail drops",
+    "postcards",
+    "e mails",
+    "skip traces",
+    "date added to list",
+    "method of add",
+    "interior condition",
+    "exterior condition",
+    "bathroom condition",
+    "kitchen condition",
+)
+_IGNORED = "__ignored__"
+
+
+def _build_alias_index() -> Dict[str, str]:
+    index = {alias: _IGNORED for alias in IGNORED_HEADERS}
+    for field in LEAD_FIELDS:
+        for alias in (field.name.replace("_", " "), *field.aliases):
+            index.setdefault(alias, field.name)
+    return index
+
+
+_ALIASES = _build_alias_index()
+_ALIAS_KEYS = list(_ALIASES)
+
+
+# Vendors reuse the same header strings; memoising keeps a known layout's fingerprint a few hashes.
+@lru_cache(maxsize=8_192)
+def normalize_header(header: str) -> str:
+    """Lower-case words only: ``"Est. Loan-to-Value"`` → ``"est loan to value"``; ``"DNC.1"`` → ``"dnc 1"``."""
+    return _NON_ALNUM.sub(" ", header.lower()).strip()
+
+
+def header_fingerprint(headers: Sequence[Optional[str]]) -> str:
+    normalized = map(normalize_header, header_names(headers))
+    return hashlib.sha256("\x1f".join(normalized).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class ColumnSuggestion:
+    column: str
+    field: Optional[str]
+    # ``confirmed``, ``alias``, ``fuzzy``, ``values``, ``embedding``, ``llm`` or ``unmapped``.
+    source: str
+    confidence: float
+
+
+@dataclass(frozen=True)
+class MappingSuggestion:
+    fingerprint: str
+    columns: Tuple[ColumnSuggestion, ...]
+    confirmed: bool = False
+    cached: bool = False
+
+    @property
+    def mapping(self) -> Dict[str, Optional[str]]:
+        return {column.column: column.field for column in self.columns}
+
+    def for_headers(self, columns: Sequence[str]) -> "MappingSuggestion":
+        """The same mapping labelled with another spelling of the layout's headers."""
+        if all(column == suggestion.column for column, suggestion in zip(columns, self.columns)):
+            return replace(self, cached=True)
+        relabelled = tuple(replace(suggestion, column=column) for column, suggestion in zip(columns, self.columns))
+        return replace(self, columns=relabelled, cached=True)
+
+
+class ColumnMappingStore(Protocol):
+    async def get(self, fingerprint: str) -> Optional[List[Optional[str]]]: ...
+
+    async def save(self, fingerprint: str, headers: Sequence[str], fields: Sequence[Optional[str]]) -> None: ...
+
+
+def _alias_match(normalized: str) -> Optional[Tuple[str, str, float]]:
+    field = _ALIASES.get(normalized)
+    if field is None:
+        base = _TRAILING_INDEX.sub("", normalized)
+        field = _ALIASES.get(base) if base != normalized else None
+        if field is not None and field != _IGNORED and not FIELDS_BY_NAME[field].repeated:
+            field = None
+    if field is not None:
+        return field, "alias", 1.0
+    close = difflib.get_close_matches(normalized, _ALIAS_KEYS, n=1, cutoff=FUZZY_CUTOFF)
+    if close:
+        return _ALIASES[close[0]], "fuzzy", round(difflib.SequenceMatcher(None, normalized, close[0]).ratio(), 3)
+    return None
+
+
+def _value_match(values: Sequence[str]) -> Optional[Tuple[str, str, float]]:
+    if not values:
+        return None
+    emails = sum(bool(_EMAIL.fullmatch(value)) for value in values)
+    if emails / len(values) >= VALUE_MATCH_RATIO:
+        return "email", "values", round(emails / len(values), 3)
+    phones = sum(len(_PHONE_DIGITS.sub("", value).lstrip("1")) == 10 for value in values)
+    if phones / len(values) >= VALUE_MATCH_RATIO:
+        return "phone", "values", round(phones / len(values), 3)
+    return None
+
+
+def _column_values(sample_rows: Sequence[Sequence[Optional[str]]], index: int) -> List[str]:
+    return [row[index].strip() for row in sample_rows if index < len(row) and row[index] and row[index].strip()]
+
+
+class ColumnMapper:
+    def __init__(
+        self,
+        store: ColumnMappingStore,
+        *,
+        provider: Optional[LLMProvider] = None,
+        cache_size: int = 1_024,
+        embedding_min_similarity: float = 0.55,
+        use_llm: bool = True,
+    ) -> None:
+        self._store = store
+        self._provider = provider
+        self._cache_size = cache_size
+        self._embedding_min_similarity = embedding_min_similarity
+        self._use_llm = use_llm
+        self._cache: "OrderedDict[str, MappingSuggestion]" = OrderedDict()
+        self._field_vectors: Any = None
+
+    def _remember(self, suggestion: MappingSuggestion) -> None:
+        self._cache[suggestion.fingerprint] = suggestion
+        self._cache.move_to_end(suggestion.fingerprint)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def suggest(
+        self, headers: Sequence[Optional[str]], sample_rows: Sequence[Sequence[Optional[str]]] = ()
+    ) -> MappingSuggestion:
+        """A field (or ``None``) for every column of ``headers``; ``sample_rows`` are in the same column order."""
+        columns = header_names(headers)
+        fingerprint = header_fingerprint(columns)
+        hit = self._cache.get(fingerprint)
+        if hit is not None and hit.confirmed:
+            self._cache.move_to_end(fingerprint)
+            return hit.for_headers(columns)
+
+        # Another worker may have confirmed the layout since it was resolved here.
+        stored = await self._store.get(fingerprint)
+        if stored is not None and len(stored) == len(columns):
+            suggestion = MappingSuggestion(
+                fingerprint,
+                tuple(ColumnSuggestion(column, field, "confirmed", 1.0) for column, field in zip(columns, stored)),
+                confirmed=True,
+            )
+        elif hit is not None:
+            self._cache.move_to_end(fingerprint)
+            return hit.for_headers(columns)
+        else:
+            resolved, complete = await self._resolve(columns, sample_rows)
+            suggestion = MappingSuggestion(fingerprint, resolved)
+            if not complete:
+                # The model-backed steps failed; the next request for this layout tries them again.
+                return suggestion
+        self._remember(suggestion)
+        return suggestion
+
+    async def confirm(
+        self, headers: Sequence[Optional[str]], mapping: Dict[str, Optional[str]]
+    ) -> MappingSuggestion:
+        """Persist a reviewed mapping for the layout; columns missing from ``mapping`` are unmapped."""
+        columns = header_names(headers)
+        unknown_columns = set(mapping) - set(columns)
+        if unknown_columns:
+            raise ValueError(f"Mapping names columns that are not in the headers: {sorted(unknown_columns)}.")
+        fields = [mapping.get(column) for column in columns]
+        self._check_fields(fields)
+        fingerprint = header_fingerprint(columns)
+        await self._store.save(fingerprint, list(columns), fields)
+        suggestion = MappingSuggestion(
+            fingerprint,
+            tuple(ColumnSuggestion(column, field, "confirmed", 1.0) for column, field in zip(columns, fields)),
+            confirmed=True,
+        )
+        self._remember(suggestion)
+        logger.info("column_mapping.confirmed", fingerprint=fingerprint, columns=len(columns))
+        return suggestion
+
+    @staticmethod
+    def _check_fields(fields: Iterable[Optional[str]]) -> None:
+        seen = set()
+        for field in fields:
+            if field is None:
+                continue
+            if field not in FIELDS_BY_NAME:
+                raise ValueError(f"Unknown lead field '{field}'.")
+            if field in seen and not FIELDS_BY_NAME[field].repeated:
+                raise ValueError(f"Lead field '{field}' is mapped to more than one column.")
+            seen.add(field)
+
+    async def _resolve(
+        self, columns: Sequence[str], sample_rows: Sequence[Sequence[Optional[str]]]
+    ) -> Tuple[Tuple[ColumnSuggestion, ...], bool]:
+        """One suggestion per column, and whether every step that was tried completed."""
+        resolved: Dict[int, ColumnSuggestion] = {}
+        taken = set()
+
+        def assign(index: int, field: Optional[str], source: str, confidence: float) -> bool:
+            if field is not None and field != _IGNORED and field in taken and not FIELDS_BY_NAME[field].repeated:
+                return False
+            if field is not None and field != _IGNORED:
+                taken.add(field)
+            resolved[index] = ColumnSuggestion(columns[index], None if field == _IGNORED else field, source, confidence)
+            return True
+
+        for index, column in enumerate(columns):
+            match = _alias_match(normalize_header(column)) or _value_match(_column_values(sample_rows, index))
+            if match is not None:
+                assign(index, *match)
+
+        open_columns = [index for index in range(len(columns)) if index not in resolved]
+        complete = True
+        try:
+            if open_columns and self._provider is not None:
+                for index, field, similarity in await self._embedding_matches([columns[i] for i in open_columns]):
+                    assign(open_columns[index], field, "embedding", similarity)
+                open_columns = [index for index in open_columns if index not in resolved]
+                if open_columns and self._use_llm:
+                    for index, field in (await self._llm_matches(columns, open_columns, sample_rows)).items():
+                        assign(index, field, "llm", LLM_CONFIDENCE)
+        except Exception as exc:
+            # A suggestion is still useful without the model-backed steps; open columns stay unmapped.
+            logger.warning("column_mapping.provider_failed", error=repr(exc), open_columns=len(open_columns))
+            complete = False
+
+        logger.info(
+            "column_mapping.resolved",
+            columns=len(columns),
+            sources=dict(Counter(suggestion.source for suggestion in resolved.values())),
+        )
+        suggestions = tuple(
+            resolved.get(index) or ColumnSuggestion(column, None, "unmapped", 0.0)
+            for index, column in enumerate(columns)
+        )
+        return suggestions, complete
+
+    async def _embedding_matches(self, headers: Sequence[str]) -> List[Tuple[int, str, float]]:
+        import numpy as np  # NumPy stays out of API start-up
+
+        if self._field_vectors is None:
+            response = await self._provider.create_embeddings([field.description for field in LEAD_FIELDS])
+            self._field_vectors = _unit_rows(np.asarray(response["embeddings"], dtype=np.float32))
+        response = await self._provider.create_embeddings(list(headers))
+        similarities = _unit_rows(np.asarray(response["embeddings"], dtype=np.float32)) @ self._field_vectors.T
+        matches = []
+        for index, row in enumerate(similarities):
+            best = int(row.argmax())
+            if row[best] >= self._embedding_min_similarity:
+                matches.append((index, LEAD_FIELDS[best].name, round(float(row[best]), 3)))
+        return matches
+
+    async def _llm_matches(
+        self, columns: Sequence[str], open_columns: Sequence[int], sample_rows: Sequence[Sequence[Optional[str]]]
+    ) -> Dict[int, Optional[str]]:
+        described = {
+            columns[index]: _column_values(sample_rows, index)[:LLM_SAMPLE_VALUES] for index in open_columns
+        }
+        prompt = (
+            "Map spreadsheet columns of a real-estate lead list to lead fields.\n"
+            f"Fields: {', '.join(field.name for field in LEAD_FIELDS)}.\n"
+            "Columns with sample values:\n"
+            f"{orjson.dumps(described).decode('utf-8')}\n"
+            "Answer with one JSON object from column name to field name, or null when no field fits."
+        )
+        response = await self._provider.generate_text(prompt, temperature=0.0, max_output_tokens=LLM_MAX_OUTPUT_TOKENS)
+        content = response.get("content") or ""
+        try:
+            answer = orjson.loads(content[content.index("{") : content.rindex("}") + 1])
+        except (ValueError, orjson.JSONDecodeError):
+            logger.warning("column_mapping.llm_unparseable", columns=len(open_columns))
+            return {}
+        if not isinstance(answer, dict):
+            return {}
+        by_column = {columns[index]: index for index in open_columns}
+        return {
+            by_column[column]: field if field in FIELDS_BY_NAME else None
+            for column, field in answer.items()
+            if column in by_column
+        }
+
+
+def _unit_rows(matrix: Any) -> Any:
+    import numpy as np  # NumPy stays out of API start-up
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
@@ -0,0 +1,239 @@
+"""Streaming encoders for ranked-deal exports: CSV, XLSX and Parquet.
+
+``encode_export`` takes row batches from a server-side cursor and yields encoded bytes as it goes.
+Nothing holds more than one batch, so memory stays flat for runs of millions of rows:
+
+* CSV: each batch becomes a block of lines.
+* XLSX: openpyxl's write-only workbook streams each sheet's XML to a temporary file. The zip is
+  assembled from those files when the rows run out and then read back in ``READ_SIZE`` pieces. An
+  XLSX body therefore starts only after the last row. A sheet holds at most ``XLSX_MAX_ROWS`` rows,
+  so longer exports continue on ``Ranked deals 2``, ``Ranked deals 3`` and so on.
+* Parquet: each batch is written as one row group. Decimal, integer and timestamp columns keep
+  their database types. This needs the optional ``pyarrow`` package.
+
+Encoders are synchronous. ``encode_export`` runs them in a worker thread so the event loop stays free.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import enum
+import io
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Protocol, Sequence
+from uuid import UUID
+
+from sqlalchemy import DateTime, Float, Integer, Numeric
+
+READ_SIZE = 1024 * 1024
+XLSX_MAX_ROWS = 1_048_576
+XLSX_SHEET_TITLE = "Ranked deals"
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    name: str
+    media_type: str
+    extension: str
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "csv": ExportFormat("csv", "text/csv; charset=utf-8", ".csv"),
+    "xlsx": ExportFormat("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx"),
+    "parquet": ExportFormat("parquet", "application/vnd.apache.parquet", ".parquet"),
+}
+
+
+class ExportEncoder(Protocol):
+    def write(self, rows: Sequence[Sequence[Any]]) -> bytes: ...
+
+    def finish(self) -> Iterator[bytes]: ...
+
+    def abort(self) -> None: ...
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _excel(value: Any) -> Any:
+    # Excel has no time zones: timestamps are written as naive UTC.
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return _plain(value)
+
+
+class CsvEncoder:
+    def __init__(self, names: Sequence[str]) -> None:
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._writer.writerow(names)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def write(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        self._writer.writerows([_plain(value) for value in row] for row in rows)
+        return self._drain()
+
+    def finish(self) -> Iterator[bytes]:
+        data = self._drain()
+        if data:
+            yield data
+
+    def abort(self) -> None:
+        self._buffer.close()
+
+
+class XlsxEncoder:
+    def __init__(self, names: Sequence[str], max_rows: int = XLSX_MAX_ROWS) -> None:
+        from openpyxl import Workbook
+
+        self._names = list(names)
+        self._max_rows = max_rows
+        self._workbook = Workbook(write_only=True)
+        self._sheet: Any = None
+        self._sheet_rows = 0
+
+    def _next_sheet(self) -> None:
+        number = len(self._workbook.worksheets) + 1
+        title = XLSX_SHEET_TITLE if number == 1 else f"{XLSX_SHEET_TITLE} {number}"
+        self._sheet = self._workbook.create_sheet(title)
+        self._sheet.append(self._names)
+        self._sheet_rows = 1
+
+    def write(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        for row in rows:
+            if self._sheet is None or self._sheet_rows >= self._max_rows:
+                self._next_sheet()
+            self._sheet.append([_excel(value) for value in row])
+            self._sheet_rows += 1
+        return b""
+
+    def finish(self) -> Iterator[bytes]:
+        if self._sheet is None:
+            self._next_sheet()
+        with tempfile.TemporaryFile() as output:
+            self._workbook.save(output)
+            output.seek(0)
+            while data := output.read(READ_SIZE):
+                yield data
+
+    def abort(self) -> None:
+        # Write-only sheets keep their XML in temporary files until the workbook is saved.
+        # Closing the sheet first ends its XML cleanly; the file can then be removed.
+        for sheet in self._workbook.worksheets:
+            if not sheet.closed:
+                sheet.close()
+                sheet._writer.cleanup()
+
+
+class _ByteSink:
+    """Minimal writable file for pyarrow; ``drain`` hands over what was written since the last call."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: Any) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _arrow_type(column: Any, pa: Any) -> Any:
+    column_type = column.type
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Numeric) and column_type.precision is not None:
+        return pa.decimal128(column_type.precision, column_type.scale or 0)
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    return pa.string()
+
+
+class ParquetEncoder:
+    def __init__(self, columns: Sequence[Any]) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("Parquet exports require the pyarrow package.") from exc
+        self._pa = pa
+        self._schema = pa.schema([pa.field(column.name, _arrow_type(column, pa)) for column in columns])
+        self._sink = _ByteSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="zstd")
+
+    def write(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        if not rows:
+            return b""
+        arrays = [
+            self._pa.array([_plain(row[index]) for row in rows], type=field.type)
+            for index, field in enumerate(self._schema)
+        ]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+        return self._sink.drain()
+
+    def finish(self) -> Iterator[bytes]:
+        self._writer.close()
+        yield self._sink.drain()
+
+    def abort(self) -> None:
+        self._writer.close()
+
+
+def open_encoder(format_name: str, columns: Sequence[Any]) -> ExportEncoder:
+    """Encoder for ``format_name``; ``columns`` are the selected SQLAlchemy columns, in row order."""
+    names = [column.name for column in columns]
+    if format_name == "csv":
+        return CsvEncoder(names)
+    if format_name == "xlsx":
+        return XlsxEncoder(names)
+    if format_name == "parquet":
+        return ParquetEncoder(columns)
+    raise ValueError(f"Unknown export format '{format_name}'.")
+
+
+async def encode_export(
+    batches: AsyncIterator[Sequence[Any]],
+    encoder: ExportEncoder,
+    on_rows: Optional[Callable[[int], None]] = None,
+) -> AsyncIterator[bytes]:
+    """Encoded bytes for every batch, then the format's trailer; the encoder is aborted on failure."""
+    finished = False
+    try:
+        async for rows in batches:
+            data = await asyncio.to_thread(encoder.write, rows)
+            if on_rows is not None:
+                on_rows(len(rows))
+            if data:
+                yield data
+        trailer = encoder.finish()
+        while (data := await asyncio.to_thread(next, trailer, None)) is not None:
+            yield data
+        finished = True
+    finally:
+        if not finished:
+            encoder.abort()
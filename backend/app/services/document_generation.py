@@ -0,0 +1,205 @@
+"""Document generation from compiled templates, one at a time or as process-parallel batches.
+
+A ``RenderJob`` names a template, its context and the artifact key to write. Rendering streams the
+template's output through a small buffer straight into an ``ArtifactWriter``, so no artifact is
+built as one string.
+
+``render_batch`` spreads jobs over a process pool (``DOCUMENT_RENDER_WORKERS``, default one per
+core). Each worker builds its own ``TemplateRegistry`` and storage client once, in the pool
+initializer. Data common to every job (e.g. the top-50 deal table rendered for 500 investors) is
+passed once as ``shared_context`` rather than pickled into each job. Templates are compiled in the
+parent first: unknown keys fail the batch before any worker starts, and with a bytecode cache the
+workers load compiled code instead of parsing. A failing job is reported on its artifact and does not
+stop the batch.
+
+Batch worker processes cannot be started from daemonic processes (Celery's prefork pool children),
+so there the batch renders in-process. ``generate_documents`` is therefore routed to
+``DOCUMENT_GENERATION_QUEUE``, whose worker runs ``--pool=solo`` and takes the parallel path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import structlog
+
+from app.core.config import settings
+from app.core.tracing import traced_stage
+from app.services.document_storage import ArtifactStorage, StorageConfig, build_storage
+from app.services.document_templates import TemplateRegistry
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "documents"
+WRITE_BUFFER_CHARS = 64 * 1024
+EXTENSIONS_BY_MIME = {"text/html": ".html", "text/markdown": ".md", "text/plain": ".txt"}
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    template_key: str
+    context: Dict[str, Any]
+    output_name: str
+
+
+@dataclass(frozen=True)
+class RenderedArtifact:
+    output_name: str
+    template_key: str
+    template_version: Optional[str] = None
+    storage_url: Optional[str] = None
+    mime_type: Optional[str] = None
+    size: int = 0
+    sha256: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def artifact_key(template_key: str, version: str, output_name: str, mime_type: str) -> str:
+    """``<template_key>/<version>/<output_name><ext>``; the version keeps re-renders of edited templates apart."""
+    return f"{template_key}/{version}/{output_name}{EXTENSIONS_BY_MIME.get(mime_type, '')}"
+
+
+def render_to_storage(
+    registry: TemplateRegistry,
+    storage: ArtifactStorage,
+    job: RenderJob,
+    shared_context: Optional[Mapping[str, Any]] = None,
+) -> RenderedArtifact:
+    compiled = registry.get(job.template_key)
+    context = {**shared_context, **job.context} if shared_context else job.context
+    key = artifact_key(job.template_key, compiled.version, job.output_name, compiled.mime_type)
+    writer = storage.open_writer(key, compiled.mime_type)
+    try:
+        pending: List[str] = []
+        buffered = 0
+        for piece in compiled.stream(context):
+            pending.append(piece)
+            buffered += len(piece)
+            if buffered >= WRITE_BUFFER_CHARS:
+                writer.write("".join(pending).encode("utf-8"))
+                pending, buffered = [], 0
+        if pending:
+            writer.write("".join(pending).encode("utf-8"))
+        stored = writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    return RenderedArtifact(
+        output_name=job.output_name,
+        template_key=job.template_key,
+        template_version=compiled.version,
+        storage_url=stored.url,
+        mime_type=compiled.mime_type,
+        size=stored.size,
+        sha256=stored.sha256,
+    )
+
+
+def _render_or_report(
+    registry: TemplateRegistry, storage: ArtifactStorage, job: RenderJob, shared_context: Optional[Mapping[str, Any]]
+) -> RenderedArtifact:
+    try:
+        return render_to_storage(registry, storage, job, shared_context)
+    except Exception as exc:
+        return RenderedArtifact(output_name=job.output_name, template_key=job.template_key, error=repr(exc))
+
+
+# Per-process state for pool workers, set once by ``_init_worker``.
+_worker_registry: Optional[TemplateRegistry] = None
+_worker_storage: Optional[ArtifactStorage] = None
+_worker_shared: Optional[Mapping[str, Any]] = None
+
+
+def _init_worker(
+    template_dir: str, bytecode_dir: Optional[str], storage_config: StorageConfig, shared: Optional[Mapping[str, Any]]
+) -> None:
+    global _worker_registry, _worker_storage, _worker_shared
+    _worker_registry = TemplateRegistry(template_dir, bytecode_dir=bytecode_dir)
+    _worker_storage = build_storage(storage_config)
+    _worker_shared = shared
+
+
+def _render_in_worker(job: RenderJob) -> RenderedArtifact:
+    return _render_or_report(_worker_registry, _worker_storage, job, _worker_shared)
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    # forkserver children start from a clean single-threaded server, not from a process running an event loop.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class DocumentGenerator:
+    def __init__(
+        self,
+        *,
+        template_dir: str | Path | None = None,
+        bytecode_dir: Optional[str] = None,
+        storage_config: StorageConfig | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        self._template_dir = str(template_dir or settings.DOCUMENT_TEMPLATE_DIR or DEFAULT_TEMPLATE_DIR)
+        self._bytecode_dir = bytecode_dir or settings.DOCUMENT_TEMPLATE_BYTECODE_DIR
+        self._storage_config = storage_config or StorageConfig.from_settings()
+        self._max_workers = max_workers or settings.DOCUMENT_RENDER_WORKERS or os.cpu_count() or 1
+        self.registry = TemplateRegistry(self._template_dir, bytecode_dir=self._bytecode_dir)
+        self._storage = build_storage(self._storage_config)
+
+    def render(self, job: RenderJob, *, shared_context: Optional[Mapping[str, Any]] = None) -> RenderedArtifact:
+        return render_to_storage(self.registry, self._storage, job, shared_context)
+
+    async def render_async(self, job: RenderJob) -> RenderedArtifact:
+        return await asyncio.to_thread(self.render, job)
+
+    def render_batch(
+        self,
+        jobs: Sequence[RenderJob],
+        *,
+        shared_context: Optional[Mapping[str, Any]] = None,
+        max_workers: int | None = None,
+    ) -> List[RenderedArtifact]:
+        if not jobs:
+            return []
+        for template_key in {job.template_key for job in jobs}:
+            self.registry.get(template_key)
+
+        workers = min(max_workers or self._max_workers, len(jobs))
+        if workers > 1 and multiprocessing.current_process().daemon:
+            logger.warning("document_batch_in_process", reason="daemonic process cannot start a pool", jobs=len(jobs))
+            workers = 1
+
+        started = time.perf_counter()
+        with traced_stage("generation.render", documents=len(jobs), workers=workers):
+            if workers <= 1:
+                artifacts = [_render_or_report(self.registry, self._storage, job, shared_context) for job in jobs]
+            else:
+                initargs = (self._template_dir, self._bytecode_dir, self._storage_config, shared_context)
+                with ProcessPoolExecutor(
+                    max_workers=workers, mp_context=_pool_context(), initializer=_init_worker, initargs=initargs
+                ) as pool:
+                    # Several jobs per task amortise pickling; four tasks per worker keeps the tail balanced.
+                    chunksize = max(1, len(jobs) // (workers * 4))
+                    artifacts = list(pool.map(_render_in_worker, jobs, chunksize=chunksize))
+
+        elapsed = time.perf_counter() - started
+        failed = sum(not artifact.ok for artifact in artifacts)
+        logger.info(
+            "document_batch_rendered",
+            documents=len(artifacts),
+            failed=failed,
+            workers=workers,
+            seconds=round(elapsed, 3),
+            documents_per_second=round(len(artifacts) / elapsed, 1) if elapsed else None,
+        )
+        return artifacts
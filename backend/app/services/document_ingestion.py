@@ -0,0 +1,196 @@
+"""Streaming ingestion of corpus documents into chunk rows and chunk embeddings.
+
+For each document the pipeline:
+
+1. hashes the source file and stops if it matches the hash recorded by the previous ingestion,
+2. extracts and chunks text in a worker thread, ``DOCUMENT_EMBEDDING_BATCH_SIZE`` chunks at a time,
+3. drops chunks whose content hash is already embedded (in this document or any other),
+4. embeds the remaining chunks in batches, overlapping embedding calls with further extraction,
+5. upserts the document's chunk rows and records the new source hash in one transaction.
+
+Re-uploading an edited document therefore only embeds chunks whose text actually changed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterator, List, Optional, Sequence, Set
+from uuid import UUID
+
+import structlog
+
+from app.ai.scheduler import LLMProvider
+from app.core.config import settings
+from app.core.tracing import traced_stage
+from app.repositories.document_corpus import DocumentCorpusRepository
+from app.services.document_text import (
+    DocumentSource,
+    TextChunk,
+    chunk_sections,
+    detect_format,
+    extract_sections,
+    hash_source,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class IngestionResult:
+    document_id: UUID
+    chunk_count: int = 0
+    embedded_chunks: int = 0
+    reused_chunks: int = 0
+    unchanged: bool = False
+    seconds: float = 0.0
+
+
+@dataclass
+class IngestionSummary:
+    results: List[IngestionResult]
+    seconds: float
+
+    @property
+    def documents_per_minute(self) -> float:
+        return len(self.results) * 60 / self.seconds if self.seconds else 0.0
+
+
+class DocumentIngestionPipeline:
+    def __init__(
+        self,
+        repository: DocumentCorpusRepository,
+        embedder: LLMProvider,
+        *,
+        model: str | None = None,
+        dimensions: int | None = None,
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+        chunk_size: int | None = None,
+        overlap: int | None = None,
+    ) -> None:
+        self._repository = repository
+        self._embedder = embedder
+        self._model = model or settings.OPENAI_EMBEDDING_MODEL
+        self._dimensions = dimensions or settings.DOCUMENT_EMBEDDING_DIMENSIONS
+        self._batch_size = batch_size or settings.DOCUMENT_EMBEDDING_BATCH_SIZE
+        self._concurrency = concurrency or settings.DOCUMENT_EMBEDDING_CONCURRENCY
+        self._chunk_size = chunk_size or settings.DOCUMENT_CHUNK_SIZE_CHARS
+        self._overlap = settings.DOCUMENT_CHUNK_OVERLAP_CHARS if overlap is None else overlap
+
+    async def ingest(
+        self,
+        document_id: UUID,
+        source: DocumentSource,
+        *,
+        mime_type: str | None = None,
+        filename: str | None = None,
+        force: bool = False,
+    ) -> IngestionResult:
+        started = time.perf_counter()
+        result = IngestionResult(document_id=document_id)
+        fmt = detect_format(mime_type, filename)
+
+        with traced_stage("ingestion.hash", document_id=str(document_id)):
+            source_hash = await asyncio.to_thread(hash_source, source)
+            unchanged = not force and await self._repository.get_document_hash(document_id) == source_hash
+        if unchanged:
+            result.unchanged = True
+            result.seconds = time.perf_counter() - started
+            return result
+
+        chunk_iter = chunk_sections(
+            extract_sections(source, fmt), chunk_size=self._chunk_size, overlap=self._overlap
+        )
+        chunks: List[TextChunk] = []
+        seen: Set[str] = set()
+        running: Set[asyncio.Task] = set()
+        finished: List[asyncio.Task] = []
+        with traced_stage("ingestion.embed", document_id=str(document_id)) as span:
+            try:
+                while True:
+                    # Each call resumes the same generator on a worker thread, so parsing never blocks the loop.
+                    batch = await asyncio.to_thread(_take, chunk_iter, self._batch_size)
+                    if not batch:
+                        break
+                    chunks.extend(batch)
+                    fresh = [chunk for chunk in _unique(batch) if chunk.content_hash not in seen]
+                    seen.update(chunk.content_hash for chunk in fresh)
+                    existing = await self._repository.existing_embedding_hashes(
+                        [chunk.content_hash for chunk in fresh], self._model
+                    )
+                    pending = [chunk for chunk in fresh if chunk.content_hash not in existing]
+                    result.reused_chunks += len(fresh) - len(pending)
+                    if not pending:
+                        continue
+                    if len(running) >= self._concurrency:
+                        done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                        finished.extend(done)
+                    running.add(asyncio.create_task(self._embed(pending)))
+                if running:
+                    done, _ = await asyncio.wait(running)
+                    finished.extend(done)
+                result.embedded_chunks = sum(task.result() for task in finished)
+            except BaseException:
+                for task in running:
+                    task.cancel()
+                raise
+            span.set_attribute("ingestion.embedded_chunks", result.embedded_chunks)
+
+        with traced_stage("ingestion.store", document_id=str(document_id), chunks=len(chunks)):
+            await self._repository.replace_chunks(document_id, chunks, source_hash)
+        result.chunk_count = len(chunks)
+        result.seconds = time.perf_counter() - started
+        logger.info(
+            "document_ingested",
+            document_id=str(document_id),
+            chunks=result.chunk_count,
+            embedded=result.embedded_chunks,
+            reused=result.reused_chunks,
+            seconds=round(result.seconds, 3),
+        )
+        return result
+
+    async def ingest_many(
+        self, documents: Sequence[tuple[UUID, DocumentSource, Optional[str], Optional[str]]], *, concurrency: int = 4
+    ) -> IngestionSummary:
+        """Ingest ``(document_id, source, mime_type, filename)`` tuples and report documents per minute."""
+        started = time.perf_counter()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def run(document_id: UUID, source: DocumentSource, mime_type: Optional[str], filename: Optional[str]):
+            async with slots:
+                return await self.ingest(document_id, source, mime_type=mime_type, filename=filename)
+
+        results = await asyncio.gather(*(run(*document) for document in documents))
+        summary = IngestionSummary(results=list(results), seconds=time.perf_counter() - started)
+        logger.info(
+            "document_batch_ingested",
+            documents=len(summary.results),
+            documents_per_minute=round(summary.documents_per_minute, 1),
+        )
+        return summary
+
+    async def _embed(self, chunks: List[TextChunk]) -> int:
+        response = await self._embedder.create_embeddings(
+            [chunk.content for chunk in chunks], model=self._model, dimensions=self._dimensions
+        )
+        vectors = response["embeddings"]
+        if len(vectors) != len(chunks):
+            raise RuntimeError("Embedding provider returned an unexpected number of vectors.")
+        if any(len(vector) != self._dimensions for vector in vectors):
+            raise RuntimeError(f"Embedding vectors must have {self._dimensions} dimensions.")
+        return await self._repository.insert_embeddings([chunk.content_hash for chunk in chunks], vectors, self._model)
+
+
+def _take(iterator: Iterator[TextChunk], count: int) -> List[TextChunk]:
+    return list(islice(iterator, count))
+
+
+def _unique(chunks: List[TextChunk]) -> List[TextChunk]:
+    by_hash = {}
+    for chunk in chunks:
+        by_hash.setdefault(chunk.content_hash, chunk)
+    return list(by_hash.values())
@@ -0,0 +1,226 @@
+"""Artifact storage for generated documents: local filesystem or an S3-compatible bucket.
+
+Writers are streaming: callers ``write`` encoded chunks as a template renders them and nothing holds
+the whole artifact in memory. Local writes go to a temporary file that is renamed into place on
+close. S3 writes buffer one part (``DOCUMENT_STORAGE_PART_SIZE_BYTES``, at least 5 MiB) at a time as
+a multipart upload; artifacts smaller than one part are sent with a single ``PutObject``. A failed
+write removes the temporary file or aborts the multipart upload. Readers stream a stored artifact back
+(a file handle, or the ``GetObject`` body), and a missing key reads as ``None``.
+
+The interface is synchronous so it can run inside batch worker processes; async callers use
+``asyncio.to_thread``. ``StorageConfig`` is a plain dataclass so workers can rebuild the backend.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, List, Optional, Protocol
+
+from app.core.config import settings
+
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class StorageConfig:
+    backend: str = "local"
+    local_path: str = "generated_documents"
+    bucket: Optional[str] = None
+    prefix: str = ""
+    endpoint_url: Optional[str] = None
+    region: Optional[str] = None
+    part_size: int = 8 * 1024 * 1024
+
+    @classmethod
+    def from_settings(cls) -> "StorageConfig":
+        return cls(
+            backend=settings.DOCUMENT_STORAGE_BACKEND,
+            local_path=settings.DOCUMENT_STORAGE_LOCAL_PATH,
+            bucket=settings.DOCUMENT_STORAGE_BUCKET,
+            prefix=settings.DOCUMENT_STORAGE_PREFIX,
+            endpoint_url=settings.DOCUMENT_STORAGE_ENDPOINT_URL,
+            region=settings.DOCUMENT_STORAGE_REGION,
+            part_size=settings.DOCUMENT_STORAGE_PART_SIZE_BYTES,
+        )
+
+
+@dataclass(frozen=True)
+class StoredArtifact:
+    key: str
+    url: str
+    size: int
+    sha256: str
+
+
+class ArtifactWriter(Protocol):
+    def write(self, data: bytes) -> None: ...
+
+    def close(self) -> StoredArtifact: ...
+
+    def abort(self) -> None: ...
+
+
+class ArtifactStorage(Protocol):
+    def open_writer(self, key: str, mime_type: str) -> ArtifactWriter: ...
+
+    def open_reader(self, key: str) -> Optional[BinaryIO]: ...
+
+
+def _validate_key(key: str) -> str:
+    parts = key.split("/")
+    if not key or key.startswith("/") or any(part in ("", ".", "..") for part in parts):
+        raise ValueError(f"Invalid artifact key '{key}'.")
+    return key
+
+
+class LocalArtifactWriter:
+    def __init__(self, root: Path, key: str) -> None:
+        self._key = key
+        self._target = root / key
+        self._target.parent.mkdir(parents=True, exist_ok=True)
+        handle, self._temp_path = tempfile.mkstemp(dir=self._target.parent, prefix=".partial-")
+        self._file = os.fdopen(handle, "wb")
+        self._digest = hashlib.sha256()
+        self._size = 0
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._digest.update(data)
+        self._size += len(data)
+
+    def close(self) -> StoredArtifact:
+        self._file.close()
+        os.replace(self._temp_path, self._target)
+        return StoredArtifact(self._key, self._target.resolve().as_uri(), self._size, self._digest.hexdigest())
+
+    def abort(self) -> None:
+        self._file.close()
+        Path(self._temp_path).unlink(missing_ok=True)
+
+
+class LocalArtifactStorage:
+    def __init__(self, root: str | Path) -> None:
+        self._root = Path(root)
+
+    def open_writer(self, key: str, mime_type: str) -> LocalArtifactWriter:
+        return LocalArtifactWriter(self._root, _validate_key(key))
+
+    def open_reader(self, key: str) -> Optional[BinaryIO]:
+        try:
+            return open(self._root / _validate_key(key), "rb")
+        except FileNotFoundError:
+            return None
+
+
+class S3ArtifactWriter:
+    def __init__(self, client: Any, bucket: str, object_key: str, key: str, mime_type: str, part_size: int) -> None:
+        self._client = client
+        self._bucket = bucket
+        self._object_key = object_key
+        self._key = key
+        self._mime_type = mime_type
+        self._part_size = part_size
+        self._buffer = io.BytesIO()
+        self._upload_id: Optional[str] = None
+        self._parts: List[dict] = []
+        self._digest = hashlib.sha256()
+        self._size = 0
+
+    def write(self, data: bytes) -> None:
+        self._buffer.write(data)
+        self._digest.update(data)
+        self._size += len(data)
+        if self._buffer.tell() >= self._part_size:
+            self._flush_part()
+
+    def close(self) -> StoredArtifact:
+        try:
+            if self._upload_id is None:
+                self._client.put_object(
+                    Bucket=self._bucket,
+                    Key=self._object_key,
+                    Body=self._buffer.getvalue(),
+                    ContentType=self._mime_type,
+                )
+            else:
+                if self._buffer.tell():
+                    self._flush_part()
+                self._client.complete_multipart_upload(
+                    Bucket=self._bucket,
+                    Key=self._object_key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": self._parts},
+                )
+        except BaseException:
+            self.abort()
+            raise
+        url = f"s3://{self._bucket}/{self._object_key}"
+        return StoredArtifact(self._key, url, self._size, self._digest.hexdigest())
+
+    def abort(self) -> None:
+        if self._upload_id is not None:
+            self._client.abort_multipart_upload(Bucket=self._bucket, Key=self._object_key, UploadId=self._upload_id)
+            self._upload_id = None
+        self._buffer = io.BytesIO()
+
+    def _flush_part(self) -> None:
+        if self._upload_id is None:
+            response = self._client.create_multipart_upload(
+                Bucket=self._bucket, Key=self._object_key, ContentType=self._mime_type
+            )
+            self._upload_id = response["UploadId"]
+        number = len(self._parts) + 1
+        response = self._client.upload_part(
+            Bucket=self._bucket,
+            Key=self._object_key,
+            UploadId=self._upload_id,
+            PartNumber=number,
+            Body=self._buffer.getvalue(),
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": number})
+        self._buffer = io.BytesIO()
+
+
+class S3ArtifactStorage:
+    """Any S3-compatible store (AWS, MinIO, R2, GCS interop) reachable through ``boto3``."""
+
+    def __init__(self, config: StorageConfig, client: Any = None) -> None:
+        if not config.bucket:
+            raise ValueError("DOCUMENT_STORAGE_BUCKET is required for S3 storage.")
+        self._config = config
+        self._client = client or self._build_client(config)
+
+    @staticmethod
+    def _build_client(config: StorageConfig) -> Any:
+        try:
+            import boto3
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("S3 document storage requires the boto3 package.") from exc
+        return boto3.client("s3", endpoint_url=config.endpoint_url, region_name=config.region)
+
+    def _object_key(self, key: str) -> str:
+        return f"{self._config.prefix.strip('/')}/{_validate_key(key)}".lstrip("/")
+
+    def open_writer(self, key: str, mime_type: str) -> S3ArtifactWriter:
+        part_size = max(self._config.part_size, MIN_PART_SIZE)
+        return S3ArtifactWriter(self._client, self._config.bucket, self._object_key(key), key, mime_type, part_size)
+
+    def open_reader(self, key: str) -> Optional[BinaryIO]:
+        try:
+            response = self._client.get_object(Bucket=self._config.bucket, Key=self._object_key(key))
+        except self._client.exceptions.NoSuchKey:
+            return None
+        return response["Body"]
+
+
+def build_storage(config: StorageConfig) -> ArtifactStorage:
+    if config.backend == "local":
+        return LocalArtifactStorage(config.local_path)
+    if config.backend == "s3":
+        return S3ArtifactStorage(config)
+    raise ValueError(f"Unknown document storage backend '{config.backend}'.")
@@ -0,0 +1,181 @@
+"""Compiled, versioned document templates.
+
+Templates are Jinja2 files under ``DOCUMENT_TEMPLATE_DIR`` named ``<template_key>.<ext>``; the
+extension sets the artifact MIME type, and files starting with ``_`` are layouts/partials that can
+only be extended or included. A template's version is the SHA-256 prefix of its source together with
+every template it references, so editing a file or its layout yields a new version without any
+registry bookkeeping.
+
+``TemplateRegistry`` parses and compiles each ``(key, version)`` once per process and afterwards only
+``stat``s the files involved to notice edits. With ``DOCUMENT_TEMPLATE_BYTECODE_DIR`` set, compiled bytecode is
+also shared on disk, so fresh batch worker processes skip parsing entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined, Template, meta
+
+MIME_TYPES_BY_SUFFIX = {
+    ".html": "text/html",
+    ".md": "text/markdown",
+    ".txt": "text/plain",
+}
+
+VERSION_LENGTH = 16
+
+
+class TemplateNotFoundError(LookupError):
+    """Raised when no template file exists for a key."""
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    key: str
+    version: str
+    mime_type: str
+    template: Template
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        return self.template.render(context)
+
+    def stream(self, context: Mapping[str, Any]) -> Iterator[str]:
+        """Render incrementally; output is produced block by block instead of as one string."""
+        return self.template.generate(context)
+
+
+def _currency(value: Any, symbol: str = "$") -> str:
+    if value is None:
+        return ""
+    return f"{symbol}{Decimal(str(value)):,.2f}"
+
+
+def _percent(value: Any, digits: int = 2) -> str:
+    if value is None:
+        return ""
+    return f"{float(value) * 100:.{digits}f}%"
+
+
+def _date(value: Any, fmt: str = "%B %d, %Y") -> str:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, (date, datetime)):
+        return value.strftime(fmt)
+    return "" if value is None else str(value)
+
+
+def build_environment(template_dir: str | Path, bytecode_dir: Optional[str] = None) -> Environment:
+    environment = Environment(
+        # Layouts and partials are loaded by name; Jinja re-stats them before reuse.
+        loader=FileSystemLoader(str(template_dir)),
+        # Autoescaping is decided per template in ``TemplateRegistry`` from the file extension.
+        autoescape=False,
+        undefined=StrictUndefined,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        bytecode_cache=FileSystemBytecodeCache(bytecode_dir) if bytecode_dir else None,
+    )
+    environment.filters.update(currency=_currency, percent=_percent, date=_date)
+    return environment
+
+
+@dataclass(frozen=True)
+class _SourceState:
+    paths: Tuple[Path, ...]
+    fingerprint: Tuple[Tuple[int, int], ...]
+    version: str
+
+
+def _fingerprint(paths: Tuple[Path, ...]) -> Tuple[Tuple[int, int], ...]:
+    stats = [path.stat() for path in paths]
+    return tuple((stat.st_mtime_ns, stat.st_size) for stat in stats)
+
+
+class TemplateRegistry:
+    def __init__(self, template_dir: str | Path, *, bytecode_dir: Optional[str] = None) -> None:
+        self._template_dir = Path(template_dir)
+        self._environment = build_environment(template_dir, bytecode_dir)
+        self._html_environment = self._environment.overlay(autoescape=True)
+        self._compiled: Dict[Tuple[str, str], CompiledTemplate] = {}
+        # A matching stat fingerprint of the template and its dependencies skips re-reading sources.
+        self._states: Dict[str, _SourceState] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CompiledTemplate:
+        path = self._resolve(key)
+        state = self._states.get(key)
+        if state is not None and state.paths[0] == path:
+            try:
+                unchanged = _fingerprint(state.paths) == state.fingerprint
+            except FileNotFoundError:
+                unchanged = False
+            compiled = self._compiled.get((key, state.version)) if unchanged else None
+            if compiled is not None:
+                return compiled
+
+        source = path.read_text(encoding="utf-8")
+        html = path.suffix == ".html"
+        environment = self._html_environment if html else self._environment
+        dependencies = self._dependencies(environment, source)
+        digest = hashlib.sha256(source.encode("utf-8"))
+        for dependency in dependencies:
+            digest.update(dependency.read_bytes())
+        version = digest.hexdigest()[:VERSION_LENGTH]
+        paths = (path, *dependencies)
+        with self._lock:
+            compiled = self._compiled.get((key, version))
+            if compiled is None:
+                compiled = CompiledTemplate(
+                    key=key,
+                    version=version,
+                    mime_type=MIME_TYPES_BY_SUFFIX[path.suffix],
+                    template=_compile(environment, f"{key}@{version}", source, str(path)),
+                )
+                self._compiled[(key, version)] = compiled
+            self._states[key] = _SourceState(paths, _fingerprint(paths), version)
+        return compiled
+
+    def cached_versions(self) -> list[Tuple[str, str]]:
+        return sorted(self._compiled)
+
+    def _resolve(self, key: str) -> Path:
+        if not key or "/" in key or "\\" in key or key.startswith((".", "_")):
+            raise TemplateNotFoundError(f"Invalid template key '{key}'.")
+        for suffix in MIME_TYPES_BY_SUFFIX:
+            path = self._template_dir / f"{key}{suffix}"
+            if path.is_file():
+                return path
+        raise TemplateNotFoundError(f"Template '{key}' not found in {self._template_dir}.")
+
+    def _dependencies(self, environment: Environment, source: str) -> Tuple[Path, ...]:
+        """Files reached through ``extends``/``include``/``import`` with constant names, recursively."""
+        found: List[Path] = []
+        pending = [source]
+        while pending:
+            for name in meta.find_referenced_templates(environment.parse(pending.pop())):
+                path = self._template_dir / name if name else None
+                if path is None or path in found or not path.is_file():
+                    continue
+                found.append(path)
+                pending.append(path.read_text(encoding="utf-8"))
+        return tuple(found)
+
+
+def _compile(environment: Environment, name: str, source: str, filename: str) -> Template:
+    """Compile ``source``, reusing on-disk bytecode for the same name and source when configured."""
+    cache = environment.bytecode_cache
+    bucket = cache.get_bucket(environment, name, filename, source) if cache is not None else None
+    code = bucket.code if bucket is not None else None
+    if code is None:
+        code = environment.compile(source, name, filename)
+        if bucket is not None:
+            bucket.code = code
+            cache.set_bucket(bucket)
+    return environment.template_class.from_code(environment, code, environment.make_globals(None), None)
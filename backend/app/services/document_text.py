@@ -0,0 +1,293 @@
+"""Text extraction and overlapping chunking for corpus documents (PDF, DOCX, XLSX, plain text).
+
+Extractors are generators yielding ``TextSection`` blocks (a PDF page, a run of DOCX paragraphs, a
+group of spreadsheet rows) so large files are never held as one string. ``chunk_sections`` turns the
+stream into bounded windows with overlap, ending on content-defined line breaks where possible. Parser libraries
+are imported inside each extractor so they only load in processes that ingest documents.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+DocumentSource = Union[str, Path, bytes, BinaryIO]
+
+PDF_MIME_TYPE = "application/pdf"
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+XLSX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+_FORMATS_BY_MIME = {
+    PDF_MIME_TYPE: "pdf",
+    DOCX_MIME_TYPE: "docx",
+    XLSX_MIME_TYPE: "xlsx",
+    "text/plain": "text",
+    "text/csv": "text",
+    "text/markdown": "text",
+}
+_FORMATS_BY_SUFFIX = {
+    ".pdf": "pdf",
+    ".docx": "docx",
+    ".xlsx": "xlsx",
+    ".xlsm": "xlsx",
+    ".txt": "text",
+    ".csv": "text",
+    ".md": "text",
+}
+
+PARAGRAPHS_PER_SECTION = 40
+ROWS_PER_SECTION = 50
+HASH_BLOCK_SIZE = 1 << 20
+ANCHOR_LINE_MODULUS = 4
+
+_INLINE_SPACE = re.compile(r"[ \t\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+@dataclass(frozen=True)
+class TextSection:
+    text: str
+    location: str
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    index: int
+    content: str
+    content_hash: str
+    location: str
+
+
+def detect_format(mime_type: Optional[str] = None, filename: Optional[str] = None) -> str:
+    if mime_type:
+        fmt = _FORMATS_BY_MIME.get(mime_type.split(";", 1)[0].strip().lower())
+        if fmt:
+            return fmt
+    if filename:
+        fmt = _FORMATS_BY_SUFFIX.get(Path(filename).suffix.lower())
+        if fmt:
+            return fmt
+    raise ValueError(f"Unsupported document type (mime_type={mime_type!r}, filename={filename!r}).")
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_source(source: DocumentSource) -> str:
+    """SHA-256 of the raw file, read in blocks."""
+    digest = hashlib.sha256()
+    if isinstance(source, bytes):
+        digest.update(source)
+    elif isinstance(source, (str, Path)):
+        with open(source, "rb") as handle:
+            for block in iter(lambda: handle.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+    else:
+        position = source.tell()
+        for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+        source.seek(position)
+    return digest.hexdigest()
+
+
+def _open_binary(source: DocumentSource) -> Union[str, BinaryIO]:
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if isinstance(source, Path):
+        return str(source)
+    return source
+
+
+def normalise_text(text: str) -> str:
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = (_INLINE_SPACE.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def extract_sections(source: DocumentSource, fmt: str) -> Iterator[TextSection]:
+    extractors = {"pdf": _pdf_sections, "docx": _docx_sections, "xlsx": _xlsx_sections, "text": _text_sections}
+    try:
+        extractor = extractors[fmt]
+    except KeyError:
+        raise ValueError(f"Unsupported document format '{fmt}'.") from None
+    return extractor(source)
+
+
+def _pdf_sections(source: DocumentSource) -> Iterator[TextSection]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(_open_binary(source))
+    for number, page in enumerate(reader.pages, start=1):
+        text = page.extract_text() or ""
+        if text.strip():
+            yield TextSection(text=text, location=f"page {number}")
+
+
+def _docx_sections(source: DocumentSource) -> Iterator[TextSection]:
+    import docx
+
+    document = docx.Document(_open_binary(source))
+    batch: List[str] = []
+    first = 1
+    for number, paragraph in enumerate(document.paragraphs, start=1):
+        if paragraph.text.strip():
+            batch.append(paragraph.text)
+        if len(batch) >= PARAGRAPHS_PER_SECTION:
+            yield TextSection(text="\n".join(batch), location=f"paragraphs {first}-{number}")
+            batch, first = [], number + 1
+    if batch:
+        yield TextSection(text="\n".join(batch), location=f"paragraphs {first}-{len(document.paragraphs)}")
+
+    for number, table in enumerate(document.tables, start=1):
+        rows = [" | ".join(cell.text.strip() for cell in row.cells) for row in table.rows]
+        if any(row.strip(" |") for row in rows):
+            yield TextSection(text="\n".join(rows), location=f"table {number}")
+
+
+def _format_cell(value: object) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _xlsx_sections(source: DocumentSource) -> Iterator[TextSection]:
+    from openpyxl import load_workbook
+
+    # read_only streams rows from the sheet XML instead of building the whole cell model.
+    workbook = load_workbook(_open_binary(source), read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            # Read-only sheets stop at the declared dimension, which exports often leave at A1.
+            sheet.reset_dimensions()
+            header: Optional[str] = None
+            batch: List[str] = []
+            first = last = 1
+            for number, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+                cells = [_format_cell(value) for value in row if value is not None and str(value).strip()]
+                if not cells:
+                    continue
+                last = number
+                line = " | ".join(cells)
+                if header is None:
+                    header, first = line, number + 1
+                    continue
+                batch.append(line)
+                if len(batch) >= ROWS_PER_SECTION:
+                    yield _sheet_section(sheet.title, header, batch, first, number)
+                    batch, first = [], number + 1
+            if batch or header is not None:
+                yield _sheet_section(sheet.title, header, batch, first, max(first, last))
+    finally:
+        workbook.close()
+
+
+def _sheet_section(title: str, header: Optional[str], rows: List[str], first: int, last: int) -> TextSection:
+    # Repeat the header row so every chunk of a sheet keeps its column context.
+    lines = [f"Sheet: {title}"] + ([header] if header else []) + rows
+    return TextSection(text="\n".join(lines), location=f"sheet {title} rows {first}-{last}")
+
+
+def _text_sections(source: DocumentSource) -> Iterator[TextSection]:
+    if isinstance(source, bytes):
+        lines: Iterable[str] = source.decode("utf-8", errors="replace").splitlines()
+        yield from _line_sections(lines)
+    elif isinstance(source, (str, Path)):
+        with open(source, encoding="utf-8", errors="replace") as handle:
+            yield from _line_sections(handle)
+    else:
+        yield from _line_sections(line.decode("utf-8", errors="replace") for line in source)
+
+
+def _line_sections(lines: Iterable[str]) -> Iterator[TextSection]:
+    batch: List[str] = []
+    first = 1
+    number = 0
+    for number, line in enumerate(lines, start=1):
+        batch.append(line.rstrip("\n"))
+        if len(batch) >= ROWS_PER_SECTION:
+            yield TextSection(text="\n".join(batch), location=f"lines {first}-{number}")
+            batch, first = [], number + 1
+    if batch:
+        yield TextSection(text="\n".join(batch), location=f"lines {first}-{number}")
+
+
+def _is_anchor(line: str) -> bool:
+    return zlib.crc32(line.encode("utf-8")) % ANCHOR_LINE_MODULUS == 0
+
+
+def _break_point(text: str, limit: int) -> int:
+    """Where to end a window of at most ``limit`` characters.
+
+    Breaks are content-defined: prefer the last line in the second half of the window whose text is an
+    "anchor" (selected by hash), then any line break there, then whitespace in the final fifth, then
+    ``limit``. Because anchors depend on the lines themselves rather than on offsets, chunking realigns
+    shortly after an edit instead of shifting every later chunk of the document.
+    """
+    floor = limit // 2
+    newline = text.rfind("\n", floor, limit)
+    last_newline = newline
+    while newline > 0:
+        line_start = text.rfind("\n", 0, newline) + 1
+        if _is_anchor(text[line_start:newline]):
+            return newline + 1
+        newline = text.rfind("\n", floor, line_start - 1) if line_start - 1 > floor else -1
+    if last_newline > 0:
+        return last_newline + 1
+    floor = int(limit * 0.8)
+    for index in range(limit, floor, -1):
+        if text[index - 1].isspace():
+            return index
+    return limit
+
+
+def chunk_sections(sections: Iterable[TextSection], *, chunk_size: int, overlap: int) -> Iterator[TextChunk]:
+    """Merge sections into ``chunk_size``-character windows that share ``overlap`` characters."""
+    if chunk_size <= 0 or not 0 <= overlap < chunk_size:
+        raise ValueError("chunk_size must be positive and overlap must be in [0, chunk_size).")
+
+    buffer = ""
+    markers: List[Tuple[int, str]] = []  # (offset in buffer, location of the section starting there)
+    carried = 0  # leading characters of ``buffer`` already emitted in the previous chunk
+    index = 0
+
+    def emit(content: str) -> TextChunk:
+        nonlocal index
+        chunk = TextChunk(index=index, content=content, content_hash=content_hash(content), location=markers[0][1])
+        index += 1
+        return chunk
+
+    for section in sections:
+        text = normalise_text(section.text)
+        if not text:
+            continue
+        if buffer:
+            buffer += "\n"
+        markers.append((len(buffer), section.location))
+        buffer += text
+
+        while len(buffer) > chunk_size:
+            end = _break_point(buffer, chunk_size)
+            content = buffer[:end].strip()
+            if content:
+                yield emit(content)
+            start = max(end - overlap, 1)
+            # Start the overlap on a line, else word, boundary when one is close by.
+            boundary = buffer.find("\n", start, end - 1)
+            if boundary < 0:
+                boundary = buffer.find(" ", start, end - 1)
+            if overlap and boundary >= 0:
+                start = boundary + 1
+            buffer = buffer[start:]
+            carried = end - start
+            kept = [(offset - start, location) for offset, location in markers if offset >= start]
+            before = [location for offset, location in markers if offset < start]
+            markers = ([(0, before[-1])] if before and (not kept or kept[0][0] > 0) else []) + kept
+
+    if buffer.strip() and len(buffer) > carried:
+        yield emit(buffer.strip())
@@ -0,0 +1,451 @@
+"""Write-behind recorder for ``AuditLog`` and ``IntegrationEvent`` rows.
+
+Mutations and external calls record an event and carry on; rows reach PostgreSQL later in batched
+``COPY`` writes instead of one ``INSERT`` per event inside the request transaction. The
+``EVENT_RECORDER_MODE`` setting picks the durability trade-off:
+
+* ``sync``: the row is written before ``record_*`` returns (one round trip per event, nothing lost).
+* ``async`` (default): the row is appended to an in-process buffer that a background task flushes every
+  ``EVENT_RECORDER_FLUSH_INTERVAL_MS`` or as soon as ``EVENT_RECORDER_FLUSH_MAX_EVENTS`` are waiting.
+  Recording costs microseconds; rows still buffered when the process dies are lost. Once
+  ``EVENT_RECORDER_MAX_BUFFERED`` rows are waiting, callers wait on a flush (backpressure). If the
+  database is unreachable, the oldest rows beyond the limit are dead-lettered instead, and
+  ``record_*`` never raises.
+* ``stream``: at-least-once. Each event is ``XADD``-ed to a Redis stream and acknowledged only after the
+  batch containing it has committed. Entries left pending by a dead consumer are claimed by another
+  after ``EVENT_RECORDER_CLAIM_IDLE_MS``. Replayed rows keep their ids and are inserted with
+  ``ON CONFLICT DO NOTHING``, so redelivery does not duplicate them.
+
+Ids and timestamps are assigned when the event is recorded, not when it is written.
+
+Only transient failures are retried: lost connections, timeouts, an overloaded or restarting server,
+and serialization failures. A batch rejected for any other reason, such as a bad value or a timestamp
+with no partition, would never succeed. It is written again row by row, and the rows that still fail
+go to the dead-letter hook. By default that hook logs each row in full as ``event_recorder_dead_letter``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
+from uuid import UUID
+
+import asyncpg
+import orjson
+import structlog
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.models.enums import IntegrationSource, IntegrationStatus
+from app.repositories.event_log import AUDIT_LOGS, INTEGRATION_EVENTS, EventLogRepository, decode_row
+
+logger = structlog.get_logger(__name__)
+
+Row = Tuple[Any, ...]
+DeadLetter = Callable[[str, Row, BaseException], None]
+
+# SQLSTATE classes a later attempt can get past: connection exceptions, transaction rollbacks
+# (serialization failures, deadlocks), insufficient resources and operator intervention.
+TRANSIENT_SQLSTATE_PREFIXES = ("08", "40", "53", "57P")
+
+
+class DurabilityMode(str, Enum):
+    SYNC = "sync"
+    ASYNC = "async"
+    STREAM = "stream"
+
+
+class EventSink(Protocol):
+    async def write(self, batches: Mapping[str, Sequence[Row]]) -> int: ...
+
+
+@dataclass
+class RecorderStats:
+    recorded: int = 0
+    written: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    dead_lettered: int = 0
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _json(value: Optional[dict]) -> Optional[str]:
+    return None if value is None else orjson.dumps(value, default=str).decode("utf-8")
+
+
+def audit_row(
+    event_type: str,
+    entity_type: str,
+    entity_id: Any,
+    description: str,
+    *,
+    user_id: Optional[UUID] = None,
+    created_at: Optional[datetime] = None,
+) -> Row:
+    return (uuid.uuid4(), user_id, event_type, entity_type, str(entity_id), description, created_at or _utcnow())
+
+
+def integration_row(
+    source_system: IntegrationSource,
+    status: IntegrationStatus,
+    *,
+    request_payload: Optional[dict] = None,
+    response_payload: Optional[dict] = None,
+    error_message: Optional[str] = None,
+    started_at: Optional[datetime] = None,
+    completed_at: Optional[datetime] = None,
+) -> Row:
+    return (
+        uuid.uuid4(),
+        IntegrationSource(source_system).value,
+        _json(request_payload),
+        _json(response_payload),
+        IntegrationStatus(status).value,
+        error_message,
+        started_at or _utcnow(),
+        completed_at,
+    )
+
+
+def is_transient(exc: BaseException) -> bool:
+    """True for failures worth retrying; a data error or a missing partition fails the same way every time."""
+    if isinstance(exc, (OSError, asyncio.TimeoutError, asyncpg.InterfaceError, sa_exc.TimeoutError)):
+        return True
+    if isinstance(exc, sa_exc.DBAPIError):
+        if exc.connection_invalidated or isinstance(exc, (sa_exc.OperationalError, sa_exc.InterfaceError)):
+            return True
+        exc = exc.orig if exc.orig is not None else exc
+    sqlstate = getattr(exc, "sqlstate", None)
+    return isinstance(sqlstate, str) and sqlstate.startswith(TRANSIENT_SQLSTATE_PREFIXES)
+
+
+def log_dead_letter(table: str, row: Row, error: BaseException) -> None:
+    logger.error(
+        "event_recorder_dead_letter",
+        table=table,
+        row=orjson.dumps(row, default=str).decode("utf-8"),
+        error=repr(error),
+    )
+
+
+def _group(records: Sequence[Tuple[str, Row]]) -> Dict[str, List[Row]]:
+    batches: Dict[str, List[Row]] = {}
+    for table, row in records:
+        batches.setdefault(table, []).append(row)
+    return batches
+
+
+class RedisEventStream:
+    """Redis stream with a consumer group; each entry holds one ``(table, row)`` pair."""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        key: str | None = None,
+        group: str | None = None,
+        consumer: str | None = None,
+        claim_idle_ms: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._client = client
+        self._key = key or settings.EVENT_RECORDER_STREAM_KEY
+        self._group = group or settings.EVENT_RECORDER_STREAM_GROUP
+        self._consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self._claim_idle_ms = claim_idle_ms or settings.EVENT_RECORDER_CLAIM_IDLE_MS
+        self._group_ready = False
+        self._clock = clock
+        self._next_claim = 0.0
+
+    async def append(self, table: str, row: Row) -> None:
+        await self._client.xadd(self._key, {"t": table, "r": orjson.dumps(row, default=str)})
+
+    async def read(
+        self, count: int, block_ms: int, *, pending: bool = False
+    ) -> List[Tuple[Any, Optional[str], Optional[Row]]]:
+        """Up to ``count`` entries: this consumer's unacknowledged ones when ``pending``, else new or stale ones."""
+        await self._ensure_group()
+        if pending:
+            response = await self._client.xreadgroup(self._group, self._consumer, {self._key: "0"}, count=count)
+            return self._decode(response[0][1] if response else [])
+        if self._clock() >= self._next_claim:
+            # Entries another consumer read but never acknowledged; checked once per idle period.
+            _, claimed, *_ = await self._client.xautoclaim(
+                self._key, self._group, self._consumer, self._claim_idle_ms, "0-0", count=count
+            )
+            if claimed:
+                return self._decode(claimed)
+            self._next_claim = self._clock() + self._claim_idle_ms / 1000
+        response = await self._client.xreadgroup(
+            self._group, self._consumer, {self._key: ">"}, count=count, block=block_ms
+        )
+        return self._decode(response[0][1] if response else [])
+
+    async def ack(self, entry_ids: Sequence[Any]) -> None:
+        if not entry_ids:
+            return
+        async with self._client.pipeline(transaction=False) as pipeline:
+            pipeline.xack(self._key, self._group, *entry_ids)
+            pipeline.xdel(self._key, *entry_ids)
+            await pipeline.execute()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            await self._client.xgroup_create(self._key, self._group, id="0", mkstream=True)
+        except Exception as exc:  # redis.ResponseError; the group survives restarts
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    @staticmethod
+    def _decode(entries: Sequence[Tuple[Any, Mapping[Any, Any]]]) -> List[Tuple[Any, Optional[str], Optional[Row]]]:
+        decoded: List[Tuple[Any, Optional[str], Optional[Row]]] = []
+        for entry_id, fields in entries:
+            if not fields:  # deleted while pending; still needs acknowledging
+                decoded.append((entry_id, None, None))
+                continue
+            table = fields.get(b"t", fields.get("t"))
+            table = table.decode() if isinstance(table, bytes) else table
+            decoded.append((entry_id, table, decode_row(table, orjson.loads(fields.get(b"r", fields.get("r"))))))
+        return decoded
+
+
+class EventRecorder:
+    def __init__(
+        self,
+        sink: EventSink,
+        *,
+        mode: DurabilityMode | str | None = None,
+        stream: Optional[RedisEventStream] = None,
+        flush_interval_ms: float | None = None,
+        flush_max_events: int | None = None,
+        max_buffered: int | None = None,
+        dead_letter: DeadLetter = log_dead_letter,
+    ) -> None:
+        self.mode = DurabilityMode(mode or settings.EVENT_RECORDER_MODE)
+        if self.mode is DurabilityMode.STREAM and stream is None:
+            raise ValueError("Stream durability needs a RedisEventStream.")
+        self._sink = sink
+        self._stream = stream
+        self._dead_letter = dead_letter
+        interval_ms = settings.EVENT_RECORDER_FLUSH_INTERVAL_MS if flush_interval_ms is None else flush_interval_ms
+        self._interval = interval_ms / 1000
+        self._max_events = flush_max_events or settings.EVENT_RECORDER_FLUSH_MAX_EVENTS
+        self._max_buffered = max_buffered or settings.EVENT_RECORDER_MAX_BUFFERED
+
+        self._buffer: List[Tuple[str, Row]] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._closed = False
+        self.stats = RecorderStats()
+
+    # -- public API ---------------------------------------------------------------------------
+
+    async def record_audit(
+        self,
+        event_type: str,
+        entity_type: str,
+        entity_id: Any,
+        description: str,
+        *,
+        user_id: Optional[UUID] = None,
+    ) -> None:
+        await self._record(AUDIT_LOGS, audit_row(event_type, entity_type, entity_id, description, user_id=user_id))
+
+    async def record_integration(
+        self,
+        source_system: IntegrationSource,
+        status: IntegrationStatus,
+        *,
+        request_payload: Optional[dict] = None,
+        response_payload: Optional[dict] = None,
+        error_message: Optional[str] = None,
+        started_at: Optional[datetime] = None,
+        completed_at: Optional[datetime] = None,
+    ) -> None:
+        row = integration_row(
+            source_system,
+            status,
+            request_payload=request_payload,
+            response_payload=response_payload,
+            error_message=error_message,
+            started_at=started_at,
+            completed_at=completed_at,
+        )
+        await self._record(INTEGRATION_EVENTS, row)
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    async def flush(self) -> int:
+        """Write everything buffered in this process now; returns rows written.
+
+        Raises only on transient failures, after putting the unwritten rows back for the next attempt.
+        """
+        async with self._flush_lock:
+            records, self._buffer = self._buffer, []
+            if not records:
+                return 0
+            return await self._deliver(records, requeue=True)
+
+    async def aclose(self) -> None:
+        """Stop the background task and write what is still buffered (for streams: read but unacknowledged)."""
+        self._closed = True
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        if self.mode is DurabilityMode.STREAM:
+            # Entries never read by this process stay in the stream for the next consumer.
+            while await self._drain_stream(pending=True, block_ms=0):
+                pass
+            await self._stream.aclose()
+        else:
+            await self.flush()
+
+    # -- internals ----------------------------------------------------------------------------
+
+    async def _record(self, table: str, row: Row) -> None:
+        self.stats.recorded += 1
+        if self.mode is DurabilityMode.SYNC:
+            await self._write([(table, row)])
+            return
+        if self.mode is DurabilityMode.STREAM:
+            await self._stream.append(table, row)
+            self._ensure_flusher()
+            return
+        self._buffer.append((table, row))
+        self._ensure_flusher()
+        if len(self._buffer) >= self._max_events:
+            self._wakeup.set()
+        if len(self._buffer) >= self._max_buffered:
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.error("event_recorder_flush_failed", buffered=len(self._buffer), error=repr(exc))
+                overflow = len(self._buffer) - self._max_buffered
+                if overflow > 0:
+                    spilled, self._buffer = self._buffer[:overflow], self._buffer[overflow:]
+                    self._reject(spilled, exc)
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None and not self._closed:
+            target = self._stream_loop if self.mode is DurabilityMode.STREAM else self._buffer_loop
+            self._flusher = asyncio.create_task(target())
+
+    async def _write(self, records: Sequence[Tuple[str, Row]]) -> int:
+        try:
+            written = await self._sink.write(_group(records))
+        except Exception:
+            self.stats.failed_batches += 1
+            raise
+        self.stats.written += written
+        self.stats.batches += 1
+        return written
+
+    async def _deliver(self, records: Sequence[Tuple[str, Row]], *, requeue: bool) -> int:
+        """Write ``records``, falling back to one row at a time when the batch fails for good.
+
+        Transient failures propagate. With ``requeue``, the rows not yet written first go back to the head of
+        the buffer, ahead of anything recorded meanwhile.
+        """
+        try:
+            return await self._write(records)
+        except BaseException as exc:
+            if not isinstance(exc, Exception) or is_transient(exc):
+                if requeue:
+                    self._buffer[:0] = records
+                raise
+            if len(records) == 1:
+                self._reject(records, exc)
+                return 0
+            logger.warning("event_recorder_batch_rejected", rows=len(records), error=repr(exc))
+
+        written = 0
+        for index, record in enumerate(records):
+            try:
+                written += await self._write([record])
+            except BaseException as exc:
+                if not isinstance(exc, Exception) or is_transient(exc):
+                    if requeue:
+                        self._buffer[:0] = records[index:]
+                    raise
+                self._reject([record], exc)
+        return written
+
+    def _reject(self, records: Sequence[Tuple[str, Row]], error: BaseException) -> None:
+        self.stats.dead_lettered += len(records)
+        for table, row in records:
+            try:
+                self._dead_letter(table, row, error)
+            except Exception as exc:
+                logger.error("event_recorder_dead_letter_failed", table=table, error=repr(exc))
+
+    async def _buffer_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                while self._buffer:
+                    await self.flush()
+            except Exception as exc:
+                logger.error("event_recorder_flush_failed", buffered=len(self._buffer), error=repr(exc))
+                await asyncio.sleep(self._interval)
+
+    async def _stream_loop(self) -> None:
+        # Start with this consumer's own unacknowledged entries (e.g. from before a restart).
+        pending = True
+        block_ms = max(1, int(self._interval * 1000))
+        while True:
+            try:
+                drained = await self._drain_stream(pending=pending, block_ms=block_ms)
+                if pending and not drained:
+                    pending = False
+            except Exception as exc:
+                logger.error("event_recorder_stream_flush_failed", error=repr(exc))
+                pending = True
+                await asyncio.sleep(self._interval)
+
+    async def _drain_stream(self, *, pending: bool, block_ms: int) -> int:
+        entries = await self._stream.read(self._max_events, block_ms, pending=pending)
+        if not entries:
+            return 0
+        records = [(table, row) for _, table, row in entries if row is not None]
+        if records:
+            # Redelivered entries are deduplicated, so rows already written before a transient error are harmless.
+            await self._deliver(records, requeue=False)
+        await self._stream.ack([entry_id for entry_id, _, _ in entries])
+        return len(entries)
+
+
+def build_event_recorder(engine: AsyncEngine) -> EventRecorder:
+    """Recorder for ``EVENT_RECORDER_MODE`` writing through ``engine``."""
+    mode = DurabilityMode(settings.EVENT_RECORDER_MODE)
+    stream = None
+    if mode is DurabilityMode.STREAM:
+        from redis.asyncio import Redis
+
+        stream = RedisEventStream(Redis.from_url(settings.REDIS_URL))
+    repository = EventLogRepository(engine, deduplicate=mode is DurabilityMode.STREAM)
+    return EventRecorder(repository, mode=mode, stream=stream)
@@ -0,0 +1,209 @@
+"""Hybrid lexical + vector retrieval over the document corpus, backing ``doc_corpus_lookup``.
+
+Vector search alone misses exact tokens (parcel IDs, certificate numbers, statute citations) and
+full-text search alone misses paraphrases, so each query runs both candidate searches concurrently
+(``RETRIEVAL_CANDIDATES`` each) and merges them with reciprocal-rank fusion:
+
+    score(chunk) = sum over lists of weight / (RETRIEVAL_RRF_K + rank)
+
+RRF only uses ranks, so ``ts_rank_cd`` scores and cosine distances never need calibrating against each
+other. When ``RETRIEVAL_RERANK_MODEL`` names a cross-encoder, the top ``RETRIEVAL_RERANK_TOP_N`` fused
+candidates are re-scored against the query text before the final cut.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Protocol, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from app.ai.scheduler import LLMProvider
+from app.core.config import settings
+from app.core.tracing import get_tracer
+from app.repositories.document_search import ChunkRecord, DocumentSearchRepository
+from app.schemas.agent_tools import DocCorpusLookupRequest, DocCorpusLookupResponse, DocRef
+
+K = TypeVar("K", bound=Hashable)
+
+SNIPPET_CHARS = 320
+_WORD = re.compile(r"[\w.\-§]+", re.UNICODE)
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[K]], *, k: int = 60, weights: Optional[Sequence[float]] = None
+) -> List[Tuple[K, float]]:
+    """Fuse best-first rankings into one list of ``(key, score)``, best first; ranks start at 1."""
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[K, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class Reranker(Protocol):
+    async def score(self, query: str, passages: Sequence[str]) -> List[float]: ...
+
+
+class CrossEncoderReranker:
+    """Local cross-encoder (``sentence-transformers``), loaded on first use and run off the event loop."""
+
+    def __init__(self, model_name: str, *, batch_size: int = 32) -> None:
+        self._model_name = model_name
+        self._batch_size = batch_size
+        self._model = None
+        self._lock = asyncio.Lock()
+
+    async def score(self, query: str, passages: Sequence[str]) -> List[float]:
+        model = await self._load()
+        pairs = [(query, passage) for passage in passages]
+        scores = await asyncio.to_thread(model.predict, pairs, batch_size=self._batch_size)
+        return [float(value) for value in scores]
+
+    async def _load(self):
+        async with self._lock:
+            if self._model is None:
+                try:
+                    from sentence_transformers import CrossEncoder
+                except ImportError as exc:  # pragma: no cover - optional dependency
+                    raise RuntimeError("Re-ranking requires the sentence-transformers package.") from exc
+                self._model = await asyncio.to_thread(CrossEncoder, self._model_name)
+            return self._model
+
+
+@dataclass
+class RetrievedChunk:
+    chunk: ChunkRecord
+    score: float
+    confidence: float
+    lexical_rank: Optional[int] = None
+    vector_rank: Optional[int] = None
+    rerank_score: Optional[float] = None
+
+
+class HybridRetriever:
+    def __init__(
+        self,
+        repository: DocumentSearchRepository,
+        embedder: LLMProvider,
+        *,
+        model: str | None = None,
+        dimensions: int | None = None,
+        candidates: int | None = None,
+        rrf_k: int | None = None,
+        lexical_weight: float = 1.0,
+        vector_weight: float = 1.0,
+        reranker: Reranker | None = None,
+        rerank_top_n: int | None = None,
+    ) -> None:
+        self._repository = repository
+        self._embedder = embedder
+        self._model = model or settings.OPENAI_EMBEDDING_MODEL
+        self._dimensions = dimensions or settings.DOCUMENT_EMBEDDING_DIMENSIONS
+        self._candidates = candidates or settings.RETRIEVAL_CANDIDATES
+        self._rrf_k = rrf_k or settings.RETRIEVAL_RRF_K
+        self._weights = (lexical_weight, vector_weight)
+        self._reranker = reranker
+        self._rerank_top_n = rerank_top_n or settings.RETRIEVAL_RERANK_TOP_N
+
+    async def search(
+        self, query: str | None = None, *, embedding: Sequence[float] | None = None, top_k: int = 10
+    ) -> List[RetrievedChunk]:
+        if query is None and embedding is None:
+            raise ValueError("Either query or embedding is required.")
+        limit = max(self._candidates, top_k)
+        with get_tracer().start_as_current_span("retrieval.hybrid") as span:
+            lexical, vector = await asyncio.gather(
+                self._repository.lexical_candidates(query, limit) if query else _no_candidates(),
+                self._vector_candidates(query, embedding, limit),
+            )
+            lexical_ids = [chunk_id for chunk_id, _ in lexical]
+            vector_ids = [chunk_id for chunk_id, _ in vector]
+            fused = reciprocal_rank_fusion([lexical_ids, vector_ids], k=self._rrf_k, weights=self._weights)
+
+            rerank = self._reranker is not None and query is not None
+            shortlist = fused[: max(top_k, self._rerank_top_n) if rerank else top_k]
+            records = await self._repository.fetch_chunks([chunk_id for chunk_id, _ in shortlist])
+
+            lexical_ranks = {chunk_id: rank for rank, chunk_id in enumerate(lexical_ids, start=1)}
+            vector_ranks = {chunk_id: rank for rank, chunk_id in enumerate(vector_ids, start=1)}
+            # Best possible fused score: rank 1 in every list. Dividing by it maps RRF scores onto [0, 1].
+            ceiling = sum(self._weights) / (self._rrf_k + 1)
+            results = [
+                RetrievedChunk(
+                    chunk=records[chunk_id],
+                    score=score,
+                    confidence=min(1.0, score / ceiling),
+                    lexical_rank=lexical_ranks.get(chunk_id),
+                    vector_rank=vector_ranks.get(chunk_id),
+                )
+                for chunk_id, score in shortlist
+                if chunk_id in records
+            ]
+            if rerank and results:
+                scores = await self._reranker.score(query, [result.chunk.content for result in results])
+                for result, value in zip(results, scores):
+                    result.rerank_score = value
+                    result.confidence = 1.0 / (1.0 + math.exp(-value))
+                results.sort(key=lambda result: result.rerank_score, reverse=True)
+
+            span.set_attribute("retrieval.lexical_candidates", len(lexical))
+            span.set_attribute("retrieval.vector_candidates", len(vector))
+            span.set_attribute("retrieval.reranked", rerank)
+        return results[:top_k]
+
+    async def lookup(self, request: DocCorpusLookupRequest) -> DocCorpusLookupResponse:
+        """``doc_corpus_lookup`` tool handler."""
+        results = await self.search(request.query, embedding=request.embedding, top_k=request.top_k)
+        return DocCorpusLookupResponse(
+            items=[
+                DocRef(
+                    document_id=result.chunk.document_id,
+                    chunk_id=result.chunk.chunk_id,
+                    chunk_index=result.chunk.chunk_index,
+                    location=result.chunk.location,
+                    snippet=snippet(result.chunk.content, request.query),
+                    confidence=round(result.confidence, 4),
+                    lexical_rank=result.lexical_rank,
+                    vector_rank=result.vector_rank,
+                )
+                for result in results
+            ]
+        )
+
+    async def _vector_candidates(
+        self, query: str | None, embedding: Sequence[float] | None, limit: int
+    ) -> List[Tuple[UUID, float]]:
+        if embedding is None:
+            response = await self._embedder.create_embeddings([query], model=self._model, dimensions=self._dimensions)
+            embedding = response["embeddings"][0]
+        if len(embedding) != self._dimensions:
+            raise ValueError(f"Query embedding must have {self._dimensions} dimensions.")
+        return await self._repository.vector_candidates(embedding, self._model, limit)
+
+
+async def _no_candidates() -> List[Tuple[UUID, float]]:
+    return []
+
+
+def snippet(content: str, query: str | None, width: int = SNIPPET_CHARS) -> str:
+    """Window of ``content`` around the first query term it contains, else its opening."""
+    if len(content) <= width:
+        return content
+    start = 0
+    if query:
+        lowered = content.lower()
+        positions = [lowered.find(term.lower()) for term in _WORD.findall(query) if len(term) > 2]
+        hits = [position for position in positions if position >= 0]
+        if hits:
+            start = max(0, min(hits) - width // 4)
+    start = min(start, len(content) - width)
+    window = content[start : start + width].strip()
+    return ("…" if start else "") + window + ("…" if start + width < len(content) else "")
+
+
+def build_reranker() -> Reranker | None:
+    return CrossEncoderReranker(settings.RETRIEVAL_RERANK_MODEL) if settings.RETRIEVAL_RERANK_MODEL else None
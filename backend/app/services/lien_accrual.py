@@ -0,0 +1,235 @@
+"""Vectorised interest accrual: redemption amounts for arrays of liens across arrays of dates.
+
+Every quote, NAV and metric is driven by the amount a lien redeems for on a given day. The amount
+is ``principal × growth factor``, where the factor depends on the lien's ``InterestType``, its annual
+nominal rate (``Lien.interest_rate_nominal`` is stored in percent, e.g. ``18.00``) and the time since
+``issue_date``. Time is counted in whole days on a ``days / 365`` year basis; before the issue date
+nothing has accrued.
+
+* ``SIMPLE``: ``1 + r·t``.
+* ``COMPOUND``: ``(1 + r/12)^(12·t)``, compounded monthly.
+* ``PENALTY``: a one-time ``1 + r`` earned in full from the day after issue (flat-penalty states).
+* ``STEPPED``: ``r`` accrues in whole ``step_months`` blocks, and a started block counts in full
+  (e.g. 18% per annum charged per started six months).
+
+Liens are grouped by interest type once, so each formula runs over just its own rows as one NumPy
+expression. ``amounts_due`` returns a dense ``(liens, dates)`` matrix. ``total_due_curve`` streams
+lien chunks through the same kernels and reduces them with a matrix-vector product. A daily NAV curve
+for 100k liens over three years therefore never holds the ~900 MB full matrix.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.models.enums import InterestType
+
+INTEREST_TYPES: Tuple[InterestType, ...] = tuple(InterestType)
+INTEREST_TYPE_CODES: Dict[InterestType, int] = {kind: code for code, kind in enumerate(INTEREST_TYPES)}
+DEFAULT_CHUNK_SIZE = 4_096
+CENT = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class AccrualConventions:
+    day_count_basis: int = 365
+    compounding_periods: int = 12
+    step_months: int = 6
+
+
+DEFAULT_CONVENTIONS = AccrualConventions()
+
+
+def _day(value: Any) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = (value.astimezone(timezone.utc) if value.tzinfo else value).date()
+    return np.datetime64(value, "D")
+
+
+def to_days(values: Any) -> np.ndarray:
+    """``date``/``datetime`` (aware datetimes are taken in UTC) or ``datetime64`` values as ``datetime64[D]``."""
+    if isinstance(values, np.ndarray) and np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[D]")
+    if isinstance(values, (date, datetime, np.datetime64, str)):
+        return np.asarray(_day(values))
+    return np.array([_day(value) for value in values], dtype="datetime64[D]")
+
+
+@dataclass(frozen=True)
+class LienTerms:
+    """Column arrays of accrual inputs, one entry per lien."""
+
+    principal: np.ndarray
+    annual_rate: np.ndarray
+    interest_type: np.ndarray
+    issue_day: np.ndarray
+    lien_ids: Optional[Tuple[UUID, ...]] = None
+
+    @classmethod
+    def from_columns(
+        cls,
+        principal: Sequence[Any],
+        rate_percent: Sequence[Any],
+        interest_type: Sequence[Any],
+        issue_date: Any,
+        lien_ids: Optional[Sequence[UUID]] = None,
+    ) -> "LienTerms":
+        if isinstance(interest_type, np.ndarray) and np.issubdtype(interest_type.dtype, np.integer):
+            codes = interest_type.astype(np.int8)  # already ``INTEREST_TYPE_CODES``
+        else:
+            codes = np.fromiter(
+                (INTEREST_TYPE_CODES[InterestType(kind)] for kind in interest_type),
+                dtype=np.int8,
+                count=len(interest_type),
+            )
+        terms = cls(
+            principal=np.asarray(principal, dtype=np.float64),
+            annual_rate=np.asarray(rate_percent, dtype=np.float64) / 100.0,
+            interest_type=codes,
+            issue_day=to_days(issue_date),
+            lien_ids=tuple(lien_ids) if lien_ids is not None else None,
+        )
+        lengths = {len(terms.principal), len(terms.annual_rate), len(codes), len(terms.issue_day)}
+        if lien_ids is not None:
+            lengths.add(len(terms.lien_ids))
+        if len(lengths) > 1:
+            raise ValueError(f"Lien term arrays have mismatched lengths: {sorted(lengths)}")
+        return terms
+
+    @classmethod
+    def from_liens(cls, liens: Iterable[Any]) -> "LienTerms":
+        """From ``Lien`` objects or result rows exposing the same attribute names."""
+        rows = list(liens)
+        return cls.from_columns(
+            [row.lien_principal_amount for row in rows],
+            [row.interest_rate_nominal for row in rows],
+            [row.interest_type for row in rows],
+            [row.issue_date for row in rows],
+            lien_ids=[row.id for row in rows],
+        )
+
+    def __len__(self) -> int:
+        return len(self.principal)
+
+    def take(self, indices: Any) -> "LienTerms":
+        ids = tuple(np.asarray(self.lien_ids, dtype=object)[indices]) if self.lien_ids is not None else None
+        return LienTerms(
+            principal=self.principal[indices],
+            annual_rate=self.annual_rate[indices],
+            interest_type=self.interest_type[indices],
+            issue_day=self.issue_day[indices],
+            lien_ids=ids,
+        )
+
+
+def _groups(codes: np.ndarray) -> Iterator[Tuple[InterestType, np.ndarray]]:
+    for code in np.unique(codes):
+        yield INTEREST_TYPES[code], np.flatnonzero(codes == code)
+
+
+def _factor(
+    kind: InterestType, rate: np.ndarray, elapsed_days: np.ndarray, conventions: AccrualConventions
+) -> np.ndarray:
+    """Growth factor for liens of one interest type; ``rate`` broadcasts against ``elapsed_days``."""
+    if kind is InterestType.SIMPLE:
+        return 1.0 + rate * (elapsed_days / conventions.day_count_basis)
+    if kind is InterestType.COMPOUND:
+        periods = conventions.compounding_periods
+        per_day = np.log1p(rate / periods) * (periods / conventions.day_count_basis)
+        return np.exp(elapsed_days * per_day)
+    if kind is InterestType.PENALTY:
+        return 1.0 + rate * (elapsed_days > 0)
+    if kind is InterestType.STEPPED:
+        months = elapsed_days * (12.0 / conventions.day_count_basis)
+        steps = np.ceil(months / conventions.step_months)
+        return 1.0 + rate * (conventions.step_months / 12.0) * steps
+    raise ValueError(f"Unsupported interest type {kind!r}.")
+
+
+def _elapsed_days(issue_day: np.ndarray, days: np.ndarray) -> np.ndarray:
+    elapsed = (days - issue_day).astype(np.float64)
+    return np.maximum(elapsed, 0.0, out=elapsed)
+
+
+def amounts_due(
+    terms: LienTerms, dates: Any, *, conventions: AccrualConventions = DEFAULT_CONVENTIONS
+) -> np.ndarray:
+    """Redemption amount of every lien on every date: a ``(len(terms), len(dates))`` float64 matrix."""
+    days = np.atleast_1d(to_days(dates))
+    result = np.empty((len(terms), len(days)), dtype=np.float64)
+    for kind, rows in _groups(terms.interest_type):
+        elapsed = _elapsed_days(terms.issue_day[rows, None], days[None, :])
+        factor = _factor(kind, terms.annual_rate[rows, None], elapsed, conventions)
+        result[rows] = terms.principal[rows, None] * factor
+    return result
+
+
+def payoff_as_of(terms: LienTerms, as_of: Any, *, conventions: AccrualConventions = DEFAULT_CONVENTIONS) -> np.ndarray:
+    """Payoff per lien, rounded to cents; ``as_of`` is one date for all liens or one date per lien."""
+    days = to_days(as_of)
+    if days.ndim and len(days) != len(terms):
+        raise ValueError("Pass one as-of date, or one per lien.")
+    result = np.empty(len(terms), dtype=np.float64)
+    for kind, rows in _groups(terms.interest_type):
+        elapsed = _elapsed_days(terms.issue_day[rows], days[rows] if days.ndim else days)
+        result[rows] = terms.principal[rows] * _factor(kind, terms.annual_rate[rows], elapsed, conventions)
+    return np.round(result, 2)
+
+
+def iter_amounts_due(
+    terms: LienTerms,
+    dates: Any,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    conventions: AccrualConventions = DEFAULT_CONVENTIONS,
+) -> Iterator[Tuple[slice, np.ndarray]]:
+    """``amounts_due`` in blocks of ``chunk_size`` liens, for curves too large to hold at once."""
+    days = np.atleast_1d(to_days(dates))
+    for start in range(0, len(terms), chunk_size):
+        window = slice(start, min(start + chunk_size, len(terms)))
+        yield window, amounts_due(terms.take(window), days, conventions=conventions)
+
+
+def total_due_curve(
+    terms: LienTerms,
+    dates: Any,
+    *,
+    weights: Optional[Sequence[float]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    conventions: AccrualConventions = DEFAULT_CONVENTIONS,
+) -> np.ndarray:
+    """``Σ weight × amount due`` across liens for each date, e.g. a portfolio's daily NAV at par.
+
+    ``weights`` scales each lien (ownership share, 0 for excluded liens) and defaults to 1.
+    """
+    days = np.atleast_1d(to_days(dates))
+    scale = terms.principal if weights is None else terms.principal * np.asarray(weights, dtype=np.float64)
+    total = np.zeros(len(days), dtype=np.float64)
+    for kind, rows in _groups(terms.interest_type):
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            elapsed = _elapsed_days(terms.issue_day[chunk, None], days[None, :])
+            total += scale[chunk] @ _factor(kind, terms.annual_rate[chunk, None], elapsed, conventions)
+    return total
+
+
+def redemption_payoff(
+    principal: Any,
+    rate_percent: Any,
+    interest_type: InterestType | str,
+    issue_date: Any,
+    as_of: Any,
+    *,
+    conventions: AccrualConventions = DEFAULT_CONVENTIONS,
+) -> Decimal:
+    """Payoff for a single lien as a ``Decimal`` rounded half-up to cents."""
+    terms = LienTerms.from_columns([principal], [rate_percent], [interest_type], [issue_date])
+    elapsed = _elapsed_days(terms.issue_day, to_days(as_of))
+    factor = _factor(InterestType(interest_type), terms.annual_rate, elapsed, conventions)[0]
+    return (Decimal(str(principal)) * Decimal(repr(float(factor)))).quantize(CENT, rounding=ROUND_HALF_UP)
@@ -0,0 +1,144 @@
+"""Fan one event out to every matching investor as notification rows, in a handful of statements.
+
+Recipients are never loaded into Python: ``NotificationFanout.publish`` runs one insert-select per
+``NOTIFICATION_FANOUT_BATCH_SIZE`` users (keyset-paginated on user id), each in its own short
+transaction, so a 100k-investor "Top Deals Updated" event is ten statements rather than 100k tasks.
+
+Events carrying a ``group`` are collapsed per user: within a ``NOTIFICATION_DIGEST_WINDOW_SECONDS``
+bucket, a repeat of the same group updates the user's unread row (count, latest title/body, up to
+``NOTIFICATION_DIGEST_MAX_EVENTS`` event payloads) instead of adding another. ``digests`` reads the
+unread rows of a period grouped per user for the Digest Email job.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Protocol
+from uuid import UUID
+
+import structlog
+from sqlalchemy import Select
+
+from app.core.config import settings
+from app.core.tracing import get_tracer
+from app.models.enums import NotificationType
+from app.repositories.notifications import Audience, FanoutBatch, UserDigest, fan_out_statement
+
+logger = structlog.get_logger(__name__)
+
+
+class NotificationStore(Protocol):
+    async def fan_out_batch(self, statement: Select) -> FanoutBatch: ...
+
+    async def mark_read(self, **filters: Any) -> int: ...
+
+    def iter_digests(
+        self, since: datetime, until: datetime, *, batch_size: int = 1_000
+    ) -> AsyncIterator[List[UserDigest]]: ...
+
+
+@dataclass(frozen=True)
+class NotificationEvent:
+    title: str
+    body: str
+    notification_type: NotificationType = NotificationType.ALERT
+    group: Optional[str] = None
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class FanoutResult:
+    recipients: int
+    inserted: int
+    collapsed: int
+    batches: int
+    seconds: float
+
+
+def digest_group_key(group: str, at: float, window_seconds: int) -> str:
+    """``<group>:<window index>``; events of one group inside the same window share a key."""
+    return f"{group}:{int(at // window_seconds)}"
+
+
+class NotificationFanout:
+    def __init__(
+        self,
+        store: NotificationStore,
+        *,
+        batch_size: int | None = None,
+        digest_window_seconds: int | None = None,
+        max_digest_events: int | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._store = store
+        self._batch_size = batch_size or settings.NOTIFICATION_FANOUT_BATCH_SIZE
+        self._window = digest_window_seconds or settings.NOTIFICATION_DIGEST_WINDOW_SECONDS
+        self._max_events = max_digest_events or settings.NOTIFICATION_DIGEST_MAX_EVENTS
+        self._clock = clock
+
+    async def publish(self, event: NotificationEvent, audience: Audience) -> FanoutResult:
+        started = time.perf_counter()
+        group_key = digest_group_key(event.group, self._clock(), self._window) if event.group else None
+        metadata = {"events": [event.payload]} if event.payload else {}
+        recipients = inserted = written = batches = 0
+        after: Optional[UUID] = None
+        with get_tracer().start_as_current_span("notifications.fan_out") as span:
+            while True:
+                statement = fan_out_statement(
+                    audience,
+                    notification_type=event.notification_type,
+                    title=event.title,
+                    body=event.body,
+                    metadata=metadata,
+                    group_key=group_key,
+                    after=after,
+                    batch_size=self._batch_size,
+                    max_events=self._max_events,
+                )
+                batch = await self._store.fan_out_batch(statement)
+                if batch.recipients:
+                    batches += 1
+                recipients += batch.recipients
+                inserted += batch.inserted
+                written += batch.written
+                if batch.recipients < self._batch_size or batch.last_user_id is None:
+                    break
+                after = batch.last_user_id
+            span.set_attribute("notifications.recipients", recipients)
+            span.set_attribute("notifications.batches", batches)
+
+        result = FanoutResult(
+            recipients=recipients,
+            inserted=inserted,
+            collapsed=written - inserted,
+            batches=batches,
+            seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            "notification_fanout",
+            group_key=group_key,
+            recipients=result.recipients,
+            inserted=result.inserted,
+            collapsed=result.collapsed,
+            batches=result.batches,
+            seconds=round(result.seconds, 3),
+        )
+        return result
+
+    async def mark_read(
+        self,
+        *,
+        user_id: Optional[UUID] = None,
+        notification_ids: Optional[List[UUID]] = None,
+        group_key: Optional[str] = None,
+        before: Optional[datetime] = None,
+    ) -> int:
+        """Mark matching unread rows read in one statement; returns the number of rows changed."""
+        return await self._store.mark_read(
+            user_id=user_id, notification_ids=notification_ids, group_key=group_key, before=before
+        )
+
+    def digests(self, since: datetime, until: datetime, *, batch_size: int = 1_000) -> AsyncIterator[List[UserDigest]]:
+        return self._store.iter_digests(since, until, batch_size=batch_size)
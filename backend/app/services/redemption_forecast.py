@@ -0,0 +1,343 @@
+"""Redemption survival model and monthly cash-flow forecast for open portfolio holdings.
+
+The model is a discrete-time hazard of redemption by month held. For each duration month ``d``:
+
+    h[d] = redemptions in month d / holdings still open at the start of month d
+
+Holdings that ended any other way (foreclosure, assignment, write-off) and holdings still open are
+censored at their last month. Hazards are estimated for every (county, lien stratum) cell and shrunk
+toward the county, and the county toward the whole book, with ``prior_strength`` pseudo-holdings:
+
+    h_cell[d] = (redemptions_cell[d] + k · h_county[d]) / (at_risk_cell[d] + k)
+
+Thin cells therefore borrow strength, and unseen counties or strata fall back to the parent curve.
+Durations past ``max_duration`` share the last month's hazard, so the survival tail is geometric.
+
+Projection is one gather per chunk of holdings. Month ``m`` of the horizon is the calendar month
+``as_of + m`` (``as_of`` is taken as the first of its month). A holding aged ``a`` months redeems in
+that month with probability ``S[a + m] · h[a + m] / S[a]``, where ``S`` is the survival curve of its cell.
+The expected cash is that probability times the lien's payoff at the month's end, from
+``lien_accrual.amounts_due``. Monthly totals per portfolio carry a normal-approximation interval from
+the Bernoulli variance ``Σ p(1 − p)·payoff²``.
+
+Fitting reads only aggregated counts from ``RedemptionForecastRepository``. Closed holdings are folded
+into the observation table incrementally, so a refit costs one ``GROUP BY``.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Protocol, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+import structlog
+
+from app.core.tracing import traced_stage
+from app.services.lien_accrual import LienTerms, amounts_due
+
+logger = structlog.get_logger(__name__)
+
+INTERVAL_Z = 1.96
+MAX_HAZARD = 1.0 - 1e-9
+
+
+def _hazard(events: np.ndarray, at_risk: np.ndarray, prior: np.ndarray, strength: float) -> np.ndarray:
+    """Hazards shrunk toward ``prior``; months nobody was at risk in take the prior as is."""
+    weight = at_risk + strength
+    fallback = np.broadcast_to(prior, events.shape).copy()
+    shrunk = np.divide(events + strength * prior, weight, out=fallback, where=weight > 0)
+    return np.clip(shrunk, 0.0, MAX_HAZARD)
+
+
+class HazardModel:
+    """Shrunken hazard curves for the whole book, each county, and each (county, stratum) cell."""
+
+    def __init__(
+        self,
+        hazards: np.ndarray,
+        county_rows: Dict[UUID, int],
+        cell_rows: Dict[Tuple[UUID, int], int],
+        *,
+        holdings: int = 0,
+        redemptions: int = 0,
+    ) -> None:
+        # Row 0 is the book-wide curve, then one row per county, then one per cell.
+        self.hazards = hazards
+        self.county_rows = county_rows
+        self.cell_rows = cell_rows
+        self.holdings = holdings
+        self.redemptions = redemptions
+        self._log_survival_cache: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def max_duration(self) -> int:
+        return self.hazards.shape[1] - 1
+
+    @classmethod
+    def fit(
+        cls, counts: Iterable[Sequence[Any]], *, max_duration: int, prior_strength: float
+    ) -> "HazardModel":
+        """Fit from ``(county_id, stratum, duration, redeemed, holdings)`` rows."""
+        rows = list(counts)
+        county_rows: Dict[UUID, int] = {}
+        cell_rows: Dict[Tuple[UUID, int], int] = {}
+        for county_id, stratum, *_ in rows:
+            county_rows.setdefault(county_id, len(county_rows))
+            cell_rows.setdefault((county_id, int(stratum)), len(cell_rows))
+
+        width = max_duration + 1
+        # ``ended[cell, d, redeemed]``: holdings whose observation stopped in duration month d.
+        ended = np.zeros((len(cell_rows), width, 2), dtype=np.float64)
+        if rows:
+            cells = np.fromiter((cell_rows[(row[0], int(row[1]))] for row in rows), dtype=np.int64, count=len(rows))
+            durations = np.clip(np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows)), 0, max_duration)
+            redeemed = np.fromiter((bool(row[3]) for row in rows), dtype=np.int64, count=len(rows))
+            weights = np.fromiter((row[4] for row in rows), dtype=np.float64, count=len(rows))
+            np.add.at(ended, (cells, durations, redeemed), weights)
+        events = ended[:, :, 1]
+        # Open in month d: every holding that ended at d or later, minus those censored exactly at d
+        # (a censored holding contributes its completed months only).
+        at_risk = np.cumsum((events + ended[:, :, 0])[:, ::-1], axis=1)[:, ::-1] - ended[:, :, 0]
+
+        county_of_cell = np.array([county_rows[county] for county, _ in cell_rows], dtype=np.int64)
+        county_events = np.zeros((len(county_rows), width))
+        county_at_risk = np.zeros((len(county_rows), width))
+        np.add.at(county_events, county_of_cell, events)
+        np.add.at(county_at_risk, county_of_cell, at_risk)
+
+        total_events, total_at_risk = events.sum(axis=0), at_risk.sum(axis=0)
+        book = np.divide(total_events, total_at_risk, out=np.zeros(width), where=total_at_risk > 0)
+        book = np.minimum(book, MAX_HAZARD)
+        county = _hazard(county_events, county_at_risk, book[None, :], prior_strength)
+        cell = _hazard(events, at_risk, county[county_of_cell], prior_strength)
+        return cls(
+            np.vstack([book[None, :], county, cell]),
+            {key: 1 + row for key, row in county_rows.items()},
+            {key: 1 + len(county_rows) + row for key, row in cell_rows.items()},
+            holdings=int(ended.sum()),
+            redemptions=int(events.sum()),
+        )
+
+    def rows_for(self, county_ids: Sequence[UUID], strata: Sequence[int]) -> np.ndarray:
+        """Curve row per holding: its cell, else its county, else the book."""
+        return np.fromiter(
+            (
+                self.cell_rows.get((county, int(stratum)), self.county_rows.get(county, 0))
+                for county, stratum in zip(county_ids, strata)
+            ),
+            dtype=np.int64,
+            count=len(county_ids),
+        )
+
+    def _tables(self, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+        tables = self._log_survival_cache.get(horizon)
+        if tables is None:
+            tail = np.repeat(self.hazards[:, -1:], horizon, axis=1)
+            hazards = np.hstack([self.hazards, tail])
+            log_survival = np.zeros_like(hazards)
+            np.cumsum(np.log1p(-hazards[:, :-1]), axis=1, out=log_survival[:, 1:])
+            tables = self._log_survival_cache[horizon] = (hazards, log_survival)
+        return tables
+
+    def redemption_probabilities(self, rows: np.ndarray, ages: np.ndarray, horizon: int) -> np.ndarray:
+        """``(holdings, horizon)`` probability of redeeming in each coming month, given open today."""
+        hazards, log_survival = self._tables(horizon)
+        # Past ``max_duration`` the hazard is constant, so an older holding behaves like one at the cap.
+        ages = np.minimum(np.asarray(ages, dtype=np.int64), self.max_duration)
+        durations = ages[:, None] + np.arange(horizon)[None, :]
+        rows = np.asarray(rows, dtype=np.int64)[:, None]
+        return np.exp(log_survival[rows, durations] - log_survival[rows, ages[:, None]]) * hazards[rows, durations]
+
+
+@dataclass(frozen=True)
+class OpenHoldings:
+    """Column arrays for a chunk of open holdings."""
+
+    portfolio_ids: Tuple[UUID, ...]
+    county_ids: Tuple[UUID, ...]
+    strata: np.ndarray
+    ages: np.ndarray
+    terms: LienTerms
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any]) -> "OpenHoldings":
+        """Rows shaped like ``open_holdings_query``: id, portfolio, county, stratum, age, then lien terms."""
+        return cls(
+            portfolio_ids=tuple(row[1] for row in rows),
+            county_ids=tuple(row[2] for row in rows),
+            strata=np.fromiter((row[3] for row in rows), dtype=np.int64, count=len(rows)),
+            ages=np.fromiter((row[4] for row in rows), dtype=np.int64, count=len(rows)),
+            terms=LienTerms.from_columns(
+                [row[5] for row in rows],
+                [row[6] for row in rows],
+                [row[7] for row in rows],
+                [row[8] for row in rows],
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.portfolio_ids)
+
+
+def forecast_months(as_of: date, horizon: int) -> np.ndarray:
+    """First day of each forecast month, starting with ``as_of``'s own month."""
+    return (np.datetime64(as_of, "M") + np.arange(horizon)).astype("datetime64[D]")
+
+
+@dataclass(frozen=True)
+class HoldingProjection:
+    redemptions: np.ndarray
+    cashflow: np.ndarray
+    variance: np.ndarray
+
+
+def project_holdings(model: HazardModel, holdings: OpenHoldings, as_of: date, horizon: int) -> HoldingProjection:
+    probabilities = model.redemption_probabilities(
+        model.rows_for(holdings.county_ids, holdings.strata), holdings.ages, horizon
+    )
+    month_ends = (np.datetime64(as_of, "M") + np.arange(1, horizon + 1)).astype("datetime64[D]")
+    payoffs = amounts_due(holdings.terms, month_ends)
+    cashflow = probabilities * payoffs
+    return HoldingProjection(probabilities, cashflow, cashflow * payoffs * (1.0 - probabilities))
+
+
+class PortfolioTotals:
+    """Per-portfolio monthly sums of expected redemptions, cash and variance, accumulated chunk by chunk."""
+
+    def __init__(self, horizon: int) -> None:
+        self.horizon = horizon
+        self._totals: Dict[UUID, np.ndarray] = {}
+
+    def add(self, portfolio_ids: Sequence[UUID], projection: HoldingProjection) -> None:
+        # A dict keeps this linear; ``np.unique`` over UUID objects sorts with Python comparisons.
+        positions: Dict[UUID, int] = {}
+        codes = np.fromiter(
+            (positions.setdefault(key, len(positions)) for key in portfolio_ids),
+            dtype=np.int64,
+            count=len(portfolio_ids),
+        )
+        keys = list(positions)
+        cells = (codes[:, None] * self.horizon + np.arange(self.horizon)[None, :]).ravel()
+        size = len(keys) * self.horizon
+        sums = np.stack(
+            [
+                np.bincount(cells, weights=values.ravel(), minlength=size).reshape(len(keys), self.horizon)
+                for values in (projection.redemptions, projection.cashflow, projection.variance)
+            ],
+            axis=1,
+        )
+        for key, values in zip(keys, sums):
+            existing = self._totals.get(key)
+            if existing is None:
+                self._totals[key] = values
+            else:
+                existing += values
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    def records(self, as_of: date) -> List[Tuple[Any, ...]]:
+        """Rows in ``redemption_cashflow_forecasts`` column order."""
+        months = forecast_months(as_of, self.horizon).tolist()
+        records: List[Tuple[Any, ...]] = []
+        for portfolio_id, (redemptions, cashflow, variance) in self._totals.items():
+            spread = INTERVAL_Z * np.sqrt(variance)
+            lower, upper = np.maximum(cashflow - spread, 0.0), cashflow + spread
+            for index, month in enumerate(months):
+                records.append(
+                    (
+                        as_of,
+                        portfolio_id,
+                        month,
+                        Decimal(f"{redemptions[index]:.4f}"),
+                        Decimal(f"{cashflow[index]:.2f}"),
+                        Decimal(f"{lower[index]:.2f}"),
+                        Decimal(f"{upper[index]:.2f}"),
+                    )
+                )
+        return records
+
+    def total_cashflow(self) -> float:
+        return float(sum(values[1].sum() for values in self._totals.values()))
+
+
+class RedemptionForecastStore(Protocol):
+    async def refresh_observations(self) -> int: ...
+
+    async def hazard_counts(self, as_of: date, max_duration: int) -> List[Tuple[Any, ...]]: ...
+
+    def iter_open_holdings(self, as_of: date, chunk_size: int) -> Any: ...
+
+    async def replace_forecast(self, as_of: date, rows: Sequence[Tuple[Any, ...]]) -> int: ...
+
+
+@dataclass(frozen=True)
+class ForecastResult:
+    as_of: date
+    observations_refreshed: int
+    fitted_holdings: int
+    fitted_redemptions: int
+    open_holdings: int
+    portfolios: int
+    rows_written: int
+    expected_cashflow: float
+    seconds: float
+
+
+class RedemptionForecaster:
+    def __init__(
+        self,
+        store: RedemptionForecastStore,
+        *,
+        horizon_months: int = 36,
+        max_duration_months: int = 60,
+        prior_strength: float = 25.0,
+        chunk_size: int = 50_000,
+    ) -> None:
+        self._store = store
+        self._horizon = horizon_months
+        self._max_duration = max_duration_months
+        self._prior_strength = prior_strength
+        self._chunk_size = chunk_size
+
+    async def fit(self, as_of: date) -> HazardModel:
+        counts = await self._store.hazard_counts(as_of, self._max_duration)
+        return HazardModel.fit(counts, max_duration=self._max_duration, prior_strength=self._prior_strength)
+
+    async def run(self, as_of: date) -> ForecastResult:
+        """Refresh observations, refit, project every open holding and replace the ``as_of`` forecast."""
+        started = time.perf_counter()
+        as_of = as_of.replace(day=1)
+        with traced_stage("forecast.refresh"):
+            refreshed = await self._store.refresh_observations()
+        with traced_stage("forecast.fit"):
+            model = await self.fit(as_of)
+
+        totals = PortfolioTotals(self._horizon)
+        open_holdings = 0
+        with traced_stage("forecast.project") as span:
+            async for rows in self._store.iter_open_holdings(as_of, self._chunk_size):
+                chunk = OpenHoldings.from_rows(rows)
+                totals.add(chunk.portfolio_ids, project_holdings(model, chunk, as_of, self._horizon))
+                open_holdings += len(chunk)
+            span.set_attribute("forecast.open_holdings", open_holdings)
+
+        with traced_stage("forecast.write", portfolios=len(totals)):
+            written = await self._store.replace_forecast(as_of, totals.records(as_of))
+        result = ForecastResult(
+            as_of=as_of,
+            observations_refreshed=refreshed,
+            fitted_holdings=model.holdings,
+            fitted_redemptions=model.redemptions,
+            open_holdings=open_holdings,
+            portfolios=len(totals),
+            rows_written=written,
+            expected_cashflow=round(totals.total_cashflow(), 2),
+            seconds=round(time.perf_counter() - started, 3),
+        )
+        logger.info("redemption_forecast.completed", **{**asdict(result), "as_of": as_of.isoformat()})
+        return result
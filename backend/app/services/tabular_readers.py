@@ -0,0 +1,241 @@
+"""Streaming readers for uploaded lead lists (CSV and XLSX) with per-chunk column type inference.
+
+``iter_chunks`` yields ``SheetChunk`` batches of at most ``chunk_size`` rows. Each batch carries its
+sheet's header and the column types inferred from the batch, and both formats produce the same rows,
+so CSV and XLSX uploads feed one staging path. Cells are normalised to stripped text or ``None``:
+
+* Whole-number floats lose their ``.0``, and dates and datetimes become ISO 8601 (midnight as a date).
+* Blank rows are skipped.
+* Rows are padded or cut to the header's width.
+* Blank header names become ``column_<n>``, and repeats get a ``.1``, ``.2`` suffix.
+
+XLSX is read with python-calamine (a Rust reader, the optional ``calamine`` extra) when it is
+installed. Otherwise it falls back to openpyxl's read-only mode, which streams the sheet XML row by
+row. Exported workbooks often declare a wrong ``A1`` dimension, so read-only sheets are reset
+before iterating.
+
+Types are one of ``TYPES`` and only ever widen: ``integer`` → ``decimal`` → ``text``,
+``date`` → ``datetime`` → ``text``, ``boolean`` → ``text``. A column with no values stays ``empty``.
+Numbers with leading zeros (ZIP codes, parcel numbers) count as text.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+TabularSource = Union[str, Path, bytes, BinaryIO]
+Row = Tuple[Optional[str], ...]
+
+CSV_MIME_TYPES = ("text/csv", "application/csv", "text/plain")
+XLSX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+_FORMATS_BY_SUFFIX = {".csv": "csv", ".txt": "csv", ".xlsx": "xlsx", ".xlsm": "xlsx"}
+
+TYPES = ("empty", "boolean", "integer", "decimal", "date", "datetime", "text")
+_WIDENS_TO = {
+    ("integer", "decimal"): "decimal",
+    ("date", "datetime"): "datetime",
+}
+_DATE = r"(?:\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4})"
+_PATTERNS = (
+    ("boolean", re.compile(r"(?i)(?:true|false|yes|no|y|n)")),
+    ("integer", re.compile(r"[-+]?(?:0|[1-9]\d{0,17})")),
+    ("decimal", re.compile(r"[-+]?(?:\d+\.\d*|\.\d+)(?:[eE][-+]?\d+)?")),
+    ("date", re.compile(_DATE)),
+    ("datetime", re.compile(_DATE + r"[ T]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[-+]\d{2}:?\d{2})?")),
+)
+_TYPE_PATTERNS = dict(_PATTERNS)
+
+
+@dataclass(frozen=True)
+class SheetChunk:
+    sheet_index: int
+    sheet_name: str
+    header: Tuple[str, ...]
+    # Source row number (1-based, header included) of each row in ``rows``.
+    row_numbers: List[int]
+    rows: List[Row]
+    types: List[str]
+
+
+def detect_tabular_format(mime_type: Optional[str] = None, filename: Optional[str] = None) -> str:
+    if mime_type:
+        kind = mime_type.split(";", 1)[0].strip().lower()
+        if kind == XLSX_MIME_TYPE:
+            return "xlsx"
+        if kind in CSV_MIME_TYPES:
+            return "csv"
+    if filename:
+        fmt = _FORMATS_BY_SUFFIX.get(Path(filename).suffix.lower())
+        if fmt:
+            return fmt
+    raise ValueError(f"Unsupported upload type (mime_type={mime_type!r}, filename={filename!r}).")
+
+
+def cell_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else repr(value)
+    if isinstance(value, datetime):
+        # Excel cells do not distinguish dates from midnight datetimes; readers differ, so normalise.
+        if value.tzinfo is None and value.time() == time():
+            return value.date().isoformat()
+        return value.isoformat(sep=" ")
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return str(value)
+    return str(value).strip() or None
+
+
+def _value_type(value: str) -> str:
+    for name, pattern in _PATTERNS:
+        if pattern.fullmatch(value):
+            return name
+    return "text"
+
+
+def widen_type(current: str, observed: str) -> str:
+    if current == observed or observed == "empty":
+        return current
+    if current == "empty":
+        return observed
+    return _WIDENS_TO.get((current, observed)) or _WIDENS_TO.get((observed, current)) or "text"
+
+
+def infer_types(rows: Sequence[Row], width: int, current: Optional[Sequence[str]] = None) -> List[str]:
+    """Column types of ``rows``, widened from ``current`` (the types inferred so far)."""
+    types = list(current) if current is not None else ["empty"] * width
+    for index in range(width):
+        column_type = types[index]
+        for row in rows:
+            if column_type == "text":
+                break
+            value = row[index]
+            if value is None:
+                continue
+            # Most values already fit the column's type; only the rest are classified.
+            pattern = _TYPE_PATTERNS.get(column_type)
+            if pattern is not None and pattern.fullmatch(value):
+                continue
+            column_type = widen_type(column_type, _value_type(value))
+        types[index] = column_type
+    return types
+
+
+def header_names(cells: Sequence[Optional[str]]) -> Tuple[str, ...]:
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for position, cell in enumerate(cells, start=1):
+        name = cell or f"column_{position}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        seen.setdefault(name, 0)
+        names.append(name)
+    return tuple(names)
+
+
+def _open_binary(source: TabularSource) -> Union[str, BinaryIO]:
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if isinstance(source, Path):
+        return str(source)
+    return source
+
+
+def _csv_sheets(source: TabularSource) -> Iterator[Tuple[str, Iterable[Sequence[Any]]]]:
+    if isinstance(source, (str, Path)):
+        with open(source, encoding="utf-8-sig", errors="replace", newline="") as handle:
+            yield Path(source).stem, csv.reader(handle)
+        return
+    binary = _open_binary(source)
+    handle = io.TextIOWrapper(binary, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        yield "csv", csv.reader(handle)
+    finally:
+        handle.detach()
+
+
+def _calamine_sheets(source: TabularSource) -> Iterator[Tuple[str, Iterable[Sequence[Any]]]]:
+    import python_calamine
+
+    workbook = python_calamine.load_workbook(_open_binary(source))
+    try:
+        for name in workbook.sheet_names:
+            yield name, workbook.get_sheet_by_name(name).iter_rows()
+    finally:
+        workbook.close()
+
+
+def _openpyxl_sheets(source: TabularSource) -> Iterator[Tuple[str, Iterable[Sequence[Any]]]]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(_open_binary(source), read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            # Read-only sheets stop at the declared dimension, which exports often leave at A1.
+            sheet.reset_dimensions()
+            yield sheet.title, sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def xlsx_reader_name() -> str:
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return "openpyxl"
+    return "calamine"
+
+
+def _sheets(
+    source: TabularSource, fmt: str, xlsx_reader: Optional[str]
+) -> Iterator[Tuple[str, Iterable[Sequence[Any]]]]:
+    if fmt == "csv":
+        return _csv_sheets(source)
+    if fmt == "xlsx":
+        reader = xlsx_reader or xlsx_reader_name()
+        if reader == "calamine":
+            return _calamine_sheets(source)
+        if reader == "openpyxl":
+            return _openpyxl_sheets(source)
+        raise ValueError(f"Unknown XLSX reader '{reader}'.")
+    raise ValueError(f"Unsupported upload format '{fmt}'.")
+
+
+def iter_chunks(
+    source: TabularSource, fmt: str, chunk_size: int, *, xlsx_reader: Optional[str] = None
+) -> Iterator[SheetChunk]:
+    """``SheetChunk`` batches of every sheet, in order; ``xlsx_reader`` forces ``calamine`` or ``openpyxl``."""
+    for sheet_index, (sheet_name, raw_rows) in enumerate(_sheets(source, fmt, xlsx_reader)):
+        header: Optional[Tuple[str, ...]] = None
+        numbers: List[int] = []
+        rows: List[Row] = []
+        yielded = False
+        for number, raw in enumerate(raw_rows, start=1):
+            cells = [cell_text(value) for value in raw]
+            if not any(cells):
+                continue
+            if header is None:
+                header = header_names(cells)
+                continue
+            width = len(header)
+            rows.append(tuple(cells[:width]) if len(cells) >= width else (*cells, *([None] * (width - len(cells)))))
+            numbers.append(number)
+            if len(rows) >= chunk_size:
+                yield SheetChunk(sheet_index, sheet_name, header, numbers, rows, infer_types(rows, width))
+                numbers, rows, yielded = [], [], True
+        # A header-only sheet still yields one empty chunk, so its columns are recorded.
+        if header is not None and (rows or not yielded):
+            yield SheetChunk(sheet_index, sheet_name, header, numbers, rows, infer_types(rows, len(header)))
@@ -0,0 +1,309 @@
+"""Interactive what-if re-ranking of an analysis run's deals.
+
+Analysts adjust one assumption and expect the run's deals re-ranked at once. The assumptions are the
+rehab cost multiplier, a multiplier on redemption probability, and the discount rate.
+``RunBaseline`` holds the run's per-lien inputs as NumPy columns. They are read once from the stored
+scenario analyses.
+
+A ``WhatIfSession`` caches every intermediate column together with the parameter values it was
+computed from. A new set of assumptions therefore recomputes only the nodes downstream of what
+changed:
+
+    probability      <- redemption_probability_multiplier
+    redemption_pv    <- discount_rate
+    deed_profit      <- rehab_cost_multiplier
+    deed_capital     <- rehab_cost_multiplier
+    deed_pv          <- deed_profit, discount_rate
+    expected_value   <- probability, redemption_pv, deed_pv
+    expected_capital <- probability, deed_capital
+    score            <- expected_value, expected_capital
+
+Rehab cost is the capital the stored deed-conversion scenario needs beyond the redemption scenario's.
+The multiplier scales it in both the deed path's profit and its capital. Profits are discounted
+monthly by ``(1 + r) ** (-months / 12)``, and the default rate of 0 reproduces the stored,
+undiscounted figures. ``score`` is expected present value per dollar of expected capital. The top
+``k`` deals come from ``argpartition``, so ranking stays linear in the number of liens.
+
+``WhatIfSessions`` keeps sessions in LRU order, up to ``WHAT_IF_MAX_SESSIONS`` of them. Sessions on
+the same run share one baseline, which is released when the last of them is evicted. A session sees
+the run as it was when the session opened.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class WhatIfParameters:
+    rehab_cost_multiplier: float = 1.0
+    redemption_probability_multiplier: float = 1.0
+    discount_rate: float = 0.0
+
+
+PARAMETERS: Tuple[str, ...] = tuple(field.name for field in fields(WhatIfParameters))
+
+
+def _column(rows: Sequence[Sequence[Any]], index: int) -> np.ndarray:
+    """Float column with ``None`` as 0."""
+    return np.fromiter(
+        (0.0 if row[index] is None else float(row[index]) for row in rows), dtype=np.float64, count=len(rows)
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class RunBaseline:
+    """Per-lien inputs of one analysis run, in lien order."""
+
+    run_id: UUID
+    lien_ids: Tuple[UUID, ...]
+    redemption_probability: np.ndarray
+    redemption_profit: np.ndarray
+    redemption_months: np.ndarray
+    redemption_capital: np.ndarray
+    deed_profit: np.ndarray
+    deed_months: np.ndarray
+    rehab_cost: np.ndarray
+    baseline_rank: np.ndarray
+
+    @classmethod
+    def from_rows(cls, run_id: UUID, rows: Sequence[Sequence[Any]]) -> "RunBaseline":
+        """Rows shaped like ``what_if_baseline_query``."""
+        redemption_capital = _column(rows, 4)
+        return cls(
+            run_id=run_id,
+            lien_ids=tuple(row[0] for row in rows),
+            redemption_probability=np.clip(_column(rows, 1), 0.0, 1.0),
+            redemption_profit=_column(rows, 2),
+            redemption_months=_column(rows, 3),
+            redemption_capital=redemption_capital,
+            deed_profit=_column(rows, 5),
+            deed_months=_column(rows, 6),
+            rehab_cost=np.maximum(_column(rows, 7) - redemption_capital, 0.0),
+            # Unranked liens keep 0, which the API reports as no baseline rank.
+            baseline_rank=_column(rows, 8).astype(np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.lien_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+
+
+Values = Dict[str, np.ndarray]
+
+
+def _discount(months: np.ndarray, rate: float) -> np.ndarray:
+    return np.power(1.0 + rate, -months / 12.0)
+
+
+def _probability(baseline: RunBaseline, parameters: WhatIfParameters, values: Values) -> np.ndarray:
+    return np.clip(baseline.redemption_probability * parameters.redemption_probability_multiplier, 0.0, 1.0)
+
+
+def _redemption_pv(baseline: RunBaseline, parameters: WhatIfParameters, values: Values) -> np.ndarray:
+    return baseline.redemption_profit * _discount(baseline.redemption_months, parameters.discount_rate)
+
+
+def _deed_profit(baseline: RunBaseline, parameters: WhatIfParameters, values: Values) -> np.ndarray:
+    return baseline.deed_profit - (parameters.rehab_cost_multiplier - 1.0) * baseline.rehab_cost
+
+
+def _deed_capital(baseline: RunBaseline, parameters: WhatIfParameters, values: Values) -> np.ndarray:
+    return baseline.redemption_capital + parameters.rehab_cost_multiplier * baseline.rehab_cost
+
+
+def _deed_pv(baseline: RunBaseline, parameters: WhatIfParameters, values: Values) -> np.ndarray:
+    return values["deed_profit"] * _discount(baseline.deed_months, parameters.discount_rate)
+
+
+def _expected_value(baseline: RunBaseline, parameters: WhatIfParameters, values: Values) -> np.ndarray:
+    probability = values["probability"]
+    return probability * values["redemption_pv"] + (1.0 - probability) * values["deed_pv"]
+
+
+def _expected_capital(baseline: RunBaseline, parameters: WhatIfParameters, values: Values) -> np.ndarray:
+    probability = values["probability"]
+    return probability * baseline.redemption_capital + (1.0 - probability) * values["deed_capital"]
+
+
+def _score(baseline: RunBaseline, parameters: WhatIfParameters, values: Values) -> np.ndarray:
+    capital = values["expected_capital"]
+    # Deals without capital cannot be ranked on return; they sort last.
+    return np.divide(values["expected_value"], capital, out=np.full(len(capital), -np.inf), where=capital > 0)
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable[[RunBaseline, WhatIfParameters, Values], np.ndarray]
+
+
+NODES: Tuple[Node, ...] = (
+    Node("probability", ("redemption_probability_multiplier",), _probability),
+    Node("redemption_pv", ("discount_rate",), _redemption_pv),
+    Node("deed_profit", ("rehab_cost_multiplier",), _deed_profit),
+    Node("deed_capital", ("rehab_cost_multiplier",), _deed_capital),
+    Node("deed_pv", ("deed_profit", "discount_rate"), _deed_pv),
+    Node("expected_value", ("probability", "redemption_pv", "deed_pv"), _expected_value),
+    Node("expected_capital", ("probability", "deed_capital"), _expected_capital),
+    Node("score", ("expected_value", "expected_capital"), _score),
+)
+
+
+def _parameter_dependencies(nodes: Sequence[Node]) -> Dict[str, Tuple[str, ...]]:
+    """The parameters each node depends on, directly or through earlier nodes."""
+    dependencies: Dict[str, Tuple[str, ...]] = {name: (name,) for name in PARAMETERS}
+    for node in nodes:
+        unknown = [name for name in node.inputs if name not in dependencies]
+        if unknown:
+            raise ValueError(f"Node {node.name!r} reads {unknown} before they are defined.")
+        found = {parameter for name in node.inputs for parameter in dependencies[name]}
+        dependencies[node.name] = tuple(name for name in PARAMETERS if name in found)
+    return dependencies
+
+
+NODE_PARAMETERS = _parameter_dependencies(NODES)
+
+
+@dataclass(frozen=True)
+class RankedDeal:
+    lien_id: UUID
+    rank: int
+    baseline_rank: Optional[int]
+    score: Optional[float]
+    expected_value: float
+    expected_capital: float
+    redemption_probability: float
+
+
+@dataclass(frozen=True)
+class WhatIfRanking:
+    session_id: UUID
+    run_id: UUID
+    parameters: WhatIfParameters
+    total_liens: int
+    recomputed: Tuple[str, ...]
+    deals: List[RankedDeal]
+
+
+def top_positions(score: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first; ties keep lien order."""
+    if k <= 0 or not len(score):
+        return np.empty(0, dtype=np.int64)
+    if k < len(score):
+        candidates = np.argpartition(-score, k - 1)[:k]
+        candidates.sort()
+    else:
+        candidates = np.arange(len(score))
+    return candidates[np.argsort(-score[candidates], kind="stable")]
+
+
+class WhatIfSession:
+    """Warm intermediate columns for one analyst exploring one run."""
+
+    def __init__(self, baseline: RunBaseline, session_id: Optional[UUID] = None) -> None:
+        self.session_id = session_id or uuid4()
+        self.baseline = baseline
+        self._values: Values = {}
+        self._stamps: Dict[str, Tuple[float, ...]] = {}
+
+    def evaluate(self, parameters: WhatIfParameters) -> Tuple[str, ...]:
+        """Bring every node up to date with ``parameters``; returns the nodes that were recomputed."""
+        recomputed = []
+        for node in NODES:
+            stamp = tuple(getattr(parameters, name) for name in NODE_PARAMETERS[node.name])
+            if self._stamps.get(node.name) != stamp:
+                self._values[node.name] = node.compute(self.baseline, parameters, self._values)
+                self._stamps[node.name] = stamp
+                recomputed.append(node.name)
+        return tuple(recomputed)
+
+    def column(self, name: str) -> np.ndarray:
+        return self._values[name]
+
+    def rank(self, parameters: WhatIfParameters, top_k: int) -> WhatIfRanking:
+        recomputed = self.evaluate(parameters)
+        score = self._values["score"]
+        positions = top_positions(score, top_k)
+        lien_ids, baseline_rank = self.baseline.lien_ids, self.baseline.baseline_rank
+        deals = [
+            RankedDeal(
+                lien_id=lien_ids[position],
+                rank=rank,
+                baseline_rank=int(baseline_rank[position]) or None,
+                score=float(score[position]) if np.isfinite(score[position]) else None,
+                expected_value=float(self._values["expected_value"][position]),
+                expected_capital=float(self._values["expected_capital"][position]),
+                redemption_probability=float(self._values["probability"][position]),
+            )
+            for rank, position in enumerate(positions.tolist(), start=1)
+        ]
+        return WhatIfRanking(self.session_id, self.baseline.run_id, parameters, len(score), recomputed, deals)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(value.nbytes for value in self._values.values())
+
+
+class WhatIfSessions:
+    """Process-wide sessions in LRU order; baselines are shared per run while any session holds them."""
+
+    def __init__(self, max_sessions: int) -> None:
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1.")
+        self._max_sessions = max_sessions
+        self._sessions: "OrderedDict[UUID, WhatIfSession]" = OrderedDict()
+        self._baselines: "weakref.WeakValueDictionary[UUID, RunBaseline]" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: UUID, run_id: UUID) -> Optional[WhatIfSession]:
+        """The live session, marked most recently used; ``None`` once evicted or if it is on another run."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.baseline.run_id != run_id:
+                return None
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def baseline(self, run_id: UUID) -> Optional[RunBaseline]:
+        return self._baselines.get(run_id)
+
+    def open(self, baseline: RunBaseline) -> WhatIfSession:
+        with self._lock:
+            # Two sessions opened concurrently on a cold run both load it; the first baseline wins.
+            shared = self._baselines.setdefault(baseline.run_id, baseline)
+            session = WhatIfSession(shared)
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+            return session
+
+    def close(self, session_id: UUID) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+_sessions: Optional[WhatIfSessions] = None
+
+
+def get_what_if_sessions() -> WhatIfSessions:
+    global _sessions
+    if _sessions is None:
+        _sessions = WhatIfSessions(settings.WHAT_IF_MAX_SESSIONS)
+    return _sessions
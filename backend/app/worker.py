@@ -1,8 +1,11 @@
 """Celery application instance accessible for background job execution."""
 
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_process_init
 
 from app.core.config import settings
+from app.core.tracing import configure_tracing, instrument_celery
 
 
 celery_app = Celery("tax_lien_strategist")
@@ -13,6 +16,41 @@ celery_app.conf.task_serializer = "json"
 celery_app.conf.result_serializer = "json"
 celery_app.conf.accept_content = ["json"]
 celery_app.conf.timezone = "UTC"
+celery_app.conf.include = [
+    "app.jobs.maintenance",
+    "app.jobs.documents",
+    "app.jobs.notifications",
+    "app.jobs.forecasts",
+    "app.jobs.exports",
+    "app.jobs.uploads",
+]
+# Chunked-upload staging can wait UPLOAD_PART_WAIT_SECONDS for each part of a slow client, so it runs
+# on its own workers instead of tying up the ones notifications, exports and forecasts share. Batch
+# generation needs a worker whose pool is not prefork: prefork children are daemonic and cannot start
+# the render process pool.
+celery_app.conf.task_routes = {
+    "app.jobs.uploads.ingest_chunked_upload": {"queue": settings.UPLOAD_INGESTION_QUEUE},
+    "app.jobs.documents.generate_documents": {"queue": settings.DOCUMENT_GENERATION_QUEUE},
+}
+celery_app.conf.beat_schedule = {
+    "manage-log-partitions": {
+        "task": "app.jobs.maintenance.manage_log_partitions",
+        "schedule": crontab(hour=1, minute=30),
+    },
+    "forecast-redemptions": {
+        "task": "app.jobs.forecasts.forecast_redemptions",
+        "schedule": crontab(hour=2, minute=30),
+    },
+}
+
+if settings.TRACING_ENABLED:
+    instrument_celery()
+
+
+@worker_process_init.connect(weak=False)
+def _init_worker_tracing(**_: object) -> None:
+    """Configure tracing per worker process so batch exporters are not shared across forks."""
+    configure_tracing(service_name=f"{settings.TRACING_SERVICE_NAME}-worker")
 
 
 @celery_app.task(name="app.jobs.health.ping")
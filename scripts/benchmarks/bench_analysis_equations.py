@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Cost of loading and evaluating the analysis equations workbook.
+
+Reports the time to parse ``Real_Estate_Analysis_Equations_KB.xlsx`` with ``openpyxl``, to reload it from
+the on-disk cache, and to compile a plan. It then evaluates every computable output over ``--rows``
+synthetic property rows with the compiled NumPy plan, and with a per-row Python tree walk over a sample
+(extrapolated):
+
+    python scripts/benchmarks/bench_analysis_equations.py --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import tempfile
+import time
+from typing import Any, Dict, Mapping
+
+import _bootstrap  # noqa: F401
+import numpy as np
+import structlog
+
+from app.services import analysis_equations
+from app.services.analysis_equations import DEFAULT_WORKBOOK, AnalysisEngine, Expr, load_equations
+
+SCALAR_OPERATIONS = {
+    "add": lambda a, b: a + b,
+    "sub": lambda a, b: a - b,
+    "mul": lambda a, b: a * b,
+    "div": lambda a, b: a / b if b else math.inf,
+    "pow": lambda a, b: a**b,
+    "neg": lambda a: -a,
+    "max": max,
+    "min": min,
+    "abs": abs,
+}
+
+
+def interpret(engine: AnalysisEngine, expression: Expr, row: Mapping[str, float], cache: Dict[str, float]) -> Any:
+    """Naive per-row evaluation: walk the expression tree, resolving names through other equations."""
+    operation = expression[0]
+    if operation == "const":
+        return expression[1]
+    if operation == "name":
+        name = expression[1]
+        if name in row:
+            return row[name]
+        if name not in cache:
+            cache[name] = interpret(engine, engine.equation(name).expression, row, cache)
+        return cache[name]
+    return SCALAR_OPERATIONS[operation](*(interpret(engine, argument, row, cache) for argument in expression[1:]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sample", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        started = time.perf_counter()
+        equations = load_equations(DEFAULT_WORKBOOK, cache_dir=cache_dir)
+        print(f"parse workbook (openpyxl)   {(time.perf_counter() - started) * 1000:8.1f} ms")
+        analysis_equations._equation_sets.clear()
+        started = time.perf_counter()
+        load_equations(DEFAULT_WORKBOOK, cache_dir=cache_dir)
+        print(f"load from disk cache        {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+    engine = AnalysisEngine(equations)
+    bases = sorted({name for output in engine.outputs for name in engine.required_inputs(output)})
+    rng = np.random.default_rng(args.seed)
+    columns = {name: rng.uniform(0.01, 1_000.0, args.rows) for name in bases}
+
+    started = time.perf_counter()
+    plan = engine.plan(columns.keys())
+    print(
+        f"compile plan                {(time.perf_counter() - started) * 1000:8.1f} ms  "
+        f"({len(plan.outputs)} outputs, {len(plan.inputs)} inputs, {plan.node_count} nodes)"
+    )
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        plan(columns)
+        timings.append(time.perf_counter() - started)
+    seconds = min(timings)
+    print(
+        f"NumPy plan                  {seconds:8.3f} s   ({args.rows / seconds / 1e6:,.1f}M rows/s, "
+        f"first call {timings[0]:.3f} s)"
+    )
+
+    sample = min(args.sample, args.rows)
+    rows = [{name: float(columns[name][index]) for name in bases} for index in range(sample)]
+    started = time.perf_counter()
+    for row in rows:
+        cache: Dict[str, float] = {}
+        for output in plan.outputs:
+            interpret(engine, engine.equation(output).expression, row, cache)
+    per_row = (time.perf_counter() - started) / sample
+    print(f"per-row Python tree walk    {per_row * args.rows:8.3f} s   (extrapolated from {sample:,} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""Staging latency and peak memory of chunked CSV uploads, parsed as parts arrive vs after the last part.
+
+Writes a synthetic lead-list CSV of ``--size-mb`` and "uploads" it part by part into local document
+storage. Each part is delayed to match a ``--mb-per-second`` client link. Rows are staged with the
+upload pipeline into a counting store that replaces Postgres. The script reports when the first rows
+became visible, when every row was staged, and the process's peak RSS growth:
+
+    python scripts/benchmarks/bench_chunked_upload.py --size-mb 512 --mb-per-second 50
+
+``overlapped`` starts staging at init, as the API does for CSV, and ``after-upload`` waits for the
+last part. Peak memory should not grow with ``--size-mb``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from uuid import UUID, uuid4
+
+import _bootstrap  # noqa: F401
+import structlog
+
+from app.services.chunked_upload import READ_SIZE, PartStreamReader, UploadPlan, part_key, store_part
+from app.services.document_storage import LocalArtifactStorage
+from app.services.upload_ingestion import UploadIngestionPipeline
+
+HEADER = "Owner Name,Mailing Address,City,State,Zip,Phone 1,Email 1,Assessed Value,Last Sale Date\n"
+MODES = ("overlapped", "after-upload")
+
+
+class CountingStore:
+    def __init__(self) -> None:
+        self.rows = 0
+        self.first_rows_at: Optional[float] = None
+
+    async def begin_staging(self, upload_id: UUID) -> None:
+        pass
+
+    async def stage_rows(
+        self, upload_id: UUID, sheet_index: int, row_numbers: Sequence[int], rows: Sequence[Sequence[Optional[str]]]
+    ) -> int:
+        if rows and self.first_rows_at is None:
+            self.first_rows_at = time.perf_counter()
+        self.rows += len(rows)
+        return len(rows)
+
+    async def complete(self, upload_id: UUID, sheets: List[Dict[str, Any]], row_count: int) -> None:
+        pass
+
+    async def fail(self, upload_id: UUID, error: str) -> None:
+        pass
+
+
+def write_csv(path: Path, size: int) -> None:
+    with open(path, "w", newline="") as handle:
+        handle.write(HEADER)
+        index = 0
+        while handle.tell() < size:
+            handle.write(
+                f"Owner {index},{index} Example St,Houston,TX,77{index % 1000:03d},713555{index % 10000:04d},"
+                f"owner{index}@example.com,{150_000 + index % 90_000},2019-{index % 12 + 1:02d}-15\n"
+            )
+            index += 1
+
+
+async def _body(data: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), 64 * 1024):
+        yield data[start : start + 64 * 1024]
+
+
+async def _upload(storage: LocalArtifactStorage, upload_id: UUID, path: str, plan: UploadPlan, rate: float) -> float:
+    with open(path, "rb") as source:
+        for number in range(1, plan.part_count + 1):
+            data = source.read(plan.part_size)
+            await asyncio.sleep(len(data) / rate)
+            await store_part(
+                storage,
+                part_key(upload_id, number),
+                _body(data),
+                expected_length=len(data),
+                expected_sha256=hashlib.sha256(data).hexdigest(),
+            )
+    return time.perf_counter()
+
+
+async def _run(mode: str, path: str, part_size: int, rate: float, chunk_size: int) -> Dict[str, float]:
+    plan = UploadPlan(Path(path).stat().st_size, part_size)
+    store = CountingStore()
+    pipeline = UploadIngestionPipeline(store, chunk_size=chunk_size)
+    upload_id = uuid4()
+    with tempfile.TemporaryDirectory() as root:
+        storage = LocalArtifactStorage(root)
+        reader = PartStreamReader(storage, upload_id, plan.part_count, poll_seconds=0.02)
+        source = io.BufferedReader(reader, READ_SIZE)
+        started = time.perf_counter()
+        if mode == "overlapped":
+            uploaded_at, _ = await asyncio.gather(
+                _upload(storage, upload_id, path, plan, rate), pipeline.ingest(upload_id, source, "csv")
+            )
+        else:
+            uploaded_at = await _upload(storage, upload_id, path, plan, rate)
+            await pipeline.ingest(upload_id, source, "csv")
+        staged_at = time.perf_counter()
+    return {
+        "rows": store.rows,
+        "uploaded": uploaded_at - started,
+        "first_rows": (store.first_rows_at or staged_at) - started,
+        "staged": staged_at - started,
+    }
+
+
+def _child(mode: str, path: str, args: argparse.Namespace) -> None:
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rate = args.mb_per_second * 2**20
+    result = asyncio.run(_run(mode, path, args.part_size_mb * 2**20, rate, args.chunk_size))
+    result["peak_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--part-size-mb", type=int, default=8)
+    parser.add_argument("--mb-per-second", type=float, default=25.0)
+    parser.add_argument("--chunk-size", type=int, default=5_000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child[0], args.child[1], args)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = str(Path(workdir) / "leads.csv")
+        write_csv(Path(path), args.size_mb * 2**20)
+        print(f"{args.size_mb} MB CSV, {args.part_size_mb} MB parts, client at {args.mb_per_second:g} MB/s")
+        for mode in MODES:
+            command = [sys.executable, __file__, *sys.argv[1:], "--child", mode, path]
+            output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"  {mode:<13}{result['rows']:>10,} rows  uploaded {result['uploaded']:6.1f} s  "
+                f"first rows {result['first_rows']:6.1f} s  all staged {result['staged']:6.1f} s  "
+                f"{result['peak_kb'] / 1024:6.1f} MB peak RSS growth"
+            )
+
+
+if __name__ == "__main__":
+    main()
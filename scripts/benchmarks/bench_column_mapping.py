@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""Time to suggest a column mapping for a new header layout vs a layout the mapper already knows.
+
+Reads the header and first rows of each ``--csv`` (the repository's vendor exports by default). It
+times a cold ``suggest`` on a fresh mapper, resolved by the alias, fuzzy and sample-value heuristics.
+It then confirms that mapping and times a warm ``suggest`` of the same layout, answered from the
+fingerprint cache. No provider is configured, so neither path can call embeddings or the LLM:
+
+    python scripts/benchmarks/bench_column_mapping.py --repeat 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import _bootstrap  # noqa: F401
+import structlog
+
+from app.services.column_mapping import ColumnMapper
+from app.services.tabular_readers import iter_chunks
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CSVS = (
+    REPO_ROOT / "Tax-Lien-Leads-SC-Hamner.csv",
+    REPO_ROOT / "contact_export-HoustonActiveCashBuyers.csv",
+)
+
+
+class NullStore:
+    async def get(self, fingerprint: str) -> Optional[List[Optional[str]]]:
+        return None
+
+    async def save(self, fingerprint: str, headers: Sequence[str], fields: Sequence[Optional[str]]) -> None:
+        pass
+
+
+async def _time(path: Path, repeat: int) -> Dict[str, float]:
+    sample = next(iter_chunks(path, "csv", 20))
+    cold = warm = 0.0
+    for _ in range(repeat):
+        mapper = ColumnMapper(NullStore(), use_llm=False)
+        started = time.perf_counter()
+        suggestion = await mapper.suggest(sample.header, sample.rows)
+        cold += time.perf_counter() - started
+        await mapper.confirm(sample.header, suggestion.mapping)
+        started = time.perf_counter()
+        await mapper.suggest(sample.header, sample.rows)
+        warm += time.perf_counter() - started
+    mapped = sum(field is not None for field in suggestion.mapping.values())
+    return {"columns": len(sample.header), "mapped": mapped, "cold": cold / repeat, "warm": warm / repeat}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", type=Path, action="append", help="CSV to read headers from (repeatable)")
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    for path in args.csv or DEFAULT_CSVS:
+        result = asyncio.run(_time(path, args.repeat))
+        print(
+            f"{path.name:<48}{result['columns']:>4} columns, {result['mapped']:>3} mapped  "
+            f"new layout {result['cold'] * 1e6:9.1f} us  known layout {result['warm'] * 1e6:7.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
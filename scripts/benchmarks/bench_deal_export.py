@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""Throughput and peak memory of the ranked-deal export encoders.
+
+Feeds ``--rows`` synthetic export rows to each format in cursor-sized batches. It reports rows per
+second, output size, and the peak Python allocation measured by tracemalloc in a second pass. The
+peak should not grow with ``--rows``:
+
+    python scripts/benchmarks/bench_deal_export.py --rows 400000 --chunk-size 5000
+
+Postgres is not involved; the cursor is replaced by a pre-built batch that is re-sent.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, AsyncIterator, List, Sequence, Tuple
+from uuid import uuid4
+
+import _bootstrap  # noqa: F401
+import structlog
+
+from app.models.enums import InterestType, LienStatus, LienType, PropertyType
+from app.repositories.deal_exports import EXPORT_COLUMNS, export_column_names
+from app.services.deal_export import encode_export, open_encoder
+
+
+def synthetic_batch(size: int) -> List[Sequence[Any]]:
+    names = export_column_names()
+    template = {
+        "investor_profile_id": uuid4(),
+        "composite_score": 0.82,
+        "yield_score": 0.7,
+        "risk_adjusted_return_score": 0.65,
+        "liquidity_score": 0.5,
+        "strategy_fit_score": 0.9,
+        "lien_certificate_number": "2026-TX-000123",
+        "lien_type": LienType.TAX_LIEN,
+        "lien_principal_amount": Decimal("4312.77"),
+        "interest_rate_nominal": Decimal("18.00"),
+        "interest_type": InterestType.SIMPLE,
+        "redemption_deadline": datetime(2027, 6, 1, tzinfo=timezone.utc),
+        "lien_status": LienStatus.SOLD,
+        "apn": "0451-22-118",
+        "street_address": "1234 Example Street",
+        "city": "Houston",
+        "state": "TX",
+        "zip_code": "77002",
+        "property_type": PropertyType.SINGLE_FAMILY,
+        "building_sqft": 1850,
+        "year_built": 1978,
+        "lien_to_value_ratio": Decimal("0.0420"),
+        "estimated_redemption_hold_months": 14,
+        "simple_yield": Decimal("18.000"),
+        "annualized_yield": Decimal("15.400"),
+        "cash_on_cash_return": Decimal("12.100"),
+        "irr_redemption_scenario": Decimal("16.200"),
+        "irr_deed_scenario": Decimal("41.800"),
+        "expected_value_overall": Decimal("7321.15"),
+        "metric_liquidity_score": Decimal("0.610"),
+    }
+    rows = []
+    for rank in range(1, size + 1):
+        values = {**template, "rank_within_run": rank, "lien_id": uuid4()}
+        rows.append(tuple(values.get(name) for name in names))
+    return rows
+
+
+async def _batches(batch: List[Sequence[Any]], rows: int) -> AsyncIterator[Sequence[Any]]:
+    for start in range(0, rows, len(batch)):
+        yield batch[: min(len(batch), rows - start)]
+
+
+async def _run(format_name: str, batch: List[Sequence[Any]], rows: int) -> Tuple[float, int]:
+    started = time.perf_counter()
+    size = 0
+    async for data in encode_export(_batches(batch, rows), open_encoder(format_name, EXPORT_COLUMNS)):
+        size += len(data)
+    return time.perf_counter() - started, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=5_000)
+    parser.add_argument("--formats", nargs="*", default=["csv", "xlsx", "parquet"])
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    batch = synthetic_batch(args.chunk_size)
+    for format_name in args.formats:
+        if format_name == "parquet" and importlib.util.find_spec("pyarrow") is None:
+            print(f"{format_name:<8} skipped (pyarrow not installed)")
+            continue
+        seconds, size = asyncio.run(_run(format_name, batch, args.rows))
+        tracemalloc.start()
+        asyncio.run(_run(format_name, batch, args.rows))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{format_name:<8}{args.rows / seconds:>12,.0f} rows/s {seconds:8.1f} s "
+            f"{size / 2**20:9.1f} MB out {peak / 2**20:7.1f} MB peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
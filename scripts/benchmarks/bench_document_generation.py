@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Batch document generation throughput by worker count.
+
+Renders one investment summary per investor over a shared top-``--deals`` table (default 500
+investors x 50 deals) to local storage in a temporary directory, once per worker count, and reports
+documents per second and speed-up over one worker. Throughput should scale roughly with cores until
+storage becomes the bottleneck.
+
+    python scripts/benchmarks/bench_document_generation.py --investors 500 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import _bootstrap  # noqa: F401
+import structlog
+
+from app.services.document_generation import DocumentGenerator, RenderJob
+from app.services.document_storage import StorageConfig
+
+
+def deals(count: int) -> list[dict]:
+    return [
+        {
+            "certificate_number": f"2024-{index:05d}",
+            "county": "Pinellas",
+            "parcel_id": f"12-34-56-{index:05d}",
+            "principal": 1_500 + index * 37.5,
+            "interest_rate": 0.18,
+            "expected_yield": 0.09 + index / 1_000,
+            "redemption_deadline": "2026-06-01",
+            "deal_score": 95.0 - index * 0.8,
+        }
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--investors", type=int, default=500)
+    parser.add_argument("--deals", type=int, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1}))
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    shared = {"deals": deals(args.deals), "generated_at": "2026-10-19T12:00:00"}
+    jobs = [
+        RenderJob("investment_summary", {"investor": {"display_name": f"Investor {n}", "strategy": "yield"}}, f"inv-{n}")
+        for n in range(args.investors)
+    ]
+    print(f"{len(jobs)} documents x {args.deals} deals on {os.cpu_count()} cores")
+    baseline = None
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as output:
+            generator = DocumentGenerator(storage_config=StorageConfig(local_path=output), max_workers=workers)
+            started = time.perf_counter()
+            artifacts = generator.render_batch(jobs, shared_context=shared)
+            elapsed = time.perf_counter() - started
+        assert all(artifact.ok for artifact in artifacts)
+        rate = len(jobs) / elapsed
+        baseline = baseline or rate
+        print(f"workers {workers:>2}: {elapsed:6.2f}s  {rate:8.1f} docs/s  x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Payload size and CPU cost of each embedding transport.
+
+Builds ``--vectors`` random float32 vectors of ``--dimensions`` and times two things for every format:
+decoding the upstream OpenAI payload, and serialising the ``/ai/embeddings`` response:
+
+    python scripts/benchmarks/bench_embedding_transport.py --vectors 1000 --dimensions 3072
+
+``pydantic floats`` is the previous path: float lists validated into ``EmbeddingsResponse`` and
+dumped as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import time
+from typing import Callable, List
+
+import _bootstrap  # noqa: F401
+import numpy as np
+import orjson
+import structlog
+
+from app.ai import embedding_codec
+from app.schemas.ai import EmbeddingsResponse
+
+USAGE = {"input_tokens": 1000, "output_tokens": 0, "total_tokens": 1000}
+
+
+def timed(function: Callable[[], object], repeat: int) -> tuple[float, object]:
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=1000)
+    parser.add_argument("--dimensions", type=int, default=3072)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    rng = np.random.default_rng(args.seed)
+    matrix = rng.standard_normal((args.vectors, args.dimensions)).astype(np.float32)
+    float_payload = orjson.dumps({"data": [{"embedding": row} for row in matrix.tolist()]})
+    base64_payload = orjson.dumps({"data": [{"embedding": value} for value in embedding_codec.encode_base64(matrix)]})
+
+    print("upstream decode")
+    seconds, _ = timed(lambda: [item["embedding"] for item in orjson.loads(float_payload)["data"]], args.repeat)
+    print(f"  float JSON     {len(float_payload) / 2**20:8.1f} MB {seconds * 1000:9.1f} ms")
+    seconds, _ = timed(
+        lambda: embedding_codec.decode_base64([item["embedding"] for item in orjson.loads(base64_payload)["data"]]),
+        args.repeat,
+    )
+    print(f"  base64 JSON    {len(base64_payload) / 2**20:8.1f} MB {seconds * 1000:9.1f} ms")
+
+    vectors = matrix.tolist()
+    formats = {
+        "pydantic floats": lambda: EmbeddingsResponse(embeddings=vectors, model="m", usage=USAGE).model_dump_json(),
+        "orjson ndarray": lambda: orjson.dumps(
+            {"embeddings": matrix, "model": "m", "usage": USAGE}, option=orjson.OPT_SERIALIZE_NUMPY
+        ),
+        "base64 JSON": lambda: orjson.dumps(
+            {"embeddings": embedding_codec.encode_base64(matrix), "model": "m", "usage": USAGE}
+        ),
+        "npy": lambda: embedding_codec.to_npy(matrix),
+    }
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        formats["arrow"] = lambda: embedding_codec.to_arrow(matrix, {"model": "m"})
+    print("response serialise")
+    for name, function in formats.items():
+        seconds, body = timed(function, args.repeat)
+        print(f"  {name:<15}{len(body) / 2**20:8.1f} MB {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""Interactive latency and batch throughput through the LLM scheduler under a token budget.
+
+A batch job floods the scheduler with requests while interactive requests arrive at a steady rate.
+Both run against ``StubLLMProvider`` with a fixed latency. The "fifo" mode submits everything at one
+priority to show what interactive users would see without priority classes and the reserve.
+
+    python scripts/benchmarks/bench_llm_scheduler.py --batch 400 --interactive 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import _bootstrap  # noqa: F401
+
+from app.ai.scheduler import LLMScheduler, Priority
+from app.ai.stub_provider import StubLLMProvider
+
+
+async def run(mode: str, batch: int, interactive: int, latency: float, tpm: int, concurrency: int) -> dict[str, float]:
+    provider = StubLLMProvider(latency=latency)
+    scheduler = LLMScheduler(provider, tokens_per_minute=tpm, requests_per_minute=0, max_concurrency=concurrency)
+    batch_priority = Priority.INTERACTIVE if mode == "fifo" else Priority.BATCH
+    prompt = "Explain the redemption outlook for this lien. " * 10
+
+    started = time.perf_counter()
+    batch_tasks = [
+        asyncio.create_task(scheduler.generate_text(prompt, priority=batch_priority, max_output_tokens=200))
+        for _ in range(batch)
+    ]
+
+    latencies: list[float] = []
+
+    async def interactive_call() -> None:
+        call_started = time.perf_counter()
+        await scheduler.generate_text("What is the yield on lien 42?", max_output_tokens=200)
+        latencies.append(time.perf_counter() - call_started)
+
+    interactive_tasks = []
+    for _ in range(interactive):
+        interactive_tasks.append(asyncio.create_task(interactive_call()))
+        await asyncio.sleep(0.02)
+    await asyncio.gather(*interactive_tasks)
+    await asyncio.gather(*batch_tasks)
+    elapsed = time.perf_counter() - started
+    await scheduler.aclose()
+
+    latencies.sort()
+    return {
+        "interactive_p50_ms": statistics.median(latencies) * 1000,
+        "interactive_p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "batch_per_second": batch / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=400)
+    parser.add_argument("--interactive", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated upstream latency in seconds.")
+    parser.add_argument("--tpm", type=int, default=3_000_000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    for mode in ("fifo", "priority"):
+        result = asyncio.run(run(mode, args.batch, args.interactive, args.latency, args.tpm, args.concurrency))
+        print(
+            f"{mode:>8}: interactive p50 {result['interactive_p50_ms']:8.1f} ms  "
+            f"p99 {result['interactive_p99_ms']:8.1f} ms  batch {result['batch_per_second']:7.1f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Compare synchronous vs queue-based structured logging on the calling thread.
+
+The sink sleeps briefly on every write to mimic a slow stdout pipe (container log driver under
+load). The "request" loop issues a burst of log calls per simulated request and reports the
+logging overhead that request would see.
+
+    python scripts/benchmarks/bench_logging.py --requests 2000 --events-per-request 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import statistics
+import time
+
+import _bootstrap  # noqa: F401
+
+import structlog
+
+from app.core import logging as app_logging
+from app.core.config import settings
+
+
+class SlowSink(io.TextIOBase):
+    def __init__(self, write_delay: float) -> None:
+        self.write_delay = write_delay
+        self.lines = 0
+
+    def write(self, value: str) -> int:
+        if self.write_delay:
+            time.sleep(self.write_delay)
+        self.lines += 1
+        return len(value)
+
+
+def run(mode: str, requests: int, events_per_request: int, write_delay: float) -> dict[str, float]:
+    settings.LOG_QUEUE_ENABLED = mode == "queue"
+    settings.LOG_QUEUE_MAX_SIZE = requests * events_per_request + 1
+    sink = SlowSink(write_delay)
+    app_logging.configure_logging(force=True, stream=sink)
+    logger = structlog.get_logger("bench.analysis")
+
+    latencies = []
+    started = time.perf_counter()
+    for request_index in range(requests):
+        request_start = time.perf_counter()
+        for event_index in range(events_per_request):
+            logger.info("agent_step", request=request_index, step=event_index, lien_id="9f1c", score=0.82)
+        latencies.append((time.perf_counter() - request_start) * 1000)
+    caller_elapsed = time.perf_counter() - started
+    app_logging.shutdown_logging()
+    total_elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "caller_events_per_sec": requests * events_per_request / caller_elapsed,
+        "drained_events_per_sec": sink.lines / total_elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--events-per-request", type=int, default=20)
+    parser.add_argument("--write-delay-us", type=float, default=20.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'caller ev/s':>12} {'drained ev/s':>13} {'req p50 ms':>11} {'req p99 ms':>11}")
+    for mode in ("sync", "queue"):
+        result = run(mode, args.requests, args.events_per_request, args.write_delay_us / 1_000_000)
+        print(
+            f"{mode:<8} {result['caller_events_per_sec']:>12,.0f} {result['drained_events_per_sec']:>13,.0f} "
+            f"{result['p50_ms']:>11.3f} {result['p99_ms']:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""Time the redemption forecast over a synthetic book.
+
+An in-memory store hands ``RedemptionForecaster`` the same shapes ``RedemptionForecastRepository``
+returns. Those shapes are hazard counts for ``--counties`` counties × 64 strata, and ``--holdings`` open
+holdings in ``--chunk-size`` row chunks. The script then times the fit, the projection and the
+forecast records:
+
+    python scripts/benchmarks/bench_redemption_forecast.py --holdings 1000000 --horizon 36
+
+Database reads and the ``COPY`` of the forecast are not included; on a real node they add the cost of
+streaming the open holdings and writing ``portfolios × horizon`` rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timezone
+from typing import Any, AsyncIterator, List, Sequence, Tuple
+from uuid import uuid4
+
+import _bootstrap  # noqa: F401
+import numpy as np
+import structlog
+
+from app.models.enums import InterestType
+from app.services.redemption_forecast import RedemptionForecaster
+
+INTEREST_TYPES = tuple(InterestType)
+
+
+class SyntheticStore:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.rng = np.random.default_rng(args.seed)
+        self.counties = [uuid4() for _ in range(args.counties)]
+        self.portfolios = [uuid4() for _ in range(args.portfolios)]
+        self.max_duration = args.max_duration
+        self.issued = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.counts = self._counts()
+        self.chunks = [
+            self._chunk(min(args.chunk_size, args.holdings - start))
+            for start in range(0, args.holdings, args.chunk_size)
+        ]
+
+    async def refresh_observations(self) -> int:
+        return 0
+
+    def _counts(self) -> List[Tuple[Any, ...]]:
+        rows = []
+        for county in self.counties:
+            for stratum in range(64):
+                for duration in range(0, self.max_duration + 1, 3):
+                    rows.append((county, stratum, duration, True, int(self.rng.integers(0, 20))))
+                    rows.append((county, stratum, duration, False, int(self.rng.integers(0, 5))))
+        return rows
+
+    async def hazard_counts(self, as_of: date, max_duration: int) -> List[Tuple[Any, ...]]:
+        return self.counts
+
+    def _chunk(self, size: int) -> List[Tuple[Any, ...]]:
+        counties = self.rng.integers(0, len(self.counties), size)
+        portfolios = self.rng.integers(0, len(self.portfolios), size)
+        strata = self.rng.integers(0, 64, size)
+        ages = self.rng.integers(0, self.max_duration + 12, size)
+        principal = self.rng.uniform(500, 50_000, size).round(2)
+        rates = self.rng.choice([8.0, 12.0, 16.0, 18.0], size)
+        kinds = self.rng.integers(0, len(INTEREST_TYPES), size)
+        return [
+            (
+                None,
+                self.portfolios[portfolios[index]],
+                self.counties[counties[index]],
+                int(strata[index]),
+                int(ages[index]),
+                float(principal[index]),
+                float(rates[index]),
+                INTEREST_TYPES[kinds[index]],
+                self.issued,
+            )
+            for index in range(size)
+        ]
+
+    async def iter_open_holdings(self, as_of: date, chunk_size: int) -> AsyncIterator[Sequence[Any]]:
+        for chunk in self.chunks:
+            yield chunk
+
+    async def replace_forecast(self, as_of: date, rows: Sequence[Tuple[Any, ...]]) -> int:
+        return len(rows)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--holdings", type=int, default=1_000_000)
+    parser.add_argument("--counties", type=int, default=200)
+    parser.add_argument("--portfolios", type=int, default=5_000)
+    parser.add_argument("--horizon", type=int, default=36)
+    parser.add_argument("--max-duration", type=int, default=60)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    store = SyntheticStore(args)
+    forecaster = RedemptionForecaster(
+        store, horizon_months=args.horizon, max_duration_months=args.max_duration, chunk_size=args.chunk_size
+    )
+    started = time.perf_counter()
+    model = await forecaster.fit(date(2026, 10, 1))
+    print(f"fit            {time.perf_counter() - started:8.2f} s  ({len(model.cell_rows):,} cells)")
+
+    result = await forecaster.run(date(2026, 10, 1))
+    print(
+        f"fit + project  {result.seconds:8.2f} s  {result.open_holdings:,} holdings -> {result.rows_written:,} rows  "
+        f"({result.open_holdings / result.seconds / 1e6:,.2f}M holdings/s)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Latency of what-if re-ranking on a warm session.
+
+Builds a ``--liens`` synthetic run baseline and times three things: a cold session (every node
+computed), each single-assumption change on a warm session, and the pydantic response for the top
+``--top-k``:
+
+    python scripts/benchmarks/bench_what_if.py --liens 50000 --top-k 50
+
+Loading the baseline from Postgres happens once per session and is not included.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import time
+from uuid import uuid4
+
+import _bootstrap  # noqa: F401
+import numpy as np
+import structlog
+
+from app.schemas.what_if import RankedDeal, WhatIfAssumptions, WhatIfResponse
+from app.services.what_if import RunBaseline, WhatIfParameters, WhatIfSession
+
+# Each assumption alternates between two values, so every call recomputes its downstream nodes.
+CHANGES = {
+    "discount_rate": (0.0, 0.1),
+    "rehab_cost_multiplier": (1.0, 1.5),
+    "redemption_probability_multiplier": (1.0, 0.8),
+}
+
+
+def synthetic_baseline(liens: int, seed: int) -> RunBaseline:
+    rng = np.random.default_rng(seed)
+    capital = rng.uniform(500, 20_000, liens)
+    rows = zip(
+        (uuid4() for _ in range(liens)),
+        rng.uniform(0.5, 0.99, liens),
+        capital * rng.uniform(0.05, 0.2, liens),
+        rng.integers(3, 36, liens),
+        capital,
+        rng.uniform(-20_000, 80_000, liens),
+        rng.integers(18, 48, liens),
+        capital + rng.uniform(0, 60_000, liens),
+        np.arange(1, liens + 1),
+    )
+    return RunBaseline.from_rows(uuid4(), list(rows))
+
+
+def respond(session: WhatIfSession, parameters: WhatIfParameters, top_k: int) -> WhatIfResponse:
+    ranking = session.rank(parameters, top_k)
+    return WhatIfResponse(
+        session_id=ranking.session_id,
+        run_id=ranking.run_id,
+        assumptions=WhatIfAssumptions(**vars(ranking.parameters)),
+        total_liens=ranking.total_liens,
+        recomputed=list(ranking.recomputed),
+        elapsed_ms=0.0,
+        deals=[RankedDeal(**vars(deal)) for deal in ranking.deals],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--liens", type=int, default=50_000)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    baseline = synthetic_baseline(args.liens, args.seed)
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        respond(WhatIfSession(baseline), WhatIfParameters(), args.top_k)
+        timings.append(time.perf_counter() - started)
+    print(f"cold session (all nodes)                 {statistics.median(timings) * 1000:7.2f} ms median")
+
+    session = WhatIfSession(baseline)
+    respond(session, WhatIfParameters(), args.top_k)
+    print(f"warm memory per session                  {(session.nbytes + baseline.nbytes) / 2**20:7.1f} MB")
+    for name, values in CHANGES.items():
+        timings = []
+        for step in range(args.repeat):
+            parameters = WhatIfParameters(**{name: values[step % 2]})
+            started = time.perf_counter()
+            response = respond(session, parameters, args.top_k)
+            timings.append(time.perf_counter() - started)
+        print(
+            f"change {name:<35}{statistics.median(timings) * 1000:7.2f} ms median, "
+            f"{max(timings) * 1000:.2f} ms max  ({len(response.recomputed)} nodes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
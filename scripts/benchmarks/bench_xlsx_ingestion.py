@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""Parse time and peak memory of the XLSX upload readers against full-workbook loading.
+
+Each mode parses every row of each workbook in a fresh process:
+- ``openpyxl-full`` loads the whole workbook model, as a naive import would.
+- ``openpyxl-stream`` and ``calamine`` go through ``tabular_readers.iter_chunks``.
+
+For each run the script reports wall time and the growth of the process's peak RSS during
+parsing, which also covers the Rust reader's allocations:
+
+    python scripts/benchmarks/bench_xlsx_ingestion.py "Property Export Houston-Active-Cash-Buyers.xlsx"
+
+Without arguments it uses the three Property Export workbooks at the repo root. ``calamine`` needs
+the optional ``calamine`` extra.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import resource
+import subprocess
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import _bootstrap  # noqa: F401
+
+from app.services.tabular_readers import cell_text, iter_chunks
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+MODES = ("openpyxl-full", "openpyxl-stream", "calamine")
+
+
+def _parse(mode: str, path: str, chunk_size: int) -> int:
+    """Data rows (non-blank rows after each sheet's header) parsed by ``mode``."""
+    if mode == "openpyxl-full":
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path)
+        rows = 0
+        for sheet in workbook.worksheets:
+            filled = sum(any(cell_text(value) for value in row) for row in sheet.iter_rows(values_only=True))
+            rows += max(filled - 1, 0)
+        return rows
+    reader = "openpyxl" if mode == "openpyxl-stream" else "calamine"
+    return sum(len(chunk.rows) for chunk in iter_chunks(path, "xlsx", chunk_size, xlsx_reader=reader))
+
+
+def _child(mode: str, path: str, chunk_size: int) -> None:
+    warnings.simplefilter("ignore")
+    import openpyxl  # noqa: F401  # library imports are not part of the measurement
+
+    if mode == "calamine":
+        import python_calamine  # noqa: F401
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    rows = _parse(mode, path, chunk_size)
+    seconds = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    print(json.dumps({"rows": rows, "seconds": seconds, "peak_kb": peak}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("workbooks", nargs="*")
+    parser.add_argument("--chunk-size", type=int, default=5_000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child[0], args.child[1], args.chunk_size)
+        return
+
+    workbooks = args.workbooks or sorted(str(path) for path in REPO_ROOT.glob("Property Export *.xlsx"))
+    for path in workbooks:
+        print(f"{Path(path).name} ({Path(path).stat().st_size / 2**20:.1f} MB)")
+        for mode in MODES:
+            if mode == "calamine" and importlib.util.find_spec("python_calamine") is None:
+                print(f"  {mode:<16} skipped (python-calamine not installed)")
+                continue
+            output = subprocess.run(
+                [sys.executable, __file__, "--chunk-size", str(args.chunk_size), "--child", mode, path],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"  {mode:<16}{result['rows']:>8} rows {result['seconds']:7.2f} s "
+                f"{result['peak_kb'] / 1024:8.1f} MB peak RSS growth"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Summarise spans written by the file trace exporter to find slow stages.
+
+Usage:
+    python scripts/trace_report.py traces.jsonl                 # slowest span names overall
+    python scripts/trace_report.py traces.jsonl --trace <id>    # span tree for a single trace
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+def _duration_ms(span: Dict[str, Any]) -> float:
+    start = datetime.fromisoformat(span["start_time"].replace("Z", "+00:00"))
+    end = datetime.fromisoformat(span["end_time"].replace("Z", "+00:00"))
+    return (end - start).total_seconds() * 1000
+
+
+def load_spans(path: Path) -> List[Dict[str, Any]]:
+    spans = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                spans.append(json.loads(line))
+    return spans
+
+
+def summarise(spans: List[Dict[str, Any]], limit: int) -> None:
+    durations: Dict[str, List[float]] = defaultdict(list)
+    for span in spans:
+        durations[span["name"]].append(_duration_ms(span))
+
+    rows = sorted(durations.items(), key=lambda item: sum(item[1]), reverse=True)[:limit]
+    print(f"{'span':<48} {'count':>7} {'total ms':>11} {'p50 ms':>9} {'max ms':>9}")
+    for name, values in rows:
+        print(f"{name[:48]:<48} {len(values):>7} {sum(values):>11.1f} {statistics.median(values):>9.1f} {max(values):>9.1f}")
+
+
+def print_trace(spans: List[Dict[str, Any]], trace_id: str) -> None:
+    trace_id = trace_id if trace_id.startswith("0x") else f"0x{trace_id}"
+    members = [span for span in spans if span["context"]["trace_id"] == trace_id]
+    children: Dict[str | None, List[Dict[str, Any]]] = defaultdict(list)
+    for span in members:
+        children[span.get("parent_id")].append(span)
+
+    known = {span["context"]["span_id"] for span in members}
+
+    def walk(span: Dict[str, Any], depth: int) -> None:
+        print(f"{'  ' * depth}{span['name']}  {_duration_ms(span):.1f} ms")
+        for child in sorted(children.get(span["context"]["span_id"], []), key=lambda item: item["start_time"]):
+            walk(child, depth + 1)
+
+    roots = [span for span in members if span.get("parent_id") not in known]
+    for root in sorted(roots, key=lambda item: item["start_time"]):
+        walk(root, 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--trace", dest="trace_id")
+    parser.add_argument("--limit", type=int, default=25)
+    args = parser.parse_args()
+
+    spans = load_spans(args.path)
+    if args.trace_id:
+        print_trace(spans, args.trace_id)
+    else:
+        summarise(spans, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import base64
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pytest
 
 from app.ai.openai_service import OpenAIService
@@ -129,21 +131,35 @@ async def test_generate_text_raises_when_text_missing() -> None:
         await service.generate_text("Prompt")
 
 
+def _base64_float32(values: List[float]) -> str:
+    return base64.b64encode(np.asarray(values, dtype="<f4").tobytes()).decode("ascii")
+
+
 @pytest.mark.asyncio
-async def test_create_embeddings_returns_vectors_and_usage() -> None:
-    items = [StubEmbeddingItem([0.1, 0.2, 0.3]), StubEmbeddingItem([0.4, 0.5, 0.6])]
+async def test_create_embeddings_decodes_base64_into_one_float32_matrix() -> None:
+    items = [StubEmbeddingItem(_base64_float32([0.1, 0.2, 0.3])), StubEmbeddingItem(_base64_float32([0.4, 0.5, 0.6]))]
     usage = {"input_tokens": 6, "output_tokens": 0, "total_tokens": 6}
     client = StubAsyncOpenAIClient(responses_payload={}, embeddings_payload=items, usage=usage)
     service = OpenAIService(client=client, default_model="gpt-4", embedding_model="text-embedding-3-large")
 
     result = await service.create_embeddings(["alpha", "beta"], model="text-embedding-test")
 
-    assert result == {
-        "embeddings": [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]],
-        "model": "text-embedding-test",
-        "usage": usage,
-    }
+    assert result["embeddings"].dtype == np.float32 and result["embeddings"].shape == (2, 3)
+    np.testing.assert_array_equal(result["embeddings"], np.array([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], dtype="<f4"))
+    assert (result["model"], result["usage"]) == ("text-embedding-test", usage)
     assert client.embeddings.calls[0]["model"] == "text-embedding-test"
+    assert client.embeddings.calls[0]["encoding_format"] == "base64"
+
+
+@pytest.mark.asyncio
+async def test_create_embeddings_accepts_float_lists_from_compatible_servers() -> None:
+    items = [StubEmbeddingItem([0.1, 0.2]), StubEmbeddingItem([0.3, 0.4])]
+    client = StubAsyncOpenAIClient(responses_payload={}, embeddings_payload=items)
+    service = OpenAIService(client=client, default_model="gpt-4", embedding_model="text-embedding-3-small")
+
+    result = await service.create_embeddings(["a", "b"])
+
+    np.testing.assert_allclose(result["embeddings"], [[0.1, 0.2], [0.3, 0.4]], rtol=1e-6)
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,129 @@
+"""Streaming tests against a local HTTP server that speaks the Responses API SSE format."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
+
+import pytest
+from openai import AsyncOpenAI
+
+from app.ai.openai_service import OpenAIService
+
+TOKEN_INTERVAL = 0.2
+
+
+def _event(payload: dict) -> bytes:
+    return f"event: {payload['type']}\ndata: {json.dumps(payload)}\n\n".encode()
+
+
+class StubResponsesServer:
+    """Emits one delta immediately and the rest ``TOKEN_INTERVAL`` apart, like a slow model."""
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.requests: List[dict] = []
+        self.disconnected = asyncio.Event()
+        self.completed = asyncio.Event()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        headers = await reader.readuntil(b"\r\n\r\n")
+        length = next(
+            int(line.split(b":", 1)[1]) for line in headers.split(b"\r\n") if line.lower().startswith(b"content-length")
+        )
+        self.requests.append(json.loads(await reader.readexactly(length)))
+        writer.write(
+            b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\n"
+            b"transfer-encoding: chunked\r\nconnection: close\r\n\r\n"
+        )
+        try:
+            for index, token in enumerate(self.tokens):
+                if index:
+                    await asyncio.sleep(TOKEN_INTERVAL)
+                delta = {"type": "response.output_text.delta", "delta": token, "sequence_number": index}
+                self._chunk(writer, _event(delta))
+                await writer.drain()
+            usage = {"input_tokens": 4, "output_tokens": len(self.tokens), "total_tokens": 4 + len(self.tokens)}
+            self._chunk(writer, _event({"type": "response.completed", "response": {"id": "resp_1", "usage": usage}}))
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+            self.completed.set()
+        except (ConnectionError, asyncio.CancelledError):
+            self.disconnected.set()
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+
+@asynccontextmanager
+async def streaming_service(server: StubResponsesServer) -> AsyncIterator[OpenAIService]:
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    client = AsyncOpenAI(api_key="test", base_url=f"http://127.0.0.1:{port}/v1", max_retries=0)
+    try:
+        yield OpenAIService(client=client, default_model="gpt-5.1", embedding_model="text-embedding-3-large")
+    finally:
+        await client.close()
+        listener.close()
+        await listener.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_stream_time_to_first_token_precedes_full_response() -> None:
+    # Warm the SDK's lazily-built event types so the measurement covers only the stream itself.
+    async with streaming_service(StubResponsesServer(["warm"])) as service:
+        [event async for event in service.generate_text_stream("warm up")]
+
+    server = StubResponsesServer(["Lien ", "redeems ", "in ", "May."])
+    async with streaming_service(server) as service:
+        started = time.perf_counter()
+        first_token_at = None
+        events = []
+        async for event in service.generate_text_stream("Explain the deal"):
+            if first_token_at is None:
+                first_token_at = time.perf_counter() - started
+            events.append(event)
+        total = time.perf_counter() - started
+
+    assert first_token_at is not None and first_token_at < TOKEN_INTERVAL
+    assert total >= TOKEN_INTERVAL * 3
+    assert [event["text"] for event in events[:-1]] == ["Lien ", "redeems ", "in ", "May."]
+    assert events[-1] == {
+        "type": "completed",
+        "content": "Lien redeems in May.",
+        "model": "gpt-5.1",
+        "usage": {"input_tokens": 4, "output_tokens": 4, "total_tokens": 8},
+    }
+    assert server.requests[0]["stream"] is True
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_early_aborts_upstream_request() -> None:
+    server = StubResponsesServer(["a", "b", "c", "d", "e"])
+
+    async with streaming_service(server) as service:
+        events = service.generate_text_stream("Explain the deal")
+        first = await events.__anext__()
+        await events.aclose()
+
+        await asyncio.wait_for(server.disconnected.wait(), timeout=TOKEN_INTERVAL * 5)
+
+    assert first == {"type": "delta", "text": "a"}
+    assert not server.completed.is_set()
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_empty_prompt() -> None:
+    server = StubResponsesServer(["unused"])
+
+    async with streaming_service(server) as service:
+        with pytest.raises(ValueError):
+            await service.generate_text_stream("   ").__anext__()
+
+    assert server.requests == []
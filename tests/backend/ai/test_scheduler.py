@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.ai.scheduler import LLMScheduler, Priority, RateBudget
+from app.ai.stub_provider import StubLLMProvider
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rate_budget_refills_continuously_and_honours_reserve() -> None:
+    clock = FakeClock()
+    budget = RateBudget(600, clock)  # 10 units per second
+
+    budget.consume(600)
+    assert budget.wait_time(50) == pytest.approx(5.0)
+
+    clock.now = 30.0
+    assert budget.level == 0  # refill is applied lazily
+    assert budget.wait_time(300) == 0.0
+    assert budget.wait_time(300, reserve_ratio=0.5) == pytest.approx(30.0)
+
+
+def test_rate_budget_admits_oversized_requests_once_full() -> None:
+    budget = RateBudget(100, FakeClock())
+
+    assert budget.wait_time(500) == 0.0
+    assert budget.wait_time(500, reserve_ratio=0.2) == 0.0
+
+
+def test_unlimited_budget_never_waits() -> None:
+    budget = RateBudget(0, FakeClock())
+
+    budget.consume(10**9)
+    assert budget.wait_time(10**9) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_jump_queued_batch_work() -> None:
+    provider = StubLLMProvider(latency=0.02)
+    scheduler = LLMScheduler(provider, tokens_per_minute=0, requests_per_minute=0, max_concurrency=1)
+    order: list[str] = []
+
+    async def call(name: str, priority: Priority) -> None:
+        await scheduler.generate_text(name, priority=priority)
+        order.append(name)
+
+    batch = [asyncio.create_task(call(f"batch-{index}", Priority.BATCH)) for index in range(4)]
+    await asyncio.sleep(0.005)
+    interactive = asyncio.create_task(call("interactive", Priority.INTERACTIVE))
+    await asyncio.gather(*batch, interactive)
+    await scheduler.aclose()
+
+    assert order.index("interactive") <= 1
+    assert provider.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_token_budget_delays_requests_until_refill() -> None:
+    provider = StubLLMProvider()
+    # 60k TPM refills 1k tokens per second.
+    scheduler = LLMScheduler(provider, tokens_per_minute=60_000, requests_per_minute=0, interactive_reserve_ratio=0)
+
+    await scheduler.generate_text("x", max_output_tokens=59_900)
+    # The stub reports far fewer tokens than estimated; pin the level so the test controls the deficit.
+    scheduler._tokens.level = 0
+    started = asyncio.get_running_loop().time()
+    await scheduler.generate_text("x", max_output_tokens=99)
+    elapsed = asyncio.get_running_loop().time() - started
+    await scheduler.aclose()
+
+    assert elapsed >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_batch_work_leaves_reserve_for_interactive() -> None:
+    provider = StubLLMProvider()
+    scheduler = LLMScheduler(provider, tokens_per_minute=60_000, requests_per_minute=0, interactive_reserve_ratio=0.5)
+
+    await scheduler.generate_text("big batch", priority=Priority.BATCH, max_output_tokens=40_000)
+    scheduler._tokens.level = 20_000
+    blocked_batch = asyncio.create_task(scheduler.generate_text("more", priority=Priority.BATCH, max_output_tokens=100))
+    interactive = await asyncio.wait_for(scheduler.generate_text("user question", max_output_tokens=100), timeout=0.5)
+    await asyncio.sleep(0.05)
+
+    assert interactive["content"] == "stub: user question"
+    assert not blocked_batch.done()
+    assert scheduler.queue_depth == 1
+
+    blocked_batch.cancel()
+    await scheduler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_small_embedding_requests_are_coalesced() -> None:
+    provider = StubLLMProvider(dimensions=4)
+    scheduler = LLMScheduler(provider, tokens_per_minute=0, requests_per_minute=0, coalesce_window_ms=20)
+
+    requests = [[f"note {index}-a", f"note {index}-b"] for index in range(5)]
+    results = await asyncio.gather(*(scheduler.create_embeddings(texts, priority=Priority.AGENT) for texts in requests))
+    await scheduler.aclose()
+
+    assert len(provider.calls) == 1
+    assert len(provider.calls[0]["texts"]) == 10
+    for texts, result in zip(requests, results):
+        assert result["embeddings"] == [provider._vector(text) for text in texts]
+    assert scheduler.stats.coalesced_requests == 5
+    assert scheduler.stats.dispatched[Priority.AGENT] == 5
+
+
+@pytest.mark.asyncio
+async def test_usage_is_reconciled_against_estimate() -> None:
+    provider = StubLLMProvider()
+    scheduler = LLMScheduler(provider, tokens_per_minute=60_000, requests_per_minute=0)
+
+    result = await scheduler.generate_text("short prompt", max_output_tokens=5_000)
+    await scheduler.aclose()
+
+    spent = 60_000 - scheduler._tokens.level
+    assert spent == pytest.approx(result["usage"]["total_tokens"], abs=5)
+
+
+@pytest.mark.asyncio
+async def test_provider_errors_reach_the_caller() -> None:
+    scheduler = LLMScheduler(StubLLMProvider(), tokens_per_minute=0, requests_per_minute=0)
+
+    with pytest.raises(ValueError):
+        await scheduler.generate_text("   ")
+    await scheduler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_holds_its_slot_and_settles_tokens_from_final_usage() -> None:
+    provider = StubLLMProvider()
+    scheduler = LLMScheduler(
+        provider, tokens_per_minute=60_000, requests_per_minute=0, max_concurrency=1, clock=FakeClock()
+    )
+
+    stream = scheduler.generate_text_stream("stream this prompt", max_output_tokens=5_000)
+    first = await stream.__anext__()
+    queued = asyncio.create_task(scheduler.generate_text("waits for the stream"))
+    await asyncio.sleep(0.01)
+    assert first["type"] == "delta" and not queued.done()
+
+    events = [first] + [event async for event in stream]
+    await queued
+    await scheduler.aclose()
+
+    completed = events[-1]
+    assert completed["type"] == "completed"
+    spent = 60_000 - scheduler._tokens.level
+    expected = completed["usage"]["total_tokens"] + queued.result()["usage"]["total_tokens"]
+    assert spent == pytest.approx(expected, abs=5)
+
+
+@pytest.mark.asyncio
+async def test_closing_a_stream_early_hands_its_slot_back() -> None:
+    scheduler = LLMScheduler(StubLLMProvider(), tokens_per_minute=0, requests_per_minute=0, max_concurrency=1)
+
+    stream = scheduler.generate_text_stream("a prompt of several words")
+    await stream.__anext__()
+    await stream.aclose()
+
+    result = await asyncio.wait_for(scheduler.generate_text("next"), timeout=1)
+    assert result["content"] == "stub: next"
+    with pytest.raises(ValueError):
+        await scheduler.generate_text_stream("   ").__anext__()
+    assert (await asyncio.wait_for(scheduler.generate_text("after error"), timeout=1))["content"]
+    await scheduler.aclose()
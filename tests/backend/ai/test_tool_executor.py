@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+from app.ai.tool_executor import ToolExecutor, ToolRegistry, ToolSpec
+from app.schemas.agent_tools import ToolCall
+
+
+def _executor(*specs: ToolSpec, max_retries: int = 2) -> ToolExecutor:
+    return ToolExecutor(ToolRegistry(specs), max_retries=max_retries, base_delay=0.001, max_delay=0.002)
+
+
+def _property_call(call_id: str, property_id: int) -> ToolCall:
+    return ToolCall(call_id=call_id, name="fetch_property_details", arguments={"property_id": property_id})
+
+
+def test_independent_calls_run_concurrently() -> None:
+    async def fetch_property(request):
+        await asyncio.sleep(0.05)
+        return {"property": {"id": request.property_id}}
+
+    executor = _executor(ToolSpec.from_catalog("fetch_property_details", fetch_property))
+
+    async def run():
+        started = time.perf_counter()
+        results = await executor.for_run("run-1").execute([_property_call(str(i), i) for i in range(10)])
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(run())
+
+    assert [result.output["property"]["id"] for result in results] == list(range(10))
+    assert elapsed < 0.25
+
+
+def test_per_tool_concurrency_limit_is_enforced() -> None:
+    active = 0
+    peak = 0
+
+    async def fetch_property(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"property": {"id": request.property_id}}
+
+    executor = _executor(ToolSpec.from_catalog("fetch_property_details", fetch_property, max_concurrency=2))
+
+    asyncio.run(executor.for_run("run-1").execute([_property_call(str(i), i) for i in range(6)]))
+
+    assert peak == 2
+
+
+def test_idempotent_tools_are_memoised_per_run() -> None:
+    calls = 0
+
+    async def compute_metrics(request):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"yield": 0.18, "ltv": 0.4, "risk_score": 20.0, "deal_score": 81.0}
+
+    executor = _executor(ToolSpec.from_catalog("compute_lien_metrics", compute_metrics))
+    call = ToolCall(call_id="a", name="compute_lien_metrics", arguments={"lien_id": 7})
+
+    async def run():
+        session = executor.for_run("run-1")
+        first = await session.execute([call, call.model_copy(update={"call_id": "b"})])
+        again = await session.execute_one(call)
+        other_run = await executor.for_run("run-2").execute_one(call)
+        return first, again, other_run
+
+    first, again, other_run = asyncio.run(run())
+
+    assert calls == 2
+    assert [result.cached for result in first] == [False, True]
+    assert again.cached and again.output["yield"] == 0.18
+    assert not other_run.cached
+
+
+def test_transient_failures_are_retried() -> None:
+    attempts = 0
+
+    async def flaky(request):
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise ConnectionError("county portal reset")
+        return {"items": [], "total": 0}
+
+    executor = _executor(ToolSpec.from_catalog("fetch_county_liens", flaky))
+
+    call = ToolCall(call_id="1", name="fetch_county_liens", arguments={"county_id": 1})
+
+    result = asyncio.run(executor.for_run("run-1").execute_one(call))
+
+    assert result.ok
+    assert result.attempts == 3
+
+
+def test_timeouts_and_exhausted_retries_surface_as_errors() -> None:
+    async def slow(request):
+        await asyncio.sleep(1)
+
+    async def broken(request):
+        raise RuntimeError("boom")
+
+    executor = _executor(
+        ToolSpec.from_catalog("fetch_property_details", slow, timeout_seconds=0.01),
+        ToolSpec.from_catalog("compute_lien_metrics", broken),
+        max_retries=1,
+    )
+
+    async def run():
+        return await executor.for_run("run-1").execute(
+            [
+                _property_call("slow", 1),
+                ToolCall(call_id="broken", name="compute_lien_metrics", arguments={"lien_id": 1}),
+            ]
+        )
+
+    slow_result, broken_result = asyncio.run(run())
+
+    assert slow_result.error == "Tool call timed out."
+    assert slow_result.attempts == 2
+    assert broken_result.error == "boom"
+    assert broken_result.attempts == 1
+
+
+def test_tools_that_write_are_not_retried_after_a_timeout_or_connection_error() -> None:
+    calls = 0
+
+    async def log_decision(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1)
+        raise ConnectionError("reset after commit")
+
+    executor = _executor(ToolSpec.from_catalog("log_decision_event", log_decision, timeout_seconds=0.01))
+    call = ToolCall(
+        call_id="1",
+        name="log_decision_event",
+        arguments={"episode_id": 1, "agent_task_id": 1, "decision_type": "bid", "payload": {}},
+    )
+
+    timed_out = asyncio.run(executor.for_run("run-1").execute_one(call))
+    reset = asyncio.run(executor.for_run("run-1").execute_one(call))
+
+    assert (timed_out.error, timed_out.attempts) == ("Tool call timed out.", 1)
+    assert (reset.error, reset.attempts) == ("reset after commit", 1)
+    assert calls == 2
+
+
+def test_invalid_arguments_and_unknown_tools_are_not_dispatched() -> None:
+    async def fetch_property(request):  # pragma: no cover - never reached
+        raise AssertionError("handler should not run")
+
+    executor = _executor(ToolSpec.from_catalog("fetch_property_details", fetch_property))
+
+    async def run():
+        return await executor.for_run("run-1").execute(
+            [
+                ToolCall(call_id="bad", name="fetch_property_details", arguments={"property_id": "abc"}),
+                ToolCall(call_id="missing", name="fetch_weather", arguments={}),
+            ]
+        )
+
+    bad, missing = asyncio.run(run())
+
+    assert bad.error and bad.attempts == 0
+    assert missing.error == "Tool 'fetch_weather' is not registered."
+
+
+def test_backoff_delay_uses_full_jitter_within_ceiling() -> None:
+    executor = ToolExecutor(ToolRegistry(), base_delay=0.2, max_delay=1.0, rng=random.Random(7))
+
+    delays = [executor.backoff_delay(attempt) for attempt in (1, 2, 3, 6)]
+
+    assert 0 <= delays[0] <= 0.2
+    assert 0 <= delays[1] <= 0.4
+    assert 0 <= delays[2] <= 0.8
+    assert 0 <= delays[3] <= 1.0
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import base64
+import io
 from contextlib import contextmanager
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import numpy as np
 from fastapi.testclient import TestClient
 from openai import OpenAIError
 
@@ -37,6 +41,24 @@ class StubOpenAIService:
         del texts, model
         return self._embeddings
 
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        temperature: float = 0.0,
+        max_output_tokens: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        del model, temperature, max_output_tokens
+        try:
+            if not prompt.strip():
+                raise ValueError("Prompt must not be empty.")
+            for chunk in ("stubbed ", "response"):
+                yield {"type": "delta", "text": chunk}
+            yield {"type": "completed", **self._text_response}
+        finally:
+            self.closed = True
+
 
 class RaisingOpenAIService(StubOpenAIService):
     def __init__(self, *, exc: Exception):
@@ -66,12 +88,16 @@ def client_with_service(service: StubOpenAIService) -> TestClient:
     async def override_service():
         yield service
 
+    async def override_streaming_service():
+        return service
+
     app.dependency_overrides[deps.get_openai_service] = override_service
+    app.dependency_overrides[deps.get_streaming_openai_service] = override_streaming_service
     try:
         with TestClient(app) as client:
             yield client
     finally:
-        app.dependency_overrides.pop(deps.get_openai_service, None)
+        app.dependency_overrides.clear()
 
 
 def test_create_text_response_success() -> None:
@@ -141,6 +167,39 @@ def test_create_embeddings_success() -> None:
     assert payload["usage"] == {"input_tokens": 2, "output_tokens": 0, "total_tokens": 2, "reasoning_tokens": None}
 
 
+def test_create_embeddings_base64_and_npy_formats() -> None:
+    service = StubOpenAIService(
+        embeddings={
+            "embeddings": [[0.5, -1.0, 2.0], [0.25, 0.0, 1.5]],
+            "model": "custom-embed",
+            "usage": {"input_tokens": 2, "output_tokens": 0, "total_tokens": 2},
+        }
+    )
+
+    with client_with_service(service) as client:
+        encoded = client.post("/api/v1/ai/embeddings", json={"texts": ["a", "b"], "encoding_format": "base64"})
+        binary = client.post(
+            "/api/v1/ai/embeddings",
+            json={"texts": ["a", "b"]},
+            headers={"Accept": "application/json;q=0.5, application/x-npy"},
+        )
+
+    vectors = [np.frombuffer(base64.b64decode(value), dtype="<f4").tolist() for value in encoded.json()["embeddings"]]
+    assert vectors == [[0.5, -1.0, 2.0], [0.25, 0.0, 1.5]]
+    assert binary.headers["content-type"] == "application/x-npy"
+    assert binary.headers["x-embedding-model"] == "custom-embed"
+    assert binary.headers["x-embedding-shape"] == "2,3"
+    matrix = np.load(io.BytesIO(binary.content), allow_pickle=False)
+    assert matrix.dtype == np.float32 and matrix.tolist() == vectors
+
+
+def test_create_embeddings_rejects_unsupported_media_types() -> None:
+    with client_with_service(StubOpenAIService()) as client:
+        response = client.post("/api/v1/ai/embeddings", json={"texts": ["a"]}, headers={"Accept": "text/csv"})
+
+    assert response.status_code == 406
+
+
 def test_create_embeddings_value_error_translates_to_422() -> None:
     override_service = RaisingOpenAIService(exc=ValueError("invalid texts"))
 
@@ -176,3 +235,30 @@ def test_embeddings_validation_error_triggers_422_before_service_call() -> None:
 
     assert response.status_code == 422
     assert response.json()["detail"][0]["loc"] == ["body", "texts"]
+
+
+def test_stream_text_response_emits_deltas_then_usage() -> None:
+    service = StubOpenAIService()
+
+    with client_with_service(service) as client:
+        response = client.post("/api/v1/ai/responses/stream", json={"prompt": "Hi"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n", 1) for block in response.text.strip().split("\n\n")]
+    assert [name for name, _ in events] == ["event: delta", "event: delta", "event: usage", "event: done"]
+    assert events[0][1] == 'data: {"text":"stubbed "}'
+    assert '"total_tokens":12' in events[2][1]
+    assert events[3][1] == 'data: {"content":"stubbed response","model":"gpt-5.1"}'
+    assert service.closed
+
+
+def test_stream_text_response_value_error_translates_to_422() -> None:
+    service = StubOpenAIService()
+
+    with client_with_service(service) as client:
+        response = client.post("/api/v1/ai/responses/stream", json={"prompt": "   "})
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Prompt must not be empty."
+    assert service.closed
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import hashlib
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.core.config import settings
+from app.main import create_app
+from app.services.chunked_upload import part_key
+from app.services.column_mapping import ColumnMapper
+from app.services.document_storage import LocalArtifactStorage
+
+PART_SIZE = 16
+CSV = b"Owner Name,Zip\nAda,77002\nGrace,77003\n"
+
+
+class InMemoryUploadRepository:
+    def __init__(self) -> None:
+        self.uploads: Dict[UUID, Dict[str, Any]] = {}
+        self.parts: Dict[UUID, Dict[int, tuple]] = {}
+
+    async def create(self, **values: Any) -> UUID:
+        upload_id = uuid4()
+        self.uploads[upload_id] = {
+            **values,
+            "id": upload_id,
+            "status": "pending",
+            "received_at": None,
+            "row_count": None,
+            "sheets": None,
+            "error": None,
+        }
+        self.parts[upload_id] = {}
+        return upload_id
+
+    async def get(self, upload_id: UUID) -> Optional[SimpleNamespace]:
+        upload = self.uploads.get(upload_id)
+        return SimpleNamespace(**upload) if upload else None
+
+    async def received_parts(self, upload_id: UUID) -> List[SimpleNamespace]:
+        return [
+            SimpleNamespace(_mapping={"part_number": number, "size": size, "sha256": sha256})
+            for number, (size, sha256) in sorted(self.parts[upload_id].items())
+        ]
+
+    async def get_part(self, upload_id: UUID, part_number: int) -> Optional[SimpleNamespace]:
+        part = self.parts[upload_id].get(part_number)
+        return SimpleNamespace(size=part[0], sha256=part[1]) if part else None
+
+    async def record_part(self, upload_id: UUID, part_number: int, size: int, sha256: str) -> str:
+        return self.parts[upload_id].setdefault(part_number, (size, sha256))[1]
+
+    async def mark_received(self, upload_id: UUID) -> None:
+        self.uploads[upload_id]["received_at"] = "2026-10-19T00:00:00+00:00"
+
+
+class RecordingEventRecorder:
+    def __init__(self) -> None:
+        self.audits: List[tuple] = []
+
+    async def record_audit(self, event_type: str, entity_type: str, entity_id: Any, description: str, **_: Any) -> None:
+        self.audits.append((event_type, entity_type, str(entity_id)))
+
+
+@contextmanager
+def upload_client(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_PART_SIZE_BYTES", PART_SIZE)
+    repository = InMemoryUploadRepository()
+    storage = LocalArtifactStorage(tmp_path)
+    queued: List[UUID] = []
+    recorder = RecordingEventRecorder()
+    app = create_app()
+    app.dependency_overrides[deps.get_upload_repository] = lambda: repository
+    app.dependency_overrides[deps.get_upload_storage] = lambda: storage
+    app.dependency_overrides[deps.get_upload_ingestion_queue] = lambda: queued.append
+    app.dependency_overrides[deps.get_event_recorder] = lambda: recorder
+    try:
+        with TestClient(app) as client:
+            yield client, repository, storage, queued, recorder
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _put(client: TestClient, upload_id: str, number: int, data: bytes, sha256: Optional[str] = None):
+    return client.put(
+        f"/api/v1/uploads/{upload_id}/parts/{number}",
+        content=data,
+        headers={"X-Part-SHA256": sha256 or hashlib.sha256(data).hexdigest()},
+    )
+
+
+def test_csv_upload_is_queued_at_init_and_resumes_from_missing_parts(tmp_path: Path, monkeypatch) -> None:
+    with upload_client(tmp_path, monkeypatch) as (client, repository, storage, queued, recorder):
+        created = client.post("/api/v1/uploads", json={"filename": "Tax-Lien-Leads.csv", "size": len(CSV)})
+        assert created.status_code == 201
+        body = created.json()
+        upload_id = body["upload_id"]
+        assert (body["file_format"], body["part_size"], body["part_count"]) == ("csv", 16, 3)
+        assert queued == [UUID(upload_id)]
+
+        parts = [CSV[offset : offset + PART_SIZE] for offset in range(0, len(CSV), PART_SIZE)]
+        assert _put(client, upload_id, 1, parts[0]).status_code == 200
+        assert _put(client, upload_id, 3, parts[2], sha256="0" * 64).status_code == 400
+        assert _put(client, upload_id, 2, parts[1] + b"!").status_code == 400
+        assert client.post(f"/api/v1/uploads/{upload_id}/complete").status_code == 409
+        assert client.get(f"/api/v1/uploads/{upload_id}").json()["missing_parts"] == [2, 3]
+
+        assert _put(client, upload_id, 2, parts[1]).status_code == 200
+        assert _put(client, upload_id, 3, parts[2]).status_code == 200
+        manifest = [
+            {"part_number": number, "size": len(part), "sha256": hashlib.sha256(part).hexdigest()}
+            for number, part in enumerate(parts, start=1)
+        ]
+        completed = client.post(f"/api/v1/uploads/{upload_id}/complete", json={"parts": manifest})
+
+        assert completed.status_code == 200
+        assert completed.json()["missing_parts"] == [] and completed.json()["received_at"]
+        assert queued == [UUID(upload_id)]
+        assert b"".join(storage.open_reader(part_key(UUID(upload_id), n)).read() for n in (1, 2, 3)) == CSV
+        assert _put(client, upload_id, 1, parts[0]).status_code == 409
+
+    assert [event for event, _, entity_id in recorder.audits if entity_id == upload_id] == [
+        "upload.created",
+        "upload.part_received",
+        "upload.part_received",
+        "upload.part_received",
+        "upload.completed",
+    ]
+
+
+def test_received_part_is_never_replaced_by_different_bytes(tmp_path: Path, monkeypatch) -> None:
+    with upload_client(tmp_path, monkeypatch) as (client, repository, storage, queued, recorder):
+        upload_id = client.post("/api/v1/uploads", json={"filename": "leads.csv", "size": len(CSV)}).json()["upload_id"]
+        first = CSV[:PART_SIZE]
+
+        assert _put(client, upload_id, 1, first).status_code == 200
+        retried = _put(client, upload_id, 1, first)
+        changed = _put(client, upload_id, 1, first.upper())
+
+        assert retried.status_code == 200 and retried.json()["sha256"] == hashlib.sha256(first).hexdigest()
+        assert changed.status_code == 409
+        assert storage.open_reader(part_key(UUID(upload_id), 1)).read() == first
+
+
+def test_xlsx_upload_is_queued_on_completion(tmp_path: Path, monkeypatch) -> None:
+    data = b"PK" + bytes(10)
+    with upload_client(tmp_path, monkeypatch) as (client, repository, storage, queued, recorder):
+        upload_id = client.post("/api/v1/uploads", json={"filename": "Property Export.xlsx", "size": len(data)}).json()[
+            "upload_id"
+        ]
+        assert queued == []
+        assert _put(client, upload_id, 2, data).status_code == 400
+        assert _put(client, upload_id, 1, data).status_code == 200
+
+        manifest = [{"part_number": 1, "size": len(data), "sha256": "0" * 64}]
+        assert client.post(f"/api/v1/uploads/{upload_id}/complete", json={"parts": manifest}).status_code == 409
+        assert client.post(f"/api/v1/uploads/{upload_id}/complete").status_code == 200
+
+    assert queued == [UUID(upload_id)]
+
+
+def test_unsupported_or_oversized_uploads_are_refused(tmp_path: Path, monkeypatch) -> None:
+    with upload_client(tmp_path, monkeypatch) as (client, repository, storage, queued, recorder):
+        assert client.post("/api/v1/uploads", json={"filename": "leads.pdf", "size": 10}).status_code == 415
+        too_big = client.post("/api/v1/uploads", json={"filename": "leads.csv", "size": settings.UPLOAD_MAX_BYTES + 1})
+        assert too_big.status_code == 413
+        assert client.get(f"/api/v1/uploads/{uuid4()}").status_code == 404
+
+    assert repository.uploads == {}
+
+
+def test_mapping_is_suggested_then_confirmed_for_the_layout() -> None:
+    class InMemoryMappingStore:
+        def __init__(self) -> None:
+            self.saved: Dict[str, List[Optional[str]]] = {}
+
+        async def get(self, fingerprint: str) -> Optional[List[Optional[str]]]:
+            return self.saved.get(fingerprint)
+
+        async def save(self, fingerprint: str, headers: Any, fields: List[Optional[str]]) -> None:
+            self.saved[fingerprint] = list(fields)
+
+    store = InMemoryMappingStore()
+    recorder = RecordingEventRecorder()
+    app = create_app()
+    app.dependency_overrides[deps.get_column_mapper] = lambda: ColumnMapper(store)
+    app.dependency_overrides[deps.get_event_recorder] = lambda: recorder
+    headers = ["Owner Name", "Situs", "Phone 1", "Phone 2"]
+    try:
+        with TestClient(app) as client:
+            suggested = client.post("/api/v1/uploads/mappings/suggest", json={"headers": headers}).json()
+            assert [(column["field"], column["source"]) for column in suggested["columns"]] == [
+                ("owner_name", "alias"),
+                (None, "unmapped"),
+                ("phone", "alias"),
+                ("phone", "alias"),
+            ]
+            assert not suggested["confirmed"]
+
+            rejected = client.put("/api/v1/uploads/mappings", json={"headers": headers, "mapping": {"Situs": "city?"}})
+            assert rejected.status_code == 422
+            mapping = {"Owner Name": "owner_name", "Situs": "street_address", "Phone 1": "phone", "Phone 2": "phone"}
+            confirmed = client.put("/api/v1/uploads/mappings", json={"headers": headers, "mapping": mapping})
+            assert confirmed.status_code == 200 and confirmed.json()["confirmed"]
+    finally:
+        app.dependency_overrides.clear()
+
+    assert store.saved == {suggested["fingerprint"]: ["owner_name", "street_address", "phone", "phone"]}
+    assert recorder.audits == [("column_mapping.confirmed", "column_mapping", suggested["fingerprint"])]
+
+
+def test_chunked_staging_runs_on_its_own_queue() -> None:
+    from app.worker import celery_app
+
+    router = celery_app.amqp.router
+    assert router.route({}, "app.jobs.uploads.ingest_chunked_upload")["queue"].name == settings.UPLOAD_INGESTION_QUEUE
+    assert router.route({}, "app.jobs.exports.export_ranked_deals")["queue"].name == "default"
+
+
+def test_upload_storage_is_built_once_per_process(monkeypatch) -> None:
+    monkeypatch.setattr(deps, "_upload_storage", None)
+
+    assert deps.get_upload_storage() is deps.get_upload_storage()
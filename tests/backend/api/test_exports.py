@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, List, Optional, Sequence
+from uuid import UUID, uuid4
+
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.main import create_app
+from app.repositories.deal_exports import EXPORT_COLUMNS
+
+RUN_ID = uuid4()
+
+
+class StubDealExportRepository:
+    def __init__(self) -> None:
+        self.requests: List[tuple] = []
+
+    async def run_exists(self, run_id: UUID) -> bool:
+        return run_id == RUN_ID
+
+    async def iter_ranked_deals(
+        self, run_id: UUID, chunk_size: int, investor_profile_id: Optional[UUID] = None
+    ) -> AsyncIterator[Sequence[Any]]:
+        self.requests.append((run_id, investor_profile_id))
+        row = [None] * len(EXPORT_COLUMNS)
+        row[1] = 1
+        yield [row]
+
+
+@contextmanager
+def client_with_repository(repository: StubDealExportRepository) -> TestClient:
+    app = create_app()
+    app.dependency_overrides[deps.get_deal_export_repository] = lambda: repository
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(deps.get_deal_export_repository, None)
+
+
+def test_csv_export_streams_an_attachment() -> None:
+    repository = StubDealExportRepository()
+    profile_id = uuid4()
+
+    with client_with_repository(repository) as client:
+        response = client.get(f"/api/v1/exports/runs/{RUN_ID}/deals", params={"investor_profile_id": str(profile_id)})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.headers["content-disposition"] == f'attachment; filename="ranked-deals-{RUN_ID}.csv"'
+    header, row = response.text.splitlines()
+    assert header.startswith("investor_profile_id,rank_within_run,composite_score")
+    assert row.startswith(",1,")
+    assert repository.requests == [(RUN_ID, profile_id)]
+
+
+def test_unknown_run_is_404_and_unknown_format_is_422() -> None:
+    with client_with_repository(StubDealExportRepository()) as client:
+        missing = client.get(f"/api/v1/exports/runs/{uuid4()}/deals")
+        bad_format = client.get(f"/api/v1/exports/runs/{RUN_ID}/deals", params={"format": "pdf"})
+
+    assert missing.status_code == 404
+    assert bad_format.status_code == 422
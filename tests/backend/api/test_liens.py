@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import date
+from typing import List, Sequence
+from uuid import UUID, uuid4
+
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.main import create_app
+from app.models.enums import InterestType
+from app.services.lien_accrual import LienTerms
+
+
+class StubLienTermsRepository:
+    def __init__(self, known: List[UUID]) -> None:
+        self._known = known
+
+    async def load(self, lien_ids: Sequence[UUID]) -> LienTerms:
+        found = [lien_id for lien_id in self._known if lien_id in lien_ids]
+        count = len(found)
+        return LienTerms.from_columns(
+            [1_000] * count, [18] * count, [InterestType.SIMPLE] * count, [date(2026, 1, 1)] * count, lien_ids=found
+        )
+
+
+@contextmanager
+def client_with_repository(repository: StubLienTermsRepository) -> TestClient:
+    app = create_app()
+
+    async def override_repository():
+        return repository
+
+    app.dependency_overrides[deps.get_lien_terms_repository] = override_repository
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(deps.get_lien_terms_repository, None)
+
+
+def test_batch_payoffs_report_missing_liens() -> None:
+    known, unknown = uuid4(), uuid4()
+
+    with client_with_repository(StubLienTermsRepository([known])) as client:
+        response = client.post(
+            "/api/v1/liens/payoffs", json={"lien_ids": [str(known), str(unknown)], "as_of": "2027-01-01"}
+        )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["payoffs"] == [
+        {"lien_id": str(known), "principal": "1000.00", "accrued_interest": "180.00", "payoff_amount": "1180.00"}
+    ]
+    assert payload["missing_lien_ids"] == [str(unknown)]
+
+
+def test_single_payoff_and_unknown_lien() -> None:
+    known = uuid4()
+
+    with client_with_repository(StubLienTermsRepository([known])) as client:
+        found = client.get(f"/api/v1/liens/{known}/payoff", params={"as_of": "2026-07-02"})
+        missing = client.get(f"/api/v1/liens/{uuid4()}/payoff")
+
+    assert found.status_code == 200
+    assert found.json()["payoff_amount"] == "1089.75"
+    assert missing.status_code == 404
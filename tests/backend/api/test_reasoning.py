@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List
+from uuid import UUID, uuid4
+
+import orjson
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.main import create_app
+from app.models.enums import AgentLogType, AgentTaskStatus, AgentType
+
+
+def _task(task_id: UUID, parent_id: UUID | None, run_id: UUID, depth: int) -> Dict[str, Any]:
+    return {
+        "type": "task",
+        "id": task_id,
+        "parent_task_id": parent_id,
+        "analysis_run_id": run_id,
+        "agent_type": AgentType.UNDERWRITING,
+        "task_name": f"task-{depth}",
+        "status": AgentTaskStatus.COMPLETED,
+        "input_payload": {"lien": 1},
+        "output_payload": None,
+        "error_message": None,
+        "started_at": None,
+        "completed_at": None,
+        "created_at": datetime(2026, 10, 19, tzinfo=timezone.utc),
+        "depth": depth,
+    }
+
+
+def _log(task_id: UUID) -> Dict[str, Any]:
+    return {
+        "type": "log",
+        "id": uuid4(),
+        "agent_task_id": task_id,
+        "log_type": AgentLogType.STEP,
+        "content": {"text": "checking redemption window"},
+        "created_at": datetime(2026, 10, 19, tzinfo=timezone.utc),
+    }
+
+
+class StubGraphRepository:
+    def __init__(self, records: List[Dict[str, Any]], *, known_ids: set[UUID]):
+        self._records = records
+        self._known_ids = known_ids
+
+    async def run_exists(self, run_id: UUID) -> bool:
+        return run_id in self._known_ids
+
+    async def task_exists(self, task_id: UUID) -> bool:
+        return task_id in self._known_ids
+
+    async def _iterate(self) -> AsyncIterator[Dict[str, Any]]:
+        for record in self._records:
+            yield dict(record)
+
+    def stream_run_graph(self, run_id: UUID) -> AsyncIterator[Dict[str, Any]]:
+        return self._iterate()
+
+    def stream_task_subtree(self, task_id: UUID) -> AsyncIterator[Dict[str, Any]]:
+        return self._iterate()
+
+
+@contextmanager
+def client_with_repository(repository: StubGraphRepository) -> TestClient:
+    app = create_app()
+
+    async def override_repository():
+        return repository
+
+    app.dependency_overrides[deps.get_reasoning_graph_repository] = override_repository
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(deps.get_reasoning_graph_repository, None)
+
+
+def _graph(run_id: UUID, task_count: int) -> List[Dict[str, Any]]:
+    root = uuid4()
+    records = [_task(root, None, run_id, 0)]
+    records += [_task(uuid4(), root, run_id, 1) for _ in range(task_count - 1)]
+    records += [_log(record["id"]) for record in records]
+    return records
+
+
+def test_run_graph_streams_ndjson_tasks_then_logs() -> None:
+    run_id = uuid4()
+    repository = StubGraphRepository(_graph(run_id, 3), known_ids={run_id})
+
+    with client_with_repository(repository) as client:
+        response = client.get(f"/api/v1/reasoning/runs/{run_id}/graph")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [line["type"] for line in lines] == ["task"] * 3 + ["log"] * 3
+    assert lines[0]["parent_task_id"] is None
+    assert lines[1]["parent_task_id"] == lines[0]["id"]
+    assert lines[0]["agent_type"] == AgentType.UNDERWRITING.value
+    assert lines[3]["content"] == {"text": "checking redemption window"}
+
+
+def test_run_graph_json_format_groups_records() -> None:
+    run_id = uuid4()
+    repository = StubGraphRepository(_graph(run_id, 2), known_ids={run_id})
+
+    with client_with_repository(repository) as client:
+        response = client.get(f"/api/v1/reasoning/runs/{run_id}/graph", params={"format": "json"})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert [task["depth"] for task in payload["tasks"]] == [0, 1]
+    assert len(payload["logs"]) == 2
+    assert "type" not in payload["tasks"][0]
+
+
+def test_run_graph_streams_large_runs_in_full() -> None:
+    run_id = uuid4()
+    repository = StubGraphRepository(_graph(run_id, 10_000), known_ids={run_id})
+
+    with client_with_repository(repository) as client:
+        response = client.get(f"/api/v1/reasoning/runs/{run_id}/graph")
+
+    assert response.status_code == 200
+    assert len(response.content.splitlines()) == 20_000
+
+
+def test_unknown_run_returns_404() -> None:
+    repository = StubGraphRepository([], known_ids=set())
+
+    with client_with_repository(repository) as client:
+        response = client.get(f"/api/v1/reasoning/runs/{uuid4()}/graph")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Analysis run not found."
+
+
+def test_task_subtree_unknown_task_returns_404() -> None:
+    repository = StubGraphRepository([], known_ids=set())
+
+    with client_with_repository(repository) as client:
+        response = client.get(f"/api/v1/reasoning/tasks/{uuid4()}/subtree")
+
+    assert response.status_code == 404
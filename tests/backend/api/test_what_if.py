@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Optional
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.main import create_app
+from app.services import what_if
+from app.services.what_if import RunBaseline, WhatIfSessions
+
+RUN_ID = uuid4()
+
+
+class StubWhatIfRepository:
+    def __init__(self) -> None:
+        self.loads = 0
+
+    async def load(self, run_id: UUID) -> Optional[RunBaseline]:
+        if run_id != RUN_ID:
+            return None
+        self.loads += 1
+        rows = [
+            (uuid4(), 0.9, 100.0, 12, 1_000.0, 2_000.0, 24, 3_000.0, 1),
+            (uuid4(), 0.9, 300.0, 12, 1_000.0, 2_000.0, 24, 3_000.0, 2),
+        ]
+        return RunBaseline.from_rows(run_id, rows)
+
+
+@contextmanager
+def client_with_repository(repository: StubWhatIfRepository) -> TestClient:
+    app = create_app()
+
+    async def override_repository():
+        return repository
+
+    app.dependency_overrides[deps.get_what_if_repository] = override_repository
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(deps.get_what_if_repository, None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(what_if, "_sessions", WhatIfSessions(max_sessions=4))
+
+
+def test_session_is_reused_and_only_changed_nodes_recompute() -> None:
+    repository = StubWhatIfRepository()
+
+    with client_with_repository(repository) as client:
+        first = client.post(f"/api/v1/what-if/runs/{RUN_ID}", json={"top_k": 1}).json()
+        second = client.post(
+            f"/api/v1/what-if/runs/{RUN_ID}",
+            json={"session_id": first["session_id"], "assumptions": {"redemption_probability_multiplier": 0.5}},
+        ).json()
+
+    assert repository.loads == 1
+    assert second["session_id"] == first["session_id"]
+    assert [deal["baseline_rank"] for deal in first["deals"]] == [2]
+    assert second["recomputed"] == ["probability", "expected_value", "expected_capital", "score"]
+    assert [deal["redemption_probability"] for deal in second["deals"]] == [0.45, 0.45]
+    assert second["total_liens"] == 2
+
+
+def test_unknown_run_and_session() -> None:
+    with client_with_repository(StubWhatIfRepository()) as client:
+        missing_run = client.post(f"/api/v1/what-if/runs/{uuid4()}", json={})
+        missing_session = client.delete(f"/api/v1/what-if/sessions/{uuid4()}")
+        stale = client.post(f"/api/v1/what-if/runs/{RUN_ID}", json={"session_id": str(uuid4())})
+        closed = client.delete(f"/api/v1/what-if/sessions/{stale.json()['session_id']}")
+
+    assert missing_run.status_code == 404
+    assert missing_session.status_code == 404
+    assert stale.status_code == 200
+    assert closed.status_code == 204
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import io
+import logging
+import queue
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+import structlog
+
+from app.core import logging as app_logging
+from app.core.config import settings
+
+
+@pytest.fixture
+def restore_logging():
+    yield
+    app_logging.configure_logging(force=True)
+
+
+def test_queue_mode_writes_json_from_background_thread(restore_logging: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOG_QUEUE_ENABLED", True)
+    writer_threads: set[str] = set()
+
+    class RecordingStream(io.StringIO):
+        def write(self, value: str) -> int:
+            writer_threads.add(threading.current_thread().name)
+            return super().write(value)
+
+    stream = RecordingStream()
+    app_logging.configure_logging(force=True, stream=stream)
+
+    structlog.get_logger("analysis").info("stage_complete", run_id="r-1", liens=42)
+    app_logging.shutdown_logging()
+
+    payload = json.loads(stream.getvalue().strip().splitlines()[-1])
+    assert payload["event"] == "stage_complete"
+    assert payload["liens"] == 42
+    assert threading.current_thread().name not in writer_threads
+
+
+def test_debug_sampler_drops_unsampled_debug_events() -> None:
+    sampler = app_logging.DebugSampler(rate=0.0)
+
+    with pytest.raises(structlog.DropEvent):
+        sampler(None, "debug", {"event": "noisy"})
+    assert sampler(None, "info", {"event": "kept"}) == {"event": "kept"}
+
+
+def test_rate_limiter_reports_suppressed_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    limiter = app_logging.PerLoggerRateLimiter(max_per_second=2)
+    clock = iter([0.0, 0.1, 0.2, 1.5])
+    monkeypatch.setattr(app_logging.time, "monotonic", lambda: next(clock))
+    logger = SimpleNamespace(name="agents.research")
+
+    limiter(logger, "info", {"event": "a"})
+    limiter(logger, "info", {"event": "b"})
+    with pytest.raises(structlog.DropEvent):
+        limiter(logger, "info", {"event": "c"})
+    assert limiter(logger, "error", {"event": "always"}) == {"event": "always"}
+
+    assert limiter(logger, "info", {"event": "d"}) == {"event": "d", "suppressed": 1}
+
+
+def test_queue_handler_reports_dropped_records_on_the_next_one_through() -> None:
+    log_queue = queue.Queue(maxsize=1)
+    handler = app_logging.DroppingQueueHandler(log_queue)
+    logger = logging.getLogger("test.dropping_queue")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        logger.warning('{"event":"kept"}')
+        logger.warning('{"event":"lost"}')
+        logger.warning("lost too")
+        assert log_queue.get_nowait().getMessage() == '{"event":"kept"}'
+
+        logger.warning('{"event":"next"}')
+        assert json.loads(log_queue.get_nowait().getMessage()) == {"event": "next", "dropped": 2}
+        logger.warning("plain")
+        assert log_queue.get_nowait().getMessage() == "plain"
+    finally:
+        logger.removeHandler(handler)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[3] / "backend"
+
+# Generous ceilings: they exist to catch an eagerly imported SDK or heavy module-level work,
+# not to benchmark the machine running the suite.
+CREATE_APP_BUDGET_SECONDS = 3.0
+WORKER_BOOT_BUDGET_SECONDS = 3.0
+
+HEAVY_MODULES = ("openai._client", "pgvector", "numpy")
+
+
+def _boot(statement: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=dict(os.environ), capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_create_app_stays_within_startup_budget() -> None:
+    result = _boot("from app.main import create_app; create_app()")
+
+    assert result["loaded"] == []
+    assert result["seconds"] < CREATE_APP_BUDGET_SECONDS
+
+
+def test_worker_boot_stays_within_startup_budget() -> None:
+    result = _boot("from app.worker import celery_app; celery_app.finalize()")
+
+    assert result["loaded"] == []
+    assert result["seconds"] < WORKER_BOOT_BUDGET_SECONDS
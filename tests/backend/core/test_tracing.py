@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, Dict
+from uuid import uuid4
+
+import pytest
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from sqlalchemy import create_engine, text
+
+from app.ai.openai_service import OpenAIService
+from app.core import tracing
+from app.core.config import settings
+from app.services.upload_ingestion import UploadIngestionPipeline
+
+
+class FakeResponse:
+    def __init__(self, payload: Dict[str, Any]):
+        self._payload = payload
+
+    def model_dump(self) -> Dict[str, Any]:
+        return self._payload
+
+
+class StubResponses:
+    async def create(self, **kwargs: Any) -> FakeResponse:
+        return FakeResponse({"output_text": "ok", "usage": {"input_tokens": 4, "output_tokens": 6, "total_tokens": 10}})
+
+
+@pytest.fixture
+def exporter(monkeypatch: pytest.MonkeyPatch) -> InMemorySpanExporter:
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+    span_exporter = InMemorySpanExporter()
+    tracing.configure_tracing(exporter=span_exporter, force=True)
+    yield span_exporter
+    monkeypatch.setattr(settings, "TRACING_ENABLED", False)
+
+
+def _finished(exporter: InMemorySpanExporter):
+    tracing.flush_tracing()
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+def test_traced_stage_records_attributes(exporter: InMemorySpanExporter) -> None:
+    with tracing.traced_stage("score", lien_count=50):
+        pass
+
+    span = _finished(exporter)["stage score"]
+    assert span.attributes["pipeline.stage"] == "score"
+    assert span.attributes["lien_count"] == 50
+
+
+def test_sql_statements_produce_child_spans(exporter: InMemorySpanExporter) -> None:
+    engine = create_engine("sqlite://")
+    tracing.instrument_engine(engine)
+
+    with tracing.traced_stage("load"):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    spans = _finished(exporter)
+    assert spans["db SELECT"].attributes["db.statement"] == "SELECT 1"
+    assert spans["db SELECT"].parent.span_id == spans["stage load"].context.span_id
+
+
+class NullUploadStore:
+    async def begin_staging(self, upload_id: Any) -> None:
+        pass
+
+    async def stage_rows(self, upload_id: Any, sheet_index: int, row_numbers: Any, rows: Any) -> int:
+        return len(rows)
+
+    async def complete(self, upload_id: Any, sheets: Any, row_count: int) -> None:
+        pass
+
+    async def fail(self, upload_id: Any, error: str) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stages_are_traced(exporter: InMemorySpanExporter) -> None:
+    await UploadIngestionPipeline(NullUploadStore(), chunk_size=2).ingest(uuid4(), b"APN\n001\n002\n003\n", "csv")
+
+    spans = _finished(exporter)
+    assert spans["stage upload.stage"].attributes["file_format"] == "csv"
+    assert spans["stage upload.complete"].attributes["rows"] == 3
+
+
+@pytest.mark.asyncio
+async def test_openai_calls_carry_token_attributes(exporter: InMemorySpanExporter) -> None:
+    client = SimpleNamespace(responses=StubResponses())
+    service = OpenAIService(client=client, default_model="gpt-4", embedding_model="text-embedding-3-large")
+
+    await service.generate_text("Explain the deal")
+
+    span = _finished(exporter)["openai.responses.create"]
+    assert span.attributes["gen_ai.request.model"] == "gpt-4"
+    assert span.attributes["gen_ai.usage.input_tokens"] == 4
+    assert span.attributes["gen_ai.usage.output_tokens"] == 6
+
+
+def test_celery_headers_propagate_trace_context(exporter: InMemorySpanExporter) -> None:
+    headers: Dict[str, Any] = {}
+    with tracing.get_tracer().start_as_current_span("enqueue") as publisher:
+        tracing._inject_task_headers(headers=headers)
+    assert "traceparent" in headers
+
+    task = SimpleNamespace(name="app.jobs.analysis.run", request=SimpleNamespace(**headers))
+    tracing._start_task_span(task_id="task-1", task=task)
+    tracing._end_task_span(task_id="task-1", state="SUCCESS")
+
+    span = _finished(exporter)["celery.task app.jobs.analysis.run"]
+    assert span.context.trace_id == publisher.get_span_context().trace_id
+    assert span.attributes["celery.state"] == "SUCCESS"
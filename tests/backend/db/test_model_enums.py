@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from sqlalchemy import Enum
+from sqlalchemy.dialects import postgresql
+
+import app.models  # noqa: F401 - registers every table on Base.metadata
+from app.db.base import Base
+from app.models.enums import InterestType, UserRole
+from app.models.lien import Lien
+from app.models.user import User
+
+
+def test_enum_columns_bind_and_read_the_lowercase_database_labels() -> None:
+    dialect = postgresql.dialect()
+    clause = User.__table__.c.role.in_([UserRole.INVESTOR, UserRole.ADMIN])
+
+    assert str(clause.compile(dialect=dialect, compile_kwargs={"literal_binds": True})) == (
+        "users.role IN ('investor', 'admin')"
+    )
+    read = Lien.__table__.c.interest_type.type.result_processor(dialect, None)
+    assert read("simple") is InterestType.SIMPLE
+
+
+def test_every_enum_column_uses_member_values() -> None:
+    columns = [column for table in Base.metadata.tables.values() for column in table.columns]
+    enum_types = [column.type for column in columns if isinstance(column.type, Enum) and column.type.enum_class]
+
+    assert enum_types
+    for enum_type in enum_types:
+        assert enum_type.enums == [member.value for member in enum_type.enum_class]
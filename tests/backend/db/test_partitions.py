@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from typing import Any, List
+
+import pytest
+
+from app.db import partitions
+
+
+class FakeConnection:
+    def __init__(self, existing: List[str], default_months: List[date] = ()):
+        self.existing = existing
+        self.default_months = list(default_months)
+        self.statements: List[str] = []
+
+    async def execute(self, statement: Any, params: Any = None) -> List[tuple]:
+        sql = str(statement)
+        if sql.startswith("SELECT child.relname"):
+            return [(name,) for name in self.existing]
+        if sql.startswith("SELECT DISTINCT"):
+            return [(month,) for month in self.default_months]
+        self.statements.append(sql)
+        return []
+
+
+def test_partition_naming_and_bounds_round_trip() -> None:
+    name = partitions.partition_name("agent_logs", date(2026, 12, 1))
+
+    assert name == "agent_logs_p2026_12"
+    assert partitions.partition_bounds(name) == (date(2026, 12, 1), date(2027, 1, 1))
+    assert partitions.partition_bounds("agent_logs_default") is None
+
+
+def test_expired_partitions_only_includes_fully_elapsed_months() -> None:
+    names = ["agent_logs_p2026_07", "agent_logs_p2026_08", "agent_logs_p2026_09"]
+
+    expired = partitions.expired_partitions(names, datetime(2026, 9, 1, tzinfo=timezone.utc))
+
+    assert expired == ["agent_logs_p2026_07", "agent_logs_p2026_08"]
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_only_missing_months() -> None:
+    connection = FakeConnection(existing=["agent_logs_p2026_10"])
+
+    created = await partitions.ensure_partitions(
+        connection, "agent_logs", months_ahead=2, now=datetime(2026, 10, 19, tzinfo=timezone.utc)
+    )
+
+    assert created == ["agent_logs_p2026_11", "agent_logs_p2026_12"]
+    assert connection.statements[0] == "CREATE TABLE IF NOT EXISTS agent_logs_default PARTITION OF agent_logs DEFAULT"
+    assert connection.statements[-1] == (
+        "CREATE TABLE IF NOT EXISTS agent_logs_p2026_12 PARTITION OF agent_logs "
+        "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+    )
+
+
+@pytest.mark.asyncio
+async def test_rows_in_the_default_partition_move_into_their_own_month() -> None:
+    connection = FakeConnection(
+        existing=["agent_logs_default", "agent_logs_p2026_10", "agent_logs_p2026_11"],
+        default_months=[date(2025, 3, 1)],
+    )
+
+    created = await partitions.ensure_partitions(
+        connection, "agent_logs", months_ahead=1, now=datetime(2026, 10, 19, tzinfo=timezone.utc)
+    )
+
+    assert created == ["agent_logs_p2025_03"]
+    assert connection.statements[:4] == [
+        "CREATE TEMPORARY TABLE _moved_agent_logs AS WITH moved AS (DELETE FROM agent_logs_default "
+        "WHERE created_at >= '2025-03-01' AND created_at < '2025-04-01' RETURNING *) SELECT * FROM moved",
+        "CREATE TABLE IF NOT EXISTS agent_logs_p2025_03 PARTITION OF agent_logs "
+        "FOR VALUES FROM ('2025-03-01') TO ('2025-04-01')",
+        "INSERT INTO agent_logs SELECT * FROM _moved_agent_logs",
+        "DROP TABLE _moved_agent_logs",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_retention_detaches_and_drops_whole_partitions() -> None:
+    connection = FakeConnection(existing=["agent_logs_p2026_08", "agent_logs_p2026_09", "agent_logs_p2026_10"])
+
+    removed = await partitions.apply_retention(
+        connection, "agent_logs", retention_days=30, mode="drop", now=datetime(2026, 10, 19, tzinfo=timezone.utc)
+    )
+
+    assert removed == ["agent_logs_p2026_08"]
+    assert connection.statements == [
+        "ALTER TABLE agent_logs DETACH PARTITION agent_logs_p2026_08",
+        "DROP TABLE agent_logs_p2026_08",
+    ]
+    assert not any(statement.startswith("DELETE") for statement in connection.statements)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.analysis_refresh import (
+    DEAL_SCORES,
+    AnalysisRefreshRepository,
+    build_copy_forward,
+    fingerprint_query,
+    previous_run_query,
+)
+
+
+def _sql(statement: Any) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class Result:
+    def __init__(self, rows: List[tuple], rowcount: int = 0) -> None:
+        self._rows, self.rowcount = rows, rowcount
+
+    def all(self) -> List[tuple]:
+        return self._rows
+
+
+class RecordingConnection:
+    def __init__(self, log: List[Dict[str, Any]], changed: List[tuple]) -> None:
+        self._log, self._changed = log, changed
+
+    async def execute(self, statement: Any, params: Dict[str, Any] | None = None) -> Result:
+        sql = str(statement)
+        self._log.append({"sql": sql, "params": params})
+        if sql.startswith("SELECT lien_id, input_fingerprint"):
+            return Result(self._changed)
+        return Result([], rowcount=3)
+
+
+class RecordingEngine:
+    def __init__(self, changed: List[tuple]) -> None:
+        self.statements: List[Dict[str, Any]] = []
+        self._changed = changed
+
+    @asynccontextmanager
+    async def begin(self):
+        yield RecordingConnection(self.statements, self._changed)
+
+
+def test_fingerprint_hashes_lien_valuation_county_and_formula_inputs() -> None:
+    sql = _sql(fingerprint_query([uuid4()], "1:abc"))
+
+    assert sql.count("md5(concat_ws(") == 1
+    assert "liens.lien_principal_amount" in sql and "liens.status" in sql
+    assert "ORDER BY property_valuations.valuation_date DESC" in sql
+    assert "EXTRACT(epoch FROM counties.updated_at)" in sql
+    assert "%(formula_version)s" in sql
+    assert "liens.current_holder" not in sql
+
+
+def test_copy_forward_rewrites_the_run_and_keeps_fingerprints() -> None:
+    sql = build_copy_forward(DEAL_SCORES)
+
+    assert sql.startswith("INSERT INTO deal_scores (analysis_run_id, investor_profile_id, lien_id,")
+    assert "SELECT CAST(:run_id AS uuid), previous.investor_profile_id, previous.lien_id" in sql
+    assert "previous.input_fingerprint" in sql
+    assert "JOIN _refresh_inputs AS inputs ON inputs.lien_id = previous.lien_id AND inputs.unchanged" in sql
+    assert sql.endswith("ON CONFLICT (analysis_run_id, investor_profile_id, lien_id) DO NOTHING")
+
+
+def test_previous_run_is_the_profiles_latest_completed_refresh() -> None:
+    sql = _sql(previous_run_query(uuid4()))
+
+    assert "analysis_runs.investor_profile_id IS NOT DISTINCT FROM current_run.investor_profile_id" in sql
+    assert "ORDER BY analysis_runs.completed_at DESC NULLS LAST" in sql
+
+
+def test_previous_run_filters_on_the_database_enum_labels() -> None:
+    statement = previous_run_query(uuid4())
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    assert "analysis_runs.analysis_type = 'watchlist_refresh'" in sql
+    assert "analysis_runs.status = 'completed'" in sql
+
+
+@pytest.mark.asyncio
+async def test_plan_copies_forward_every_output_table_and_returns_changed_liens() -> None:
+    changed_lien = uuid4()
+    engine = RecordingEngine(changed=[(changed_lien, "f" * 32)])
+    run_id, previous_run_id = uuid4(), uuid4()
+
+    plan = await AnalysisRefreshRepository(engine).plan(run_id, previous_run_id, [changed_lien, uuid4()], "1:abc")
+
+    assert plan.changed == {changed_lien: "f" * 32}
+    assert plan.liens == 2
+    assert plan.copied_forward == {
+        "deal_metrics": 3,
+        "risk_assessments": 3,
+        "scenario_analyses": 3,
+        "deal_scores": 3,
+    }
+    sql = [statement["sql"] for statement in engine.statements]
+    assert sql[0].startswith("CREATE TEMPORARY TABLE _refresh_inputs")
+    assert sql[2].startswith("UPDATE _refresh_inputs")
+    assert engine.statements[3]["params"] == {"run_id": run_id, "previous_run_id": previous_run_id}
+
+
+@pytest.mark.asyncio
+async def test_plan_without_previous_run_analyses_everything() -> None:
+    engine = RecordingEngine(changed=[])
+
+    plan = await AnalysisRefreshRepository(engine).plan(uuid4(), None, [uuid4()], "1:abc")
+
+    assert plan.copied_forward == {}
+    assert [statement["sql"].split()[0] for statement in engine.statements] == ["CREATE", "INSERT", "SELECT"]
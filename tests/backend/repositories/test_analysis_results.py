@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.models.enums import ScenarioType
+from app.repositories.analysis_results import (
+    DEAL_METRICS,
+    SCENARIO_ANALYSES,
+    AnalysisResultRepository,
+    build_unnest_upsert,
+    prepare_columns,
+)
+
+
+class RecordingConnection:
+    def __init__(self, log: List[Dict[str, Any]]):
+        self._log = log
+
+    async def execute(self, statement: Any, params: Dict[str, Any] | None = None) -> None:
+        self._log.append({"sql": str(statement), "params": params})
+
+
+class RecordingEngine:
+    def __init__(self) -> None:
+        self.transactions: List[List[Dict[str, Any]]] = []
+
+    @asynccontextmanager
+    async def begin(self):
+        statements: List[Dict[str, Any]] = []
+        self.transactions.append(statements)
+        yield RecordingConnection(statements)
+
+
+def test_unnest_upsert_casts_arrays_and_updates_non_key_columns() -> None:
+    sql = build_unnest_upsert(DEAL_METRICS, ["analysis_run_id", "lien_id", "simple_yield"])
+
+    assert "unnest(CAST(:analysis_run_id AS uuid[]), CAST(:lien_id AS uuid[]), CAST(:simple_yield AS float8[]))" in sql
+    assert "CAST(u.simple_yield AS NUMERIC(6, 3))" in sql
+    assert sql.endswith("ON CONFLICT (analysis_run_id, lien_id) DO UPDATE SET simple_yield = EXCLUDED.simple_yield")
+
+
+def test_prepare_columns_encodes_enums_json_and_numpy() -> None:
+    names, encoded, rows = prepare_columns(
+        SCENARIO_ANALYSES,
+        {
+            "analysis_run_id": [uuid4(), uuid4()],
+            "lien_id": [uuid4(), uuid4()],
+            "scenario_type": [ScenarioType.REDEMPTION, "deed_conversion"],
+            "probability": np.array([0.7, 0.3]),
+        },
+    )
+
+    assert rows == 2
+    assert encoded[names.index("scenario_type")] == ["redemption", "deed_conversion"]
+    assert encoded[names.index("probability")] == [0.7, 0.3]
+    assert all(isinstance(value, float) for value in encoded[names.index("probability")])
+
+
+def test_prepare_columns_rejects_bad_payloads() -> None:
+    with pytest.raises(ValueError, match="Unknown columns"):
+        prepare_columns(DEAL_METRICS, {"analysis_run_id": [], "lien_id": [], "bogus": []})
+    with pytest.raises(ValueError, match="Missing key columns"):
+        prepare_columns(DEAL_METRICS, {"analysis_run_id": [uuid4()]})
+    with pytest.raises(ValueError, match="mismatched lengths"):
+        prepare_columns(DEAL_METRICS, {"analysis_run_id": [uuid4()], "lien_id": [uuid4(), uuid4()]})
+
+
+@pytest.mark.asyncio
+async def test_upsert_writes_one_transaction_per_shard() -> None:
+    engine = RecordingEngine()
+    repository = AnalysisResultRepository(engine, shard_size=2)
+    run_id = uuid4()
+
+    written = await repository.upsert_deal_metrics(
+        {
+            "analysis_run_id": [run_id] * 5,
+            "lien_id": [uuid4() for _ in range(5)],
+            "property_id": [uuid4() for _ in range(5)],
+            "simple_yield": np.linspace(0.1, 0.5, 5),
+        }
+    )
+
+    assert written == 5
+    assert [len(tx[0]["params"]["lien_id"]) for tx in engine.transactions] == [2, 2, 1]
+    assert all(len(tx) == 1 for tx in engine.transactions)
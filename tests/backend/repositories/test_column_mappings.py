@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.column_mappings import save_mapping_statement
+
+
+def test_confirming_a_layout_again_replaces_its_mapping() -> None:
+    statement = save_mapping_statement("ab" * 32, ["Owner Name", "Notes"], ["owner_name", None])
+    compiled = statement.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+
+    assert "ON CONFLICT (fingerprint) DO UPDATE" in sql
+    assert "headers = excluded.headers" in sql and "fields = excluded.fields" in sql
+    assert "updated_at = now()" in sql
+    assert compiled.params["fields"] == ["owner_name", None]
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+from sqlalchemy import Enum
+from sqlalchemy.dialects import postgresql
+
+from app.models.enums import PropertyType
+from app.repositories.deal_exports import EXPORT_COLUMNS, export_column_names, ranked_deals_query
+
+
+def test_ranked_deals_follow_the_rank_index_and_keep_scores_without_metrics() -> None:
+    sql = str(ranked_deals_query(uuid4(), uuid4()).compile(dialect=postgresql.dialect()))
+
+    assert "LEFT OUTER JOIN deal_metrics ON deal_metrics.analysis_run_id = deal_scores.analysis_run_id" in sql
+    assert "deal_scores.investor_profile_id = %(investor_profile_id_1)s" in sql
+    assert sql.endswith(
+        "ORDER BY deal_scores.investor_profile_id, deal_scores.rank_within_run, deal_scores.lien_id"
+    )
+    names = export_column_names()
+    assert len(names) == len(set(names))
+    assert "metric_liquidity_score" in names and "lien_status" in names
+
+
+def test_enum_export_columns_decode_the_stored_labels() -> None:
+    dialect = postgresql.dialect()
+    enum_columns = [column for column in EXPORT_COLUMNS if isinstance(column.type, Enum)]
+
+    assert [column.name for column in enum_columns] == ["lien_type", "interest_type", "lien_status", "property_type"]
+    for column in enum_columns:
+        decode = column.type.result_processor(dialect, None)
+        assert [decode(member.value) for member in column.type.enum_class] == list(column.type.enum_class)
+    assert enum_columns[-1].type.result_processor(dialect, None)("sfh") is PropertyType.SINGLE_FAMILY
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.enums import InterestType
+from app.repositories.lien_terms import TERM_COLUMNS, lien_terms_query
+from app.services.lien_accrual import LienTerms
+
+
+def test_lien_terms_query_binds_one_id_array() -> None:
+    sql = str(lien_terms_query([uuid4(), uuid4()]).compile(dialect=postgresql.dialect()))
+
+    assert "liens.interest_type" in sql
+    assert sql.endswith("WHERE liens.id = ANY (%(lien_ids)s::UUID[])")
+
+
+def test_term_columns_decode_the_database_interest_labels() -> None:
+    dialect = postgresql.dialect()
+    lien_id = uuid4()
+    stored = (lien_id, Decimal("1000.00"), Decimal("0.18"), "simple", date(2026, 1, 1))
+
+    values = {}
+    for column, value in zip(TERM_COLUMNS, stored):
+        process = column.type.result_processor(dialect, None)
+        values[column.name] = process(value) if process else value
+    terms = LienTerms.from_liens([SimpleNamespace(**values)])
+
+    assert values["interest_type"] is InterestType.SIMPLE
+    assert terms.lien_ids == (lien_id,)
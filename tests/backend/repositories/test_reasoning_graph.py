@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.reasoning_graph import (
+    ReasoningGraphRepository,
+    run_logs_query,
+    run_tasks_query,
+    subtree_logs_query,
+    subtree_tasks_query,
+)
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_run_tasks_query_reads_depth_from_closure_table() -> None:
+    sql = _sql(run_tasks_query(uuid4()))
+
+    assert "FROM agent_tasks" in sql
+    assert "max(agent_task_closure.depth)" in sql
+    assert "agent_tasks.analysis_run_id = %(analysis_run_id_1)s" in sql
+
+
+def test_run_logs_query_is_a_single_join() -> None:
+    sql = _sql(run_logs_query(uuid4()))
+
+    assert "FROM agent_logs JOIN agent_tasks ON agent_tasks.id = agent_logs.agent_task_id" in sql
+    assert "ORDER BY agent_logs.agent_task_id, agent_logs.created_at" in sql
+
+
+def test_subtree_queries_filter_on_ancestor() -> None:
+    task_sql = _sql(subtree_tasks_query(uuid4()))
+    log_sql = _sql(subtree_logs_query(uuid4()))
+
+    assert "JOIN agent_task_closure ON agent_task_closure.descendant_id = agent_tasks.id" in task_sql
+    assert "agent_task_closure.ancestor_id = %(ancestor_id_1)s" in task_sql
+    assert "JOIN agent_task_closure ON agent_task_closure.descendant_id = agent_logs.agent_task_id" in log_sql
+
+
+class StreamResult:
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self._rows = rows
+
+    async def mappings(self):
+        for row in self._rows:
+            yield row
+
+
+class StreamingEngine:
+    def __init__(self) -> None:
+        self.events: List[str] = []
+
+    @asynccontextmanager
+    async def connect(self):
+        self.events.append("open")
+        connection = self
+
+        class Connection:
+            async def stream(self, statement: Any) -> StreamResult:
+                sql = str(statement)
+                connection.events.append("stream")
+                return StreamResult([{"id": "log"}] if "agent_logs" in sql.split("FROM")[1] else [{"id": "task"}])
+
+        try:
+            yield Connection()
+        finally:
+            self.events.append("close")
+
+
+@pytest.mark.asyncio
+async def test_stream_holds_its_own_connection_for_the_body() -> None:
+    engine = StreamingEngine()
+    records = ReasoningGraphRepository(engine).stream_run_graph(uuid4())
+
+    assert engine.events == []
+    assert [record async for record in records] == [{"type": "task", "id": "task"}, {"type": "log", "id": "log"}]
+    assert engine.events == ["open", "stream", "stream", "close"]
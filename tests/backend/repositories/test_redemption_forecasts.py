@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, List
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.enums import InterestType
+from app.repositories.redemption_forecasts import (
+    hazard_counts_query,
+    observation_upsert_statement,
+    open_holdings_query,
+    reopened_delete_statement,
+)
+
+
+def _bound_values(statement: Any) -> List[Any]:
+    """Parameter values as the driver receives them, after each column type's bind processor."""
+    dialect = postgresql.dialect()
+    compiled = statement.compile(dialect=dialect)
+    values = []
+    for bind, name in compiled.bind_names.items():
+        process = bind.type.bind_processor(dialect)
+        values.append(process(compiled.params[name]) if process else compiled.params[name])
+    return values
+
+
+def test_status_and_interest_filters_bind_the_database_labels() -> None:
+    upsert = _bound_values(observation_upsert_statement(None))
+    reopened = _bound_values(reopened_delete_statement(None))
+    counts = _bound_values(hazard_counts_query(date(2026, 10, 1), 120))
+
+    assert {"redeemed", "held", "foreclosed", "simple", "penalty", "compound", "stepped"} <= set(map(str, upsert))
+    assert "held" in reopened
+    assert "held" in counts
+    assert not {"HELD", "REDEEMED", "SIMPLE"} & set(map(str, upsert + reopened + counts))
+
+
+def test_open_holdings_decode_the_stored_interest_label() -> None:
+    interest_type = open_holdings_query(date(2026, 10, 1)).selected_columns.interest_type
+
+    assert interest_type.type.result_processor(postgresql.dialect(), None)("stepped") is InterestType.STEPPED
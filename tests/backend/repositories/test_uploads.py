@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+from app.repositories.uploads import ROW_COLUMNS, row_records
+
+
+def test_row_records_send_cells_as_json_arrays() -> None:
+    upload_id = uuid4()
+
+    records = row_records(upload_id, 0, [2, 5], [("1 Main St", None), ('Say "hi"', "77002")])
+
+    assert ROW_COLUMNS == ("upload_id", "sheet_index", "row_number", "cells")
+    assert records == [
+        (upload_id, 0, 2, '["1 Main St",null]'),
+        (upload_id, 0, 5, '["Say \\"hi\\"","77002"]'),
+    ]
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.what_if import what_if_baseline_query
+
+
+def test_baseline_joins_scenarios_by_their_database_labels() -> None:
+    statement = what_if_baseline_query(uuid4())
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    assert "redemption.scenario_type = 'redemption'" in sql
+    assert "deed.scenario_type = 'deed_conversion'" in sql
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services import analysis_equations
+from app.services.analysis_equations import (
+    AnalysisEngine,
+    EquationSet,
+    MissingInputsError,
+    UnsupportedFormula,
+    load_equations,
+    parse_formula,
+    read_workbook,
+    repair_text,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+EQUATIONS_WORKBOOK = REPO_ROOT / "Real_Estate_Analysis_Equations_KB.xlsx"
+
+
+@pytest.fixture(scope="module")
+def engine() -> AnalysisEngine:
+    return AnalysisEngine(read_workbook(EQUATIONS_WORKBOOK))
+
+
+def test_repair_text_undoes_mac_roman_mojibake() -> None:
+    assert repair_text("NOI = EGI ‚àí OpEx √ó 12") == "NOI = EGI − OpEx × 12"
+    assert repair_text("Σ already fine") == "Σ already fine"
+
+
+def test_parse_formula_handles_workbook_notation() -> None:
+    ((target, expression),) = parse_formula("PGI = Σ (Market Rent_per_Unit × Units) × 12 + Other_Scheduled_Income")
+
+    assert target == "PGI"
+    assert expression == (
+        "add",
+        ("mul", ("mul", ("name", "Market_Rent_per_Unit"), ("name", "Units")), ("const", 12.0)),
+        ("name", "Other_Scheduled_Income"),
+    )
+    assert [target for target, _ in parse_formula("EBITDA = NOI − Overhead; Margin = EBITDA / Revenue")] == [
+        "EBITDA",
+        "Margin",
+    ]
+    for formula in ("NPV = Σ [CF_t / (1 + i)^t] − Equity", "MIRR = FV(x) − 1", "If IRR ≥ Hurdle: P = 1"):
+        with pytest.raises(UnsupportedFormula):
+            parse_formula(formula)
+
+
+def test_workbook_compiles_with_reasons_for_skipped_rows(engine: AnalysisEngine) -> None:
+    equations = engine.equations
+    skipped = {item.metric: item.reason for item in equations.skipped}
+
+    assert {"PGI", "NOI", "Cap_Rate", "PMT", "Debt_Service_Constant", "ΔNOI", "Exit_Value"} <= set(engine.outputs)
+    assert engine.equation("nnn_retail.NOI").category == "NNN / Retail"
+    assert skipped["NPV"].startswith("indexed series")
+    assert skipped["MIRR"] == "unknown function 'FV'"
+    assert len(equations.equations) + len(skipped) > 50
+
+
+def test_evaluate_follows_dependencies_across_rows(engine: AnalysisEngine) -> None:
+    columns = {
+        "Market_Rent_per_Unit": np.array([1_000.0, 1_500.0]),
+        "Units": np.array([10.0, 4.0]),
+        "Other_Scheduled_Income": 0.0,
+        "Vacancy_Rate": np.array([0.05, 0.10]),
+        "Bad_Debt": 0.0,
+        "Other_Income": np.array([2_000.0, 0.0]),
+        "Operating_Expenses": np.array([40_000.0, 20_000.0]),
+        "Replacement_Reserves": np.array([3_000.0, 1_000.0]),
+        "Purchase_Price": np.array([1_000_000.0, 400_000.0]),
+    }
+
+    result = engine.evaluate(columns, ["Cap_Rate", "OER"])
+
+    pgi = np.array([120_000.0, 72_000.0])
+    egi = pgi * (1 - columns["Vacancy_Rate"]) + columns["Other_Income"]
+    noi = egi - columns["Operating_Expenses"] - columns["Replacement_Reserves"]
+    np.testing.assert_allclose(result["Cap_Rate"], noi / columns["Purchase_Price"])
+    np.testing.assert_allclose(result["OER"], columns["Operating_Expenses"] / egi)
+
+
+def test_negative_constant_base_keeps_its_sign() -> None:
+    equations = EquationSet.from_rows("test", [{"Metric": "Sign", "Category": "Test", "Formula": "Sign = (-2)^n"}])
+
+    result = AnalysisEngine(equations).evaluate({"n": np.array([2.0, 3.0])}, ["Sign"])
+
+    np.testing.assert_array_equal(result["Sign"], [4.0, -8.0])
+
+
+def test_supplied_columns_override_derived_values(engine: AnalysisEngine) -> None:
+    result = engine.evaluate({"NOI": [100.0, 50.0], "Purchase_Price": [1_000.0, 0.0], "Debt_Service": 80.0})
+
+    np.testing.assert_allclose(result["Cap_Rate"], [0.1, np.inf])
+    np.testing.assert_allclose(result["DSCR"], [1.25, 0.625])
+    assert "NOI" not in result and "PGI" not in result
+
+
+def test_missing_inputs_are_reported_per_output(engine: AnalysisEngine) -> None:
+    with pytest.raises(MissingInputsError) as excinfo:
+        engine.evaluate({"NOI": [1.0]}, ["Cap_Rate", "Value"])
+
+    assert excinfo.value.missing == {"Cap_Rate": ["Purchase_Price"], "Value": ["Market_Cap_Rate"]}
+
+
+def test_plans_share_subexpressions_and_are_cached(engine: AnalysisEngine) -> None:
+    available = ["r", "L", "n", "NOI", "DSCR_Target"]
+    plan = engine.plan(available, ["PMT", "DS_IO", "Debt_Service_Constant", "Loan"])
+
+    # r·L and 1 − (1 + r)^(−n) are each computed once across the four outputs.
+    assert plan.source.count(" * ") == 2 and plan.source.count(" ** ") == 1
+    assert engine.plan(reversed(available), ["PMT", "DS_IO", "Debt_Service_Constant", "Loan"]) is plan
+
+    result = plan({"r": 0.005, "L": 200_000.0, "n": 360.0, "NOI": 30_000.0, "DSCR_Target": 1.25})
+    assert result["PMT"] == pytest.approx(1199.10, abs=0.01)
+    assert result["Loan"] == pytest.approx(30_000.0 / (1.25 * result["Debt_Service_Constant"]))
+
+
+def test_parsed_workbook_is_cached_on_disk_by_hash(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    workbook = tmp_path / "equations.xlsx"
+    workbook.write_bytes(EQUATIONS_WORKBOOK.read_bytes())
+    monkeypatch.setattr(analysis_equations, "_equation_sets", {})
+
+    first = load_equations(workbook, cache_dir=tmp_path / "cache")
+    (cache_file,) = (tmp_path / "cache").iterdir()
+    assert first.digest[:16] in cache_file.name
+
+    monkeypatch.setattr(analysis_equations, "_equation_sets", {})
+    monkeypatch.setattr(analysis_equations, "read_workbook", pytest.fail)
+    second = load_equations(workbook, cache_dir=tmp_path / "cache")
+
+    assert second == first
+    assert EquationSet.from_json(first.to_json()) == first
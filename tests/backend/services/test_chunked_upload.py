@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, List
+from uuid import uuid4
+
+import pytest
+
+from app.services.chunked_upload import PartRejected, PartStreamReader, UploadPlan, part_key, spool_parts, store_part
+from app.services.document_storage import LocalArtifactStorage
+from app.services.tabular_readers import iter_chunks
+
+CSV = b"Owner Name,Zip\n" + b"".join(f"Owner {index},770{index:02d}\n".encode() for index in range(40))
+
+
+async def _chunks(data: bytes, size: int = 7) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def _store_all(storage: LocalArtifactStorage, upload_id, data: bytes, plan: UploadPlan, numbers=None) -> None:
+    for number in numbers or range(1, plan.part_count + 1):
+        part = data[(number - 1) * plan.part_size : number * plan.part_size]
+        asyncio.run(
+            store_part(
+                storage,
+                part_key(upload_id, number),
+                _chunks(part),
+                expected_length=plan.part_length(number),
+                expected_sha256=hashlib.sha256(part).hexdigest(),
+            )
+        )
+
+
+def test_plan_has_full_parts_and_a_short_last_part() -> None:
+    plan = UploadPlan(size=25, part_size=10)
+
+    assert plan.part_count == 3
+    assert [plan.part_length(number) for number in (1, 2, 3)] == [10, 10, 5]
+    with pytest.raises(PartRejected):
+        plan.part_length(4)
+
+
+def test_store_part_keeps_only_verified_parts(tmp_path: Path) -> None:
+    storage = LocalArtifactStorage(tmp_path)
+    key = part_key(uuid4(), 1)
+    data = b"0123456789"
+
+    with pytest.raises(PartRejected, match="SHA-256"):
+        asyncio.run(store_part(storage, key, _chunks(data), expected_length=10, expected_sha256="0" * 64))
+    with pytest.raises(PartRejected, match="longer"):
+        asyncio.run(store_part(storage, key, _chunks(data + b"x"), expected_length=10, expected_sha256="0" * 64))
+    assert storage.open_reader(key) is None
+    assert [path.name for path in tmp_path.rglob("*") if path.is_file()] == []
+
+    stored = asyncio.run(
+        store_part(storage, key, _chunks(data), expected_length=10, expected_sha256=hashlib.sha256(data).hexdigest())
+    )
+
+    assert stored.size == 10
+    assert storage.open_reader(key).read() == data
+
+
+def test_reader_parses_csv_across_part_boundaries(tmp_path: Path) -> None:
+    storage = LocalArtifactStorage(tmp_path)
+    upload_id = uuid4()
+    plan = UploadPlan(len(CSV), part_size=64)
+    _store_all(storage, upload_id, CSV, plan)
+
+    with PartStreamReader(
+        storage, upload_id, plan.part_count, expected_sha256=hashlib.sha256(CSV).hexdigest()
+    ) as reader:
+        chunks = list(iter_chunks(io.BufferedReader(reader), "csv", 16))
+
+    assert [len(chunk.rows) for chunk in chunks] == [16, 16, 8]
+    assert chunks[-1].rows[-1] == ("Owner 39", "77039")
+    assert reader.size == len(CSV)
+
+
+def test_reader_waits_for_parts_that_arrive_later(tmp_path: Path) -> None:
+    storage = LocalArtifactStorage(tmp_path)
+    upload_id = uuid4()
+    plan = UploadPlan(len(CSV), part_size=200)
+    _store_all(storage, upload_id, CSV, plan, numbers=[1])
+    waits: List[float] = []
+
+    def arrive(seconds: float) -> None:
+        waits.append(seconds)
+        _store_all(storage, upload_id, CSV, plan, numbers=range(2, plan.part_count + 1))
+
+    with PartStreamReader(storage, upload_id, plan.part_count, poll_seconds=0.25, sleep=arrive) as reader:
+        assert reader.read() == CSV
+
+    assert waits == [0.25]
+
+
+def test_reader_times_out_and_checks_the_whole_file_hash(tmp_path: Path) -> None:
+    storage = LocalArtifactStorage(tmp_path)
+    upload_id = uuid4()
+    plan = UploadPlan(len(CSV), part_size=200)
+    _store_all(storage, upload_id, CSV, plan, numbers=[1])
+    ticks = iter([0.0, 0.0, 5.0, 11.0])
+
+    stalled = PartStreamReader(
+        storage, upload_id, plan.part_count, wait_seconds=10, sleep=lambda _: None, clock=lambda: next(ticks)
+    )
+    with pytest.raises(TimeoutError):
+        stalled.read()
+
+    _store_all(storage, upload_id, CSV, plan)
+    with pytest.raises(PartRejected, match="Upload SHA-256"):
+        with tempfile.TemporaryFile() as target:
+            spool_parts(PartStreamReader(storage, upload_id, plan.part_count, expected_sha256="0" * 64), target)
+
+    with tempfile.TemporaryFile() as target:
+        assert spool_parts(PartStreamReader(storage, upload_id, plan.part_count), target) == len(CSV)
+        assert target.read() == CSV
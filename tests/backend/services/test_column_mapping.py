@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pytest
+
+from app.ai.stub_provider import StubLLMProvider
+from app.services.column_mapping import ColumnMapper, header_fingerprint, normalize_header
+from app.services.tabular_readers import SheetChunk, iter_chunks
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+TAX_LIEN_LEADS = REPO_ROOT / "Tax-Lien-Leads-SC-Hamner.csv"
+CASH_BUYERS = REPO_ROOT / "contact_export-HoustonActiveCashBuyers.csv"
+
+
+class InMemoryMappingStore:
+    def __init__(self) -> None:
+        self.saved: Dict[str, List[Optional[str]]] = {}
+        self.reads = 0
+
+    async def get(self, fingerprint: str) -> Optional[List[Optional[str]]]:
+        self.reads += 1
+        return self.saved.get(fingerprint)
+
+    async def save(self, fingerprint: str, headers: Sequence[str], fields: Sequence[Optional[str]]) -> None:
+        self.saved[fingerprint] = list(fields)
+
+
+class ScriptedProvider(StubLLMProvider):
+    """Stub whose text answer is fixed, to stand in for the LLM's JSON mapping."""
+
+    def __init__(self, answer: str) -> None:
+        super().__init__()
+        self.answer = answer
+
+    async def generate_text(self, prompt: str, **kwargs) -> Dict[str, object]:
+        self.calls.append({"kind": "text", "prompt": prompt})
+        return {"content": self.answer, "model": "stub-model", "usage": None}
+
+
+def _sample(path: Path) -> SheetChunk:
+    return next(iter_chunks(path, "csv", 20))
+
+
+def test_vendor_layouts_map_fully_without_a_provider() -> None:
+    mapper = ColumnMapper(InMemoryMappingStore())
+
+    lead_sample, buyer_sample = _sample(TAX_LIEN_LEADS), _sample(CASH_BUYERS)
+
+    leads = asyncio.run(mapper.suggest(lead_sample.header, lead_sample.rows))
+    buyers = asyncio.run(mapper.suggest(buyer_sample.header, buyer_sample.rows))
+
+    assert leads.fingerprint != buyers.fingerprint
+    assert all(column.source == "alias" for column in leads.columns + buyers.columns)
+    assert [field for field in leads.mapping.values()].count("phone") == 12
+    assert [field for field in buyers.mapping.values()].count("phone") == 8
+    assert [field for field in buyers.mapping.values()].count("email") == 3
+    assert leads.mapping["DNC 2.1"] == "do_not_call"
+    assert buyers.mapping["Mail Zip"] == "mailing_zip"
+
+
+def test_known_layout_is_served_from_cache_under_any_spelling() -> None:
+    store = InMemoryMappingStore()
+    mapper = ColumnMapper(store)
+    asyncio.run(mapper.suggest(["Owner Name", "Zip", "Phone 1"]))
+
+    again = asyncio.run(mapper.suggest(["OWNER NAME", "zip", "phone-1"]))
+
+    assert store.reads == 2
+    assert again.cached and again.mapping == {"OWNER NAME": "owner_name", "zip": "zip_code", "phone-1": "phone"}
+    assert header_fingerprint(["OWNER NAME"]) == header_fingerprint(["Owner  Name"])
+    assert normalize_header("Est. Loan-to-Value") == "est loan to value"
+
+
+def test_confirmed_mappings_are_persisted_and_win_over_heuristics() -> None:
+    store = InMemoryMappingStore()
+    headers = ["Owner Name", "Situs", "Notes"]
+    asyncio.run(ColumnMapper(store).confirm(headers, {"Owner Name": "company_name", "Situs": "street_address"}))
+
+    fresh = ColumnMapper(store)
+    suggestion = asyncio.run(fresh.suggest(headers))
+
+    assert suggestion.confirmed and not suggestion.cached
+    assert suggestion.mapping == {"Owner Name": "company_name", "Situs": "street_address", "Notes": None}
+    reads = store.reads
+    assert asyncio.run(fresh.suggest(headers)).cached
+    assert store.reads == reads
+
+    with pytest.raises(ValueError, match="Unknown lead field"):
+        asyncio.run(fresh.confirm(headers, {"Notes": "favourite_colour"}))
+    with pytest.raises(ValueError, match="more than one column"):
+        asyncio.run(fresh.confirm(headers, {"Owner Name": "city", "Situs": "city"}))
+
+
+def test_sample_values_then_llm_resolve_unfamiliar_columns() -> None:
+    provider = ScriptedProvider('Sure: {"Col C": "lien_amount", "Col D": "nonsense"}')
+    mapper = ColumnMapper(InMemoryMappingStore(), provider=provider, embedding_min_similarity=1.01)
+    rows = [["ada@example.com", "(713) 555-0100", "1,204.11", "x"], ["bo@example.org", "713.555.0101", "88.00", "y"]]
+
+    suggestion = asyncio.run(mapper.suggest(["Col A", "Col B", "Col C", "Col D"], rows))
+
+    assert [(column.field, column.source) for column in suggestion.columns] == [
+        ("email", "values"),
+        ("phone", "values"),
+        ("lien_amount", "llm"),
+        (None, "llm"),
+    ]
+    assert [call["kind"] for call in provider.calls] == ["embeddings", "embeddings", "text"]
+    assert '"Col C":["1,204.11","88.00"]' in provider.calls[-1]["prompt"]
+
+    asyncio.run(mapper.suggest(["col a", "col b", "col c", "col d"], rows))
+    assert len(provider.calls) == 3
+
+
+def test_provider_failure_leaves_open_columns_unmapped() -> None:
+    class FailingProvider(StubLLMProvider):
+        async def create_embeddings(self, texts, **kwargs):
+            raise RuntimeError("upstream down")
+
+    suggestion = asyncio.run(ColumnMapper(InMemoryMappingStore(), provider=FailingProvider()).suggest(["Zip", "Xyzzy"]))
+
+    assert [(column.field, column.source) for column in suggestion.columns] == [
+        ("zip_code", "alias"),
+        (None, "unmapped"),
+    ]
+
+
+def test_layout_confirmed_by_another_worker_replaces_a_cached_suggestion() -> None:
+    store = InMemoryMappingStore()
+    headers = ["Owner Name", "Situs"]
+    mapper = ColumnMapper(store)
+    assert asyncio.run(mapper.suggest(headers)).mapping == {"Owner Name": "owner_name", "Situs": None}
+
+    asyncio.run(ColumnMapper(store).confirm(headers, {"Owner Name": "owner_name", "Situs": "street_address"}))
+    suggestion = asyncio.run(mapper.suggest(headers))
+
+    assert suggestion.confirmed
+    assert suggestion.mapping == {"Owner Name": "owner_name", "Situs": "street_address"}
+
+
+def test_suggestion_made_while_the_provider_failed_is_not_cached() -> None:
+    class FlakyProvider(StubLLMProvider):
+        failures = 1
+
+        async def create_embeddings(self, texts, **kwargs):
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("upstream down")
+            return await super().create_embeddings(texts, **kwargs)
+
+    provider = FlakyProvider()
+    mapper = ColumnMapper(InMemoryMappingStore(), provider=provider, use_llm=False)
+
+    assert not asyncio.run(mapper.suggest(["Zip", "Xyzzy"])).cached
+    retried = asyncio.run(mapper.suggest(["Zip", "Xyzzy"]))
+
+    assert not retried.cached
+    assert [call["kind"] for call in provider.calls] == ["embeddings", "embeddings"]
+    assert asyncio.run(mapper.suggest(["Zip", "Xyzzy"])).cached
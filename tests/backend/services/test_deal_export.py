@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, AsyncIterator, List, Sequence
+from uuid import uuid4
+
+import pytest
+from openpyxl import load_workbook
+
+from app.models.enums import LienType
+from app.repositories.deal_exports import EXPORT_COLUMNS
+from app.services.deal_export import CsvEncoder, XlsxEncoder, encode_export, open_encoder
+
+ROW_ID = uuid4()
+ROW = (ROW_ID, LienType.TAX_LIEN, Decimal("1250.50"), datetime(2026, 5, 1, 12, tzinfo=timezone.utc), None)
+
+
+async def _batches(*batches: Sequence[Any]) -> AsyncIterator[Sequence[Any]]:
+    for batch in batches:
+        yield batch
+
+
+async def _collect(stream: AsyncIterator[bytes]) -> bytes:
+    return b"".join([data async for data in stream])
+
+
+@pytest.mark.asyncio
+async def test_csv_streams_one_block_per_batch_with_plain_values() -> None:
+    chunks: List[bytes] = []
+    rows: List[int] = []
+    encoder = CsvEncoder(["id", "type", "amount", "at", "x"])
+    async for data in encode_export(_batches([ROW], [ROW, ROW]), encoder, rows.append):
+        chunks.append(data)
+
+    assert rows == [1, 2]
+    assert len(chunks) == 2
+    lines = b"".join(chunks).decode().splitlines()
+    assert lines[0] == "id,type,amount,at,x"
+    assert lines[1] == f"{ROW_ID},{LienType.TAX_LIEN.value},1250.50,2026-05-01 12:00:00+00:00,"
+    assert len(lines) == 4
+
+
+@pytest.mark.asyncio
+async def test_xlsx_rolls_over_to_a_new_sheet_at_the_row_limit() -> None:
+    encoder = XlsxEncoder(["id", "type", "amount", "at", "x"], max_rows=3)
+    body = await _collect(encode_export(_batches([ROW, ROW], [ROW]), encoder))
+
+    workbook = load_workbook(io.BytesIO(body), read_only=True)
+    assert workbook.sheetnames == ["Ranked deals", "Ranked deals 2"]
+    first = list(workbook["Ranked deals"].values)
+    assert first[0] == ("id", "type", "amount", "at", "x")
+    assert first[1][:4] == (str(ROW_ID), LienType.TAX_LIEN.value, 1250.5, datetime(2026, 5, 1, 12))
+    assert len(first) == 3 and len(list(workbook["Ranked deals 2"].values)) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_export_aborts_the_encoder() -> None:
+    class Encoder(CsvEncoder):
+        aborted = False
+
+        def abort(self) -> None:
+            self.aborted = True
+
+    async def failing() -> AsyncIterator[Sequence[Any]]:
+        yield [ROW]
+        raise RuntimeError("cursor lost")
+
+    encoder = Encoder(["id", "type", "amount", "at", "x"])
+    with pytest.raises(RuntimeError):
+        await _collect(encode_export(failing(), encoder))
+    assert encoder.aborted
+
+
+@pytest.mark.asyncio
+async def test_parquet_keeps_database_types() -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    row = [None] * len(EXPORT_COLUMNS)
+    names = [column.name for column in EXPORT_COLUMNS]
+    row[names.index("lien_id")] = ROW_ID
+    row[names.index("lien_principal_amount")] = Decimal("1250.50")
+    row[names.index("rank_within_run")] = 1
+
+    body = await _collect(encode_export(_batches([row], [row]), open_encoder("parquet", EXPORT_COLUMNS)))
+
+    table = pq.read_table(io.BytesIO(body))
+    assert table.num_rows == 2
+    assert str(table.schema.field("lien_principal_amount").type) == "decimal128(18, 2)"
+    assert table.column("lien_id").to_pylist() == [str(ROW_ID)] * 2
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+from uuid import uuid4
+
+import pytest
+from jinja2 import UndefinedError
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.jobs import documents
+from app.models.notification import Document
+from app.services.document_generation import DocumentGenerator, RenderJob
+from app.services.document_storage import S3ArtifactStorage, S3ArtifactWriter, StorageConfig
+from app.services.document_templates import TemplateNotFoundError, TemplateRegistry
+
+DEALS = [
+    {
+        "certificate_number": f"2024-{index:05d}",
+        "county": "Pinellas",
+        "parcel_id": f"12-34-{index:04d}",
+        "principal": 1_000 + index * 25,
+        "interest_rate": 0.18,
+        "expected_yield": 0.11,
+        "redemption_deadline": "2026-06-01",
+        "deal_score": 90.0 - index,
+    }
+    for index in range(50)
+]
+
+
+def _generator(tmp_path: Path, template_dir: Path | None = None, **kwargs: Any) -> DocumentGenerator:
+    return DocumentGenerator(
+        template_dir=template_dir, storage_config=StorageConfig(local_path=str(tmp_path / "out")), **kwargs
+    )
+
+
+def _touch(path: Path, text: str) -> None:
+    path.write_text(text)
+    # Bump mtime explicitly so fast successive writes are always seen as edits.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_registry_compiles_once_per_version(tmp_path: Path) -> None:
+    (tmp_path / "_layout.html").write_text("<main>{% block body %}{% endblock %}</main>")
+    _touch(tmp_path / "letter.html", '{% extends "_layout.html" %}{% block body %}Hi {{ name }}{% endblock %}')
+    registry = TemplateRegistry(tmp_path)
+
+    first = registry.get("letter")
+    assert registry.get("letter") is first
+    assert first.render({"name": "<b>"}) == "<main>Hi &lt;b&gt;</main>"
+
+    _touch(tmp_path / "_layout.html", "<article>{% block body %}{% endblock %}</article>")
+    edited = registry.get("letter")
+
+    assert edited.version != first.version
+    assert edited.render({"name": "Ann"}) == "<article>Hi Ann</article>"
+    assert registry.cached_versions() == sorted([("letter", first.version), ("letter", edited.version)])
+
+
+def test_registry_rejects_partials_and_unknown_keys(tmp_path: Path) -> None:
+    (tmp_path / "_layout.html").write_text("x")
+    registry = TemplateRegistry(tmp_path)
+
+    for key in ("_layout", "missing", "../etc/passwd"):
+        with pytest.raises(TemplateNotFoundError):
+            registry.get(key)
+
+
+def test_missing_context_fails_instead_of_rendering_blanks(tmp_path: Path) -> None:
+    (tmp_path / "note.txt").write_text("Pay {{ amount | currency }} to {{ lender }}")
+    registry = TemplateRegistry(tmp_path)
+
+    assert registry.get("note").render({"amount": 1234.5, "lender": "L"}) == "Pay $1,234.50 to L"
+    with pytest.raises(UndefinedError):
+        registry.get("note").render({"amount": 1})
+
+
+def test_bytecode_cache_is_shared_between_registries(tmp_path: Path) -> None:
+    templates, cache = tmp_path / "templates", tmp_path / "bytecode"
+    templates.mkdir()
+    cache.mkdir()
+    (templates / "note.txt").write_text("{{ value }}")
+
+    TemplateRegistry(templates, bytecode_dir=str(cache)).get("note")
+    assert list(cache.iterdir())
+    assert TemplateRegistry(templates, bytecode_dir=str(cache)).get("note").render({"value": 7}) == "7"
+
+
+def test_render_streams_to_versioned_local_key(tmp_path: Path) -> None:
+    generator = _generator(tmp_path)
+
+    artifact = generator.render(
+        RenderJob("investment_summary", {"investor": {"display_name": "Acme & Co"}}, "acme"),
+        shared_context={"deals": DEALS, "generated_at": "2026-10-19T12:00:00"},
+    )
+
+    path = tmp_path / "out" / "investment_summary" / artifact.template_version / "acme.html"
+    assert artifact.storage_url == path.resolve().as_uri()
+    body = path.read_text()
+    assert "Acme &amp; Co" in body and "2024-00049" in body
+    assert artifact.size == len(body.encode())
+    assert not list(path.parent.glob(".partial-*"))
+
+
+def test_failed_render_leaves_no_partial_file(tmp_path: Path) -> None:
+    generator = _generator(tmp_path)
+
+    with pytest.raises(UndefinedError):
+        generator.render(RenderJob("investment_summary", {}, "broken"))
+    assert not [path for path in (tmp_path / "out").rglob("*") if path.is_file()]
+
+
+def test_batch_renders_in_process_pool_and_reports_failures(tmp_path: Path) -> None:
+    generator = _generator(tmp_path, max_workers=2)
+    jobs = [
+        RenderJob("investment_summary", {"investor": {"display_name": f"Investor {n}"}}, f"inv-{n}") for n in range(6)
+    ]
+    jobs.append(RenderJob("investment_summary", {}, "missing-investor"))
+
+    artifacts = generator.render_batch(jobs, shared_context={"deals": DEALS[:5], "generated_at": "2026-10-19"})
+
+    assert [artifact.output_name for artifact in artifacts] == [job.output_name for job in jobs]
+    assert all(artifact.ok for artifact in artifacts[:-1])
+    assert "investor" in artifacts[-1].error
+    assert len({artifact.sha256 for artifact in artifacts[:-1]}) == 6
+
+
+def test_batch_fails_fast_on_unknown_template(tmp_path: Path) -> None:
+    with pytest.raises(TemplateNotFoundError):
+        _generator(tmp_path).render_batch([RenderJob("no_such_template", {}, "x")])
+
+
+def test_generation_job_records_documents_with_the_database_enum_label(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    recorded: List[List[Dict[str, Any]]] = []
+
+    async def record(rows: List[Dict[str, Any]]) -> None:
+        recorded.append(rows)
+
+    monkeypatch.setattr(documents, "DocumentGenerator", lambda: _generator(tmp_path, max_workers=1))
+    monkeypatch.setattr(documents, "_record_documents", record)
+    item = {"output_name": "inv-1", "owner_user_id": str(uuid4()), "context": {"investor": {"display_name": "A"}}}
+
+    result = documents.generate_documents(
+        "investment_summary", "investor_summary", [item], {"deals": DEALS[:1], "generated_at": "2026-10-19"}
+    )
+
+    assert result == {"generated": 1, "failed": []}
+    statement = insert(Document.__table__).values(recorded[0])
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "'investor_summary'" in sql
+
+
+def test_generation_job_runs_on_the_queue_whose_worker_can_start_a_pool() -> None:
+    from app.worker import celery_app
+
+    route = celery_app.amqp.router.route({}, "app.jobs.documents.generate_documents")
+
+    assert route["queue"].name == settings.DOCUMENT_GENERATION_QUEUE != celery_app.conf.task_default_queue
+
+
+class FakeS3Client:
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+        self.parts: Dict[int, bytes] = {}
+        self.objects: Dict[str, bytes] = {}
+
+    def put_object(self, *, Bucket: str, Key: str, Body: bytes, ContentType: str) -> None:
+        self.calls.append("put_object")
+        self.objects[Key] = Body
+
+    def create_multipart_upload(self, *, Bucket: str, Key: str, ContentType: str) -> Dict[str, str]:
+        self.calls.append("create_multipart_upload")
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, *, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes) -> Dict[str, str]:
+        self.calls.append("upload_part")
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, *, Bucket: str, Key: str, UploadId: str, MultipartUpload: Dict) -> None:
+        self.calls.append("complete_multipart_upload")
+        self.objects[Key] = b"".join(self.parts[part["PartNumber"]] for part in MultipartUpload["Parts"])
+
+    def abort_multipart_upload(self, *, Bucket: str, Key: str, UploadId: str) -> None:
+        self.calls.append("abort_multipart_upload")
+
+    def get_object(self, *, Bucket: str, Key: str) -> Dict[str, Any]:
+        if Key not in self.objects:
+            raise self.exceptions.NoSuchKey(Key)
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+
+def test_s3_writer_streams_multipart_uploads() -> None:
+    client = FakeS3Client()
+    writer = S3ArtifactWriter(client, "docs", "prefix/a.html", "a.html", "text/html", part_size=10)
+
+    for _ in range(5):
+        writer.write(b"0123456")
+    stored = writer.close()
+
+    assert client.calls == ["create_multipart_upload"] + ["upload_part"] * 3 + ["complete_multipart_upload"]
+    assert client.objects["prefix/a.html"] == b"0123456" * 5
+    assert stored.url == "s3://docs/prefix/a.html" and stored.size == 35
+
+
+def test_s3_writer_uses_single_put_for_small_artifacts_and_aborts_on_error() -> None:
+    client = FakeS3Client()
+    small = S3ArtifactWriter(client, "docs", "b.txt", "b.txt", "text/plain", part_size=100)
+    small.write(b"short")
+    small.close()
+    assert client.calls == ["put_object"]
+
+    failing = S3ArtifactWriter(client, "docs", "c.txt", "c.txt", "text/plain", part_size=4)
+    failing.write(b"12345")
+    failing.abort()
+    assert client.calls[-1] == "abort_multipart_upload"
+
+
+def test_s3_reader_streams_prefixed_objects_and_misses_as_none() -> None:
+    client = FakeS3Client()
+    storage = S3ArtifactStorage(StorageConfig(backend="s3", bucket="docs", prefix="documents"), client=client)
+    client.objects["documents/uploads/a/parts/000001"] = b"part one"
+
+    reader = storage.open_reader("uploads/a/parts/000001")
+
+    assert reader is not None and reader.read() == b"part one"
+    assert storage.open_reader("uploads/a/parts/000002") is None
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Set
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.ai.stub_provider import StubLLMProvider
+from app.services.document_ingestion import DocumentIngestionPipeline
+from app.services.document_text import TextChunk
+
+
+class InMemoryCorpusRepository:
+    """Mirrors ``DocumentCorpusRepository`` semantics over dictionaries."""
+
+    def __init__(self) -> None:
+        self.document_hashes: Dict[UUID, Optional[str]] = {}
+        self.embeddings: Dict[tuple[str, str], List[float]] = {}
+        self.chunks: Dict[UUID, List[TextChunk]] = {}
+
+    async def get_document_hash(self, document_id: UUID) -> Optional[str]:
+        if document_id not in self.document_hashes:
+            raise LookupError(document_id)
+        return self.document_hashes[document_id]
+
+    async def existing_embedding_hashes(self, hashes: Sequence[str], model_name: str) -> Set[str]:
+        return {value for value in hashes if (value, model_name) in self.embeddings}
+
+    async def insert_embeddings(self, hashes: Sequence[str], vectors: Sequence[Any], model_name: str) -> int:
+        for value, vector in zip(hashes, vectors):
+            self.embeddings.setdefault((value, model_name), list(vector))
+        return len(hashes)
+
+    async def replace_chunks(self, document_id: UUID, chunks: List[TextChunk], source_hash: str) -> None:
+        self.chunks[document_id] = list(chunks)
+        self.document_hashes[document_id] = source_hash
+
+
+def _paragraphs(count: int, *, edited: Optional[int] = None) -> bytes:
+    lines = []
+    for index in range(count):
+        body = f"Clause {index}: the holder may foreclose after the redemption period lapses."
+        if index == edited:
+            body = f"Clause {index}: amended to require notice by certified mail before foreclosure."
+        lines.append(body)
+    return "\n".join(lines).encode()
+
+
+def _pipeline(repository: InMemoryCorpusRepository, provider: StubLLMProvider) -> DocumentIngestionPipeline:
+    return DocumentIngestionPipeline(
+        repository, provider, model="stub-embed", dimensions=8, batch_size=4, chunk_size=400, overlap=0
+    )
+
+
+@pytest.mark.asyncio
+async def test_first_ingestion_embeds_every_distinct_chunk() -> None:
+    repository, provider = InMemoryCorpusRepository(), StubLLMProvider()
+    document_id = uuid4()
+    repository.document_hashes[document_id] = None
+
+    result = await _pipeline(repository, provider).ingest(document_id, _paragraphs(60), filename="terms.txt")
+
+    assert result.chunk_count == len(repository.chunks[document_id]) > 4
+    assert result.embedded_chunks == len({chunk.content_hash for chunk in repository.chunks[document_id]})
+    assert all(len(call["texts"]) <= 4 for call in provider.calls)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_reupload_skips_work() -> None:
+    repository, provider = InMemoryCorpusRepository(), StubLLMProvider()
+    document_id = uuid4()
+    repository.document_hashes[document_id] = None
+    pipeline = _pipeline(repository, provider)
+    await pipeline.ingest(document_id, _paragraphs(20), filename="terms.txt")
+    calls = len(provider.calls)
+
+    result = await pipeline.ingest(document_id, _paragraphs(20), filename="terms.txt")
+
+    assert result.unchanged
+    assert len(provider.calls) == calls
+
+
+@pytest.mark.asyncio
+async def test_edited_reupload_embeds_only_changed_chunks() -> None:
+    repository, provider = InMemoryCorpusRepository(), StubLLMProvider()
+    document_id = uuid4()
+    repository.document_hashes[document_id] = None
+    pipeline = _pipeline(repository, provider)
+    first = await pipeline.ingest(document_id, _paragraphs(60), filename="terms.txt")
+
+    second = await pipeline.ingest(document_id, _paragraphs(60, edited=30), filename="terms.txt")
+
+    assert second.chunk_count == first.chunk_count
+    assert 1 <= second.embedded_chunks <= 2
+    assert second.reused_chunks == second.chunk_count - second.embedded_chunks
+
+
+@pytest.mark.asyncio
+async def test_identical_chunks_are_shared_across_documents() -> None:
+    repository, provider = InMemoryCorpusRepository(), StubLLMProvider()
+    first_id, second_id = uuid4(), uuid4()
+    repository.document_hashes.update({first_id: None, second_id: None})
+    pipeline = _pipeline(repository, provider)
+
+    await pipeline.ingest(first_id, _paragraphs(30), filename="a.txt")
+    result = await pipeline.ingest(second_id, _paragraphs(30) + b"\n", filename="b.txt")
+
+    assert result.embedded_chunks == 0
+    assert result.reused_chunks == result.chunk_count
+
+
+@pytest.mark.asyncio
+async def test_wrong_vector_dimensions_fail_ingestion() -> None:
+    repository, provider = InMemoryCorpusRepository(), StubLLMProvider(dimensions=4)
+    document_id = uuid4()
+    repository.document_hashes[document_id] = None
+    original = provider.create_embeddings
+
+    async def ignore_requested_dimensions(texts, *, model=None, dimensions=None):
+        return await original(texts, model=model)
+
+    provider.create_embeddings = ignore_requested_dimensions  # type: ignore[method-assign]
+
+    with pytest.raises(RuntimeError, match="8 dimensions"):
+        await _pipeline(repository, provider).ingest(document_id, _paragraphs(5), filename="terms.txt")
+    assert document_id not in repository.chunks
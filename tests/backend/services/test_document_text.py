@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.services.document_text import (
+    DOCX_MIME_TYPE,
+    TextSection,
+    chunk_sections,
+    detect_format,
+    extract_sections,
+    hash_source,
+    normalise_text,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+EQUATIONS_WORKBOOK = REPO_ROOT / "Real_Estate_Analysis_Equations_KB.xlsx"
+PROPERTY_EXPORT = REPO_ROOT / "Property Export Houston+Pre-Foreclosure (1).xlsx"
+
+
+def test_detect_format_prefers_mime_type_then_suffix() -> None:
+    assert detect_format(DOCX_MIME_TYPE, "notes.pdf") == "docx"
+    assert detect_format(None, "Real_Estate_Analysis_Equations_KB.xlsx") == "xlsx"
+    assert detect_format("application/pdf; charset=binary") == "pdf"
+    with pytest.raises(ValueError):
+        detect_format("image/png", "scan.png")
+
+
+def test_normalise_text_collapses_whitespace() -> None:
+    assert normalise_text("Lien  \t amount\r\n\r\n\r\n\nRedemption   ") == "Lien amount\n\nRedemption"
+
+
+def test_chunks_overlap_and_break_on_whitespace() -> None:
+    words = " ".join(f"word{index}" for index in range(400))
+    chunks = list(chunk_sections([TextSection(words, "page 1")], chunk_size=200, overlap=40))
+
+    assert len(chunks) > 5
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    for previous, current in zip(chunks, chunks[1:]):
+        assert len(previous.content) <= 200
+        # Every chunk ends and starts on whole words, and shares a tail with its predecessor.
+        assert previous.content.split()[-1] in current.content.split()[:10]
+    assert chunks[-1].content.endswith("word399")
+
+
+def test_chunks_track_the_section_they_start_in() -> None:
+    sections = [TextSection("alpha " * 60, "page 1"), TextSection("beta " * 60, "page 2")]
+
+    chunks = list(chunk_sections(sections, chunk_size=150, overlap=0))
+
+    assert chunks[0].location == "page 1"
+    assert chunks[-1].location == "page 2"
+    assert "".join(chunk.content for chunk in chunks).count("beta") == 60
+
+
+def test_identical_text_hashes_identically() -> None:
+    first = list(chunk_sections([TextSection("Same clause.", "a")], chunk_size=100, overlap=10))
+    second = list(chunk_sections([TextSection("Same   clause.", "b")], chunk_size=100, overlap=10))
+
+    assert first[0].content_hash == second[0].content_hash
+
+
+def test_rejects_overlap_not_smaller_than_chunk() -> None:
+    with pytest.raises(ValueError):
+        list(chunk_sections([TextSection("text", "a")], chunk_size=10, overlap=10))
+
+
+def test_xlsx_sections_repeat_sheet_header() -> None:
+    sections = list(extract_sections(EQUATIONS_WORKBOOK, "xlsx"))
+
+    assert sections
+    first_lines = sections[0].text.split("\n")
+    assert first_lines[0].startswith("Sheet: ")
+    assert "Formula" in first_lines[1]
+    sheet = sections[0].location.split(" rows")[0]
+    same_sheet = [section for section in sections if section.location.startswith(sheet)]
+    assert all(section.text.split("\n")[1] == first_lines[1] for section in same_sheet)
+
+
+def test_xlsx_sections_read_past_a_wrong_sheet_dimension() -> None:
+    # The property exports declare their sheet dimension as A1.
+    sections = list(extract_sections(PROPERTY_EXPORT, "xlsx"))
+
+    assert sections[0].text.split("\n")[1].startswith("Address | Unit # | City")
+    assert sections[-1].location == "sheet Properties rows 1602-1624"
+
+
+def test_docx_sections_include_paragraphs_and_tables(tmp_path: Path) -> None:
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_paragraph("Redemption period is 24 months.")
+    table = document.add_table(rows=1, cols=2)
+    table.rows[0].cells[0].text = "Penalty"
+    table.rows[0].cells[1].text = "25%"
+    path = tmp_path / "terms.docx"
+    document.save(path)
+
+    sections = list(extract_sections(path, "docx"))
+
+    assert sections[0].text == "Redemption period is 24 months."
+    assert sections[1] == TextSection("Penalty | 25%", "table 1")
+
+
+def test_hash_source_matches_for_bytes_and_path(tmp_path: Path) -> None:
+    path = tmp_path / "note.txt"
+    path.write_bytes(b"lien note")
+
+    assert hash_source(path) == hash_source(b"lien note")
+    with path.open("rb") as handle:
+        assert hash_source(handle) == hash_source(b"lien note")
+        assert handle.tell() == 0
+
+
+def test_edit_only_changes_nearby_chunks() -> None:
+    lines = [f"Certificate {index:04d} accrues interest monthly until the parcel is redeemed." for index in range(300)]
+    edited = list(lines)
+    edited[20] += " Amended."
+
+    def hashes(text_lines: list[str]) -> list[str]:
+        chunks = chunk_sections([TextSection("\n".join(text_lines), "a")], chunk_size=600, overlap=80)
+        return [chunk.content_hash for chunk in chunks]
+
+    before, after = set(hashes(lines)), hashes(edited)
+
+    assert len(after) > 20
+    assert sum(value not in before for value in after) <= 3
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+import asyncpg
+import pytest
+from sqlalchemy import exc as sa_exc
+
+from app.models.enums import IntegrationSource, IntegrationStatus
+from app.repositories.event_log import AUDIT_LOGS, COLUMNS, INTEGRATION_EVENTS
+from app.services.event_recorder import EventRecorder, RedisEventStream, is_transient
+
+
+async def _eventually(condition: Callable[[], bool], timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition() and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.005)
+
+
+class FakeSink:
+    def __init__(self, failures: int = 0, reject: Callable[[Tuple[Any, ...]], bool] = lambda row: False) -> None:
+        self.batches: List[Dict[str, List[Tuple[Any, ...]]]] = []
+        self.failures = failures
+        self.reject = reject
+
+    async def write(self, batches: Mapping[str, Sequence[Tuple[Any, ...]]]) -> int:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        if any(self.reject(row) for rows in batches.values() for row in rows):
+            raise asyncpg.CheckViolationError("no partition of relation found for row")
+        self.batches.append({table: list(rows) for table, rows in batches.items()})
+        return sum(len(rows) for rows in batches.values())
+
+    def rows(self, table: str) -> List[Tuple[Any, ...]]:
+        return [row for batch in self.batches for row in batch.get(table, [])]
+
+
+class FakeRedis:
+    """Just enough of a Redis stream with one consumer group for the recorder."""
+
+    def __init__(self) -> None:
+        self.entries: Dict[bytes, Dict[bytes, bytes]] = {}
+        self.delivered: List[bytes] = []
+        self.pending: Dict[bytes, str] = {}
+        self.sequence = 0
+
+    async def xadd(self, key: str, fields: Mapping[str, Any]) -> bytes:
+        self.sequence += 1
+        entry_id = f"{self.sequence}-0".encode()
+        self.entries[entry_id] = {
+            name.encode(): value if isinstance(value, bytes) else value.encode() for name, value in fields.items()
+        }
+        return entry_id
+
+    async def xgroup_create(self, key: str, group: str, id: str, mkstream: bool) -> None:
+        return None
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        (key, cursor), = streams.items()
+        if cursor == "0":
+            ids = [entry_id for entry_id, owner in self.pending.items() if owner == consumer][:count]
+        else:
+            ids = [entry_id for entry_id in self.entries if entry_id not in self.delivered][:count]
+            self.delivered.extend(ids)
+            self.pending.update({entry_id: consumer for entry_id in ids})
+        if not ids:
+            if block:
+                await asyncio.sleep(block / 1000)
+            return []
+        return [[key, [(entry_id, self.entries.get(entry_id)) for entry_id in ids]]]
+
+    async def xautoclaim(self, key, group, consumer, min_idle_time, start, count=None):
+        return [b"0-0", [], []]
+
+    def pipeline(self, transaction: bool = True) -> "FakeRedis":
+        return self
+
+    async def __aenter__(self) -> "FakeRedis":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    def xack(self, key: str, group: str, *entry_ids: bytes) -> None:
+        for entry_id in entry_ids:
+            self.pending.pop(entry_id, None)
+
+    def xdel(self, key: str, *entry_ids: bytes) -> None:
+        for entry_id in entry_ids:
+            self.entries.pop(entry_id, None)
+
+    async def execute(self) -> None:
+        return None
+
+    async def aclose(self) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_sync_mode_writes_before_returning() -> None:
+    sink = FakeSink()
+    recorder = EventRecorder(sink, mode="sync")
+
+    await recorder.record_audit("lien.updated", "tax_lien", "lien-1", "Status changed")
+
+    (row,) = sink.rows(AUDIT_LOGS)
+    assert len(row) == len(COLUMNS[AUDIT_LOGS])
+    assert row[2:6] == ("lien.updated", "tax_lien", "lien-1", "Status changed")
+    await recorder.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_mode_flushes_full_batches_in_one_write() -> None:
+    sink = FakeSink()
+    recorder = EventRecorder(sink, mode="async", flush_interval_ms=10_000, flush_max_events=50)
+
+    for index in range(120):
+        await recorder.record_audit("lien.viewed", "tax_lien", index, "Viewed")
+    assert sink.batches == []
+    await _eventually(lambda: bool(sink.batches))
+
+    assert [len(batch[AUDIT_LOGS]) for batch in sink.batches] == [120]
+    await recorder.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_mode_flushes_on_interval_and_groups_tables() -> None:
+    sink = FakeSink()
+    recorder = EventRecorder(sink, mode="async", flush_interval_ms=5, flush_max_events=1_000)
+
+    await recorder.record_audit("portfolio.created", "portfolio", "p-1", "Created")
+    await recorder.record_integration(
+        IntegrationSource.COUNTY,
+        IntegrationStatus.SUCCESS,
+        request_payload={"parcel": "12-345"},
+        started_at=datetime(2026, 10, 1),
+    )
+    await _eventually(lambda: bool(sink.batches))
+
+    assert len(sink.batches) == 1
+    (integration,) = sink.rows(INTEGRATION_EVENTS)
+    assert integration[1:5] == ("county", '{"parcel":"12-345"}', None, "success")
+    await recorder.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_rows_and_close_drains_them() -> None:
+    sink = FakeSink(failures=1)
+    recorder = EventRecorder(sink, mode="async", flush_interval_ms=10_000, flush_max_events=1_000)
+    await recorder.record_audit("a", "b", "c", "d")
+
+    with pytest.raises(ConnectionError):
+        await recorder.flush()
+    assert recorder.buffered == 1
+
+    await recorder.aclose()
+    assert len(sink.rows(AUDIT_LOGS)) == 1
+    assert (recorder.stats.failed_batches, recorder.stats.written) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_applies_backpressure() -> None:
+    sink = FakeSink()
+    recorder = EventRecorder(sink, mode="async", flush_interval_ms=10_000, flush_max_events=1_000, max_buffered=10)
+
+    for index in range(10):
+        await recorder.record_audit("a", "b", index, "d")
+
+    assert recorder.buffered == 0
+    assert len(sink.rows(AUDIT_LOGS)) == 10
+    await recorder.aclose()
+
+
+@pytest.mark.asyncio
+async def test_permanently_failing_rows_are_dead_lettered_and_the_rest_written() -> None:
+    sink = FakeSink(reject=lambda row: row[4] == "2")
+    dead: List[Tuple[str, Tuple[Any, ...]]] = []
+    recorder = EventRecorder(
+        sink,
+        mode="async",
+        flush_interval_ms=10_000,
+        flush_max_events=1_000,
+        dead_letter=lambda table, row, error: dead.append((table, row)),
+    )
+    for index in range(4):
+        await recorder.record_audit("a", "b", index, "d")
+
+    assert await recorder.flush() == 3
+    assert recorder.buffered == 0
+    assert [row[4] for row in sink.rows(AUDIT_LOGS)] == ["0", "1", "3"]
+    assert [(table, row[4]) for table, row in dead] == [(AUDIT_LOGS, "2")]
+    assert recorder.stats.dead_lettered == 1
+    await recorder.aclose()
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_never_raises_into_callers_during_an_outage() -> None:
+    sink = FakeSink(failures=100)
+    dead: List[Tuple[str, Tuple[Any, ...]]] = []
+    recorder = EventRecorder(
+        sink,
+        mode="async",
+        flush_interval_ms=10_000,
+        flush_max_events=1_000,
+        max_buffered=5,
+        dead_letter=lambda table, row, error: dead.append((table, row)),
+    )
+
+    for index in range(8):
+        await recorder.record_audit("a", "b", index, "d")
+
+    assert recorder.buffered == 5
+    assert [row[4] for _, row in dead] == ["0", "1", "2"]
+    sink.failures = 0
+    await recorder.aclose()
+    assert [row[4] for row in sink.rows(AUDIT_LOGS)] == ["3", "4", "5", "6", "7"]
+
+
+def test_only_connection_and_contention_errors_are_transient() -> None:
+    assert is_transient(ConnectionResetError())
+    assert is_transient(asyncpg.ConnectionDoesNotExistError("closed"))
+    assert is_transient(asyncpg.SerializationError("could not serialize"))
+    assert is_transient(sa_exc.OperationalError("SELECT 1", {}, Exception("server closed the connection")))
+    assert not is_transient(asyncpg.CheckViolationError("no partition of relation found for row"))
+    assert not is_transient(asyncpg.InvalidTextRepresentationError("invalid input value for enum"))
+    assert not is_transient(ValueError("bad row"))
+
+
+@pytest.mark.asyncio
+async def test_stream_mode_acknowledges_only_written_entries() -> None:
+    redis = FakeRedis()
+    sink = FakeSink(failures=1)
+    stream = RedisEventStream(redis, key="events", group="recorder", consumer="c1")
+    recorder = EventRecorder(sink, mode="stream", stream=stream, flush_interval_ms=5, flush_max_events=100)
+
+    for index in range(3):
+        await recorder.record_audit("lien.updated", "tax_lien", index, "Updated")
+    await _eventually(lambda: not redis.entries)
+    await recorder.aclose()
+
+    rows = sink.rows(AUDIT_LOGS)
+    assert [row[4] for row in rows] == ["0", "1", "2"]
+    assert isinstance(rows[0][6], datetime)
+    assert redis.entries == {} and redis.pending == {}
+    assert recorder.stats.failed_batches == 1
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from app.ai.stub_provider import StubLLMProvider
+from app.repositories.document_search import ChunkRecord
+from app.schemas.agent_tools import DocCorpusLookupRequest
+from app.services.hybrid_retrieval import HybridRetriever, reciprocal_rank_fusion, snippet
+
+
+class FakeSearchRepository:
+    def __init__(self, lexical: List[UUID], vector: List[UUID], records: Dict[UUID, ChunkRecord]) -> None:
+        self.lexical, self.vector, self.records = lexical, vector, records
+        self.lexical_queries: List[str] = []
+        self.vector_queries: List[Sequence[float]] = []
+
+    async def lexical_candidates(self, query: str, limit: int) -> List[Tuple[UUID, float]]:
+        self.lexical_queries.append(query)
+        return [(chunk_id, 1.0 / rank) for rank, chunk_id in enumerate(self.lexical[:limit], start=1)]
+
+    async def vector_candidates(self, vector: Sequence[float], model_name: str, limit: int) -> List[Tuple[UUID, float]]:
+        self.vector_queries.append(vector)
+        return [(chunk_id, rank / 10) for rank, chunk_id in enumerate(self.vector[:limit], start=1)]
+
+    async def fetch_chunks(self, chunk_ids: Sequence[UUID]) -> Dict[UUID, ChunkRecord]:
+        return {chunk_id: self.records[chunk_id] for chunk_id in chunk_ids if chunk_id in self.records}
+
+
+class ReverseReranker:
+    """Scores passages by reverse input order, so re-ranking visibly reorders results."""
+
+    def __init__(self) -> None:
+        self.calls: List[int] = []
+
+    async def score(self, query: str, passages: Sequence[str]) -> List[float]:
+        self.calls.append(len(passages))
+        return [float(index) for index in range(len(passages))]
+
+
+def _corpus(count: int) -> Tuple[List[UUID], Dict[UUID, ChunkRecord]]:
+    ids = [uuid4() for _ in range(count)]
+    document_id = uuid4()
+    records = {
+        chunk_id: ChunkRecord(chunk_id, document_id, index, f"Chunk {index} mentions parcel 12-{index:04d}.", None)
+        for index, chunk_id in enumerate(ids)
+    }
+    return ids, records
+
+
+def _retriever(repository: FakeSearchRepository, **kwargs) -> HybridRetriever:
+    return HybridRetriever(repository, StubLLMProvider(), model="stub-embed", dimensions=8, candidates=20, **kwargs)
+
+
+def test_rrf_rewards_agreement_between_lists() -> None:
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a", "d"]], k=60)
+
+    assert [key for key, _ in fused] == ["a", "c", "b", "d"]
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 62)
+
+
+def test_rrf_weights_scale_each_list() -> None:
+    fused = reciprocal_rank_fusion([["a"], ["b"]], k=0, weights=[1.0, 2.0])
+
+    assert fused == [("b", 2.0), ("a", 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_surfaces_results_from_both_lists() -> None:
+    ids, records = _corpus(6)
+    # The exact-ID chunk is only found lexically; the paraphrase match only by vector.
+    repository = FakeSearchRepository(lexical=[ids[0], ids[2]], vector=[ids[1], ids[2], ids[3]], records=records)
+
+    results = await _retriever(repository).search("parcel 12-0000", top_k=3)
+
+    assert results[0].chunk.chunk_id == ids[2]
+    assert {result.chunk.chunk_id for result in results[1:]} == {ids[0], ids[1]}
+    assert results[0].lexical_rank == 2 and results[0].vector_rank == 2
+    assert all(0 < result.confidence <= 1 for result in results)
+
+
+@pytest.mark.asyncio
+async def test_embedding_only_lookup_skips_lexical_search() -> None:
+    ids, records = _corpus(3)
+    repository = FakeSearchRepository(lexical=ids, vector=[ids[2]], records=records)
+
+    results = await _retriever(repository).search(embedding=[0.1] * 8, top_k=5)
+
+    assert [result.chunk.chunk_id for result in results] == [ids[2]]
+    assert repository.lexical_queries == []
+
+
+@pytest.mark.asyncio
+async def test_rejects_embedding_with_wrong_dimensions() -> None:
+    ids, records = _corpus(1)
+    repository = FakeSearchRepository(lexical=[], vector=ids, records=records)
+
+    with pytest.raises(ValueError, match="8 dimensions"):
+        await _retriever(repository).search(embedding=[0.1] * 4)
+
+
+@pytest.mark.asyncio
+async def test_reranker_reorders_the_fused_shortlist() -> None:
+    ids, records = _corpus(10)
+    repository = FakeSearchRepository(lexical=ids, vector=ids, records=records)
+    reranker = ReverseReranker()
+
+    results = await _retriever(repository, reranker=reranker, rerank_top_n=5).search("parcel", top_k=3)
+
+    assert reranker.calls == [5]
+    assert [result.chunk.chunk_id for result in results] == [ids[4], ids[3], ids[2]]
+    assert results[0].confidence > results[-1].confidence
+
+
+@pytest.mark.asyncio
+async def test_lookup_returns_doc_refs_with_snippets() -> None:
+    ids, records = _corpus(2)
+    repository = FakeSearchRepository(lexical=[ids[1]], vector=[ids[1]], records=records)
+
+    response = await _retriever(repository).lookup(DocCorpusLookupRequest(query="parcel 12-0001", top_k=1))
+
+    assert len(response.items) == 1
+    item = response.items[0]
+    assert item.chunk_id == ids[1]
+    assert item.confidence == pytest.approx(1.0)
+    assert "12-0001" in item.snippet
+
+
+def test_lookup_request_requires_query_or_embedding() -> None:
+    with pytest.raises(ValidationError):
+        DocCorpusLookupRequest(top_k=5)
+
+
+def test_snippet_centres_on_first_query_term() -> None:
+    content = "Preamble. " * 60 + "Certificate 2024-00731 was redeemed in full." + " Closing." * 60
+
+    window = snippet(content, "certificate 2024-00731", width=120)
+
+    assert "2024-00731" in window
+    assert window.startswith("…") and window.endswith("…")
+    assert len(window) <= 122
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.models.enums import InterestType
+from app.services.lien_accrual import (
+    AccrualConventions,
+    LienTerms,
+    amounts_due,
+    iter_amounts_due,
+    payoff_as_of,
+    redemption_payoff,
+    total_due_curve,
+)
+
+ISSUED = date(2026, 1, 1)
+
+
+def _terms(*kinds: InterestType, rate: float = 18.0, principal: float = 1_000.0) -> LienTerms:
+    count = len(kinds)
+    return LienTerms.from_columns([principal] * count, [rate] * count, list(kinds), [ISSUED] * count)
+
+
+def test_each_interest_type_after_one_year() -> None:
+    terms = _terms(InterestType.SIMPLE, InterestType.COMPOUND, InterestType.PENALTY, InterestType.STEPPED)
+
+    payoffs = payoff_as_of(terms, date(2027, 1, 1))
+
+    assert payoffs.tolist() == [1_180.0, 1_195.62, 1_180.0, 1_180.0]
+
+
+def test_nothing_accrues_on_or_before_issue_date() -> None:
+    terms = _terms(*InterestType)
+
+    due = amounts_due(terms, [date(2025, 6, 1), ISSUED])
+
+    assert np.all(due == 1_000.0)
+
+
+def test_penalty_is_earned_in_full_the_day_after_issue() -> None:
+    due = amounts_due(_terms(InterestType.PENALTY), [date(2026, 1, 2), date(2028, 1, 1)])
+
+    assert due.tolist() == [[1_180.0, 1_180.0]]
+
+
+def test_stepped_charges_each_started_block_in_full() -> None:
+    terms = _terms(InterestType.STEPPED)
+    dates = [date(2026, 1, 2), date(2026, 7, 1), date(2026, 7, 3), date(2027, 1, 1)]
+
+    assert amounts_due(terms, dates).tolist() == [[1_090.0, 1_090.0, 1_180.0, 1_180.0]]
+    quarterly = amounts_due(terms, [date(2026, 4, 3)], conventions=AccrualConventions(step_months=3))
+    assert quarterly.tolist() == [[1_090.0]]
+
+
+def test_matrix_matches_per_lien_payoffs_across_mixed_types() -> None:
+    rng = np.random.default_rng(3)
+    count = 500
+    terms = LienTerms.from_columns(
+        rng.uniform(500, 20_000, count),
+        rng.uniform(5, 25, count),
+        rng.integers(0, len(InterestType), count),
+        np.datetime64("2025-01-01") + rng.integers(0, 365, count),
+    )
+    dates = np.arange(np.datetime64("2025-06-01"), np.datetime64("2026-06-01"), 30)
+
+    due = amounts_due(terms, dates)
+
+    for column, day in enumerate(dates):
+        assert np.allclose(np.round(due[:, column], 2), payoff_as_of(terms, day))
+
+
+def test_chunked_paths_agree_with_the_dense_matrix() -> None:
+    rng = np.random.default_rng(5)
+    count = 1_000
+    terms = LienTerms.from_columns(
+        rng.uniform(500, 20_000, count),
+        rng.uniform(5, 25, count),
+        rng.integers(0, len(InterestType), count),
+        np.datetime64("2025-01-01") + rng.integers(0, 365, count),
+    )
+    dates = np.arange(np.datetime64("2026-01-01"), np.datetime64("2026-03-01"))
+    weights = rng.uniform(0, 1, count)
+    dense = amounts_due(terms, dates)
+
+    assert np.allclose(total_due_curve(terms, dates, weights=weights, chunk_size=128), weights @ dense)
+    blocks = np.vstack([block for _, block in iter_amounts_due(terms, dates, chunk_size=300)])
+    assert np.array_equal(blocks, dense)
+
+
+def test_per_lien_as_of_dates_and_aware_datetimes() -> None:
+    terms = _terms(InterestType.SIMPLE, InterestType.SIMPLE)
+    as_of = [datetime(2026, 7, 2, 3, tzinfo=timezone.utc), date(2027, 1, 1)]
+
+    assert payoff_as_of(terms, as_of).tolist() == [1_089.75, 1_180.0]
+    with pytest.raises(ValueError):
+        payoff_as_of(terms, [date(2027, 1, 1)] * 3)
+
+
+def test_single_lien_payoff_is_a_rounded_decimal() -> None:
+    payoff = redemption_payoff(Decimal("1234.56"), Decimal("18.00"), "compound", ISSUED, date(2026, 12, 31))
+
+    assert payoff == Decimal("1475.34")  # 1234.56 × 1.015^(12 × 364/365)
+    assert payoff.as_tuple().exponent == -2
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import Select
+from sqlalchemy.dialects import postgresql
+
+from app.models.enums import NotificationType, StrategyType, UserRole
+from app.repositories.notifications import (
+    Audience,
+    FanoutBatch,
+    UserDigest,
+    fan_out_statement,
+    mark_read_statement,
+)
+from app.services.notification_fanout import NotificationEvent, NotificationFanout, digest_group_key
+
+
+def _sql(statement: Any) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _params(statement: Any) -> Dict[str, Any]:
+    return statement.compile(dialect=postgresql.dialect()).params
+
+
+def _bound(statement: Any) -> Dict[str, Any]:
+    """Parameters as the driver receives them, after each column type's bind processor."""
+    dialect = postgresql.dialect()
+    compiled = statement.compile(dialect=dialect)
+    bound = {}
+    for bind, name in compiled.bind_names.items():
+        value, process = compiled.params[name], bind.type.bind_processor(dialect)
+        if process is not None:
+            value = [process(item) for item in value] if bind.expanding else process(value)
+        bound[name] = value
+    return bound
+
+
+class FakeNotificationStore:
+    """Pages through a sorted user list the way the keyset query does, tracking open digest rows."""
+
+    def __init__(self, user_ids: List[UUID]) -> None:
+        self.user_ids = sorted(user_ids)
+        self.open_groups: Dict[tuple, int] = {}
+        self.statements: List[Select] = []
+
+    async def fan_out_batch(self, statement: Select) -> FanoutBatch:
+        self.statements.append(statement)
+        params = _params(statement)
+        after = params.get("after_user_id")
+        limit = max(value for key, value in params.items() if key.startswith("param_") and isinstance(value, int))
+        page = [user_id for user_id in self.user_ids if after is None or user_id > after][:limit]
+        group_key = next(value for key, value in params.items() if isinstance(value, str) and ":" in value)
+        inserted = 0
+        for user_id in page:
+            if (user_id, group_key) not in self.open_groups:
+                inserted += 1
+            self.open_groups[(user_id, group_key)] = self.open_groups.get((user_id, group_key), 0) + 1
+        return FanoutBatch(len(page), inserted, len(page), page[-1] if page else None)
+
+    async def mark_read(self, **filters: Any) -> int:
+        return len(self.open_groups)
+
+    async def iter_digests(self, since: datetime, until: datetime, *, batch_size: int = 1_000):
+        yield [UserDigest(user_id, 1, count, []) for (user_id, _), count in self.open_groups.items()]
+
+
+def test_fan_out_statement_upserts_into_the_open_digest_row() -> None:
+    statement = fan_out_statement(
+        Audience(),
+        notification_type=NotificationEvent("t", "b").notification_type,
+        title="Top Deals Updated",
+        body="12 new deals",
+        metadata={"events": [{"deals": 12}]},
+        group_key="top_deals:1",
+        after=None,
+        batch_size=500,
+        max_events=5,
+    )
+    sql = _sql(statement)
+
+    assert "INSERT INTO notifications" in sql and "FROM audience" in sql
+    assert "ON CONFLICT (user_id, group_key) WHERE group_key IS NOT NULL AND NOT is_read DO UPDATE" in sql
+    assert "event_count = (notifications.event_count +" in sql
+    assert ">= 5 THEN" in sql
+    assert "users.is_active" in sql and "ORDER BY users.id" in sql
+    assert "users.id >" not in sql
+
+
+def test_audience_filters_bind_arrays_not_per_user_parameters() -> None:
+    user_ids = [uuid4() for _ in range(5_000)]
+    statement = fan_out_statement(
+        Audience(user_ids=user_ids, strategy_types=[StrategyType.YIELD], states=["fl", "az"], lien_ids=[uuid4()]),
+        notification_type=NotificationEvent("t", "b").notification_type,
+        title="t",
+        body="b",
+        metadata={},
+        group_key=None,
+        after=uuid4(),
+        batch_size=100,
+        max_events=5,
+    )
+    sql = _sql(statement)
+    params = _params(statement)
+
+    assert "users.id = ANY (%(audience_user_ids)s::UUID[])" in sql
+    assert "investor_profiles.preferred_states && " in sql
+    assert "portfolio_holdings.lien_id = ANY" in sql
+    assert "users.id > %(after_user_id)s" in sql
+    assert params["audience_user_ids"] == user_ids
+    assert params["audience_states"] == ["FL", "AZ"]
+
+
+def test_enum_filters_and_notification_type_bind_the_database_labels() -> None:
+    statement = fan_out_statement(
+        Audience(roles=[UserRole.INVESTOR], strategy_types=[StrategyType.YIELD]),
+        notification_type=NotificationType.ALERT,
+        title="t",
+        body="b",
+        metadata={},
+        group_key=None,
+        after=None,
+        batch_size=100,
+        max_events=5,
+    )
+
+    bound = _bound(statement)
+
+    assert bound["role_1"] == ["investor"]
+    assert bound["strategy_type_1"] == ["yield"]
+    assert "alert" in bound.values()
+
+
+def test_mark_read_is_one_update_and_requires_a_scope() -> None:
+    user_id = uuid4()
+    sql = _sql(mark_read_statement(user_id=user_id, group_key="top_deals:1"))
+
+    assert sql.startswith("UPDATE notifications SET is_read=")
+    assert "read_at=now()" in sql and "NOT notifications.is_read" in sql
+    with pytest.raises(ValueError):
+        mark_read_statement(group_key="top_deals:1")
+
+
+def test_digest_group_key_buckets_by_window() -> None:
+    assert digest_group_key("top_deals", 1_800.0, 900) == digest_group_key("top_deals", 2_699.9, 900)
+    assert digest_group_key("top_deals", 2_699.9, 900) != digest_group_key("top_deals", 2_700.0, 900)
+
+
+@pytest.mark.asyncio
+async def test_publish_pages_through_the_audience_in_batches() -> None:
+    store = FakeNotificationStore([uuid4() for _ in range(2_500)])
+    fanout = NotificationFanout(store, batch_size=1_000, digest_window_seconds=900, clock=lambda: 1_000.0)
+
+    result = await fanout.publish(NotificationEvent("Top Deals Updated", "b", group="top_deals"), Audience())
+
+    assert (result.recipients, result.inserted, result.collapsed, result.batches) == (2_500, 2_500, 0, 3)
+    assert len(store.statements) == 3
+    assert "after_user_id" not in _params(store.statements[0])
+    assert _params(store.statements[1])["after_user_id"] == store.user_ids[999]
+
+
+@pytest.mark.asyncio
+async def test_repeat_event_in_window_collapses_into_existing_rows() -> None:
+    store = FakeNotificationStore([uuid4() for _ in range(300)])
+    now = [1_000.0]
+    fanout = NotificationFanout(store, batch_size=1_000, digest_window_seconds=900, clock=lambda: now[0])
+    event = NotificationEvent("Top Deals Updated", "b", group="top_deals", payload={"deals": 3})
+
+    await fanout.publish(event, Audience())
+    repeat = await fanout.publish(event, Audience())
+    now[0] = 2_000.0
+    next_window = await fanout.publish(event, Audience())
+
+    assert (repeat.inserted, repeat.collapsed) == (0, 300)
+    assert (next_window.inserted, next_window.collapsed) == (300, 0)
+    digests = [digest async for batch in fanout.digests(datetime.min, datetime.max) for digest in batch]
+    assert sorted({digest.event_count for digest in digests}) == [1, 2]
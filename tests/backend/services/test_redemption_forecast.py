@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, AsyncIterator, List, Sequence, Tuple
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.models.enums import InterestType
+from app.services.redemption_forecast import HazardModel, OpenHoldings, RedemptionForecaster, project_holdings
+
+COUNTY_A, COUNTY_B = uuid4(), uuid4()
+
+
+def test_fit_counts_redemptions_against_holdings_at_risk() -> None:
+    # 10 holdings: 2 redeem in month 0, 3 are censored at month 1, 5 redeem in month 1.
+    counts = [(COUNTY_A, 0, 0, True, 2), (COUNTY_A, 0, 1, False, 3), (COUNTY_A, 0, 1, True, 5)]
+
+    model = HazardModel.fit(counts, max_duration=2, prior_strength=0.0)
+    cell = model.cell_rows[(COUNTY_A, 0)]
+
+    np.testing.assert_allclose(model.hazards[cell], [2 / 10, 5 / 5, 0.0], atol=1e-8)
+    assert (model.holdings, model.redemptions) == (10, 7)
+
+
+def test_thin_cells_shrink_toward_their_county() -> None:
+    counts = [(COUNTY_A, 0, 0, True, 50), (COUNTY_A, 0, 1, False, 50), (COUNTY_A, 1, 0, True, 1)]
+
+    model = HazardModel.fit(counts, max_duration=1, prior_strength=10.0)
+    thin = model.hazards[model.cell_rows[(COUNTY_A, 1)], 0]
+    county = model.hazards[model.county_rows[COUNTY_A], 0]
+
+    assert county < thin < 1.0
+    assert thin == pytest.approx((1 + 10 * county) / (1 + 10))
+    assert model.rows_for([COUNTY_A, COUNTY_A, COUNTY_B], [1, 7, 1]).tolist() == [
+        model.cell_rows[(COUNTY_A, 1)],
+        model.county_rows[COUNTY_A],
+        0,
+    ]
+
+
+def test_redemption_probabilities_follow_the_survival_curve() -> None:
+    model = HazardModel(np.array([[0.1, 0.2, 0.5]]), {}, {})
+
+    fresh, old = model.redemption_probabilities(np.array([0, 0]), np.array([0, 40]), horizon=4)
+
+    np.testing.assert_allclose(fresh, [0.1, 0.9 * 0.2, 0.9 * 0.8 * 0.5, 0.9 * 0.8 * 0.5 * 0.5])
+    # Past the last duration month the hazard stays constant.
+    np.testing.assert_allclose(old, [0.5, 0.25, 0.125, 0.0625])
+
+
+class FakeStore:
+    def __init__(self, counts: List[Tuple[Any, ...]], holdings: List[Tuple[Any, ...]]) -> None:
+        self.counts = counts
+        self.holdings = holdings
+        self.written: List[Tuple[Any, ...]] = []
+        self.as_of: date | None = None
+
+    async def refresh_observations(self) -> int:
+        return 4
+
+    async def hazard_counts(self, as_of: date, max_duration: int) -> List[Tuple[Any, ...]]:
+        return self.counts
+
+    async def iter_open_holdings(self, as_of: date, chunk_size: int) -> AsyncIterator[Sequence[Any]]:
+        for start in range(0, len(self.holdings), chunk_size):
+            yield self.holdings[start : start + chunk_size]
+
+    async def replace_forecast(self, as_of: date, rows: Sequence[Tuple[Any, ...]]) -> int:
+        self.as_of, self.written = as_of, list(rows)
+        return len(rows)
+
+
+def _holding(portfolio_id: Any, principal: float, age: int) -> Tuple[Any, ...]:
+    issued = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return (uuid4(), portfolio_id, COUNTY_A, 0, age, principal, Decimal("12.00"), InterestType.SIMPLE, issued)
+
+
+@pytest.mark.asyncio
+async def test_run_projects_every_open_holding_into_portfolio_months() -> None:
+    first, second = uuid4(), uuid4()
+    holdings = [_holding(first, 1_000.0, 3), _holding(first, 2_000.0, 10), _holding(second, 5_000.0, 0)]
+    store = FakeStore([(COUNTY_A, 0, 0, True, 5), (COUNTY_A, 0, 6, True, 5), (COUNTY_A, 0, 12, False, 20)], holdings)
+    forecaster = RedemptionForecaster(store, horizon_months=6, max_duration_months=12, chunk_size=2)
+
+    result = await forecaster.run(date(2026, 10, 19))
+
+    assert store.as_of == result.as_of == date(2026, 10, 1)
+    assert (result.open_holdings, result.portfolios, result.rows_written) == (3, 2, 12)
+    assert [row[2] for row in store.written[:6]] == [date(2026, month, 1) for month in (10, 11, 12)] + [
+        date(2027, month, 1) for month in (1, 2, 3)
+    ]
+
+    model = await forecaster.fit(result.as_of)
+    projection = project_holdings(model, OpenHoldings.from_rows(holdings), result.as_of, 6)
+    by_portfolio = {row[1]: 0.0 for row in store.written}
+    for row in store.written:
+        by_portfolio[row[1]] += float(row[4])
+        assert row[5] <= row[4] <= row[6] and row[5] >= 0
+    assert by_portfolio[first] == pytest.approx(projection.cashflow[:2].sum(), abs=0.05)
+    assert result.expected_cashflow == pytest.approx(projection.cashflow.sum(), abs=0.01)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import io
+import re
+import zipfile
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook
+
+from app.services.tabular_readers import detect_tabular_format, infer_types, iter_chunks, widen_type
+
+
+def _xlsx_with_a1_dimension() -> bytes:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Properties"
+    sheet.append(["Address", "Zip", "Est. Value", "Sold"])
+    sheet.append(["1 Main St", "07002", 250000, datetime(2025, 1, 2)])
+    sheet.append([None, None, None, None])
+    sheet.append(["2 Oak Ave", "77002", 199999.5, datetime(2025, 3, 4, 5, 6)])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    # Rewrite the sheet's declared dimension to A1, as the property exports do.
+    source, output = zipfile.ZipFile(io.BytesIO(buffer.getvalue())), io.BytesIO()
+    with zipfile.ZipFile(output, "w") as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = re.sub(rb'<dimension ref="[^"]+"', b'<dimension ref="A1"', data)
+            target.writestr(item, data)
+    return output.getvalue()
+
+
+def test_csv_headers_are_deduplicated_and_rows_padded_in_chunks() -> None:
+    data = b'\xef\xbb\xbf"Name","DNC","DNC",""\n"Ann","Yes","No","x"\n,,,\n"Bob","No"\n"Cy","y","n","z","extra"\n'
+
+    chunks = list(iter_chunks(data, "csv", chunk_size=2))
+
+    assert [len(chunk.rows) for chunk in chunks] == [2, 1]
+    assert chunks[0].header == ("Name", "DNC", "DNC.1", "column_4")
+    assert chunks[0].rows[1] == ("Bob", "No", None, None)
+    assert chunks[0].row_numbers == [2, 4]
+    assert chunks[1].rows == [("Cy", "y", "n", "z")]
+    assert chunks[0].types == ["text", "boolean", "boolean", "text"]
+
+
+@pytest.mark.parametrize("reader", ["openpyxl", "calamine"])
+def test_xlsx_reads_past_a_wrong_dimension_with_either_reader(reader: str) -> None:
+    if reader == "calamine":
+        pytest.importorskip("python_calamine")
+
+    (chunk,) = iter_chunks(_xlsx_with_a1_dimension(), "xlsx", chunk_size=100, xlsx_reader=reader)
+
+    assert chunk.sheet_name == "Properties"
+    assert chunk.rows == [
+        ("1 Main St", "07002", "250000", "2025-01-02"),
+        ("2 Oak Ave", "77002", "199999.5", "2025-03-04 05:06:00"),
+    ]
+    assert chunk.row_numbers == [2, 4]
+    assert chunk.types == ["text", "text", "decimal", "datetime"]
+
+
+def test_types_only_widen() -> None:
+    assert infer_types([("1", "2025-01-02", None), ("-3", "2025-01-02 10:00", None)], 3) == [
+        "integer",
+        "datetime",
+        "empty",
+    ]
+    assert infer_types([("1.5",)], 1, current=["integer"]) == ["decimal"]
+    assert widen_type("boolean", "integer") == "text"
+    assert widen_type("decimal", "empty") == "decimal"
+
+
+def test_format_detection_prefers_mime_type_then_suffix() -> None:
+    assert detect_tabular_format("text/csv; charset=utf-8", "list.xlsx") == "csv"
+    assert detect_tabular_format(None, "Property Export.XLSX") == "xlsx"
+    with pytest.raises(ValueError):
+        detect_tabular_format("application/pdf", "report.pdf")
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.services.upload_ingestion import UploadIngestionPipeline
+
+
+class FakeStore:
+    def __init__(self) -> None:
+        self.calls: List[tuple] = []
+        self.staged: List[tuple] = []
+
+    async def begin_staging(self, upload_id: UUID) -> None:
+        self.calls.append(("begin", upload_id))
+
+    async def stage_rows(
+        self, upload_id: UUID, sheet_index: int, row_numbers: Sequence[int], rows: Sequence[Sequence[Optional[str]]]
+    ) -> int:
+        self.staged.append((sheet_index, list(row_numbers), list(rows)))
+        return len(rows)
+
+    async def complete(self, upload_id: UUID, sheets: List[Dict[str, Any]], row_count: int) -> None:
+        self.calls.append(("complete", sheets, row_count))
+
+    async def fail(self, upload_id: UUID, error: str) -> None:
+        self.calls.append(("fail", error))
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_staged_in_order_and_types_widen_across_chunks() -> None:
+    store = FakeStore()
+    upload_id = uuid4()
+    data = b"APN,Amount\n001,10\n002,12\n003,12.5\n"
+
+    result = await UploadIngestionPipeline(store, chunk_size=2).ingest(upload_id, data, "csv")
+
+    assert [(numbers, len(rows)) for _, numbers, rows in store.staged] == [([2, 3], 2), ([4], 1)]
+    assert store.calls[0] == ("begin", upload_id)
+    assert store.calls[-1] == (
+        "complete",
+        [{"name": "csv", "columns": ["APN", "Amount"], "types": ["text", "decimal"], "rows": 3}],
+        3,
+    )
+    assert result.rows == 3
+
+
+@pytest.mark.asyncio
+async def test_unreadable_upload_is_marked_failed() -> None:
+    store = FakeStore()
+
+    with pytest.raises(Exception):
+        await UploadIngestionPipeline(store, chunk_size=10).ingest(uuid4(), b"not a zip", "xlsx")
+
+    assert store.calls[-1][0] == "fail"
+    assert store.staged == []
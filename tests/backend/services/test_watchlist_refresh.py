@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.repositories.analysis_refresh import RefreshPlan
+from app.services.watchlist_refresh import WatchlistRefresher
+
+
+class FakeStore:
+    def __init__(self, previous: Optional[UUID], changed: Dict[UUID, str]) -> None:
+        self.previous = previous
+        self.changed = changed
+        self.planned: List[Any] = []
+
+    async def previous_run(self, run_id: UUID) -> Optional[UUID]:
+        return self.previous
+
+    async def plan(
+        self, run_id: UUID, previous_run_id: Optional[UUID], lien_ids: Sequence[UUID], formula_version: str
+    ) -> RefreshPlan:
+        self.planned.append((previous_run_id, formula_version))
+        copied = {"deal_metrics": len(lien_ids) - len(self.changed)} if previous_run_id else {}
+        return RefreshPlan(run_id, previous_run_id, len(lien_ids), dict(self.changed), copied)
+
+    async def rerank_deal_scores(self, run_id: UUID) -> int:
+        return 7
+
+
+@pytest.mark.asyncio
+async def test_only_changed_liens_are_analysed() -> None:
+    lien_ids = [uuid4() for _ in range(5)]
+    previous = uuid4()
+    store = FakeStore(previous, {lien_ids[1]: "a" * 32})
+    calls: List[Mapping[UUID, str]] = []
+
+    async def analyse(run_id: UUID, changed: Mapping[UUID, str]) -> None:
+        calls.append(changed)
+
+    result = await WatchlistRefresher(store, formula_version="1:abc").run(uuid4(), lien_ids, analyse)
+
+    assert calls == [{lien_ids[1]: "a" * 32}]
+    assert store.planned == [(previous, "1:abc")]
+    assert (result.liens, result.analysed, result.skipped, result.reranked) == (5, 1, 4, 7)
+    assert result.copied_forward == {"deal_metrics": 4}
+
+
+@pytest.mark.asyncio
+async def test_nothing_changed_skips_analysis_and_explicit_previous_run_wins() -> None:
+    store = FakeStore(uuid4(), {})
+    explicit = uuid4()
+
+    async def analyse(run_id: UUID, changed: Mapping[UUID, str]) -> None:
+        raise AssertionError("nothing to analyse")
+
+    result = await WatchlistRefresher(store, formula_version="1:abc").run(
+        uuid4(), [uuid4()], analyse, previous_run_id=explicit
+    )
+
+    assert result.previous_run_id == explicit and result.analysed == 0
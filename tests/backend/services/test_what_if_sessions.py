@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import gc
+from decimal import Decimal
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.services.what_if import RunBaseline, WhatIfParameters, WhatIfSession, WhatIfSessions, top_positions
+
+RUN_ID = uuid4()
+
+
+def _baseline(run_id=RUN_ID) -> RunBaseline:
+    # lien, p(redeem), redemption profit, months, capital, deed profit, deed months, deed capital, rank
+    rows = [
+        (uuid4(), 0.9, Decimal("150.00"), 12, Decimal("1000.00"), Decimal("4000.00"), 24, Decimal("6000.00"), 2),
+        (uuid4(), 0.5, Decimal("180.00"), 12, Decimal("1000.00"), Decimal("9000.00"), 24, Decimal("3000.00"), 1),
+        (uuid4(), None, None, None, None, None, None, None, None),
+    ]
+    return RunBaseline.from_rows(run_id, rows)
+
+
+def test_baseline_scores_reproduce_the_stored_scenarios() -> None:
+    session = WhatIfSession(_baseline())
+
+    ranking = session.rank(WhatIfParameters(), top_k=5)
+
+    first, second, empty = ranking.deals
+    assert (first.baseline_rank, second.baseline_rank, empty.baseline_rank) == (1, 2, None)
+    # 0.5 x 180 + 0.5 x 9000 over 0.5 x 1000 + 0.5 x 3000.
+    assert first.score == pytest.approx(4590 / 2000)
+    assert second.expected_value == pytest.approx(0.9 * 150 + 0.1 * 4000)
+    assert second.expected_capital == pytest.approx(0.9 * 1000 + 0.1 * 6000)
+    assert empty.score is None and empty.rank == 3
+    assert ranking.recomputed == (
+        "probability",
+        "redemption_pv",
+        "deed_profit",
+        "deed_capital",
+        "deed_pv",
+        "expected_value",
+        "expected_capital",
+        "score",
+    )
+
+
+def test_only_nodes_downstream_of_a_changed_assumption_are_recomputed() -> None:
+    session = WhatIfSession(_baseline())
+    session.evaluate(WhatIfParameters())
+
+    assert session.evaluate(WhatIfParameters()) == ()
+    assert session.evaluate(WhatIfParameters(discount_rate=0.1)) == (
+        "redemption_pv",
+        "deed_pv",
+        "expected_value",
+        "score",
+    )
+    assert session.evaluate(WhatIfParameters(discount_rate=0.1, rehab_cost_multiplier=2.0)) == (
+        "deed_profit",
+        "deed_capital",
+        "deed_pv",
+        "expected_value",
+        "expected_capital",
+        "score",
+    )
+    # The second lien's deed path costs 2000 more rehab when it is doubled.
+    np.testing.assert_allclose(session.column("deed_profit")[:2], [4000 - 5000, 9000 - 2000])
+    np.testing.assert_allclose(session.column("redemption_pv")[:2], [150 / 1.1, 180 / 1.1])
+
+
+def test_top_positions_match_a_full_sort() -> None:
+    score = np.random.default_rng(3).normal(size=10_000)
+    score[::7] = score[0]
+
+    expected = np.argsort(-score, kind="stable")[:25]
+
+    np.testing.assert_array_equal(top_positions(score, 25), expected)
+    np.testing.assert_array_equal(top_positions(score[:10], 25), np.argsort(-score[:10], kind="stable"))
+
+
+def test_sessions_evict_least_recently_used_and_release_unused_baselines() -> None:
+    sessions = WhatIfSessions(max_sessions=2)
+    other_run = uuid4()
+    first = sessions.open(_baseline())
+    second = sessions.open(_baseline())
+    assert second.baseline is first.baseline
+
+    assert sessions.get(first.session_id, RUN_ID) is first
+    assert sessions.get(first.session_id, other_run) is None
+    sessions.open(_baseline(other_run))
+
+    assert sessions.get(second.session_id, RUN_ID) is None
+    assert sessions.get(first.session_id, RUN_ID) is first
+    assert sessions.close(first.session_id) and not sessions.close(first.session_id)
+    del first, second
+    gc.collect()
+    assert sessions.baseline(RUN_ID) is None
+    assert sessions.baseline(other_run) is not None